@@ -25,6 +25,7 @@ from .app import (
     RunTarget,
     RuntimeApp,
     RuntimePlan,
+    SessionHub,
     app,
     run,
     run_desktop,
@@ -34,6 +35,10 @@ from .core import (
     Breakpoints,
     Component,
     Control,
+    NumericArray,
+    Slot,
+    Template,
+    TemplateInstance,
 )
 from .icons import (
     ICON_NAMES,
@@ -92,6 +97,7 @@ from .controls import *  # noqa: F401,F403
 from .controls import __all__ as _controls_all
 from .state import Computed, DerivedState, Signal, State, effect
 from .callbacks import Update, update, NO_UPDATE, TaskQueue, Progress as ProgressHandle, bind_event
+from .data import ColumnTable, DataProvider, DataWindow, DisplayList, GridQuery, Query, QueryPage, QuerySource, SequenceProvider, SqliteSource, TimeSeries
 from .assets import AssetServer, data_uri_from_base64, file_payload_to_src, files_payload_to_srcs
 
 __all__ = [
@@ -99,6 +105,7 @@ __all__ = [
     "__version__",
     "AppConfig",
     "RuntimeApp",
+    "SessionHub",
     "App",
     "Page",
     "BaseApp",
@@ -114,6 +121,10 @@ __all__ = [
     "run_desktop",
     "Component",
     "Control",
+    "NumericArray",
+    "Slot",
+    "Template",
+    "TemplateInstance",
     "Breakpoints",
     "IconData",
     "ICON_NAMES",
@@ -181,6 +192,17 @@ __all__ = [
     "ProgressHandle",
     "bind_event",
     "AssetServer",
+    "ColumnTable",
+    "DataProvider",
+    "DataWindow",
+    "DisplayList",
+    "GridQuery",
+    "Query",
+    "QueryPage",
+    "QuerySource",
+    "SequenceProvider",
+    "SqliteSource",
+    "TimeSeries",
     "data_uri_from_base64",
     "file_payload_to_src",
     "files_payload_to_srcs",
@@ -25,18 +25,22 @@ import json
 import logging
 import sys
 import warnings
-from typing import Any, Awaitable, Callable, Optional, Iterable
+from typing import Any, Awaitable, Callable, Optional, Iterable, Mapping
 import uuid
 import threading
 import hashlib
 
 import time
 
-from .runtime.transport.websocket import WebSocketRuntimeServer
+from .runtime.transport.apply_log import ApplyLog
+from .runtime.transport.broadcast import BroadcastGroup
+from .runtime.transport.websocket import RuntimeConnection, WebSocketRuntimeServer
 from .runtime.boot import build_problem, build_runtime_stall_problem
 from .runtime import set_current_session
 from .runtime.runner import RunTarget, RuntimePlan, build_runtime_plan
 from .core.control import Control, coerce_json_value
+from .core.diff import ItemsPatch, PropAppend, TreeDiff, diff_control_tree
+from .runtime.protocol.capabilities import UI_ACKS, UI_OPS, UI_RESUME
 from .core.performance import PerformanceConfig
 from .stylesheet import StyleSheet, parse_stylesheet
 
@@ -64,6 +68,30 @@ class AppConfig:
 		target_fps: Target FPS for client pacing and performance reporting.
 		hello_timeout: Timeout waiting for the runtime hello.
 		first_render_timeout: Timeout waiting for the first render.
+		production: Production mode; disables dev-only work such as recording
+			where each control was constructed. `None` follows `BUTTERFLYUI_MODE`.
+		compression: Negotiate permessage-deflate with the runtime.
+		compression_threshold: Messages smaller than this many bytes are sent
+			uncompressed.
+		chunk_size: Largest `ui.*` frame sent in one piece; bigger frames are
+			streamed as `ui.chunk` messages when the runtime supports it. `None`
+			disables chunking.
+		send_queue_limit: High-water mark of queued UI/diagnostic messages per
+			connection; `send()` waits above it.
+		multi_client: Web target only. Give every runtime connection its own
+			`Page` and session instead of sharing one between browser tabs.
+		max_clients: Connection limit when `multi_client` or `broadcast` is
+			set; `None` is unlimited.
+		broadcast: Web target only. Mirror one `Page` to every connected
+			runtime; each update is encoded once for all of them.
+		max_frames_in_flight: With runtimes that acknowledge applies
+			(`ui.acks`), hold prop patches while this many `ui.apply` batches
+			are unacknowledged and merge them into one batch.
+		resume_timeout: With runtimes that resume (`ui.resume`), how long a
+			session outlives its connection waiting for the runtime to come
+			back. `None` ends the session on disconnect.
+		resume_log_size: `ui.apply` batches kept for replay to resuming
+			runtimes; older resume points get a full snapshot.
 	"""
 	host: str = "127.0.0.1"
 	port: int = 8765
@@ -74,6 +102,42 @@ class AppConfig:
 	target_fps: int = 60
 	hello_timeout: float | None = 10.0
 	first_render_timeout: float | None = 10.0
+	production: bool | None = None
+	compression: bool = True
+	compression_threshold: int = 1024
+	chunk_size: int | None = 256 * 1024
+	send_queue_limit: int = 256
+	multi_client: bool = False
+	max_clients: int | None = None
+	broadcast: bool = False
+	max_frames_in_flight: int = 3
+	resume_timeout: float | None = 30.0
+	resume_log_size: int = 256
+
+
+# A batch unacknowledged for this long no longer holds back patch flushes.
+_ACK_TIMEOUT_S = 1.0
+# Send times kept for round-trip measurement when acks stop arriving.
+_MAX_TRACKED_SEQS = 256
+# `ui.apply` keys that are not part of a page snapshot's metadata.
+_SNAPSHOT_SKIP_KEYS = frozenset({"root", "screen", "overlay", "splash", "ops", "patch", "patches", "seq"})
+
+
+def _build_server(config: AppConfig) -> WebSocketRuntimeServer:
+	return WebSocketRuntimeServer(
+		host=config.host,
+		port=config.port,
+		path=config.path,
+		token=config.token,
+		require_token=config.require_token,
+		protocol=config.protocol,
+		target_fps=config.target_fps,
+		compression=config.compression,
+		compression_threshold=config.compression_threshold,
+		chunk_size=config.chunk_size,
+		send_queue_limit=config.send_queue_limit,
+		max_connections=config.max_clients if config.multi_client or config.broadcast else None,
+	)
 
 
 class ButterflyUISession:
@@ -82,9 +146,12 @@ class ButterflyUISession:
 	The session owns the WebSocket transport, event subscriptions, invoke handlers,
 	and UI patch buffering. It also tracks the last rendered root/screen/overlay
 	state to support reconnection logic and runtime stall diagnostics.
+
+	`server` is either a whole `WebSocketRuntimeServer` (single-client apps)
+	or one `RuntimeConnection` of it (see `SessionHub`).
 	"""
 
-	def __init__(self, server: WebSocketRuntimeServer, config: AppConfig) -> None:
+	def __init__(self, server: WebSocketRuntimeServer | RuntimeConnection, config: AppConfig) -> None:
 		self._server = server
 		self._config = config
 		self._max_fps: int = int(getattr(server, "target_fps", 60) or 60)
@@ -92,8 +159,28 @@ class ButterflyUISession:
 			self._max_fps = 60
 		self._frame_interval_s: float = 1.0 / float(self._max_fps)
 		self._patch_buffer: dict[str, dict[str, Any]] = {}
+		# Set while `_patch_buffer` may hold `PropAppend`/`ItemsPatch` values.
+		self._pending_list_ops: bool = False
 		self._patch_flush_handle: asyncio.Handle | None = None
 		self._last_patch_flush: float = 0.0
+		# `ui.acks` flow control: `seq` of the last sent and last applied batch.
+		self._max_frames_in_flight: int = max(1, int(config.max_frames_in_flight))
+		self._seq: int = 0
+		self._acked_seq: int = 0
+		self._sent_at: dict[int, float] = {}
+		self._flush_deferred: bool = False
+		self._deferred_flushes: int = 0
+		self._acks: int = 0
+		self._apply_rtt_s: float | None = None
+		self._apply_rtt_min_s: float | None = None
+		self._apply_rtt_max_s: float | None = None
+		# `ui.resume`: sequenced batches kept for runtimes that reconnect.
+		self._apply_log = ApplyLog(config.resume_log_size)
+		self._resume_enabled: bool = False
+		self._reconnected = asyncio.Event()
+		self._served: bool = False
+		self._resumes: int = 0
+		self._resume_snapshots: int = 0
 		self.session_id: str | None = None
 		self.hello_payload: dict[str, Any] | None = None
 		self.connected: bool = False
@@ -104,6 +191,14 @@ class ButterflyUISession:
 		self._last_screen: dict[str, Any] | None = None
 		self._last_overlay: dict[str, Any] | None = None
 		self._last_splash: dict[str, Any] | None = None
+		self._tree_sizes: dict[str, int] = {}
+		# Control id -> (slot, child positions) in the `_last_*` trees below,
+		# built for the trees in `_snapshot_paths_roots`.
+		self._snapshot_paths: dict[str, tuple[str, tuple[int, ...]]] = {}
+		self._snapshot_paths_roots: tuple[Any, ...] = ()
+		# Top-level `ui.apply` keys other than trees (title, theme, ...),
+		# replayed with the trees in snapshots.
+		self._snapshot_meta: dict[str, Any] = {}
 		self._first_render_event = asyncio.Event()
 		self._stall_task: asyncio.Task[Any] | None = None
 		self._stall_timeout_s: float | None = (
@@ -115,14 +210,40 @@ class ButterflyUISession:
 		PerformanceConfig.initialize()
 
 	@property
-	def server(self) -> WebSocketRuntimeServer:
+	def server(self) -> WebSocketRuntimeServer | RuntimeConnection:
 		return self._server
 
+	def supports(self, capability: str) -> bool:
+		"""Return whether the connected runtime negotiated `capability`."""
+		return capability in getattr(self._server, "capabilities", ())
+
 	async def start(self) -> None:
+		self._bind_transport()
+		await self._server.start()
+
+	def _bind_transport(self) -> None:
 		self._server._on_event = self._handle_event
 		self._server._on_result = self._handle_invoke_result
 		self._server._on_applied = self._handle_applied
-		await self._server.start()
+		self._server._on_hello = self._handle_hello
+
+	def _rebind(self, server: WebSocketRuntimeServer | RuntimeConnection) -> None:
+		"""Move the session onto the connection of a resuming runtime."""
+		self._server = server
+		self._bind_transport()
+
+	def _shutdown(self) -> None:
+		"""Drop timers and pending invokes once the transport is gone."""
+		self.connected = False
+		self._cancel_stall_watchdog()
+		handle = self._patch_flush_handle
+		if handle is not None:
+			handle.cancel()
+			self._patch_flush_handle = None
+		for fut in self._pending_invokes.values():
+			if not fut.done():
+				fut.cancel()
+		self._pending_invokes.clear()
 
 	async def wait_for_hello(self, timeout: float | None = None) -> dict[str, Any] | None:
 		payload = await self._server.wait_for_hello(timeout=timeout)
@@ -134,13 +255,25 @@ class ButterflyUISession:
 		return payload
 
 	async def wait_for_disconnect(self) -> None:
-		await self._server.wait_for_disconnect()
+		"""Wait until the runtime is gone and did not resume in time."""
+		while True:
+			self._reconnected.clear()
+			await self._server.wait_for_disconnect()
+			timeout = self._config.resume_timeout
+			if not self._resume_enabled or timeout is None:
+				return
+			self.connected = False
+			try:
+				await asyncio.wait_for(self._reconnected.wait(), timeout=timeout)
+			except asyncio.TimeoutError:
+				return
 
 	async def stop(self) -> None:
 		await self._server.stop()
 
 	async def send_runtime_ready(self) -> None:
 		payload = {"session_id": self.session_id}
+		self._served = True
 		await self._server.send("runtime.ready", payload)
 
 	async def send_runtime_problem(self, payload: dict[str, Any]) -> None:
@@ -172,8 +305,77 @@ class ButterflyUISession:
 
 	async def send_ui_reset(self) -> None:
 		self._values.clear()
+		self._snapshot_meta.clear()
+		self._apply_log.clear(self._seq)
 		await self._server.send("ui.reset", {})
 
+	def _handle_hello(self, payload: dict[str, Any]) -> None:
+		"""Answer a runtime (re)connecting to this session.
+
+		The first hello only records the negotiated capabilities; `main` then
+		renders the page. A later one is a reconnect: a runtime resuming from
+		a `seq` still in the apply log gets the batches it missed, anything
+		else gets a reset and a full snapshot.
+		"""
+		if not self._served:
+			self._resume_enabled = self.supports(UI_RESUME)
+			return
+		self.hello_payload = payload
+		self.connected = True
+		self._resume_enabled = self.supports(UI_RESUME)
+		self._reconnected.set()
+		resume = payload.get("resume")
+		replay = None
+		if isinstance(resume, dict) and resume.get("session_id") == self.session_id:
+			seq = resume.get("seq")
+			if isinstance(seq, int):
+				replay = self._apply_log.since(seq)
+		self._sent_at.clear()
+		if replay is None:
+			self._resume_snapshots += 1
+			self._send_snapshot_nowait()
+			return
+		self._resumes += 1
+		self._acked_seq = self._seq - len(replay)
+		for batch in replay:
+			self._sent_at[batch["seq"]] = time.monotonic()
+			self._server.send_nowait("ui.apply", batch)
+		self._server.send_nowait("runtime.ready", {"session_id": self.session_id, "resumed": True})
+
+	def _send_snapshot_nowait(self) -> None:
+		payload = self._snapshot_payload()
+		self._acked_seq = self._seq
+		self._apply_log.clear(self._seq)
+		self._server.send_nowait("ui.reset", {})
+		if payload:
+			self._server.send_nowait("ui.apply", self._sequence(payload))
+		self._server.send_nowait("runtime.ready", {"session_id": self.session_id})
+
+	def _snapshot_payload(self) -> dict[str, Any] | None:
+		"""The current page as one `ui.apply` payload, prop patches included."""
+		payload = dict(self._snapshot_meta)
+		for slot in ("root", "screen", "overlay", "splash"):
+			tree = getattr(self, f"_last_{slot}")
+			if tree is not None:
+				payload[slot] = self._with_current_values(tree)
+		return payload or None
+
+	def _with_current_values(self, value: Any) -> Any:
+		# `_last_*` trees are not touched by prop patches; `_values` is.
+		if isinstance(value, list):
+			return [self._with_current_values(item) for item in value]
+		if not isinstance(value, dict):
+			return value
+		out = {key: self._with_current_values(item) for key, item in value.items()}
+		props = value.get("props")
+		current = self._values.get(str(value.get("id"))) if "id" in value else None
+		if current is not None and isinstance(props, dict):
+			merged = out["props"]
+			for key, item in current.items():
+				if item is not props.get(key):
+					merged[key] = item
+		return out
+
 	def start_first_render_watchdog(self) -> None:
 		timeout = self._stall_timeout_s
 		if timeout is None or timeout <= 0:
@@ -191,6 +393,67 @@ class ButterflyUISession:
 	def _handle_applied(self, payload: dict[str, Any]) -> None:
 		if payload.get("first_render") or payload.get("has_root"):
 			self._mark_first_render()
+		seq = payload.get("seq")
+		if isinstance(seq, int) and seq > self._acked_seq:
+			self._record_ack(seq)
+
+	def _record_ack(self, seq: int) -> None:
+		now = time.monotonic()
+		sent_at = self._sent_at
+		sent = sent_at.get(seq)
+		# Acks are cumulative: everything up to `seq` has been applied.
+		while sent_at:
+			oldest = next(iter(sent_at))
+			if oldest > seq:
+				break
+			del sent_at[oldest]
+		self._acked_seq = min(seq, self._seq)
+		self._acks += 1
+		if sent is not None:
+			rtt = now - sent
+			srtt = self._apply_rtt_s
+			self._apply_rtt_s = rtt if srtt is None else srtt + (rtt - srtt) / 8.0
+			if self._apply_rtt_min_s is None or rtt < self._apply_rtt_min_s:
+				self._apply_rtt_min_s = rtt
+			if self._apply_rtt_max_s is None or rtt > self._apply_rtt_max_s:
+				self._apply_rtt_max_s = rtt
+		if self._flush_deferred and not self._window_full():
+			handle = self._patch_flush_handle
+			if handle is not None:
+				handle.cancel()
+				self._patch_flush_handle = None
+			self._schedule_patch_flush()
+
+	def _window_full(self) -> bool:
+		return self._seq - self._acked_seq >= self._max_frames_in_flight and self.supports(UI_ACKS)
+
+	def _ack_deadline(self) -> float:
+		"""Monotonic time at which the oldest unacknowledged batch stops counting."""
+		oldest = next(iter(self._sent_at.values()), None)
+		if oldest is None:
+			return 0.0
+		return oldest + _ACK_TIMEOUT_S
+
+	def apply_stats(self) -> dict[str, Any]:
+		"""Apply acknowledgement and resume counters; round trips need `ui.acks`."""
+
+		def ms(value: float | None) -> float | None:
+			return None if value is None else value * 1000.0
+
+		return {
+			"seq": self._seq,
+			"acked_seq": self._acked_seq,
+			"in_flight": self._seq - self._acked_seq,
+			"max_in_flight": self._max_frames_in_flight,
+			"acks": self._acks,
+			"deferred_flushes": self._deferred_flushes,
+			"rtt_ms": ms(self._apply_rtt_s),
+			"rtt_min_ms": ms(self._apply_rtt_min_s),
+			"rtt_max_ms": ms(self._apply_rtt_max_s),
+			"resumes": self._resumes,
+			"resume_snapshots": self._resume_snapshots,
+			"log": self._apply_log.stats(),
+		}
 
 	def _mark_first_render(self) -> None:
 		if self._first_render_event.is_set():
@@ -219,59 +482,169 @@ class ButterflyUISession:
 		await self.send_runtime_problem(payload)
 
 	async def send_ui_apply(self, root: dict[str, Any]) -> None:
+		if self._pending_list_ops:
+			self._drop_list_ops({"root": root})
 		self._last_root = root
-		self._cache_tree(root)
+		self._tree_sizes["root"] = self._cache_tree(root)
 		self._prune_runtime_caches()
-		await self._server.send("ui.apply", {"root": root})
+		await self._send_apply({"root": root})
+
+	async def _send_apply(self, payload: dict[str, Any]) -> None:
+		await self._server.send("ui.apply", self._sequence(payload))
+
+	def _sequence(self, payload: dict[str, Any]) -> dict[str, Any]:
+		"""Number a `ui.apply` batch for acks and log it for resuming runtimes.
+
+		Batches produced while a resumable runtime is away are logged too, so
+		they are replayed when it comes back.
+		"""
+		acks = self.supports(UI_ACKS)
+		if not acks and not self._resume_enabled:
+			return payload
+		self._seq += 1
+		seq = self._seq
+		payload = {**payload, "seq": seq}
+		if acks:
+			sent_at = self._sent_at
+			sent_at[seq] = time.monotonic()
+			if len(sent_at) > _MAX_TRACKED_SEQS:
+				del sent_at[next(iter(sent_at))]
+		if self._resume_enabled:
+			self._apply_log.append(seq, payload, weight=self._apply_weight(payload))
+		return payload
 
-	async def send_ui_payload(self, payload: dict[str, Any]) -> None:
+	def _apply_weight(self, payload: dict[str, Any]) -> int:
+		# Roughly the number of control nodes the batch carries.
+		weight = len(payload.get("ops") or ()) + len(payload.get("patches") or ())
+		for slot in ("root", "screen", "overlay", "splash"):
+			if slot in payload:
+				weight += self._tree_sizes.get(slot, 1)
+		return weight
+
+	async def send_ui_payload(
+		self,
+		payload: dict[str, Any],
+		*,
+		diffs: dict[str, TreeDiff] | None = None,
+	) -> None:
+		"""Send a `ui.apply` payload and record the trees it carries.
+
+		`diffs` holds the tree diffs whose ops are already in `payload["ops"]`;
+		their snapshots replace the matching `_last_*` trees.
+		"""
+		if self._pending_list_ops:
+			self._drop_list_ops(payload)
+		for key, value in payload.items():
+			if key not in _SNAPSHOT_SKIP_KEYS:
+				self._snapshot_meta[key] = value
 		has_tree_delta = any(key in payload for key in ("root", "screen", "overlay", "splash"))
 		root = payload.get("root")
 		if isinstance(root, dict):
 			self._last_root = root
-			self._cache_tree(root)
+			self._tree_sizes["root"] = self._cache_tree(root)
 		elif "root" in payload:
 			self._last_root = None
+			self._tree_sizes.pop("root", None)
 
 		screen = payload.get("screen")
 		if isinstance(screen, dict):
 			self._last_screen = screen
-			self._cache_tree(screen)
+			self._tree_sizes["screen"] = self._cache_tree(screen)
 		elif "screen" in payload:
 			self._last_screen = None
+			self._tree_sizes.pop("screen", None)
 
 		overlay = payload.get("overlay")
 		if isinstance(overlay, dict):
 			self._last_overlay = overlay
-			self._cache_tree(overlay)
+			self._tree_sizes["overlay"] = self._cache_tree(overlay)
 		elif "overlay" in payload:
 			self._last_overlay = None
+			self._tree_sizes.pop("overlay", None)
 
 		splash = payload.get("splash")
 		if isinstance(splash, dict):
 			self._last_splash = splash
-			self._cache_tree(splash)
+			self._tree_sizes["splash"] = self._cache_tree(splash)
 		elif "splash" in payload:
 			self._last_splash = None
+			self._tree_sizes.pop("splash", None)
 
 		if has_tree_delta:
 			self._prune_runtime_caches()
+		if diffs:
+			for slot, diff in diffs.items():
+				self._commit_tree_diff(slot, diff)
+
+		await self._send_apply(payload)
 
-		await self._server.send("ui.apply", payload)
+	def _drop_list_ops(self, payload: dict[str, Any]) -> None:
+		"""Drop pending list ops for props that `payload` sends whole.
+
+		The trees and props ops of a page update are built from the current
+		props, which already include the pending appends and item changes.
+		"""
+		sent: dict[str, Any] = {}
+		nodes: list[Any] = [payload.get(slot) for slot in ("root", "screen", "overlay", "splash")]
+		for op in payload.get("ops") or ():
+			kind = op.get("op")
+			if kind == "props":
+				sent.setdefault(str(op.get("id")), set()).update(op.get("props") or ())
+			elif kind == "insert":
+				nodes.append(op.get("node"))
+			elif kind == "children":
+				nodes.extend(op.get("children") or ())
+		for node in nodes:
+			if isinstance(node, dict):
+				for control in self._iter_control_nodes(node):
+					if control.get("id") is not None:
+						sent[str(control["id"])] = None
+		for control_id, props in self._patch_buffer.items():
+			if control_id not in sent:
+				continue
+			keys = sent[control_id]
+			for prop, value in list(props.items()):
+				if isinstance(value, (PropAppend, ItemsPatch)) and (keys is None or prop in keys):
+					del props[prop]
+
+	def diff_ui_tree(self, slot: str, value: Any) -> TreeDiff | None:
+		"""Diff a page slot against its last sent snapshot.
+
+		Returns `None` when the slot must be sent in full: the runtime does not
+		support tree ops, there is no comparable snapshot, or the ops would
+		carry more nodes than the tree itself.
+		"""
+		if not isinstance(value, Control) or not self.supports(UI_OPS):
+			return None
+		diff = diff_control_tree(value, getattr(self, f"_last_{slot}", None))
+		if diff is not None and diff.adopted:
+			self.adopt_control_ids(diff.adopted)
+		if diff is None or diff.weight > self._tree_sizes.get(slot, 0):
+			return None
+		return diff
+
+	def _commit_tree_diff(self, slot: str, diff: TreeDiff) -> None:
+		setattr(self, f"_last_{slot}", diff.snapshot)
+		self._tree_sizes[slot] = self._tree_sizes.get(slot, 0) + diff.size_delta
+		for node in diff.inserted:
+			self._cache_tree(node)
+		for node in diff.updated:
+			props = node.get("props")
+			if isinstance(props, dict):
+				self._values[str(node.get("id"))] = dict(props)
+		if diff.removed_ids:
+			self._forget_controls(diff.removed_ids)
 
 	async def send_ui_patch(self, control_id: str, props: dict[str, Any]) -> None:
 		current = self._values.get(control_id)
 		if current is not None:
 			current.update(props)
-		await self._server.send(
-			"ui.apply",
-			{"patch": {"id": control_id, "props": props}},
-		)
+		await self._send_apply({"patch": {"id": control_id, "props": props}})
 
 	async def send_ui_patches(self, patches: list[dict[str, Any]]) -> None:
 		if not patches:
 			return
-		await self._server.send("ui.apply", {"patches": patches})
+		await self._send_apply({"patches": patches})
 
 	def _schedule_patch_flush(self) -> None:
 		if self._patch_flush_handle is not None and not self._patch_flush_handle.cancelled():
@@ -284,6 +657,13 @@ class ButterflyUISession:
 		now = time.monotonic()
 		elapsed = now - self._last_patch_flush
 		delay = self._frame_interval_s - elapsed
+		if self._window_full():
+			# The runtime is behind; patches keep merging in `_patch_buffer`
+			# until an ack reopens the window or the oldest batch times out.
+			if not self._flush_deferred:
+				self._flush_deferred = True
+				self._deferred_flushes += 1
+			delay = max(delay, self._ack_deadline() - now)
 		if delay < 0:
 			delay = 0.0
 
@@ -292,16 +672,96 @@ class ButterflyUISession:
 	async def _flush_patch_buffer(self) -> None:
 		self._patch_flush_handle = None
 		if not self._patch_buffer:
+			self._flush_deferred = False
+			return
+		if self._window_full() and time.monotonic() < self._ack_deadline():
+			self._schedule_patch_flush()
 			return
+		self._flush_deferred = False
 		patches: list[dict[str, Any]] = []
+		ops: list[dict[str, Any]] = []
+		list_ops = self._pending_list_ops
+		self._pending_list_ops = False
 		for control_id, props in list(self._patch_buffer.items()):
+			if list_ops:
+				for prop, value in list(props.items()):
+					if isinstance(value, (PropAppend, ItemsPatch)):
+						ops.append(value.to_op(control_id, prop))
+						self._apply_list_op(control_id, prop, value)
+						del props[prop]
 			if not props:
 				continue
 			patches.append({"id": control_id, "props": props})
 		self._patch_buffer.clear()
 		self._last_patch_flush = time.monotonic()
+		if ops:
+			payload: dict[str, Any] = {"ops": ops}
+			if patches:
+				payload["patches"] = patches
+			await self._send_apply(payload)
+			return
 		await self.send_ui_patches(patches)
 
+	def _apply_list_op(self, control_id: str, prop: str, change: PropAppend | ItemsPatch) -> None:
+		"""Apply a sent list op to the `_last_*` snapshot and `_values`.
+
+		Later tree diffs then compare the live list with what the runtime
+		has, and snapshots for resets and late joiners include the change.
+		Snapshot nodes are shared with the apply log, so the path to the
+		node is copied rather than changed in place.
+		"""
+		current = self._values.get(control_id)
+		found = self._snapshot_node_path(control_id)
+		node: dict[str, Any] | None = None
+		if found is not None:
+			node = getattr(self, f"_last_{found[0]}")
+			for position in found[1]:
+				node = node["children"][position]
+		if current is not None and prop in current:
+			base = current[prop]
+		elif node is not None:
+			base = (node.get("props") or {}).get(prop)
+		else:
+			return
+		value = change.apply(base.tolist() if hasattr(base, "tolist") else list(base or ()))
+		self._values.setdefault(control_id, {})[prop] = value
+		if found is None:
+			return
+		slot, path = found
+		root = dict(getattr(self, f"_last_{slot}"))
+		node = root
+		for position in path:
+			children = list(node["children"])
+			node["children"] = children
+			node = children[position] = dict(children[position])
+		node["props"] = {**(node.get("props") or {}), prop: value}
+		setattr(self, f"_last_{slot}", root)
+		self._snapshot_paths_roots = self._snapshot_roots()
+
+	def _snapshot_roots(self) -> tuple[Any, ...]:
+		return (self._last_root, self._last_screen, self._last_overlay, self._last_splash)
+
+	def _snapshot_node_path(self, control_id: str) -> tuple[str, tuple[int, ...]] | None:
+		roots = self._snapshot_roots()
+		if len(roots) != len(self._snapshot_paths_roots) or any(
+			root is not known for root, known in zip(roots, self._snapshot_paths_roots)
+		):
+			paths: dict[str, tuple[str, tuple[int, ...]]] = {}
+			for slot, root in zip(("root", "screen", "overlay", "splash"), roots):
+				stack: list[tuple[Any, tuple[int, ...]]] = [(root, ())]
+				while stack:
+					node, path = stack.pop()
+					if not isinstance(node, dict):
+						continue
+					if node.get("id") is not None:
+						paths.setdefault(str(node["id"]), (slot, path))
+					children = node.get("children")
+					if isinstance(children, list):
+						stack.extend((child, (*path, offset)) for offset, child in enumerate(children))
+			self._snapshot_paths = paths
+			self._snapshot_paths_roots = roots
+		return self._snapshot_paths.get(control_id)
+
 	async def send_ui_snapshot(self) -> None:
 		if (
 			self._last_root is None
@@ -341,6 +801,75 @@ class ButterflyUISession:
 			current.update(props)
 		self._schedule_patch_flush()
 
+	def append_prop(
+		self,
+		control_id: str,
+		prop: str,
+		items: Iterable[Any],
+		*,
+		replace: int = 0,
+		limit: int | None = None,
+	) -> None:
+		"""Append `items` to the list prop `prop` without resending the list.
+
+		Sent as an ``append`` op (``ui.append``) that first drops the last
+		`replace` items and then keeps only the last `limit` items. Appends
+		to the same prop within a frame are merged into one op, which is
+		exact while each append adds at least as many items as it replaces.
+		Check ``supports(UI_APPEND)`` first; other runtimes need
+		`update_props`.
+		"""
+		try:
+			asyncio.get_running_loop()
+		except RuntimeError:
+			warnings.warn("append_prop called outside of runtime loop", RuntimeWarning)
+			return
+
+		control_key = str(control_id)
+		append = PropAppend(list(items), max(0, int(replace)), limit)
+		buf = self._patch_buffer.setdefault(control_key, {})
+		pending = buf.get(prop)
+		if isinstance(pending, PropAppend):
+			buf[prop] = pending.then(append)
+		elif prop in buf:
+			# A whole value is already pending: send it with the items applied.
+			values = pending.tolist() if hasattr(pending, "tolist") else list(pending or ())
+			buf[prop] = append.apply(values)
+			self._values.setdefault(control_key, {})[prop] = buf[prop]
+		else:
+			# `_values` gets the change when the op is flushed.
+			buf[prop] = append
+			self._pending_list_ops = True
+		self._schedule_patch_flush()
+
+	def patch_items(self, control_id: str, prop: str, patch: ItemsPatch) -> None:
+		"""Send keyed changes to the list-of-dicts prop `prop` (``ui.items``).
+
+		Patches to the same prop within a frame are merged into one
+		``items`` op; a whole value already pending for the prop is sent
+		with the patch applied. Check ``supports(UI_ITEMS)`` first; other
+		runtimes need `update_props`.
+		"""
+		try:
+			asyncio.get_running_loop()
+		except RuntimeError:
+			warnings.warn("patch_items called outside of runtime loop", RuntimeWarning)
+			return
+
+		control_key = str(control_id)
+		buf = self._patch_buffer.setdefault(control_key, {})
+		pending = buf.get(prop)
+		if isinstance(pending, ItemsPatch):
+			pending.merge(patch)
+		elif prop in buf:
+			buf[prop] = patch.apply(list(pending or ()))
+			self._values.setdefault(control_key, {})[prop] = buf[prop]
+		else:
+			# `_values` gets the change when the op is flushed.
+			buf[prop] = ItemsPatch().merge(patch)
+			self._pending_list_ops = True
+		self._schedule_patch_flush()
+
 	def wait_for_client(self, timeout: float | None = None) -> bool:
 		"""Convenience synchronous method to check or wait for a connected client.
 
@@ -568,6 +1097,8 @@ class ButterflyUISession:
 		event = payload.get("event")
 		if not control_id or not event:
 			return
+		# Handlers that do not take a session resolve it from the context.
+		set_current_session(self)
 		msg = {
 			"control_id": str(control_id),
 			"control": str(control_id),
@@ -607,14 +1138,17 @@ class ButterflyUISession:
 			else:
 				return
 
-	def _cache_tree(self, node: dict[str, Any]) -> None:
+	def _cache_tree(self, node: dict[str, Any]) -> int:
+		count = 0
 		for control in self._iter_control_nodes(node):
+			count += 1
 			control_id = control.get("id")
 			if control_id is None:
 				continue
 			props = control.get("props")
 			if isinstance(props, dict):
 				self._values[str(control_id)] = dict(props)
+		return count
 
 	def _collect_control_ids(self, node: dict[str, Any], out: set[str]) -> None:
 		for control in self._iter_control_nodes(node):
@@ -623,29 +1157,22 @@ class ButterflyUISession:
 				out.add(str(control_id))
 
 	def _iter_control_nodes(self, root: Any) -> Iterable[dict[str, Any]]:
+		# Iterative pre-order walk; recursive generators cost a frame per
+		# nesting level for every yielded node.
 		seen: set[int] = set()
-
-		def is_control_like(value: Any) -> bool:
-			return isinstance(value, dict) and (
-				"id" in value and ("type" in value or "props" in value or "children" in value)
-			)
-
-		def walk(value: Any) -> Iterable[dict[str, Any]]:
+		stack: list[Any] = [root]
+		while stack:
+			value = stack.pop()
 			if isinstance(value, dict):
 				marker = id(value)
 				if marker in seen:
-					return
+					continue
 				seen.add(marker)
-				if is_control_like(value):
+				if "id" in value and ("type" in value or "props" in value or "children" in value):
 					yield value
-				for nested in value.values():
-					yield from walk(nested)
-				return
-			if isinstance(value, list):
-				for nested in value:
-					yield from walk(nested)
-
-		yield from walk(root)
+				stack.extend(reversed(value.values()))
+			elif isinstance(value, list):
+				stack.extend(reversed(value))
 
 	def _prune_runtime_caches(self) -> None:
 		active_ids: set[str] = set()
@@ -674,21 +1201,44 @@ class ButterflyUISession:
 			self._patch_buffer.clear()
 			self._event_handlers.clear()
 
+	def adopt_control_ids(self, adopted: Mapping[str, str]) -> None:
+		"""Hand reused control ids over to the keyed controls that adopted them.
+
+		`adopted` maps each reused id to the id its new control was created
+		with. Handlers and pending patches of the replaced control are
+		dropped; handlers registered under the original id move over. Patches
+		queued under the original id are dropped too: the runtime never saw
+		that id and the diff compares the adopted control's props anyway.
+		"""
+		renamed = {original: reused for reused, original in adopted.items()}
+		handlers: dict[tuple[str, str], list[Callable[[dict[str, Any]], Any]]] = {}
+		for key, bound in self._event_handlers.items():
+			if key[0] in adopted:
+				continue
+			reused = renamed.get(key[0])
+			handlers[(reused, key[1]) if reused is not None else key] = bound
+		self._event_handlers = handlers
+		for control_id in adopted:
+			self._patch_buffer.pop(control_id, None)
+		for control_id in renamed:
+			self._patch_buffer.pop(control_id, None)
+
+	def _forget_controls(self, control_ids: set[str]) -> None:
+		for control_id in control_ids:
+			self._values.pop(control_id, None)
+			self._patch_buffer.pop(control_id, None)
+		self._event_handlers = {
+			key: handlers
+			for key, handlers in self._event_handlers.items()
+			if key[0] not in control_ids
+		}
+
 
 class WebSession(ButterflyUISession):
 	"""WebSocket-based runtime session for browser targets."""
 
 	def __init__(self, config: AppConfig) -> None:
-		server = WebSocketRuntimeServer(
-			host=config.host,
-			port=config.port,
-			path=config.path,
-			token=config.token,
-			require_token=config.require_token,
-			protocol=config.protocol,
-			target_fps=config.target_fps,
-		)
-		super().__init__(server, config)
+		super().__init__(_build_server(config), config)
 
 	@property
 	def url(self) -> str:
@@ -721,6 +1271,27 @@ class WebSession(ButterflyUISession):
 		)
 
 
+class BroadcastSession(WebSession):
+	"""One page mirrored to every connected runtime (wallboards, dashboards).
+
+	Updates are encoded once and queued on every connection by a
+	`BroadcastGroup`. Runtimes that join late or fall behind receive the
+	current snapshot; events from any runtime reach the shared page.
+	"""
+
+	def __init__(self, config: AppConfig) -> None:
+		group = BroadcastGroup(_build_server(config), snapshot=self._snapshot_payload)
+		ButterflyUISession.__init__(self, group, config)
+
+	@property
+	def group(self) -> BroadcastGroup:
+		return self._server
+
+	def start_first_render_watchdog(self) -> None:
+		# Runtimes come and go; having none connected is not a stall.
+		return
+
+
 class DesktopSession(WebSession):
 	"""Desktop runtime session using butterflyui_desktop."""
 
@@ -742,6 +1313,83 @@ class DesktopSession(WebSession):
 		)
 
 
+class SessionHub:
+	"""Serves one isolated `ButterflyUISession` per runtime connection.
+
+	Sessions share the server, the event loop and process-wide caches such as
+	control schemas and specs; pages, cached values, event handlers and pending
+	invokes are per session. `handler` runs once per session in its own task
+	and should return when the runtime disconnects.
+	"""
+
+	def __init__(
+		self,
+		server: WebSocketRuntimeServer,
+		config: AppConfig,
+		handler: Callable[[ButterflyUISession], Awaitable[Any]],
+	) -> None:
+		self._server = server
+		self._config = config
+		self._handler = handler
+		self._sessions: dict[str, ButterflyUISession] = {}
+		self._tasks: set[asyncio.Task[Any]] = set()
+		self._closed = asyncio.Event()
+
+	@property
+	def server(self) -> WebSocketRuntimeServer:
+		return self._server
+
+	@property
+	def sessions(self) -> dict[str, ButterflyUISession]:
+		"""Live sessions by session id."""
+		return dict(self._sessions)
+
+	def __len__(self) -> int:
+		return len(self._sessions)
+
+	async def start(self) -> None:
+		self._server._on_connect = self._on_connect
+		await self._server.start()
+
+	async def stop(self) -> None:
+		for task in list(self._tasks):
+			task.cancel()
+		await self._server.stop()
+		self._closed.set()
+
+	async def wait_closed(self) -> None:
+		await self._closed.wait()
+
+	def _on_connect(self, connection: RuntimeConnection) -> None:
+		hello = connection._hello_payload or {}
+		resume = hello.get("resume")
+		if isinstance(resume, dict):
+			session = self._sessions.get(str(resume.get("session_id")))
+			if session is not None and not session.server.connected:
+				session._rebind(connection)
+				session._handle_hello(hello)
+				return
+		session = ButterflyUISession(connection, self._config)
+		session._bind_transport()
+		session.hello_payload = hello
+		session.session_id = connection.session_id
+		session.connected = True
+		session._handle_hello(hello)
+		self._sessions[connection.session_id] = session
+		task = asyncio.get_running_loop().create_task(self._run(session))
+		self._tasks.add(task)
+		task.add_done_callback(self._tasks.discard)
+
+	async def _run(self, session: ButterflyUISession) -> None:
+		try:
+			await self._handler(session)
+		except Exception as exc:
+			_log.exception("Session %s failed: %s", session.session_id, exc)
+		finally:
+			self._sessions.pop(str(session.session_id), None)
+			session._shutdown()
+
+
 class BaseApp:
 	"""Base app wrapper for future runtime features."""
 
@@ -784,103 +1432,120 @@ class RuntimeApp(BaseApp):
 		self._auto_install = bool(auto_install)
 		# Initialize 60 FPS performance configuration
 		PerformanceConfig.initialize()
+		PerformanceConfig.set_production(config.production)
 
-	def run(self) -> int:
-		async def _ensure_initial_state(page: "Page", session: ButterflyUISession) -> None:
-			# Wait for any pending update() calls to complete
-			await page.await_updates()
-			if session._last_root is not None:
+	async def _ensure_initial_state(self, page: "Page", session: ButterflyUISession) -> None:
+		# Wait for any pending update() calls to complete
+		await page.await_updates()
+		if session._last_root is not None:
+			return
+
+		root_payload = page._coerce_root(page.root) if page.root is not None else None
+		if page.root is not None and root_payload is None:
+			warnings.warn(
+				"Page.update() root is not serializable; using automatic boot root.",
+				RuntimeWarning,
+				stacklevel=3,
+			)
+		if root_payload is None:
+			root_payload = _minimal_boot_root()
+
+		extra: dict[str, Any] = {}
+		if page.screen is not None:
+			screen_payload = page._coerce_root(page.screen)
+			if screen_payload is not None:
+				extra["screen"] = screen_payload
+		if page.overlay is not None:
+			overlay_payload = page._coerce_root(page.overlay)
+			if overlay_payload is not None:
+				extra["overlay"] = overlay_payload
+		if page.splash is not None:
+			splash_payload = page._coerce_root(page.splash)
+			if splash_payload is not None:
+				extra["splash"] = splash_payload
+		if page.title:
+			extra["title"] = page.title
+		if page.bgcolor:
+			extra["bgcolor"] = page.bgcolor
+		if page.background is not None:
+			extra["background"] = coerce_json_value(page.background)
+		if page.stylesheet is not None:
+			extra["stylesheet"] = page._coerce_stylesheet(page.stylesheet)
+		if page.devtools is not None:
+			extra["devtools"] = bool(page.devtools)
+		if page.devtools_prefs:
+			extra["devtools_prefs"] = dict(page.devtools_prefs)
+		extra.update(page._runtime_metadata_payload())
+
+		payload: dict[str, Any] = {"root": root_payload}
+		payload.update(extra)
+
+		await session.send_ui_reset()
+		await session.send_ui_payload(payload)
+
+	async def serve_session(self, session: ButterflyUISession) -> None:
+		"""Run `main` for one connected session until its runtime disconnects."""
+		page = Page(session=session)
+		try:
+			set_current_session(session)
+			self._main(page)
+		except Exception as exc:
+			problem = build_problem(exc)
+			if problem is not None:
+				await session.send_runtime_problem(problem)
+				await session.wait_for_disconnect()
 				return
+			# Suppressed error types should not block startup or surface logs.
+			pass
+		finally:
+			set_current_session(None)
+
+		await self._ensure_initial_state(page, session)
+		await session.send_runtime_ready()
+		await session.send_ui_snapshot()
+		session.start_first_render_watchdog()
+		await session.wait_for_disconnect()
+
+	def _launch_runtime(self, session: ButterflyUISession) -> None:
+		host = str(getattr(session.server, "host", "127.0.0.1") or "127.0.0.1")
+		port = int(getattr(session.server, "port", 8765) or 8765)
+		_log.info("Runtime transport listening at %s:%s", host, port)
 
-			root_payload = page._coerce_root(page.root) if page.root is not None else None
-			if page.root is not None and root_payload is None:
-				warnings.warn(
-					"Page.update() root is not serializable; using automatic boot root.",
-					RuntimeWarning,
-					stacklevel=3,
-				)
-			if root_payload is None:
-				root_payload = _minimal_boot_root()
-
-			extra: dict[str, Any] = {}
-			if page.screen is not None:
-				screen_payload = page._coerce_root(page.screen)
-				if screen_payload is not None:
-					extra["screen"] = screen_payload
-			if page.overlay is not None:
-				overlay_payload = page._coerce_root(page.overlay)
-				if overlay_payload is not None:
-					extra["overlay"] = overlay_payload
-			if page.splash is not None:
-				splash_payload = page._coerce_root(page.splash)
-				if splash_payload is not None:
-					extra["splash"] = splash_payload
-			if page.title:
-				extra["title"] = page.title
-			if page.bgcolor:
-				extra["bgcolor"] = page.bgcolor
-			if page.background is not None:
-				extra["background"] = coerce_json_value(page.background)
-			if page.stylesheet is not None:
-				extra["stylesheet"] = page._coerce_stylesheet(page.stylesheet)
-			if page.devtools is not None:
-				extra["devtools"] = bool(page.devtools)
-			if page.devtools_prefs:
-				extra["devtools_prefs"] = dict(page.devtools_prefs)
-			extra.update(page._runtime_metadata_payload())
-
-			payload: dict[str, Any] = {"root": root_payload}
-			payload.update(extra)
-
-			await session.send_ui_reset()
-			await session.send_ui_payload(payload)
+		if isinstance(session, DesktopSession):
+			session.launch_runtime(wait=False)
+		else:
+			web_runtime = session.launch_runtime(wait=False)
+			if web_runtime is not None and hasattr(web_runtime, "url"):
+				print(f"App running at: {web_runtime.url}")
+			else:
+				print(f"App running at: 127.0.0.1:{port}")
+				print(f"App running at: localhost:{port}")
+				if host not in ("127.0.0.1", "localhost"):
+					print(f"App running at: {host}:{port}")
 
+	def run(self) -> int:
 		async def _run_async() -> None:
 			session: ButterflyUISession
 			if self._desktop:
 				session = DesktopSession(self._config, auto_install=self._auto_install)
+			elif self._config.broadcast:
+				session = BroadcastSession(self._config)
 			else:
 				session = WebSession(self._config)
 
-			await session.start()
-			host = str(getattr(session.server, "host", "127.0.0.1") or "127.0.0.1")
-			port = int(getattr(session.server, "port", 8765) or 8765)
-			_log.info("Runtime transport listening at %s:%s", host, port)
-
-			if isinstance(session, DesktopSession):
-				session.launch_runtime(wait=False)
-			else:
-				web_runtime = session.launch_runtime(wait=False)
-				if web_runtime is not None and hasattr(web_runtime, "url"):
-					print(f"App running at: {web_runtime.url}")
-				else:
-					print(f"App running at: 127.0.0.1:{port}")
-					print(f"App running at: localhost:{port}")
-					if host not in ("127.0.0.1", "localhost"):
-						print(f"App running at: {host}:{port}")
+			if self._config.multi_client and not self._desktop and not self._config.broadcast:
+				# `session` only launches the web runtime; every connection
+				# gets its own session and page from the hub.
+				hub = SessionHub(session.server, self._config, self.serve_session)
+				await hub.start()
+				self._launch_runtime(session)
+				await hub.wait_closed()
+				return
 
+			await session.start()
+			self._launch_runtime(session)
 			await session.wait_for_hello(timeout=self._config.hello_timeout)
-
-			page = Page(session=session)
-			try:
-				set_current_session(session)
-				self._main(page)
-			except Exception as exc:
-				problem = build_problem(exc)
-				if problem is not None:
-					await session.send_runtime_problem(problem)
-					await session.wait_for_disconnect()
-					return
-				# Suppressed error types should not block startup or surface logs.
-				pass
-			finally:
-				set_current_session(None)
-
-			await _ensure_initial_state(page, session)
-			await session.send_runtime_ready()
-			await session.send_ui_snapshot()
-			session.start_first_render_watchdog()
-			await session.wait_for_disconnect()
+			await self.serve_session(session)
 
 		asyncio.run(_run_async())
 		return 0
@@ -942,9 +1607,9 @@ class Page:
 		# Track pending update tasks to ensure they complete before runtime.ready
 		self._pending_updates: list[asyncio.Task[Any]] = []
 		self._pending_update_task: asyncio.Task[Any] | None = None
-		self._queued_update_payload: dict[str, Any] | None = None
+		self._update_requested: bool = False
 
-	def _bind_inline_handlers(self) -> None:
+	def _bind_inline_handlers(self, diffs: dict[str, TreeDiff] | None = None) -> None:
 		visited: set[int] = set()
 
 		def walk(node: Any) -> None:
@@ -954,6 +1619,11 @@ class Page:
 			visited.add(marker)
 
 			if isinstance(node, Control):
+				state = node._dirty_state
+				if state.adopted is not None:
+					# Sent in full, so no diff reports the adopted id.
+					self.session.adopt_control_ids({node.control_id: state.adopted})
+					state.adopted = None
 				try:
 					node.bind_inline_event_handlers(self.session)
 				except Exception:
@@ -973,44 +1643,101 @@ class Page:
 				for item in node:
 					walk(item)
 
-		walk(self.root)
-		walk(self.screen)
-		walk(self.overlay)
-		walk(self.splash)
+		diffs = diffs or {}
+		for slot, node in (
+			("root", self.root),
+			("screen", self.screen),
+			("overlay", self.overlay),
+			("splash", self.splash),
+		):
+			diff = diffs.get(slot)
+			if diff is None:
+				walk(node)
+				continue
+			# Untouched subtrees were bound by an earlier update.
+			for control in diff.touched:
+				visited.add(id(control))
+				try:
+					control.bind_inline_event_handlers(self.session)
+				except Exception:
+					pass
+			for control in diff.inserted_controls:
+				walk(control)
 
 	def update(self) -> None:
 		"""Send the current page state to the runtime.
 
 		Sends a payload that may include root, screen, overlay, splash, title,
-		and runtime metadata when available.
+		and runtime metadata when available. When the runtime supports tree
+		ops, control trees that were sent before are diffed and only the
+		changed nodes are sent.
 		"""
 		if not self._has_payload():
 			return
 
-		root_payload = self._coerce_root(self.root) if self.root is not None else None
 		# If root is present but not serializable, warn and abort.
-		if self.root is not None and root_payload is None:
+		if (
+			self.root is not None
+			and not isinstance(self.root, (Control, dict))
+			and self._coerce_root(self.root) is None
+		):
 			warnings.warn("Page.update() root is not serializable", RuntimeWarning)
 			return
 
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			warnings.warn("Page.update() called outside of runtime loop", RuntimeWarning)
+			return
+		self._update_requested = True
+		if self._pending_update_task is not None and not self._pending_update_task.done():
+			return
+
+		# Store tasks so we can await them before sending runtime.ready.
+		# Coalesce bursts of update() calls into sequential latest-state sends.
+		self._pending_update_task = loop.create_task(self._flush_updates())
+		self._pending_updates.append(self._pending_update_task)
+
+	async def _flush_updates(self) -> None:
+		# Payloads are built when the flush runs rather than in update(), so
+		# every diff is taken against the snapshot that was actually sent.
+		while self._update_requested:
+			self._update_requested = False
+			payload, diffs = self._build_update_payload()
+			if payload is None:
+				continue
+			self._bind_inline_handlers(diffs)
+			await self.session.send_ui_payload(payload, diffs=diffs)
+
+	def _build_update_payload(self) -> tuple[dict[str, Any] | None, dict[str, TreeDiff]]:
 		payload: dict[str, Any] = {}
-		if root_payload is not None:
-			payload["root"] = root_payload
-		if self.screen is not None:
-			screen_payload = self._coerce_root(self.screen)
-			if screen_payload is not None:
-				payload["screen"] = screen_payload
-		if self.overlay is not None:
-			overlay_payload = self._coerce_root(self.overlay)
-			if overlay_payload is not None:
-				payload["overlay"] = overlay_payload
-		elif self._overlay_cleared:
+		diffs: dict[str, TreeDiff] = {}
+		ops: list[dict[str, Any]] = []
+		for slot, value in (
+			("root", self.root),
+			("screen", self.screen),
+			("overlay", self.overlay),
+			("splash", self.splash),
+		):
+			if value is None:
+				continue
+			diff = self.session.diff_ui_tree(slot, value)
+			if diff is not None:
+				diffs[slot] = diff
+				ops.extend(diff.ops)
+				continue
+			node_payload = self._coerce_root(value)
+			if node_payload is None:
+				if slot == "root":
+					warnings.warn("Page.update() root is not serializable", RuntimeWarning)
+					return None, {}
+				continue
+			payload[slot] = node_payload
+		if ops:
+			payload["ops"] = ops
+		if self.overlay is None and self._overlay_cleared:
 			payload["overlay"] = None
 			self._overlay_cleared = False
-		if self.splash is not None:
-			splash_payload = self._coerce_root(self.splash)
-			if splash_payload is not None:
-				payload["splash"] = splash_payload
 		if self.title:
 			payload["title"] = self.title
 		if self.bgcolor:
@@ -1026,31 +1753,7 @@ class Page:
 		if self.devtools_prefs:
 			payload["devtools_prefs"] = dict(self.devtools_prefs)
 		payload.update(self._runtime_metadata_payload())
-
-		try:
-			loop = asyncio.get_running_loop()
-		except RuntimeError:
-			warnings.warn("Page.update() called outside of runtime loop", RuntimeWarning)
-			return
-		if self._pending_update_task is not None and not self._pending_update_task.done():
-			self._queued_update_payload = payload
-			return
-
-		# Store tasks so we can await them before sending runtime.ready.
-		# Coalesce bursts of update() calls into sequential latest-payload sends.
-		self._pending_update_task = loop.create_task(self._flush_updates(payload))
-		self._pending_updates.append(self._pending_update_task)
-
-	async def _flush_updates(self, initial_payload: dict[str, Any]) -> None:
-		payload = initial_payload
-		while True:
-			self._bind_inline_handlers()
-			await self.session.send_ui_payload(payload)
-			next_payload = self._queued_update_payload
-			self._queued_update_payload = None
-			if next_payload is None:
-				break
-			payload = next_payload
+		return payload, diffs
 
 	def clean(self) -> None:
 		"""Remove all content from the page."""
@@ -1144,7 +1847,7 @@ class Page:
 		await asyncio.gather(*self._pending_updates, return_exceptions=True)
 		self._pending_updates.clear()
 		self._pending_update_task = None
-		self._queued_update_payload = None
+		self._update_requested = False
 
 	def _has_payload(self) -> bool:
 		if self.root is not None or self.screen is not None or self.overlay is not None or self.splash is not None:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import email.utils
 import mimetypes
+import os
 import secrets
+import socket
 import threading
 import time
 import urllib.parse
@@ -10,7 +14,7 @@ from dataclasses import dataclass
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Optional
+from typing import Any, Callable, Iterable, Literal, Mapping, Optional
 
 __all__ = [
     "AssetServer",
@@ -19,6 +23,8 @@ __all__ = [
     "files_payload_to_srcs",
 ]
 
+_HEAD_LIMIT = 64 * 1024
+
 
 @dataclass(slots=True)
 class _AssetEntry:
@@ -27,12 +33,134 @@ class _AssetEntry:
     mime: str
     filename: str
     expires_at: float | None
+    cache_control: str = "no-cache"
+    # Validators of byte entries; files use their size and mtime.
+    etag: str = ""
+    modified: float = 0.0
 
     def expired(self) -> bool:
         return self.expires_at is not None and time.time() >= self.expires_at
 
 
+@dataclass(slots=True)
+class _Response:
+    status: HTTPStatus
+    headers: list[tuple[str, str]]
+    # The part of the body to send.
+    offset: int = 0
+    length: int = 0
+
+
+def _plan_response(
+    entry: _AssetEntry,
+    method: str,
+    request_headers: Mapping[str, str],
+    size: int,
+    modified: float,
+    etag: str,
+) -> _Response:
+    """Pick the status, headers and body range for a GET or HEAD.
+
+    ``request_headers`` has lower-case names. Handles ``If-None-Match`` and
+    ``If-Modified-Since`` (304), and a single ``Range`` (206 or 416), which
+    ``If-Range`` can turn back into a full response.
+    """
+    last_modified = email.utils.formatdate(int(modified), usegmt=True)
+    validators = [("Cache-Control", entry.cache_control), ("ETag", etag), ("Last-Modified", last_modified)]
+    if _not_modified(request_headers, int(modified), etag):
+        return _Response(HTTPStatus.NOT_MODIFIED, validators)
+    headers = [
+        ("Content-Type", entry.mime),
+        ("Content-Disposition", f'inline; filename="{entry.filename}"'),
+        ("Accept-Ranges", "bytes"),
+        *validators,
+    ]
+    requested = request_headers.get("range")
+    if method == "GET" and requested and _if_range_holds(request_headers.get("if-range"), int(modified), etag):
+        span = _parse_range(requested, size)
+        if span == ():
+            headers.append(("Content-Range", f"bytes */{size}"))
+            headers.append(("Content-Length", "0"))
+            return _Response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers)
+        if span is not None:
+            start, end = span
+            headers.append(("Content-Range", f"bytes {start}-{end}/{size}"))
+            headers.append(("Content-Length", str(end - start + 1)))
+            return _Response(HTTPStatus.PARTIAL_CONTENT, headers, start, end - start + 1)
+    headers.append(("Content-Length", str(size)))
+    return _Response(HTTPStatus.OK, headers, 0, size)
+
+
+def _not_modified(request_headers: Mapping[str, str], modified: int, etag: str) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison; when present, If-Modified-Since is ignored.
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    since = _parse_http_date(request_headers.get("if-modified-since"))
+    return since is not None and modified <= since
+
+
+def _if_range_holds(if_range: str | None, modified: int, etag: str) -> bool:
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        # Strong comparison: a weak tag never matches.
+        return if_range == etag and not etag.startswith("W/")
+    return _parse_http_date(if_range) == modified
+
+
+def _parse_http_date(value: str | None) -> int | None:
+    if not value:
+        return None
+    try:
+        return int(email.utils.parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _parse_range(value: str, size: int) -> tuple[int, int] | tuple[()] | None:
+    """Parse a single ``bytes=`` range into inclusive offsets.
+
+    Returns ``()`` when the range cannot be satisfied and None when the
+    header should be ignored (bad syntax or several ranges), which serves
+    the whole body.
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix < 0:
+                return None
+            if suffix == 0 or size == 0:
+                return ()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= size:
+        return ()
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _file_etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
 class _AssetHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections when a page opens with
+    # hundreds of images; the dropped SYNs are retried seconds later.
+    request_queue_size = 128
+
     def __init__(self, server_address: tuple[str, int], handler: type[BaseHTTPRequestHandler], asset_server: "AssetServer") -> None:
         self.asset_server = asset_server
         super().__init__(server_address, handler)
@@ -55,42 +183,280 @@ class _AssetHandler(BaseHTTPRequestHandler):
         if entry is None:
             self.send_error(HTTPStatus.NOT_FOUND)
             return
+        method = "HEAD" if head_only else "GET"
+        request_headers = {name.lower(): value for name, value in self.headers.items()}
 
-        self.send_response(HTTPStatus.OK)
-        self.send_header("Content-Type", entry.mime)
-        self.send_header("Cache-Control", "no-store")
-        self.send_header("Content-Disposition", f'inline; filename="{entry.filename}"')
         if entry.data is not None:
-            self.send_header("Content-Length", str(len(entry.data)))
-        elif entry.path is not None:
-            try:
-                self.send_header("Content-Length", str(entry.path.stat().st_size))
-            except Exception:
-                pass
+            response = _plan_response(entry, method, request_headers, len(entry.data), entry.modified, entry.etag)
+            self._send_head(response)
+            if not head_only and response.length:
+                self._send_body(lambda: self.wfile.write(memoryview(entry.data)[response.offset : response.offset + response.length]))
+            return
+        try:
+            handle = entry.path.open("rb") if entry.path is not None else None
+        except OSError:
+            handle = None
+        if handle is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        with handle:
+            stat = os.fstat(handle.fileno())
+            response = _plan_response(entry, method, request_headers, stat.st_size, stat.st_mtime, _file_etag(stat))
+            self._send_head(response)
+            if not head_only and response.length:
+                # Reads only the requested range (os.sendfile where available).
+                self._send_body(lambda: self.connection.sendfile(handle, response.offset, response.length))
+
+    def _send_body(self, send: Callable[[], object]) -> None:
+        try:
+            send()
+        except ConnectionError:
+            # The client dropped the download, e.g. a player seeking elsewhere.
+            self.close_connection = True
+
+    def _send_head(self, response: _Response) -> None:
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
         self.end_headers()
 
-        if head_only:
+    def log_message(self, format: str, *args: Any) -> None:
+        # Keep the asset server quiet by default.
+        return
+
+
+class _AsyncAssetServer:
+    """HTTP/1.1 asset server running on an asyncio event loop.
+
+    Connections are kept alive between requests and file bodies go out
+    through ``loop.sendfile`` (``os.sendfile`` where the platform has it).
+    """
+
+    def __init__(self, asset_server: "AssetServer", sock: socket.socket, keep_alive: float) -> None:
+        self.asset_server = asset_server
+        self.sock = sock
+        self.keep_alive = keep_alive
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+        # Open connections: handler task -> writer.
+        self._connections: dict[asyncio.Task[Any], asyncio.StreamWriter] = {}
+
+    def start(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            # Called from a coroutine: serve on that loop. The socket is
+            # already listening, so early connections wait in the backlog.
+            self.loop = loop
+            loop.create_task(self._listen())
             return
-        if entry.data is not None:
-            self.wfile.write(entry.data)
-        elif entry.path is not None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="ButterflyUIAssetServer", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._listen(), self.loop).result()
+
+    def stop(self) -> None:
+        loop = self.loop
+        self.loop = None
+        if loop is None or loop.is_closed():
+            self.sock.close()
+            return
+        if self._thread is not None:
             try:
-                with entry.path.open("rb") as handle:
-                    while True:
-                        chunk = handle.read(1024 * 128)
-                        if not chunk:
-                            break
-                        self.wfile.write(chunk)
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=2.0)
             except Exception:
-                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR)
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=2.0)
+            self._thread = None
+            if not loop.is_running():
+                loop.close()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._close()
+        else:
+            loop.call_soon_threadsafe(self._close)
+
+    async def _listen(self) -> None:
+        if self.loop is None:
+            return
+        self._server = await asyncio.start_server(self._serve, sock=self.sock, limit=_HEAD_LIMIT, backlog=128)
 
-    def log_message(self, format: str, *args: Any) -> None:
-        # Keep the asset server quiet by default.
-        return
+    def _close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        else:
+            self.sock.close()
+        # Closing the transports ends the handlers with EOF or a ConnectionError.
+        for writer in list(self._connections.values()):
+            writer.close()
+
+    async def _shutdown(self) -> None:
+        tasks = list(self._connections)
+        self._close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections[task] = writer
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            # asyncio only sets this when proto is IPPROTO_TCP, and
+            # create_server() leaves it 0; without it Nagle delays replies.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keep_alive)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                request = _parse_request_head(head)
+                if request is None or "transfer-encoding" in request[3]:
+                    await self._send_error(writer, HTTPStatus.BAD_REQUEST, keep_alive=False)
+                    return
+                method, target, version, headers = request
+                if headers.get("content-length", "0") != "0":
+                    # GET and HEAD carry no body; skip one if a client sent it anyway.
+                    try:
+                        await reader.readexactly(int(headers["content-length"]))
+                    except ValueError:
+                        await self._send_error(writer, HTTPStatus.BAD_REQUEST, keep_alive=False)
+                        return
+                keep_alive = _wants_keep_alive(version, headers)
+                if not await self._respond(writer, method, target, headers, keep_alive) or not keep_alive:
+                    return
+        except (OSError, RuntimeError, asyncio.IncompleteReadError):
+            # The peer went away, or stop() closed the transport mid-response.
+            pass
+        finally:
+            if task is not None:
+                self._connections.pop(task, None)
+            writer.close()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        keep_alive: bool,
+    ) -> bool:
+        """Answer one request; return False when the connection must close."""
+        if method not in ("GET", "HEAD"):
+            await self._send_error(writer, HTTPStatus.METHOD_NOT_ALLOWED, keep_alive=keep_alive, headers=[("Allow", "GET, HEAD")])
+            return True
+        entry = self.asset_server._resolve_request(target)
+        if entry is None:
+            await self._send_error(writer, HTTPStatus.NOT_FOUND, keep_alive=keep_alive)
+            return True
+        if entry.data is not None:
+            response = _plan_response(entry, method, headers, len(entry.data), entry.modified, entry.etag)
+            writer.write(_response_head(response.status, response.headers, keep_alive))
+            if method == "GET" and response.length:
+                writer.write(memoryview(entry.data)[response.offset : response.offset + response.length])
+            await writer.drain()
+            return True
+        try:
+            # open/fstat are metadata calls; the body never passes through Python.
+            handle = entry.path.open("rb") if entry.path is not None else None
+        except OSError:
+            handle = None
+        if handle is None:
+            await self._send_error(writer, HTTPStatus.NOT_FOUND, keep_alive=keep_alive)
+            return True
+        with handle:
+            stat = os.fstat(handle.fileno())
+            response = _plan_response(entry, method, headers, stat.st_size, stat.st_mtime, _file_etag(stat))
+            writer.write(_response_head(response.status, response.headers, keep_alive))
+            await writer.drain()
+            if method == "HEAD" or not response.length:
+                return True
+            loop = asyncio.get_running_loop()
+            sent = await loop.sendfile(writer.transport, handle, response.offset, response.length)
+        # A file that shrank while being sent leaves the client short; close.
+        return sent == response.length
+
+    async def _send_error(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        *,
+        keep_alive: bool,
+        headers: list[tuple[str, str]] | None = None,
+    ) -> None:
+        body = f"{status.value} {status.phrase}\n".encode("ascii")
+        fields = [*(headers or ()), ("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", str(len(body)))]
+        writer.write(_response_head(status, fields, keep_alive) + body)
+        await writer.drain()
+
+
+def _parse_request_head(head: bytes) -> tuple[str, str, str, dict[str, str]] | None:
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        return None
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], parts[2], headers
+
+
+def _wants_keep_alive(version: str, headers: Mapping[str, str]) -> bool:
+    tokens = {token.strip().lower() for token in headers.get("connection", "").split(",")}
+    if version == "HTTP/1.0":
+        return "keep-alive" in tokens
+    return "close" not in tokens
+
+
+def _response_head(status: HTTPStatus, headers: Iterable[tuple[str, str]], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", "replace")
 
 
 class AssetServer:
-    def __init__(self, *, host: str = "127.0.0.1", port: int = 0, base_path: str = "/assets") -> None:
+    """Serves registered files and bytes to the runtime over HTTP.
+
+    ``mode="threads"`` (the default) runs a ``ThreadingHTTPServer`` with a
+    thread per connection. ``mode="asyncio"`` serves every connection from
+    one event loop: the running loop when the server starts inside a
+    coroutine (such as ``main(page)``), otherwise a dedicated loop thread.
+    It keeps HTTP/1.1 connections open for ``keep_alive`` idle seconds and
+    sends files with ``os.sendfile`` where the platform supports it.
+
+    Both modes answer ``Range`` requests (206) and revalidation with
+    ``ETag``/``Last-Modified`` (304). ``cache_control`` is the default
+    ``Cache-Control`` of registered entries; ``register_file`` and
+    ``register_bytes`` take a per-entry value.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_path: str = "/assets",
+        mode: Literal["threads", "asyncio"] = "threads",
+        keep_alive: float = 15.0,
+        cache_control: str = "no-cache",
+    ) -> None:
+        if mode not in ("threads", "asyncio"):
+            raise ValueError(f"Unknown asset server mode: {mode!r}")
         self.host = host
         self.port = int(port)
         normalized = (base_path or "/assets").strip() or "/assets"
@@ -99,32 +465,46 @@ class AssetServer:
         if normalized != "/" and normalized.endswith("/"):
             normalized = normalized[:-1]
         self.base_path = normalized
-        self._server: _AssetHTTPServer | None = None
+        self.mode = mode
+        self.keep_alive = float(keep_alive)
+        self.cache_control = cache_control
+        self._server: _AssetHTTPServer | _AsyncAssetServer | None = None
         self._thread: threading.Thread | None = None
-        self._lock = threading.Lock()
+        # Lookups read this dict without a lock: single dict operations are
+        # atomic, and entries are never changed after they are stored.
         self._entries: dict[str, _AssetEntry] = {}
 
     def start(self) -> None:
         if self._server is not None:
             return
+        if self.mode == "asyncio":
+            sock = socket.create_server((self.host, self.port))
+            self.port = int(sock.getsockname()[1])
+            server = _AsyncAssetServer(self, sock, self.keep_alive)
+            self._server = server
+            server.start()
+            return
         self._server = _AssetHTTPServer((self.host, self.port), _AssetHandler, self)
         self.port = int(self._server.server_address[1])
         self._thread = threading.Thread(target=self._server.serve_forever, name="ButterflyUIAssetServer", daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
-        if self._server is None:
+        server = self._server
+        if server is None:
             return
-        self._server.shutdown()
-        self._server.server_close()
         self._server = None
+        if isinstance(server, _AsyncAssetServer):
+            server.stop()
+            return
+        server.shutdown()
+        server.server_close()
         if self._thread is not None:
             self._thread.join(timeout=2.0)
         self._thread = None
 
     def clear(self) -> None:
-        with self._lock:
-            self._entries.clear()
+        self._entries.clear()
 
     @property
     def base_url(self) -> str:
@@ -139,6 +519,7 @@ class AssetServer:
         filename: Optional[str] = None,
         mime: Optional[str] = None,
         ttl: Optional[float] = None,
+        cache_control: Optional[str] = None,
     ) -> str:
         file_path = Path(path).expanduser().resolve()
         if not file_path.exists():
@@ -147,8 +528,14 @@ class AssetServer:
         mime = mime or _guess_mime(name)
         token = secrets.token_urlsafe(16)
         expires_at = None if ttl is None else time.time() + float(ttl)
-        with self._lock:
-            self._entries[token] = _AssetEntry(path=file_path, data=None, mime=mime, filename=name, expires_at=expires_at)
+        self._entries[token] = _AssetEntry(
+            path=file_path,
+            data=None,
+            mime=mime,
+            filename=name,
+            expires_at=expires_at,
+            cache_control=cache_control or self.cache_control,
+        )
         return self.url_for(token, name)
 
     def register_bytes(
@@ -158,13 +545,23 @@ class AssetServer:
         filename: Optional[str] = None,
         mime: Optional[str] = None,
         ttl: Optional[float] = None,
+        cache_control: Optional[str] = None,
     ) -> str:
         name = filename or "blob"
         mime = mime or _guess_mime(name)
         token = secrets.token_urlsafe(16)
         expires_at = None if ttl is None else time.time() + float(ttl)
-        with self._lock:
-            self._entries[token] = _AssetEntry(path=None, data=bytes(data), mime=mime, filename=name, expires_at=expires_at)
+        # The bytes of a token never change, so the token is a strong ETag.
+        self._entries[token] = _AssetEntry(
+            path=None,
+            data=bytes(data),
+            mime=mime,
+            filename=name,
+            expires_at=expires_at,
+            cache_control=cache_control or self.cache_control,
+            etag=f'"{token}"',
+            modified=time.time(),
+        )
         return self.url_for(token, name)
 
     def url_for(self, token: str, filename: Optional[str] = None) -> str:
@@ -181,14 +578,13 @@ class AssetServer:
         token = remainder.split("/", 1)[0]
         if not token:
             return None
-        with self._lock:
-            entry = self._entries.get(token)
-            if entry is None:
-                return None
-            if entry.expired():
-                self._entries.pop(token, None)
-                return None
-            return entry
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        if entry.expired():
+            self._entries.pop(token, None)
+            return None
+        return entry
 
     def __enter__(self) -> "AssetServer":
         self.start()
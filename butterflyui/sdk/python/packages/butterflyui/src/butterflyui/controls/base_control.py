@@ -34,8 +34,7 @@ class BaseControl(CoreControl):
         return self
 
     def set_children(self, children: Iterable[Any]) -> "BaseControl":
-        self.children.clear()
-        self.children.extend(children)
+        self.children[:] = list(children)
         return self
 
     def get_state(self, session: Any) -> dict[str, Any]:
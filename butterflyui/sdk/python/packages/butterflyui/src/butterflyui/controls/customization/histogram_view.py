@@ -28,7 +28,8 @@ class HistogramView(LayoutControl):
 
     bins: list[float] | None = None
     """
-    List of bin values (relative bar heights, ``0.0``–``1.0``).
+    List of bin values (relative bar heights, ``0.0``–``1.0``). An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     channels: list[Mapping[str, Any]] | None = None
@@ -1,10 +1,14 @@
 from __future__ import annotations
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from ..base_control import butterfly_control
 from ..scrollable_control import ScrollableControl
 
 from ..multi_child_control import MultiChildControl
+
+if TYPE_CHECKING:
+    from ...data import GridQuery, QuerySource
+
 __all__ = ["DataTable"]
 
 @butterfly_control('data_table', field_aliases={'controls': 'children'})
@@ -126,3 +130,22 @@ class DataTable(ScrollableControl, MultiChildControl):
 
     def clear_selection(self, session: Any) -> dict[str, Any]:
         return self.invoke(session, "clear_selection", {})
+
+    def set_query_source(self, source: "QuerySource", *, page_size: int | None = None) -> "GridQuery":
+        """Answer sort, filter and paging from ``source``, sending only the current page.
+
+        ``source`` is a `ColumnTable`, a `SqliteSource` or any
+        `QuerySource`. Returns the `GridQuery`; call ``await
+        query.refresh()`` after the data changes.
+        """
+        from ...data import GridQuery
+
+        query = GridQuery(
+            source,
+            page_size=page_size or self.props.get("page_size") or 50,
+            sort_column=self.props.get("sort_column"),
+            sort_ascending=self.props.get("sort_ascending", True) is not False,
+            filter_query=self.props.get("filter_query") or "",
+        )
+        query.attach(self)
+        return query
@@ -1,10 +1,13 @@
 from __future__ import annotations
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 from ..base_control import butterfly_control
 from ..scrollable_control import ScrollableControl
 
 from ..multi_child_control import MultiChildControl
+
+if TYPE_CHECKING:
+    from ...data import DataProvider, DataWindow
 __all__ = ["VirtualGrid"]
 
 @butterfly_control('virtual_grid', field_aliases={'controls': 'children'})
@@ -70,3 +73,23 @@ class VirtualGrid(ScrollableControl, MultiChildControl):
     """
     Number of remaining items at which a ``"prefetch"`` event is emitted.
     """
+
+    def set_data_provider(
+        self,
+        provider: "DataProvider",
+        *,
+        render: Callable[[Any, int], Any] | None = None,
+        page_size: int = 50,
+        cache_size: int = 1000,
+    ) -> "DataWindow":
+        """Serve this grid from ``provider``, sending only the visible rows.
+
+        ``render(row, index)`` turns a row into a control, template instance
+        or item map. Returns the `DataWindow`; call ``await
+        window.refresh()`` after the data changes.
+        """
+        from ...data import DataWindow
+
+        window = DataWindow(provider, render=render, page_size=page_size, cache_size=cache_size)
+        window.attach(self)
+        return window
@@ -1,10 +1,13 @@
 from __future__ import annotations
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 from ..base_control import butterfly_control
 from ..scrollable_control import ScrollableControl
 
 from ..multi_child_control import MultiChildControl
+
+if TYPE_CHECKING:
+    from ...data import DataProvider, DataWindow
 __all__ = ["VirtualList"]
 
 @butterfly_control('virtual_list', field_aliases={'controls': 'children'})
@@ -100,3 +103,23 @@ class VirtualList(ScrollableControl, MultiChildControl):
     """
     Initial index value forwarded to the `virtual_list` runtime control.
     """
+
+    def set_data_provider(
+        self,
+        provider: "DataProvider",
+        *,
+        render: Callable[[Any, int], Any] | None = None,
+        page_size: int = 50,
+        cache_size: int = 1000,
+    ) -> "DataWindow":
+        """Serve this list from ``provider``, sending only the visible rows.
+
+        ``render(row, index)`` turns a row into a control, template instance
+        or item map. Returns the `DataWindow`; call ``await
+        window.refresh()`` after the data changes.
+        """
+        from ...data import DataWindow
+
+        window = DataWindow(provider, render=render, page_size=page_size, cache_size=cache_size)
+        window.attach(self)
+        return window
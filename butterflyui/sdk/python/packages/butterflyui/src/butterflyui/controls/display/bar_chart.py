@@ -36,7 +36,8 @@ class BarChart(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Primary list of numeric bar values.
+    Primary list of numeric bar values. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
@@ -31,7 +31,8 @@ class BarPlot(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Numeric bar values for a single series.
+    Numeric bar values for a single series. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
@@ -1,9 +1,12 @@
 from __future__ import annotations
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from ..base_control import butterfly_control
 from ..layout_control import LayoutControl
 
+if TYPE_CHECKING:
+    from ...data import DisplayList
+
 __all__ = ["Canvas"]
 
 @butterfly_control('canvas')
@@ -20,7 +23,8 @@ class Canvas(LayoutControl):
     Tapping the canvas emits a ``"tap"`` event with ``x``/``y`` local
     coordinates.  Use ``set_shapes`` to replace the shape list,
     ``clear`` to remove all shapes, and ``get_state`` to retrieve
-    the current shape count.
+    the current shape count.  For interactive drawing, ``display_list``
+    changes shapes by id and sends only the shapes that changed.
 
     Example:
 
@@ -55,6 +59,16 @@ class Canvas(LayoutControl):
     def set_shapes(self, session: Any, shapes: list[Mapping[str, Any]]) -> dict[str, Any]:
         return self.invoke(session, "set_shapes", {"shapes": [dict(shape) for shape in shapes]})
 
+    def display_list(self, *, tolerance: float = 0.0) -> "DisplayList":
+        """Edit ``shapes`` by id, sending each frame's changes as one op.
+
+        ``tolerance`` (in pixels) simplifies freehand strokes before they
+        are sent. Returns the `DisplayList`.
+        """
+        from ...data import DisplayList
+
+        return DisplayList(self, tolerance=tolerance)
+
     def clear(self, session: Any) -> dict[str, Any]:
         return self.invoke(session, "clear", {})
 
@@ -37,7 +37,8 @@ class Chart(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Numeric data points for the chart.
+    Numeric data points for the chart. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
@@ -1,10 +1,13 @@
 from __future__ import annotations
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from .chart import Chart
 from ..base_control import butterfly_control
 from ..layout_control import LayoutControl
 
+if TYPE_CHECKING:
+    from ...data import TimeSeries
+
 __all__ = ["LineChart"]
 
 @butterfly_control('line_chart')
@@ -18,7 +21,8 @@ class LineChart(LayoutControl):
     20% opacity.  Tapping the chart emits a ``"select"`` event with
     the nearest data-point index and value.
 
-    Use ``set_data`` to replace the data series at runtime.
+    Use ``set_data`` to replace the data series at runtime, or
+    ``set_time_series`` to stream live samples from a ``TimeSeries``.
 
     Example:
 
@@ -35,7 +39,8 @@ class LineChart(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Numeric data points for the polyline.
+    Numeric data points for the polyline. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
@@ -51,5 +56,13 @@ class LineChart(LayoutControl):
     def set_data(self, session: Any, values: list[Any]) -> dict[str, Any]:
         return self.invoke(session, "set_data", {"values": values})
 
+    def set_time_series(self, source: "TimeSeries", series: str = "values") -> None:
+        """Stream series ``series`` of ``source`` into ``values``.
+
+        New samples are sent as appends, downsampled once the history
+        outgrows the point budget of ``source``.
+        """
+        source.attach(self, series)
+
     def emit(self, session: Any, event: str, payload: Mapping[str, Any] | None = None) -> dict[str, Any]:
         return self.invoke(session, "emit", {"event": event, "payload": dict(payload or {})})
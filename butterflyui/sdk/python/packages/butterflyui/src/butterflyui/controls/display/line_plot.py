@@ -31,7 +31,8 @@ class LinePlot(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Numeric data points for the polyline.
+    Numeric data points for the polyline. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
@@ -33,7 +33,8 @@ class PiePlot(LayoutControl):
 
     values: list[float] | None = None
     """
-    Numeric values for each pie segment.
+    Numeric values for each pie segment. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     labels: list[str] | None = None
@@ -29,7 +29,8 @@ class SparkPlot(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Numeric data points for the sparkline.
+    Numeric data points for the sparkline. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
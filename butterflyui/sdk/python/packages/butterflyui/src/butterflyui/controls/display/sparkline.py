@@ -1,9 +1,12 @@
 from __future__ import annotations
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from ..base_control import butterfly_control
 from ..layout_control import LayoutControl
 
+if TYPE_CHECKING:
+    from ...data import TimeSeries
+
 __all__ = ["Sparkline"]
 
 @butterfly_control('sparkline')
@@ -17,7 +20,8 @@ class Sparkline(LayoutControl):
     ``fill`` is ``True`` the area under the line is shaded at
     reduced opacity.
 
-    Use ``set_data`` to update the data points at runtime.
+    Use ``set_data`` to update the data points at runtime, or
+    ``set_time_series`` to stream live samples from a ``TimeSeries``.
 
     Example:
 
@@ -34,7 +38,8 @@ class Sparkline(LayoutControl):
 
     values: list[Any] | None = None
     """
-    Numeric data points for the sparkline.
+    Numeric data points for the sparkline. An ``array.array``, NumPy array or ``NumericArray`` is sent as
+    one binary buffer to runtimes that support it.
     """
 
     points: list[Any] | None = None
@@ -50,5 +55,13 @@ class Sparkline(LayoutControl):
     def set_data(self, session: Any, values: list[Any]) -> dict[str, Any]:
         return self.invoke(session, "set_data", {"values": values})
 
+    def set_time_series(self, source: "TimeSeries", series: str = "values") -> None:
+        """Stream series ``series`` of ``source`` into ``values``.
+
+        New samples are sent as appends, downsampled once the history
+        outgrows the point budget of ``source``.
+        """
+        source.attach(self, series)
+
     def emit(self, session: Any, event: str, payload: Mapping[str, Any] | None = None) -> dict[str, Any]:
         return self.invoke(session, "emit", {"event": event, "payload": dict(payload or {})})
@@ -20,6 +20,7 @@ from ..types import (
     RadialGradient,
     SweepGradient,
 )
+from .arrays import NumericArray
 from .control import Component, Control
 from .performance import PerformanceConfig, enable_60fps, performance_config
 from .responsive import Breakpoints
@@ -40,11 +41,16 @@ from .schema import (
     validate_frame_child,
     validate_props,
 )
+from .template import Slot, Template, TemplateInstance
 
 __all__ = [
     "AnimationSpec",
     "Component",
     "Control",
+    "NumericArray",
+    "Slot",
+    "Template",
+    "TemplateInstance",
     "IconData",
     "ICON_NAMES",
     "ICON_SET",
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+__all__ = ["DTYPES", "NumericArray", "is_array_like"]
+
+# Wire dtype -> ``array`` type code of the same width.
+DTYPES: dict[str, str] = {
+    "i8": "b",
+    "u8": "B",
+    "i16": "h",
+    "u16": "H",
+    "i32": "i",
+    "u32": "I",
+    "i64": "q",
+    "u64": "Q",
+    "f32": "f",
+    "f64": "d",
+}
+
+_CODES = {dtype: code for dtype, code in DTYPES.items() if array(code).itemsize * 8 == int(dtype[1:])}
+_SIGNED = frozenset("bhilqn")
+_UNSIGNED = frozenset("BHILQN")
+_FLOAT = frozenset("fd")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def is_array_like(value: Any) -> bool:
+    """Return whether ``value`` is an ``array.array`` or a NumPy-style array."""
+    return isinstance(value, array) or hasattr(value, "__array_interface__")
+
+
+class NumericArray:
+    """A numeric vector or table sent as one binary buffer.
+
+    Wraps an ``array.array``, a ``memoryview``, a NumPy array or any other
+    buffer of numbers without copying it (big-endian and strided buffers
+    are copied once). Other sequences are packed as ``dtype``. Chart props
+    take it anywhere they take a list of numbers; ``array.array`` and
+    NumPy values are copied into one automatically.
+
+    ``columns`` splits the values into rows, for ``[x, y]`` points; a 2-D
+    NumPy array sets it from its shape. Runtimes that support
+    ``ui.arrays`` receive the raw little-endian bytes as a frame attachment;
+    others receive ``tolist()``.
+
+    The buffer is shared, so changes made to it in place are not seen by
+    ``page.update()``, and an ``array.array`` cannot be resized while it is
+    wrapped. Pass ``copy=True`` to keep a snapshot, or wrap a new array to
+    change the data.
+    """
+
+    __slots__ = ("dtype", "columns", "_data", "_view")
+
+    # Number of arrays created in this process; the connection writer skips
+    # its walk while this is zero.
+    created = 0
+
+    def __init__(
+        self,
+        values: Any,
+        *,
+        dtype: str = "f64",
+        columns: int | None = None,
+        copy: bool = False,
+    ) -> None:
+        if isinstance(values, NumericArray):
+            view = values._view
+            columns = columns or values.columns
+        else:
+            view = _buffer_view(values, dtype)
+        if view.ndim == 2:
+            columns = columns or view.shape[1]
+        elif view.ndim > 2:
+            raise ValueError("NumericArray supports 1-D and 2-D buffers")
+        self.dtype = _dtype_of(view)
+        self.columns = max(1, int(columns or 1))
+        code = _CODES[self.dtype]
+        swap = _byteswapped(view)
+        if swap or copy or not view.c_contiguous:
+            values = array(code, view.tobytes())
+            if swap:
+                values.byteswap()
+            view = memoryview(values)
+        elif view.ndim != 1 or view.format != code:
+            view = view.cast("B").cast(code)
+        if len(view) % self.columns:
+            raise ValueError(f"{len(view)} values do not fill rows of {self.columns} columns")
+        self._view = view
+        if _LITTLE_ENDIAN:
+            self._data = view.cast("B")
+        else:
+            values = array(code, view)
+            values.byteswap()
+            self._data = memoryview(values).cast("B")
+        NumericArray.created += 1
+
+    @property
+    def buffer(self) -> memoryview:
+        """The values as little-endian bytes."""
+        return self._data
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @property
+    def length(self) -> int:
+        """Number of values (``len()`` counts rows)."""
+        return len(self._view)
+
+    def __len__(self) -> int:
+        return len(self._view) // self.columns
+
+    def tolist(self) -> list[Any]:
+        if self.columns == 1:
+            return self._view.tolist()
+        return self._view.cast("B").cast(self._view.format, (len(self), self.columns)).tolist()
+
+    def to_wire(self) -> dict[str, Any]:
+        """Reference metadata sent in place of the values."""
+        ref: dict[str, Any] = {"dtype": self.dtype, "length": len(self._view)}
+        if self.columns != 1:
+            ref["columns"] = self.columns
+        return ref
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, NumericArray):
+            return NotImplemented
+        return self.dtype == other.dtype and self.columns == other.columns and self._data == other._data
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __copy__(self) -> "NumericArray":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "NumericArray":
+        return self
+
+    def __repr__(self) -> str:
+        shape = f"{len(self)}x{self.columns}" if self.columns != 1 else str(len(self))
+        return f"NumericArray({self.dtype}, {shape})"
+
+
+def _buffer_view(values: Any, dtype: str) -> memoryview:
+    try:
+        return memoryview(values)
+    except TypeError:
+        pass
+    code = _CODES.get(dtype)
+    if code is None:
+        raise ValueError(f"Unsupported NumericArray dtype: {dtype}")
+    if not isinstance(values, Iterable):
+        raise TypeError(f"NumericArray needs a buffer or a sequence of numbers, got {type(values).__name__}")
+    return memoryview(array(code, values))
+
+
+def _dtype_of(view: memoryview) -> str:
+    code = view.format.lstrip("@=<>!")
+    if code in _FLOAT:
+        kind = "f"
+    elif code in _SIGNED:
+        kind = "i"
+    elif code in _UNSIGNED:
+        kind = "u"
+    else:
+        raise TypeError(f"NumericArray does not support buffer format {view.format!r}")
+    dtype = f"{kind}{view.itemsize * 8}"
+    if dtype not in _CODES:
+        raise TypeError(f"NumericArray does not support buffer format {view.format!r}")
+    return dtype
+
+
+def _byteswapped(view: memoryview) -> bool:
+    """Return whether the buffer is not in native byte order."""
+    order = view.format[:1]
+    if order in (">", "!"):
+        return _LITTLE_ENDIAN
+    if order == "<":
+        return not _LITTLE_ENDIAN
+    return False
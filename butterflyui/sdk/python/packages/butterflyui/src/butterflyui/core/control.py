@@ -3,19 +3,23 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 import inspect
 import keyword
-import traceback
+import sys
 import sysconfig
-from collections.abc import Mapping
+from collections.abc import Mapping, Set as AbstractSet
 from enum import Enum
 from functools import wraps
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, TYPE_CHECKING
 import weakref
 
+from .arrays import NumericArray, is_array_like
 from .children import control_children_from_slots
-from .dirty import DirtyChildrenList, DirtyPropsDict, DirtyState
+from .dirty import DirtyChildrenList, DirtyPropsDict, DirtyState, PropIndex
 from .ids import new_control_id
 from .invocation import invoke_control_method, invoke_control_method_async
+from .performance import PerformanceConfig
+from .reconcile import reconcile_children
 
 if TYPE_CHECKING:
     from ..app import ButterflyUISession
@@ -66,6 +70,8 @@ except Exception:
     _STDLIB_ROOTS = ()
 _CONTROL_REGISTRY: "weakref.WeakValueDictionary[str, Control]" = weakref.WeakValueDictionary()
 _CONTROL_FIELD_DEFAULT_MISSING = object()
+_NO_INLINE_HANDLERS: Mapping[str, Any] = MappingProxyType({})
+_NO_BOUND_SESSIONS: frozenset[str] = frozenset()
 _CONTROL_FIELD_EXCLUDE_NAMES = {
     "control_type",
     "control_id",
@@ -73,24 +79,6 @@ _CONTROL_FIELD_EXCLUDE_NAMES = {
     "children",
     "meta",
 }
-_CONTROL_RUNTIME_ATTRS = {
-    "__class__",
-    "__dict__",
-    "__weakref__",
-    "__module__",
-    "__doc__",
-    "__annotations__",
-    "__dataclass_fields__",
-    "__dataclass_params__",
-    "__orig_class__",
-    "__slots__",
-    "__match_args__",
-    "control_type",
-    "control_id",
-    "props",
-    "children",
-    "meta",
-}
 
 
 def _collect_doc_only_field_names(cls: type["Control"]) -> frozenset[str]:
@@ -160,12 +148,35 @@ def _is_internal_path(path: str | None) -> bool:
     return False
 
 
-def _capture_source() -> dict[str, Any] | None:
-    frames = traceback.extract_stack()
-    for frame in reversed(frames):
-        if _is_internal_path(frame.filename):
-            continue
-        return {"path": frame.filename, "line": frame.lineno, "function": frame.name}
+_INTERNAL_PATH_VERDICTS: dict[str, bool] = {}
+_SOURCE_SITES: dict[tuple[str, int, str], dict[str, Any]] = {}
+
+
+def _capture_source_meta() -> dict[str, Any] | None:
+    """Return ``{"source": {...}}`` for the first caller outside ButterflyUI.
+
+    The dict is shared by every control built on the same line and is
+    already JSON-safe, so callers must copy it before mutating.
+    """
+    if not PerformanceConfig.source_capture_enabled():
+        return None
+    verdicts = _INTERNAL_PATH_VERDICTS
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        internal = verdicts.get(filename)
+        if internal is None:
+            internal = verdicts[filename] = _is_internal_path(filename)
+        if not internal:
+            site = (filename, frame.f_lineno, code.co_name)
+            source_meta = _SOURCE_SITES.get(site)
+            if source_meta is None:
+                source_meta = _SOURCE_SITES[site] = {
+                    "source": {"path": filename, "line": site[1], "function": site[2]}
+                }
+            return source_meta
+        frame = frame.f_back
     return None
 
 
@@ -232,7 +243,10 @@ def _collect_control_field_order(
 def _control_field_default(cls: type["Control"], name: str) -> Any:
     for base in cls.__mro__:
         if name in getattr(base, "__dict__", {}):
-            return inspect.getattr_static(base, name)
+            value = inspect.getattr_static(base, name)
+            if isinstance(value, _ControlField):
+                return value.default
+            return value
     return _CONTROL_FIELD_DEFAULT_MISSING
 
 
@@ -247,6 +261,184 @@ def _control_field_prop_name(cls: type["Control"], name: str) -> str:
     return name
 
 
+class _ControlField:
+    """Data descriptor that stores a declared control field in ``props``.
+
+    ``prepare_control_class`` installs one per field with the prop name and
+    class default resolved, so reading ``control.value`` is a dict lookup.
+    Until ``Control.__init__`` has created ``props`` the value lives in the
+    instance ``__dict__`` like a plain attribute.
+    """
+
+    __slots__ = ("name", "prop_name", "default", "fallback")
+
+    def __init__(self, name: str, prop_name: str, default: Any) -> None:
+        self.name = name
+        self.prop_name = prop_name
+        self.default = default
+        self.fallback = None if default is _CONTROL_FIELD_DEFAULT_MISSING else default
+
+    def matches(self, other: Any) -> bool:
+        return (
+            type(other) is type(self)
+            and other.prop_name == self.prop_name
+            and other.default is self.default
+        )
+
+    def _unbound_get(self, instance: Any) -> Any:
+        try:
+            return instance.__dict__[self.name]
+        except (AttributeError, KeyError):
+            pass
+        if self.default is _CONTROL_FIELD_DEFAULT_MISSING:
+            raise AttributeError(
+                f"{type(instance).__name__!r} object has no attribute {self.name!r}"
+            )
+        return self.default
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            if self.default is _CONTROL_FIELD_DEFAULT_MISSING:
+                raise AttributeError(self.name)
+            return self.default
+        try:
+            props = instance.props
+        except AttributeError:
+            return self._unbound_get(instance)
+        return props.get(self.prop_name, self.fallback)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        try:
+            props = instance.props
+        except AttributeError:
+            instance.__dict__[self.name] = value
+            return
+        if value is None:
+            props.pop(self.prop_name, None)
+        else:
+            props[self.prop_name] = value
+
+    def __delete__(self, instance: Any) -> None:
+        self.__set__(instance, None)
+
+
+class _ControlEventsField(_ControlField):
+    """Field mapped to ``events``; assigning it re-subscribes on the runtime."""
+
+    __slots__ = ()
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        try:
+            props = instance.props
+        except AttributeError:
+            instance.__dict__[self.name] = value
+            return
+        if value is None:
+            props.pop("events", None)
+        else:
+            props["events"] = value
+        instance.mark_events_dirty()
+
+
+class _ControlChildField(_ControlField):
+    """Field mapped to ``child``: the first entry of ``children``."""
+
+    __slots__ = ()
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return _ControlField.__get__(self, None, owner)
+        try:
+            props = instance.props
+        except AttributeError:
+            return self._unbound_get(instance)
+        children = instance.children
+        if children:
+            return children[0]
+        return props.get("child", self.fallback)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        try:
+            props = instance.props
+        except AttributeError:
+            instance.__dict__[self.name] = value
+            return
+        children = instance.children
+        if children:
+            children[0] = value
+        elif value is None:
+            props.pop("child", None)
+        else:
+            children.append(value)
+
+
+class _ControlChildrenField(_ControlField):
+    """Field mapped to ``children``: reads and replaces the children list."""
+
+    __slots__ = ()
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return _ControlField.__get__(self, None, owner)
+        try:
+            instance.props
+        except AttributeError:
+            return self._unbound_get(instance)
+        return instance.children
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        try:
+            props = instance.props
+        except AttributeError:
+            instance.__dict__[self.name] = value
+            return
+        children = instance.children
+        children.clear()
+        if value is None:
+            props.pop("children", None)
+            return
+        if isinstance(value, (list, tuple)):
+            children.extend(value)
+        else:
+            children.append(value)
+
+
+def _install_control_fields(cls: type["Control"]) -> None:
+    """Install a ``_ControlField`` for every declared field of ``cls``.
+
+    Fields whose resolved descriptor is already inherited unchanged are
+    left alone; names that stopped being fields (for example after
+    ``doc_only_fields`` is applied) get their plain class default back.
+    """
+    fields = cls._butterflyui_control_fields
+    for name in cls._butterflyui_control_field_order:
+        inherited = _CONTROL_FIELD_DEFAULT_MISSING
+        for base in cls.__mro__:
+            if name in base.__dict__:
+                inherited = base.__dict__[name]
+                break
+        if name not in fields:
+            if isinstance(inherited, _ControlField):
+                if inherited.default is _CONTROL_FIELD_DEFAULT_MISSING:
+                    if name in cls.__dict__:
+                        delattr(cls, name)
+                else:
+                    setattr(cls, name, inherited.default)
+            continue
+        prop_name = _control_field_prop_name(cls, name)
+        default = _control_field_default(cls, name)
+        if prop_name == "child":
+            descriptor: _ControlField = _ControlChildField(name, prop_name, default)
+        elif prop_name == "children":
+            descriptor = _ControlChildrenField(name, prop_name, default)
+        elif prop_name == "events":
+            descriptor = _ControlEventsField(name, prop_name, default)
+        else:
+            descriptor = _ControlField(name, prop_name, default)
+        if not descriptor.matches(inherited):
+            setattr(cls, name, descriptor)
+
+
 def _signature_default(value: Any) -> Any:
     if value is _CONTROL_FIELD_DEFAULT_MISSING:
         return None
@@ -315,87 +507,198 @@ def _build_control_class_signature(cls: type["Control"]) -> inspect.Signature |
     return inspect.Signature(parameters=params)
 
 
-def _build_declarative_control_init(cls: type["Control"]):
-    positional_fields = tuple(getattr(cls, "_butterflyui_positional_fields", ()))
-    doc_only_fields = frozenset(getattr(cls, "_butterflyui_doc_only_fields", ()))
-    field_order = tuple(getattr(cls, "_butterflyui_control_field_order", ()))
+def _resolve_base_init(cls: type["Control"]) -> Any:
+    """The first `__init__` above `cls` that is not a declarative one.
 
-    @wraps(Control.__init__)
-    def generated(
-        self: "Control",
-        *args: Any,
-        props: Mapping[str, Any] | None = None,
-        style: Any | None = None,
-        strict: bool = False,
-        child: Any | None = None,
-        children: Any | None = None,
-        **kwargs: Any,
-    ) -> None:
-        field_values: dict[str, Any] = {}
-        extra_children: list[Any] = []
+    Declarative constructors handle every inherited field themselves, so
+    they skip straight to the nearest hand-written (or the core) init.
+    """
+    for base in cls.__mro__[1:]:
+        init = base.__dict__.get("__init__")
+        if init is None or getattr(init, "_butterflyui_generated", False):
+            continue
+        return init
+    return Control.__init__
 
-        for index, value in enumerate(args):
-            if index < len(positional_fields):
-                field_values[positional_fields[index]] = value
-            else:
-                extra_children.append(value)
 
-        for name in field_order:
-            if name in kwargs and name not in field_values:
-                field_values[name] = kwargs.pop(name)
+_DECLARATIVE_INIT_CODE: dict[str, Any] = {}
 
-        doc_values: dict[str, Any] = {}
-        translated_kwargs: dict[str, Any] = {}
-        for name, value in field_values.items():
-            if name in doc_only_fields:
-                doc_values[name] = value
-                continue
-            prop_name = _control_field_prop_name(cls, name)
-            if prop_name == "child":
-                if value is not None and child is None:
-                    child = value
-                continue
-            if prop_name == "children":
-                if value is not None and children is None:
-                    children = value
-                continue
-            translated_kwargs[prop_name] = value
 
-        resolved_children = children
-        if extra_children:
-            if resolved_children is None:
-                resolved_children = list(extra_children)
-            else:
-                merged_children = list(resolved_children)
-                merged_children.extend(extra_children)
-                resolved_children = merged_children
-
-        super(cls, self).__init__(
-            child=child,
-            children=resolved_children,
-            props=props,
-            style=style,
-            strict=strict,
-            **translated_kwargs,
-            **kwargs,
-        )
+def _declarative_field_ranks(
+    cls: type["Control"],
+    positional_fields: tuple[str, ...],
+    props: Mapping[str, str | None],
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Rank fields by where their prop lands in `props`.
+
+    Props inherited from declarative ancestors come first, the deepest
+    ancestor's own fields leading. Props only this class declares follow:
+    those passed positionally, then keyword ones. Fields sharing a prop
+    keep declaration order, so the last one declared wins. Returns the
+    ranks for keyword and for positional arguments.
+    """
+    translatable = [prop for prop in props.values() if prop is not None and prop not in ("child", "children")]
+    prop_ranks: dict[str, int] = {}
+    for base in reversed(cls.__mro__[1:]):
+        if not getattr(base.__dict__.get("__init__"), "_butterflyui_generated", False):
+            continue
+        for prop in getattr(base, "_butterflyui_control_field_order", ()):
+            if prop in translatable and prop not in prop_ranks:
+                prop_ranks[prop] = len(prop_ranks)
+    positional_prop_ranks = dict(prop_ranks)
+    offset = len(prop_ranks)
+    for name in positional_fields:
+        prop = props.get(name)
+        if prop is not None and prop not in positional_prop_ranks:
+            positional_prop_ranks[prop] = offset
+            offset += 1
+    for prop in translatable:
+        if prop not in prop_ranks:
+            prop_ranks[prop] = offset
+            offset += 1
+
+    width = len(props) + 1
+    ranks: dict[str, int] = {}
+    positional_ranks: dict[str, int] = {}
+    for index, (name, prop) in enumerate(props.items()):
+        ranks[name] = prop_ranks.get(prop, -1) * width + index
+        if name in positional_fields:
+            positional_ranks[name] = positional_prop_ranks.get(prop, -1) * width + index
+    return ranks, positional_ranks
+
+
+def _declarative_init_source(
+    positional_fields: tuple[str, ...],
+    kinds: frozenset[str],
+) -> str:
+    lines = [
+        "def __init__(self, *args, props=None, style=None, strict=False, child=None, children=None, **kwargs):",
+        "    values = {}",
+        "    extra = ()",
+        "    if args:",
+    ]
+    if positional_fields:
+        lines.append("        count = len(args)")
+        for index, name in enumerate(positional_fields):
+            lines.append(f"        if count > {index}:")
+            lines.append(f"            values[{name!r}] = args[{index}]")
+        lines.append(f"        extra = args[{len(positional_fields)}:]")
+    else:
+        lines.append("        extra = args")
+    lines += [
+        "    if kwargs:",
+        "        for name in [name for name in kwargs if name in _props and name not in values]:",
+        "            values[name] = kwargs.pop(name)",
+    ]
+    # Props are inserted in the order the ancestor chain of declarative
+    # constructors used to give them (see `_declarative_field_ranks`).
+    if positional_fields:
+        lines += [
+            "    if len(values) < 2:",
+            "        order = values",
+            "    elif args:",
+            "        given = _positional[:len(args)]",
+            "        order = sorted(values, key=lambda name: _positional_ranks[name] if name in given else _ranks[name])",
+            "    else:",
+            "        order = sorted(values, key=_ranks.__getitem__)",
+        ]
+    else:
+        lines.append("    order = sorted(values, key=_ranks.__getitem__) if len(values) > 1 else values")
+    if not kinds:
+        lines.append("    translated = {_props[name]: values[name] for name in order}")
+    else:
+        lines += [
+            "    translated = {}",
+            "    doc_values = None",
+            "    for name in order:",
+            "        value = values[name]",
+            "        prop_name = _props[name]",
+        ]
+        if "doc" in kinds:
+            lines += [
+                "        if prop_name is None:",
+                "            if doc_values is None:",
+                "                doc_values = {}",
+                "            doc_values[name] = value",
+                "            continue",
+            ]
+        for slot in ("child", "children"):
+            if slot in kinds:
+                lines += [
+                    f"        if prop_name == {slot!r}:",
+                    f"            if value is not None and {slot} is None:",
+                    f"                {slot} = value",
+                    "            continue",
+                ]
+        lines.append("        translated[prop_name] = value")
+    lines += [
+        "    if extra:",
+        "        children = list(extra) if children is None else [*children, *extra]",
+        "    _base_init(self, child=child, children=children, props=props, style=style, strict=strict, **translated, **kwargs)",
+    ]
+    if "doc" in kinds:
+        lines += [
+            "    if doc_values:",
+            "        for name, value in doc_values.items():",
+            "            object.__setattr__(self, name, value)",
+        ]
+    lines += [
+        "    init_hook = getattr(self, 'init', None)",
+        "    if callable(init_hook):",
+        "        init_hook()",
+        "    try:",
+        "        _register_control(self)",
+        "    except Exception:",
+        "        pass",
+        "    try:",
+        "        self.clear_dirty()",
+        "    except Exception:",
+        "        pass",
+    ]
+    return "\n".join(lines) + "\n"
 
-        for name, value in doc_values.items():
-            object.__setattr__(self, name, value)
 
-        init_hook = getattr(self, "init", None)
-        if callable(init_hook):
-            init_hook()
+def _build_declarative_control_init(cls: type["Control"]):
+    """Generate the constructor of a declarative control class.
 
-        try:
-            _register_control(self)
-        except Exception:
-            pass
-        try:
-            self.clear_dirty()
-        except Exception:
-            pass
+    Like `dataclasses`, the source is specialized per class when the class
+    is prepared: positional fields are unrolled and the field -> prop table,
+    declaration ranks and base init are bound once, so building a control
+    does no introspection.
+    """
+    positional_fields = tuple(getattr(cls, "_butterflyui_positional_fields", ()))
+    doc_only_fields = frozenset(getattr(cls, "_butterflyui_doc_only_fields", ()))
+    field_order = tuple(getattr(cls, "_butterflyui_control_field_order", ()))
 
+    # Field -> prop name; `None` marks doc-only fields kept as attributes.
+    props: dict[str, str | None] = {}
+    kinds: set[str] = set()
+    for name in (*field_order, *(name for name in positional_fields if name not in field_order)):
+        if name in doc_only_fields:
+            props[name] = None
+            kinds.add("doc")
+            continue
+        prop_name = _control_field_prop_name(cls, name)
+        props[name] = prop_name
+        if prop_name in ("child", "children"):
+            kinds.add(prop_name)
+    ranks, positional_ranks = _declarative_field_ranks(cls, positional_fields, props)
+
+    source = _declarative_init_source(positional_fields, frozenset(kinds))
+    code = _DECLARATIVE_INIT_CODE.get(source)
+    if code is None:
+        # Classes with the same positional fields and field kinds share code.
+        code = _DECLARATIVE_INIT_CODE[source] = compile(source, "<butterflyui generated __init__>", "exec")
+    namespace: dict[str, Any] = {
+        "_props": props,
+        "_ranks": ranks,
+        "_positional": positional_fields,
+        "_positional_ranks": positional_ranks,
+        "_base_init": _resolve_base_init(cls),
+        "_register_control": _register_control,
+    }
+    exec(code, namespace)
+    generated = wraps(Control.__init__)(namespace["__init__"])
     generated._butterflyui_wrapped = True  # type: ignore[attr-defined]
     generated._butterflyui_generated = True  # type: ignore[attr-defined]
     return generated
@@ -520,14 +823,13 @@ def _normalize_universal_prop_aliases(props: Mapping[str, Any] | None) -> dict[s
     return normalized
 
 
-def _backfill_bound_init_props(
-    target: dict[str, Any],
-    signature: inspect.Signature,
-    bound_arguments: Mapping[str, Any],
-) -> None:
-    if not isinstance(target, dict):
-        return
-    for name, parameter in signature.parameters.items():
+def _init_backfill_table(
+    parameters: tuple[inspect.Parameter, ...],
+) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Prop keys each explicitly passed init argument is backfilled into."""
+    table: list[tuple[str, tuple[str, ...]]] = []
+    for parameter in parameters:
+        name = parameter.name
         if name in _AUTOPROP_EXCLUDE_NAMES:
             continue
         if parameter.kind in (
@@ -535,31 +837,98 @@ def _backfill_bound_init_props(
             inspect.Parameter.VAR_KEYWORD,
         ):
             continue
-        if name not in bound_arguments:
-            continue
-        value = bound_arguments[name]
-        if value is None:
-            continue
-        if callable(value):
-            continue
         candidate_keys = [name]
         if name.endswith("_") and len(name) > 1:
             candidate_keys.append(name[:-1])
         if name == "from_":
             candidate_keys.append("from")
+        table.append((name, tuple(key for key in candidate_keys if key)))
+    return tuple(table)
+
+
+@dataclass(frozen=True, slots=True)
+class _InitBinding:
+    """What `Signature.bind_partial` needs to know, precomputed per init."""
+
+    positional: tuple[str, ...]
+    var_positional: bool
+    keywords: frozenset[str]
+    var_keyword: bool
+
+    @classmethod
+    def from_parameters(cls, parameters: tuple[inspect.Parameter, ...]) -> "_InitBinding":
+        kind = inspect.Parameter
+        return cls(
+            # The first parameter is `self`.
+            positional=tuple(
+                p.name for p in parameters[1:] if p.kind in (kind.POSITIONAL_ONLY, kind.POSITIONAL_OR_KEYWORD)
+            ),
+            var_positional=any(p.kind == kind.VAR_POSITIONAL for p in parameters),
+            keywords=frozenset(
+                p.name for p in parameters[1:] if p.kind in (kind.POSITIONAL_OR_KEYWORD, kind.KEYWORD_ONLY)
+            ),
+            var_keyword=any(p.kind == kind.VAR_KEYWORD for p in parameters),
+        )
+
+    def bind(self, args: tuple[Any, ...], kwargs: Mapping[str, Any]) -> dict[str, Any] | None:
+        """Arguments bound to named parameters, or `None` if binding fails."""
+        if len(args) > len(self.positional) and not self.var_positional:
+            return None
+        bound = dict(zip(self.positional, args))
+        for name, value in kwargs.items():
+            if name in self.keywords:
+                if name in bound:
+                    return None
+                bound[name] = value
+            elif not self.var_keyword:
+                return None
+        return bound
+
+
+def _backfill_init_props(
+    target: dict[str, Any],
+    table: tuple[tuple[str, tuple[str, ...]], ...],
+    bound_arguments: Mapping[str, Any],
+) -> None:
+    if not isinstance(target, dict):
+        return
+    for name, candidate_keys in table:
+        value = bound_arguments.get(name)
+        if value is None:
+            continue
+        if callable(value):
+            continue
         for key in candidate_keys:
-            if not key:
-                continue
             if key not in target:
                 target[key] = value
 
 
+_STATE_TYPE: Any = None
+_TEMPLATE_INSTANCE_TYPE: Any = None
+
+
+def _state_type() -> Any:
+    global _STATE_TYPE
+    if _STATE_TYPE is None:
+        try:
+            from ..state import State
+        except Exception:
+            return ()
+        _STATE_TYPE = State
+    return _STATE_TYPE
+
+
+def _template_instance_type() -> Any:
+    global _TEMPLATE_INSTANCE_TYPE
+    if _TEMPLATE_INSTANCE_TYPE is None:
+        from .template import TemplateInstance
+
+        _TEMPLATE_INSTANCE_TYPE = TemplateInstance
+    return _TEMPLATE_INSTANCE_TYPE
+
+
 def _coerce_state_value(value: Any) -> tuple[bool, Any]:
-    try:
-        from ..state import State
-    except Exception:
-        return False, value
-    if isinstance(value, State):
+    if isinstance(value, _state_type()):
         return True, value.value
     return False, value
 
@@ -597,6 +966,8 @@ def coerce_child_json(child: Any) -> dict[str, Any] | None:
         return child.to_json()
     if isinstance(child, Mapping):
         return coerce_control_map(child)
+    if isinstance(child, _template_instance_type()):
+        return child.to_json()
     is_state, value = _coerce_state_value(child)
     if is_state:
         return _text_child(value)
@@ -605,6 +976,49 @@ def coerce_child_json(child: Any) -> dict[str, Any] | None:
     return _text_child(child)
 
 
+_PROPS_EMBED_CONTROLS = 1
+_PROPS_DYNAMIC = 2
+
+
+def _scan_props(owner: "Control", value: Any) -> int:
+    if isinstance(value, Control):
+        value._parent = owner
+        if value._json_dynamic:
+            return _PROPS_EMBED_CONTROLS | _PROPS_DYNAMIC
+        return _PROPS_EMBED_CONTROLS
+    if isinstance(value, _state_type()):
+        return _PROPS_DYNAMIC
+    flags = 0
+    if isinstance(value, Mapping):
+        for item in value.values():
+            flags |= _scan_props(owner, item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            flags |= _scan_props(owner, item)
+    return flags
+
+
+def serialize_control_props(control: "Control") -> dict[str, Any]:
+    """Coerce ``control.props`` to JSON and link any controls embedded in them.
+
+    Embedded controls (for example ``leading`` or ``actions`` slots) get their
+    parent pointer set so dirty marks on them reach ``control``. Props holding
+    a ``State`` mark the control as dynamic: its JSON is never cached.
+    """
+    payload = coerce_json_value(control.props)
+    flags = _scan_props(control, control.props)
+    control._embeds_controls = bool(flags & _PROPS_EMBED_CONTROLS)
+    control._dynamic_props = bool(flags & _PROPS_DYNAMIC)
+    return payload
+
+
+def child_is_dynamic(child: Any) -> bool:
+    """Return whether ``child`` serializes differently without a dirty mark."""
+    if isinstance(child, Control):
+        return child._json_dynamic
+    return isinstance(child, _state_type())
+
+
 def coerce_json_value(value: Any) -> Any:
     if value is None:
         return None
@@ -621,6 +1035,17 @@ def coerce_json_value(value: Any) -> Any:
         return {str(key): coerce_json_value(val) for key, val in value.items()}
     if isinstance(value, (list, tuple, set)):
         return [coerce_json_value(item) for item in value]
+    if isinstance(value, NumericArray):
+        # Sent as one buffer by the connection writer (``ui.arrays``).
+        return value
+    if is_array_like(value):
+        # Copied: the cached JSON outlives the call and must neither see
+        # later changes nor pin the caller's buffer (``array.array`` cannot
+        # grow while a view of it exists).
+        try:
+            return NumericArray(value, copy=True)
+        except (TypeError, ValueError):
+            return coerce_json_value(value.tolist())
     is_state, state_value = _coerce_state_value(value)
     if is_state:
         return coerce_json_value(state_value)
@@ -755,6 +1180,14 @@ def prepare_control_class(cls: type["Control"]) -> type["Control"]:
         doc_only_fields=cls._butterflyui_doc_only_fields,
         include_doc_only=True,
     )
+    _install_control_fields(cls)
+    cls._butterflyui_prop_index = PropIndex(
+        _control_field_prop_name(cls, name)
+        for name in cls._butterflyui_control_field_order
+        if name in cls._butterflyui_control_fields
+    )
+    # Classes that shadow `meta` with a field of their own keep an eager dict.
+    cls._butterflyui_lazy_meta = inspect.getattr_static(cls, "meta", None) is Control.__dict__["meta"]
     if "__init__" not in cls.__dict__:
         cls.__init__ = _build_declarative_control_init(cls)  # type: ignore[assignment]
         try:
@@ -777,31 +1210,27 @@ def prepare_control_class(cls: type["Control"]) -> type["Control"]:
             pass
         return cls
     signature = inspect.signature(init)
-    param_names = {param.name for param in signature.parameters.values()}
-    has_var_kw = any(
-        param.kind == inspect.Parameter.VAR_KEYWORD
-        for param in signature.parameters.values()
-    )
+    parameters = tuple(signature.parameters.values())
+    param_names = {param.name for param in parameters}
+    has_var_kw = any(param.kind == inspect.Parameter.VAR_KEYWORD for param in parameters)
+    # Everything the wrapper needs per instance is resolved here once.
+    binding = _InitBinding.from_parameters(parameters)
+    backfill = _init_backfill_table(parameters)
+    pops_props = "props" not in param_names
+    pops_style = "style" not in param_names
+    pops_strict = "strict" not in param_names
+    layout_keys = tuple(key for key in _LAYOUT_KEYS if key not in param_names)
 
     @wraps(init)
     def wrapped(self: "Control", *args: Any, **kwargs: Any) -> None:
-        init_args = args
-        init_kwargs = dict(kwargs)
-        extra_props = None
-        if "props" not in param_names:
-            extra_props = kwargs.pop("props", None)
-
-        style = None
-        if "style" not in param_names:
-            style = kwargs.pop("style", None)
-
-        strict = (
-            bool(kwargs.pop("strict", False)) if "strict" not in param_names else False
-        )
+        bound = binding.bind(args, kwargs) if backfill else None
+        extra_props = kwargs.pop("props", None) if pops_props else None
+        style = kwargs.pop("style", None) if pops_style else None
+        strict = bool(kwargs.pop("strict", False)) if pops_strict else False
 
         layout_kwargs: dict[str, Any] = {}
-        for key in _LAYOUT_KEYS:
-            if key in kwargs and key not in param_names:
+        for key in layout_keys:
+            if key in kwargs:
                 layout_kwargs[key] = kwargs.pop(key)
 
         extra_kwargs: dict[str, Any] = {}
@@ -824,41 +1253,14 @@ def prepare_control_class(cls: type["Control"]) -> type["Control"]:
             _merge_props(self.props, extra_kwargs, override=False)
         if layout_kwargs:
             _apply_layout_props(self.props, layout_kwargs)
-        try:
-            bound = signature.bind_partial(self, *init_args, **init_kwargs)
-        except Exception:
-            bound = None
-        if bound is not None:
-            _backfill_bound_init_props(
-                self.props,
-                signature,
-                bound.arguments,
-            )
+        if bound:
+            _backfill_init_props(self.props, backfill, bound)
 
         if strict:
             from .schema import ensure_valid_props
 
             ensure_valid_props(self.control_type, self.props, strict=True)
 
-        try:
-            meta = self.meta if isinstance(self.meta, dict) else {}
-            if meta is not self.meta:
-                self.meta = meta
-            if "source" not in meta:
-                source = _capture_source()
-                if source:
-                    meta["source"] = source
-        except Exception:
-            pass
-
-        try:
-            cls.__signature__ = _build_control_class_signature(cls)
-        except Exception:
-            schema_sig = _build_schema_signature(signature, self.control_type)
-            if schema_sig is not None:
-                wrapped.__signature__ = schema_sig
-        cls._butterflyui_signature_ready = True
-
         try:
             _register_control(self)
         except Exception:
@@ -873,7 +1275,10 @@ def prepare_control_class(cls: type["Control"]) -> type["Control"]:
     try:
         cls.__signature__ = _build_control_class_signature(cls)
     except Exception:
-        pass
+        schema_sig = _build_schema_signature(signature, str(getattr(cls, "control_type", "")))
+        if schema_sig is not None:
+            wrapped.__signature__ = schema_sig
+    cls._butterflyui_signature_ready = True
     return cls
 
 
@@ -892,6 +1297,18 @@ class Control:
     props: dict[str, Any] = field(default_factory=dict)
     children: list["Control"] = field(default_factory=list)
     meta: dict[str, Any] = field(default_factory=dict)
+    # Runtime bookkeeping lives in slots too, so a control whose class
+    # supplies ``control_type`` never materializes an instance ``__dict__``.
+    _parent: "Control | None" = field(init=False, repr=False, compare=False)
+    _json_cache: dict[str, Any] | None = field(init=False, repr=False, compare=False)
+    _embeds_controls: bool = field(init=False, repr=False, compare=False)
+    _dynamic_props: bool = field(init=False, repr=False, compare=False)
+    _json_dynamic: bool = field(init=False, repr=False, compare=False)
+    _dirty_state: DirtyState = field(init=False, repr=False, compare=False)
+    _suspend_dirty_tracking: bool = field(init=False, repr=False, compare=False)
+    _source_meta: dict[str, Any] | None = field(init=False, repr=False, compare=False)
+    _inline_event_handlers: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+    _inline_event_bound_sessions: AbstractSet[str] = field(init=False, repr=False, compare=False)
 
     def __init__(
         self,
@@ -905,20 +1322,39 @@ class Control:
         strict: bool = False,
         **extra_props: Any,
     ) -> None:
+        cls = self.__class__
         resolved_type = control_type
         if not resolved_type:
             resolved_type = getattr(self, "control_type", None)
         if not resolved_type:
-            resolved_type = self.__class__.__name__.lower()
-        self.control_type = str(resolved_type)
+            resolved_type = cls.__name__.lower()
+        resolved_type = str(resolved_type)
+        if getattr(cls, "control_type", None) != resolved_type:
+            self.control_type = resolved_type
         self.control_id = str(control_id) if control_id else new_control_id()
-        self._dirty_state = DirtyState()
+        self._parent = None
+        self._json_cache = None
+        self._embeds_controls = False
+        self._dynamic_props = False
+        self._json_dynamic = False
+        self._dirty_state = DirtyState(index=cls._butterflyui_prop_index)
         self._suspend_dirty_tracking = True
         self.props = DirtyPropsDict(self)
         self.children = DirtyChildrenList(self, children or [])
-        self.meta = dict(meta) if isinstance(meta, Mapping) else {}
-        self._inline_event_handlers: dict[str, Any] = {}
-        self._inline_event_bound_sessions: set[str] = set()
+        self._inline_event_handlers = _NO_INLINE_HANDLERS
+        self._inline_event_bound_sessions = _NO_BOUND_SESSIONS
+        # `meta` is allocated on first access; until then the captured
+        # construction site is kept on its own.
+        self._source_meta = None
+        if (isinstance(meta, Mapping) and meta) or not cls._butterflyui_lazy_meta:
+            self.meta = dict(meta) if isinstance(meta, Mapping) else {}
+            if "source" not in self.meta:
+                source_meta = _capture_source_meta()
+                if source_meta:
+                    self.meta["source"] = source_meta["source"]
+        else:
+            self.meta = None
+            self._source_meta = _capture_source_meta()
 
         if isinstance(props, Mapping):
             _merge_props(
@@ -961,7 +1397,9 @@ class Control:
         name = str(event).strip()
         if not name:
             return
-        self._inline_event_handlers[name] = handler
+        if self._inline_event_handlers is _NO_INLINE_HANDLERS:
+            self._inline_event_handlers = {}
+        self._inline_event_handlers[name] = handler  # type: ignore[index]
 
     def bind_inline_event_handlers(self, session: "ButterflyUISession") -> None:
         if not self._inline_event_handlers:
@@ -971,53 +1409,122 @@ class Control:
             return
         for event, handler in self._inline_event_handlers.items():
             self.on_event(session, event, handler)
+        if not isinstance(self._inline_event_bound_sessions, set):
+            self._inline_event_bound_sessions = set()
         self._inline_event_bound_sessions.add(session_key)
 
     def to_json(self) -> dict[str, Any]:
+        """Serialize the control tree.
+
+        The result is cached until a dirty mark on this control or one of its
+        descendants drops it, so callers must not mutate the returned dict.
+        """
+        cached = self._json_cache
+        if cached is not None:
+            return cached
         merged_children = control_children_from_slots(str(self.control_type), self.props, list(self.children))
+        for child in merged_children:
+            if isinstance(child, Control):
+                child._parent = self
         payload = {
             "id": self.control_id,
             "type": self.control_type,
-            "props": coerce_json_value(self.props),
+            "props": serialize_control_props(self),
             "children": [
                 child
                 for child in (coerce_child_json(c) for c in merged_children)
                 if child is not None
             ],
         }
-        if self.meta:
-            payload["meta"] = coerce_json_value(self.meta)
+        meta = _META_SLOT.__get__(self) if self._butterflyui_lazy_meta else self.meta
+        if meta:
+            payload["meta"] = coerce_json_value(meta)
+        elif meta is None and self._source_meta:
+            # Untouched `meta`: reuse the shared source payload as is.
+            payload["meta"] = self._source_meta
+        self._json_dynamic = self._dynamic_props or any(child_is_dynamic(c) for c in merged_children)
+        if not self._json_dynamic:
+            self._json_cache = payload
         return payload
 
     def to_dict(self) -> dict[str, Any]:
         """Alias for to_json() for compatibility with older control code."""
         return self.to_json()
 
+
     def mark_dirty(self, name: str) -> None:
         if getattr(self, "_suspend_dirty_tracking", False):
             return
-        self._dirty_state.props.add(str(name))
+        self._dirty_state.mark(str(name))
+        self._mark_ancestors_dirty()
 
     def mark_children_dirty(self) -> None:
         if getattr(self, "_suspend_dirty_tracking", False):
             return
         self._dirty_state.children = True
+        self._mark_ancestors_dirty()
 
     def mark_events_dirty(self) -> None:
         if getattr(self, "_suspend_dirty_tracking", False):
             return
         self._dirty_state.events = True
+        self._mark_ancestors_dirty()
+
+    def _mark_ancestors_dirty(self) -> None:
+        # Parents are linked when a control is serialized, so the tree differ
+        # can skip every subtree whose root is still clean and cached JSON is
+        # dropped only along the path to the root.
+        self._json_cache = None
+        parent = self._parent
+        while parent is not None:
+            parent._dirty_state.subtree = True
+            parent._json_cache = None
+            parent = parent._parent
+
+    def _replace_tree_attr(self, name: str, value: Any) -> None:
+        slot = _TREE_ATTR_SLOTS[name]
+        if getattr(self, "_suspend_dirty_tracking", True):
+            slot.__set__(self, value)
+            return
+        # Reassigned containers are wrapped again so later in-place edits keep
+        # marking this control dirty.
+        if name == "props":
+            previous = slot.__get__(self)
+            props = DirtyPropsDict(self, dict(value or {}))
+            slot.__set__(self, props)
+            for key in set(previous) | set(props):
+                self.mark_dirty(key)
+            return
+        children = DirtyChildrenList(self, list(value or []))
+        children.drop_log()
+        reconcile_children(slot.__get__(self), children)
+        slot.__set__(self, children)
+        self.mark_children_dirty()
 
     def clear_dirty(self) -> None:
         self._dirty_state.clear()
+        children = _TREE_ATTR_SLOTS["children"].__get__(self)
+        if isinstance(children, DirtyChildrenList):
+            children.clear_log()
+
+    def collect_patch(self, *, children_ops: bool = False) -> dict[str, Any]:
+        """Return the dirty props of this control as a patch.
 
-    def collect_patch(self) -> dict[str, Any]:
+        Child edits are reported as the full ``children`` list. With
+        ``children_ops=True`` they are reported as ``children_ops`` instead
+        (``insert``, ``remove`` and ``move`` ops in the ``ui.ops`` format)
+        while the children splice log is intact.
+        """
         patch: dict[str, Any] = {}
         for name in sorted(self._dirty_state.props):
             patch[name] = coerce_json_value(self.props.get(name))
         if self._dirty_state.events and "events" not in patch:
             patch["events"] = coerce_json_value(self.props.get("events"))
         if self._dirty_state.children:
+            ops = self._children_splice_ops() if children_ops else None
+            if ops is not None:
+                patch["children_ops"] = ops
+                return patch
             merged_children = control_children_from_slots(
                 str(self.control_type),
                 self.props,
@@ -1030,6 +1537,23 @@ class Control:
             ]
         return patch
 
+    def _children_splice_ops(self) -> list[dict[str, Any]] | None:
+        children = self.children
+        log = children.splice_log() if isinstance(children, DirtyChildrenList) else None
+        if not log or not children:
+            return None
+        parent_id = self.control_id
+        ops: list[dict[str, Any]] = []
+        for op, _, _, child, before in log:
+            before_id = before.control_id if before is not None else None
+            if op == "insert":
+                ops.append({"op": "insert", "parent": parent_id, "before": before_id, "node": child.to_json()})
+            elif op == "remove":
+                ops.append({"op": "remove", "parent": parent_id, "id": child.control_id})
+            else:
+                ops.append({"op": "move", "parent": parent_id, "id": child.control_id, "before": before_id})
+        return ops
+
     def _get(self, key: str, default: Any = None) -> Any:
         return self.props.get(key, default)
 
@@ -1056,81 +1580,6 @@ class Control:
         super(Control, cls).__init_subclass__(**kwargs)
         prepare_control_class(cls)
 
-    def __getattribute__(self, name: str) -> Any:
-        if name.startswith("_") or name in _CONTROL_RUNTIME_ATTRS:
-            return object.__getattribute__(self, name)
-        cls = object.__getattribute__(self, "__class__")
-        field_names = getattr(cls, "_butterflyui_control_fields", ())
-        if name in field_names:
-            try:
-                props = object.__getattribute__(self, "props")
-            except AttributeError:
-                return object.__getattribute__(self, name)
-            prop_name = _control_field_prop_name(cls, name)
-            if prop_name == "child":
-                children = object.__getattribute__(self, "children")
-                if children:
-                    return children[0]
-            if prop_name == "children":
-                return object.__getattribute__(self, "children")
-            if prop_name in props:
-                return props.get(prop_name)
-            default = _control_field_default(cls, name)
-            if default is not _CONTROL_FIELD_DEFAULT_MISSING:
-                return default
-            return None
-        return object.__getattribute__(self, name)
-
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name.startswith("_") or name in _CONTROL_RUNTIME_ATTRS:
-            object.__setattr__(self, name, value)
-            return
-        cls = object.__getattribute__(self, "__class__")
-        field_names = getattr(cls, "_butterflyui_control_fields", ())
-        if name in field_names:
-            try:
-                props = object.__getattribute__(self, "props")
-            except AttributeError:
-                object.__setattr__(self, name, value)
-                return
-            prop_name = _control_field_prop_name(cls, name)
-            if prop_name == "child":
-                children = object.__getattribute__(self, "children")
-                if children:
-                    children[0] = value
-                elif value is None:
-                    props.pop("child", None)
-                else:
-                    children.append(value)
-                return
-            if prop_name == "children":
-                children = object.__getattribute__(self, "children")
-                children.clear()
-                if value is None:
-                    props.pop("children", None)
-                    return
-                if isinstance(value, (list, tuple)):
-                    children.extend(value)
-                else:
-                    children.append(value)
-                return
-            if value is None:
-                props.pop(prop_name, None)
-            else:
-                props[prop_name] = value
-            if prop_name == "events":
-                self.mark_events_dirty()
-            return
-        object.__setattr__(self, name, value)
-
-    def __delattr__(self, name: str) -> None:
-        cls = object.__getattribute__(self, "__class__")
-        field_names = getattr(cls, "_butterflyui_control_fields", ())
-        if name in field_names:
-            self.__setattr__(name, None)
-            return
-        object.__delattr__(self, name)
-
     def patch(self, *, session: "ButterflyUISession | None" = None, **props: Any) -> None:
         """Update props in-place and optionally notify the runtime."""
         if not props:
@@ -1715,6 +2164,43 @@ class Control:
         return self.on_event(session, "select", handler, **kwargs)
 
 
+# `props` and `children` stay dataclass slots; the properties read the slot
+# directly and route assignment through `_replace_tree_attr`.
+_TREE_ATTR_SLOTS = {name: Control.__dict__[name] for name in ("props", "children")}
+
+
+def _tree_attr_property(name: str) -> property:
+    slot = _TREE_ATTR_SLOTS[name]
+
+    def fset(self: Control, value: Any) -> None:
+        self._replace_tree_attr(name, value)
+
+    return property(slot.__get__, fset, slot.__delete__)
+
+
+Control.props = _tree_attr_property("props")  # type: ignore[assignment]
+Control.children = _tree_attr_property("children")  # type: ignore[assignment]
+
+_META_SLOT = Control.__dict__["meta"]
+
+
+def _get_meta(self: Control) -> dict[str, Any]:
+    meta = _META_SLOT.__get__(self)
+    if meta is None:
+        meta = dict(self._source_meta) if self._source_meta else {}
+        _META_SLOT.__set__(self, meta)
+    # The caller may edit the dict in place, so cached JSON cannot be trusted.
+    control: Control | None = self
+    while control is not None:
+        control._json_cache = None
+        control = control._parent
+    return meta
+
+
+Control.meta = property(_get_meta, _META_SLOT.__set__, _META_SLOT.__delete__)  # type: ignore[assignment]
+Control._butterflyui_lazy_meta = True  # type: ignore[attr-defined]
+Control._butterflyui_prop_index = PropIndex()  # type: ignore[attr-defined]
+
 Component = Control
 
 __all__ = ["Control", "Component"]
@@ -0,0 +1,635 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from .children import control_children_from_slots
+from .control import Control, child_is_dynamic, coerce_child_json, serialize_control_props
+from .dirty import DirtyChildrenList
+
+__all__ = [
+    "ItemsPatch",
+    "PropAppend",
+    "TreeDiff",
+    "apply_tree_ops",
+    "count_control_nodes",
+    "diff_control_tree",
+]
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class TreeDiff:
+    """Result of diffing a live control tree against the last sent snapshot.
+
+    ``snapshot`` is the new JSON tree. Subtrees that did not change are the
+    very same dict objects as in the previous snapshot, so callers must treat
+    both snapshots as immutable. ``adopted`` maps ids taken over by keyed
+    controls to the ids those controls were created with.
+    """
+
+    snapshot: dict[str, Any]
+    ops: list[dict[str, Any]] = field(default_factory=list)
+    weight: int = 0
+    size_delta: int = 0
+    inserted: list[dict[str, Any]] = field(default_factory=list)
+    updated: list[dict[str, Any]] = field(default_factory=list)
+    removed_ids: set[str] = field(default_factory=set)
+    touched: list[Control] = field(default_factory=list)
+    inserted_controls: list[Control] = field(default_factory=list)
+    adopted: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not self.ops
+
+
+@dataclass(slots=True)
+class PropAppend:
+    """Pending change of a list prop, sent as an ``append`` op (``ui.append``).
+
+    Drops the last ``replace`` items, appends ``items`` and keeps the last
+    ``limit`` items.
+    """
+
+    items: list[Any]
+    replace: int = 0
+    limit: int | None = None
+
+    def then(self, later: "PropAppend") -> "PropAppend":
+        """One append with the effect of this one followed by ``later``.
+
+        Exact when both keep the same ``limit`` and ``later`` adds at least
+        as many items as it replaces; otherwise items this append would
+        have trimmed from the front may be kept.
+        """
+        dropped = min(later.replace, len(self.items))
+        items = self.items[: len(self.items) - dropped] + later.items
+        limit = later.limit
+        if limit is not None and len(items) > limit:
+            items = items[len(items) - limit :]
+        return PropAppend(items, self.replace + later.replace - dropped, limit)
+
+    def apply(self, values: list[Any]) -> list[Any]:
+        """Apply this append to ``values`` in place and return it."""
+        if self.replace:
+            del values[max(0, len(values) - self.replace) :]
+        values.extend(self.items)
+        if self.limit is not None and len(values) > self.limit:
+            del values[: len(values) - self.limit]
+        return values
+
+    def to_op(self, control_id: str, prop: str) -> dict[str, Any]:
+        op: dict[str, Any] = {"op": "append", "id": control_id, "prop": prop, "items": self.items}
+        if self.replace:
+            op["replace"] = self.replace
+        if self.limit is not None:
+            op["limit"] = self.limit
+        return op
+
+
+@dataclass(slots=True)
+class ItemsPatch:
+    """Pending changes to a list prop of dicts keyed by ``id`` (``ui.items``).
+
+    Sent as an ``items`` op. The runtime removes the ``remove`` ids, then
+    replaces the items of ``add`` in place (or appends new ones), merges
+    ``update`` into items and appends the ``extend`` values to list fields
+    of items. The methods record one change each so that the patch has
+    the effect of the calls made in order.
+    """
+
+    add: dict[str, dict[str, Any]] = field(default_factory=dict)
+    update: dict[str, dict[str, Any]] = field(default_factory=dict)
+    remove: dict[str, None] = field(default_factory=dict)
+    extend: dict[str, dict[str, list[Any]]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.add or self.update or self.remove or self.extend)
+
+    def add_item(self, item: Mapping[str, Any]) -> None:
+        item_id = str(item["id"])
+        self.update.pop(item_id, None)
+        self.extend.pop(item_id, None)
+        self.add[item_id] = _own(item)
+
+    def update_item(self, item_id: str, changes: Mapping[str, Any]) -> None:
+        item_id = str(item_id)
+        added = self.add.get(item_id)
+        if added is not None:
+            added.update(_own(changes))
+            return
+        if item_id in self.remove:
+            return
+        fields = self.extend.get(item_id)
+        if fields is not None:
+            for key in changes:
+                fields.pop(key, None)
+        self.update.setdefault(item_id, {}).update(_own(changes))
+
+    def remove_item(self, item_id: str) -> None:
+        item_id = str(item_id)
+        self.add.pop(item_id, None)
+        self.update.pop(item_id, None)
+        self.extend.pop(item_id, None)
+        self.remove[item_id] = None
+
+    def extend_item(self, item_id: str, key: str, values: Iterable[Any]) -> None:
+        item_id = str(item_id)
+        target = self.add.get(item_id)
+        if target is None:
+            if item_id in self.remove:
+                return
+            target = self.update.get(item_id)
+        if target is not None and (key in target or item_id in self.add):
+            target[key] = [*(target.get(key) or ()), *values]
+            return
+        self.extend.setdefault(item_id, {}).setdefault(key, []).extend(values)
+
+    def merge(self, later: "ItemsPatch") -> "ItemsPatch":
+        """Record the changes of ``later`` after those of this patch."""
+        for item_id in later.remove:
+            self.remove_item(item_id)
+        for item in later.add.values():
+            self.add_item(item)
+        for item_id, changes in later.update.items():
+            self.update_item(item_id, changes)
+        for item_id, fields in later.extend.items():
+            for key, values in fields.items():
+                self.extend_item(item_id, key, values)
+        return self
+
+    def apply(self, items: list[Any]) -> list[Any]:
+        """Apply this patch to ``items`` in place and return it."""
+        if self.remove:
+            items[:] = [item for item in items if not (isinstance(item, Mapping) and str(item.get("id")) in self.remove)]
+        positions = {str(item.get("id")): offset for offset, item in enumerate(items) if isinstance(item, Mapping)}
+        for item_id, item in self.add.items():
+            offset = positions.get(item_id)
+            if offset is None:
+                positions[item_id] = len(items)
+                items.append(dict(item))
+            else:
+                items[offset] = dict(item)
+        for item_id, changes in self.update.items():
+            offset = positions.get(item_id)
+            if offset is not None:
+                items[offset] = {**items[offset], **changes}
+        for item_id, fields in self.extend.items():
+            offset = positions.get(item_id)
+            if offset is not None:
+                item = dict(items[offset])
+                for key, values in fields.items():
+                    item[key] = [*(item.get(key) or ()), *values]
+                items[offset] = item
+        return items
+
+    def to_op(self, control_id: str, prop: str) -> dict[str, Any]:
+        op: dict[str, Any] = {"op": "items", "id": control_id, "prop": prop}
+        if self.remove:
+            op["remove"] = list(self.remove)
+        if self.add:
+            op["add"] = list(self.add.values())
+        if self.update:
+            op["update"] = [{"id": item_id, **changes} for item_id, changes in self.update.items()]
+        if self.extend:
+            op["extend"] = [{"id": item_id, **fields} for item_id, fields in self.extend.items() if fields]
+        return op
+
+    @classmethod
+    def from_op(cls, op: Mapping[str, Any]) -> "ItemsPatch":
+        patch = cls()
+        patch.remove = dict.fromkeys(str(item_id) for item_id in op.get("remove") or ())
+        patch.add = {str(item["id"]): dict(item) for item in op.get("add") or ()}
+        for item in op.get("update") or ():
+            patch.update[str(item["id"])] = {key: value for key, value in item.items() if key != "id"}
+        for item in op.get("extend") or ():
+            patch.extend[str(item["id"])] = {key: list(value) for key, value in item.items() if key != "id"}
+        return patch
+
+
+def _own(item: Mapping[str, Any]) -> dict[str, Any]:
+    # List fields are copied: extending them must not touch the caller's lists.
+    return {key: list(value) if isinstance(value, list) else value for key, value in item.items()}
+
+
+def diff_control_tree(control: Control, previous: Mapping[str, Any] | None) -> TreeDiff | None:
+    """Diff ``control`` against ``previous`` and return keyed tree ops.
+
+    Returns ``None`` when the trees cannot be diffed (no previous snapshot or
+    a different root id); callers should send the full tree in that case.
+    Nodes whose ``DirtyState`` is clean are reused from ``previous`` without
+    being walked, unless they hold a ``State`` somewhere below them. Every
+    visited node has its dirty state cleared and its JSON cache refreshed.
+    """
+    if not isinstance(control, Control) or not isinstance(previous, Mapping):
+        return None
+    if previous.get("id") != control.control_id or previous.get("type") != control.control_type:
+        return None
+    diff = TreeDiff(snapshot={})
+    diff.snapshot = _diff_node(control, previous, diff)
+    if diff.removed_ids:
+        for node in diff.inserted:
+            for nested in _iter_nodes(node):
+                diff.removed_ids.discard(str(nested.get("id")))
+    return diff
+
+
+def _diff_node(control: Control, old: Mapping[str, Any], diff: TreeDiff) -> dict[str, Any]:
+    state = control._dirty_state
+    if state.clean and not control._json_dynamic:
+        return old  # type: ignore[return-value]
+
+    diff.touched.append(control)
+    adopted = state.adopted is not None
+    if adopted:
+        # A keyed control that took over this id. The reconciler marked the
+        # props that differ from its predecessor's; its children are new.
+        diff.adopted[control.control_id] = state.adopted  # type: ignore[assignment]
+    own_props_dirty = bool(state.mask) or state.events or control._dynamic_props
+    old_props = old.get("props")
+    if not isinstance(old_props, Mapping):
+        old_props = {}
+    if own_props_dirty or control._embeds_controls:
+        new_props = serialize_control_props(control)
+        changed, removed = _diff_props(old_props, new_props)
+    else:
+        new_props = old_props
+        changed, removed = {}, []
+
+    old_children = old.get("children")
+    if not isinstance(old_children, list):
+        old_children = []
+    dynamic_children = False
+    if (
+        state.children
+        or state.subtree
+        or own_props_dirty
+        or control._json_dynamic
+        or (adopted and (old_children or control.children))
+    ):
+        new_children, dynamic_children = _diff_children(control, old_children, diff)
+    else:
+        new_children = old_children
+
+    control.clear_dirty()
+    control._json_dynamic = control._dynamic_props or dynamic_children
+    if not changed and not removed and new_children is old_children:
+        if not control._json_dynamic:
+            control._json_cache = old  # type: ignore[assignment]
+        return old  # type: ignore[return-value]
+
+    node = dict(old)
+    node["props"] = new_props
+    node["children"] = new_children
+    if changed or removed:
+        op: dict[str, Any] = {"op": "props", "id": control.control_id, "props": changed}
+        if removed:
+            op["remove"] = removed
+        diff.ops.append(op)
+        diff.weight += 1
+        diff.updated.append(node)
+    if not control._json_dynamic:
+        control._json_cache = node
+    return node
+
+
+def _diff_props(
+    old_props: Mapping[str, Any], new_props: Mapping[str, Any]
+) -> tuple[dict[str, Any], list[str]]:
+    changed: dict[str, Any] = {}
+    for key, value in new_props.items():
+        if old_props.get(key, _MISSING) != value:
+            changed[key] = value
+    removed = [key for key in old_props if key not in new_props]
+    return changed, removed
+
+
+def _diff_children(
+    control: Control,
+    old_children: list[Any],
+    diff: TreeDiff,
+) -> tuple[list[Any], bool]:
+    spliced = _splice_children(control, old_children, diff)
+    if spliced is not None:
+        return spliced
+    merged = control_children_from_slots(str(control.control_type), control.props, list(control.children))
+    parent_id = control.control_id
+
+    old_by_id: dict[str, Mapping[str, Any]] = {}
+    old_ids: list[str] = []
+    for child in old_children:
+        if not isinstance(child, Mapping) or child.get("id") is None:
+            return _replace_children(control, old_children, merged, diff)
+        child_id = str(child["id"])
+        old_by_id[child_id] = child
+        old_ids.append(child_id)
+
+    new_children: list[Any] = []
+    new_ids: list[str] = []
+    seen: set[str] = set()
+    fresh: set[str] = set()
+    dynamic = False
+    for child in merged:
+        if isinstance(child, Control):
+            child._parent = control
+            previous = old_by_id.get(child.control_id)
+            if previous is not None and previous.get("type") == child.control_type:
+                node = _diff_node(child, previous, diff)
+            else:
+                node = child.to_json()
+                fresh.add(child.control_id)
+                diff.inserted_controls.append(child)
+            dynamic = dynamic or child._json_dynamic
+        else:
+            dynamic = dynamic or child_is_dynamic(child)
+            node = coerce_child_json(child)
+            if node is None:
+                continue
+            previous = old_by_id.get(str(node.get("id")))
+            if previous is not None and previous == node:
+                node = previous  # type: ignore[assignment]
+            else:
+                fresh.add(str(node.get("id")))
+        node_id = node.get("id")
+        if node_id is None or str(node_id) in seen:
+            return _replace_children(control, old_children, merged, diff)
+        seen.add(str(node_id))
+        new_children.append(node)
+        new_ids.append(str(node_id))
+
+    if new_ids == old_ids and not fresh:
+        if all(new is old for new, old in zip(new_children, old_children)):
+            return old_children, dynamic
+        return new_children, dynamic
+
+    kept_set = seen - fresh
+    kept = [child_id for child_id in old_ids if child_id in kept_set]
+    for child_id in old_ids:
+        if child_id not in kept_set:
+            _record_removal(old_by_id[child_id], diff)
+            diff.ops.append({"op": "remove", "parent": parent_id, "id": child_id})
+            diff.weight += 1
+
+    old_index = {child_id: index for index, child_id in enumerate(kept)}
+    stable = _stable_ids([child_id for child_id in new_ids if child_id in kept_set], old_index)
+    placement: list[dict[str, Any]] = []
+    before: str | None = None
+    for node, child_id in zip(reversed(new_children), reversed(new_ids)):
+        if child_id in fresh:
+            placement.append({"op": "insert", "parent": parent_id, "before": before, "node": node})
+            size = count_control_nodes(node)
+            diff.weight += size
+            diff.size_delta += size
+            diff.inserted.append(node)
+        elif child_id not in stable:
+            placement.append({"op": "move", "parent": parent_id, "id": child_id, "before": before})
+            diff.weight += 1
+        before = child_id
+    diff.ops.extend(placement)
+    return new_children, dynamic
+
+
+def _splice_children(
+    control: Control,
+    old_children: list[Any],
+    diff: TreeDiff,
+) -> tuple[list[Any], bool] | None:
+    """Replay the children splice log of ``control`` onto ``old_children``.
+
+    Only the logged children are serialized, so appending to a long list
+    costs the same as appending to a short one. Every logged index and
+    sibling is checked against the previous snapshot; ``None`` means the
+    log does not line up (or is missing) and the keyed diff must run.
+    """
+    children = control.children
+    log = children.splice_log() if isinstance(children, DirtyChildrenList) else None
+    if not log or not children:
+        return None
+    delta = 0
+    for entry in log:
+        if entry[0] == "insert":
+            delta += 1
+        elif entry[0] == "remove":
+            delta -= 1
+    if len(old_children) != len(children) - delta:
+        return None
+
+    parent_id = control.control_id
+    nodes = list(old_children)
+    ops: list[dict[str, Any]] = []
+    inserted: list[tuple[Control, dict[str, Any]]] = []
+    removed: list[tuple[Control, Mapping[str, Any]]] = []
+    removed_ids: set[str] = set()
+    live: set[str] = set()
+    for op, index, to, child, before in log:
+        child_id = child.control_id
+        before_id = before.control_id if before is not None else None
+        if op == "remove":
+            if index >= len(nodes) or not _has_id(nodes[index], child_id):
+                return None
+            removed.append((child, nodes.pop(index)))
+            removed_ids.add(child_id)
+            live.discard(child_id)
+            ops.append({"op": "remove", "parent": parent_id, "id": child_id})
+            continue
+        if op == "move":
+            if index >= len(nodes) or not _has_id(nodes[index], child_id):
+                return None
+            node = nodes.pop(index)
+            index = to
+        else:
+            # A child linked to this parent may still be in the list.
+            if child_id in live or (child._parent is control and child_id not in removed_ids):
+                return None
+            node = child.to_json()
+            live.add(child_id)
+        if index > len(nodes) or before_id != (nodes[index].get("id") if index < len(nodes) else None):
+            return None
+        nodes.insert(index, node)
+        if op == "move":
+            ops.append({"op": "move", "parent": parent_id, "id": child_id, "before": before_id})
+        else:
+            inserted.append((child, node))
+            ops.append({"op": "insert", "parent": parent_id, "before": before_id, "node": node})
+    if len(nodes) != len(children):
+        return None
+
+    for child, node in removed:
+        _record_removal(node, diff)
+        if child._parent is control:
+            child._parent = None
+    diff.ops.extend(ops)
+    diff.weight += len(ops) - len(inserted)
+    fresh: set[int] = set()
+    for child, node in inserted:
+        child._parent = control
+        fresh.add(id(child))
+        diff.inserted_controls.append(child)
+        size = count_control_nodes(node)
+        diff.weight += size
+        diff.size_delta += size
+        diff.inserted.append(node)
+
+    if control._dirty_state.subtree or control._json_dynamic:
+        # Kept children that changed themselves still need their own diff.
+        for position, child in enumerate(children):
+            if not isinstance(child, Control) or id(child) in fresh:
+                continue
+            if not child._dirty_state.clean or child._json_dynamic:
+                nodes[position] = _diff_node(child, nodes[position], diff)
+        return nodes, any(child_is_dynamic(child) for child in children)
+    return nodes, any(child._json_dynamic for child, _ in inserted)
+
+
+def _has_id(node: Any, child_id: str) -> bool:
+    return isinstance(node, Mapping) and node.get("id") == child_id
+
+
+def _replace_children(
+    control: Control,
+    old_children: list[Any],
+    merged: list[Any],
+    diff: TreeDiff,
+) -> tuple[list[Any], bool]:
+    children: list[Any] = []
+    for child in merged:
+        if isinstance(child, Control):
+            child._parent = control
+            diff.inserted_controls.append(child)
+        node = coerce_child_json(child)
+        if node is not None:
+            children.append(node)
+    for child in old_children:
+        if isinstance(child, Mapping):
+            _record_removal(child, diff)
+    diff.ops.append({"op": "children", "id": control.control_id, "children": children})
+    for node in children:
+        size = count_control_nodes(node)
+        diff.weight += size
+        diff.size_delta += size
+        diff.inserted.append(node)
+    return children, any(child_is_dynamic(child) for child in merged)
+
+
+def _record_removal(node: Mapping[str, Any], diff: TreeDiff) -> None:
+    for nested in _iter_nodes(node):
+        nested_id = nested.get("id")
+        if nested_id is not None:
+            diff.removed_ids.add(str(nested_id))
+        diff.size_delta -= 1
+
+
+def _stable_ids(sequence: list[str], old_index: Mapping[str, int]) -> set[str]:
+    """Return the ids forming a longest increasing run of old positions."""
+    positions = [old_index[child_id] for child_id in sequence]
+    tails: list[int] = []
+    tail_slots: list[int] = []
+    previous: list[int] = [-1] * len(positions)
+    for index, position in enumerate(positions):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if tails[middle] < position:
+                low = middle + 1
+            else:
+                high = middle
+        if low > 0:
+            previous[index] = tail_slots[low - 1]
+        if low == len(tails):
+            tails.append(position)
+            tail_slots.append(index)
+        else:
+            tails[low] = position
+            tail_slots[low] = index
+    stable: set[str] = set()
+    cursor = tail_slots[-1] if tail_slots else -1
+    while cursor >= 0:
+        stable.add(sequence[cursor])
+        cursor = previous[cursor]
+    return stable
+
+
+def _iter_nodes(node: Any) -> Iterable[Mapping[str, Any]]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, Mapping):
+            continue
+        yield current
+        children = current.get("children")
+        if isinstance(children, list):
+            stack.extend(children)
+
+
+def count_control_nodes(node: Any) -> int:
+    """Count control nodes reachable through ``children`` in a JSON tree."""
+    return sum(1 for _ in _iter_nodes(node))
+
+
+def apply_tree_ops(root: Mapping[str, Any], ops: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+    """Apply tree ops to a deep copy of ``root`` and return the result.
+
+    This is the reference implementation of the ``ui.apply`` ``ops`` contract
+    used by runtimes and fake clients.
+    """
+    import copy
+
+    tree: dict[str, Any] = copy.deepcopy(dict(root))
+    index: dict[str, dict[str, Any]] = {}
+
+    def reindex(node: Any) -> None:
+        for nested in _iter_nodes(node):
+            if nested.get("id") is not None:
+                index[str(nested["id"])] = nested  # type: ignore[assignment]
+
+    def position(children: list[Any], child_id: str | None) -> int:
+        if child_id is None:
+            return len(children)
+        for offset, child in enumerate(children):
+            if isinstance(child, Mapping) and str(child.get("id")) == child_id:
+                return offset
+        raise KeyError(child_id)
+
+    reindex(tree)
+    for op in ops:
+        kind = op.get("op")
+        if kind == "props":
+            node = index[str(op["id"])]
+            props = dict(node.get("props") or {})
+            props.update(op.get("props") or {})
+            for key in op.get("remove") or ():
+                props.pop(key, None)
+            node["props"] = props
+        elif kind == "children":
+            node = index[str(op["id"])]
+            node["children"] = copy.deepcopy(list(op.get("children") or []))
+            reindex(node)
+        elif kind == "append":
+            node = index[str(op["id"])]
+            props = dict(node.get("props") or {})
+            append = PropAppend(list(op.get("items") or []), int(op.get("replace") or 0), op.get("limit"))
+            props[op["prop"]] = append.apply(list(props.get(op["prop"]) or []))
+            node["props"] = props
+        elif kind == "items":
+            node = index[str(op["id"])]
+            props = dict(node.get("props") or {})
+            props[op["prop"]] = ItemsPatch.from_op(op).apply(list(props.get(op["prop"]) or []))
+            node["props"] = props
+        elif kind in ("insert", "move", "remove"):
+            parent = index[str(op["parent"])]
+            children = parent.setdefault("children", [])
+            if kind == "remove":
+                del children[position(children, str(op["id"]))]
+                continue
+            if kind == "insert":
+                child = copy.deepcopy(dict(op["node"]))
+                reindex(child)
+            else:
+                child = children.pop(position(children, str(op["id"])))
+            children.insert(position(children, op.get("before")), child)
+        else:
+            raise ValueError(f"unknown tree op: {kind!r}")
+    return tree
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, Iterable
 
 __all__ = [
+    "PropIndex",
     "DirtyState",
     "DirtyTrackingMixin",
     "DirtyPropsDict",
@@ -11,16 +12,76 @@ __all__ = [
 ]
 
 
+class PropIndex:
+    """Shared prop name <-> bit table for the dirty masks of one control class.
+
+    Bits are handed out on first use, so a class's declared props get the
+    low bits and ad-hoc props are appended as they show up.
+    """
+
+    __slots__ = ("_bits", "_names")
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._bits: dict[str, int] = {}
+        self._names: list[str] = []
+        for name in names:
+            self.bit(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def bit(self, name: str) -> int:
+        bit = self._bits.get(name)
+        if bit is None:
+            bit = self._bits[name] = 1 << len(self._names)
+            self._names.append(name)
+        return bit
+
+    def names(self, mask: int) -> list[str]:
+        names = self._names
+        found: list[str] = []
+        while mask:
+            low = mask & -mask
+            found.append(names[low.bit_length() - 1])
+            mask ^= low
+        return found
+
+
+_SHARED_PROP_INDEX = PropIndex()
+
+
 @dataclass(slots=True)
 class DirtyState:
-    props: set[str] = field(default_factory=set)
+    """Dirty flags of one control; dirty props are a bitmask over ``index``.
+
+    ``adopted`` holds the original id of a control that took over the id of
+    a keyed predecessor (see ``reconcile_children``) until it is diffed.
+    """
+
+    mask: int = 0
     children: bool = False
     events: bool = False
+    subtree: bool = False
+    adopted: str | None = None
+    index: PropIndex = field(default=_SHARED_PROP_INDEX, repr=False, compare=False)
+
+    def mark(self, name: str) -> None:
+        self.mask |= self.index.bit(name)
+
+    @property
+    def props(self) -> set[str]:
+        return set(self.index.names(self.mask)) if self.mask else set()
 
     def clear(self) -> None:
-        self.props.clear()
+        self.mask = 0
         self.children = False
         self.events = False
+        self.subtree = False
+        self.adopted = None
+
+    @property
+    def clean(self) -> bool:
+        return not (self.mask or self.children or self.events or self.subtree) and self.adopted is None
 
 
 class DirtyTrackingMixin:
@@ -32,7 +93,7 @@ class DirtyTrackingMixin:
             return
         if not hasattr(self, "_dirty_state"):
             self._dirty_state = DirtyState()
-        self._dirty_state.props.add(str(name))
+        self._dirty_state.mark(str(name))
 
     def mark_children_dirty(self) -> None:
         if getattr(self, "_suspend_dirty_tracking", False):
@@ -57,10 +118,19 @@ class DirtyTrackingMixin:
         if not hasattr(self, "_dirty_state"):
             self._dirty_state = DirtyState()
         state = self._dirty_state
-        return DirtyState(props=set(state.props), children=state.children, events=state.events)
+        return DirtyState(
+            mask=state.mask,
+            children=state.children,
+            events=state.events,
+            subtree=state.subtree,
+            adopted=state.adopted,
+            index=state.index,
+        )
 
 
 class DirtyPropsDict(dict[str, Any]):
+    __slots__ = ("_owner",)
+
     def __init__(self, owner: DirtyTrackingMixin, values: dict[str, Any] | None = None) -> None:
         self._owner = owner
         super().__init__()
@@ -123,43 +193,169 @@ class DirtyPropsDict(dict[str, Any]):
             self._mark(changed)
 
 
+# A dropped splice log: the next diff compares the children by id instead.
+_LOG_DROPPED: tuple[Any, ...] = ()
+
+
+def _is_control(value: Any) -> bool:
+    return isinstance(getattr(value, "control_id", None), str)
+
+
 class DirtyChildrenList(list[Any]):
+    """Children list that marks its owner dirty and logs splices.
+
+    Every edit is also recorded as ``(op, index, to, child, before)`` entries
+    (``insert``, ``remove`` or ``move``; ``before`` is the sibling the child
+    ends up in front of), so the tree differ and ``collect_patch`` can send
+    only the children that changed. ``splice_log()`` returns ``None`` once the
+    log is longer than the list, after an edit with no splice form
+    (``sort``, ``reverse``, stepped slices) or when a non-control child is
+    involved.
+    """
+
+    __slots__ = ("_owner", "_log")
+
     def __init__(self, owner: DirtyTrackingMixin, values: Iterable[Any] | None = None) -> None:
         self._owner = owner
+        self._log: list[tuple[str, int, int, Any, Any]] | tuple[Any, ...] | None = None
         super().__init__(values or [])
 
     def _mark(self) -> None:
         self._owner.mark_children_dirty()
 
+    def splice_log(self) -> list[tuple[str, int, int, Any, Any]] | None:
+        """Return the splices since the last ``clear_log()``, or ``None`` if dropped."""
+        log = self._log
+        if log is _LOG_DROPPED:
+            return None
+        return log if log is not None else []
+
+    def clear_log(self) -> None:
+        self._log = None
+
+    def drop_log(self) -> None:
+        self._log = _LOG_DROPPED
+
+    def _record(self, op: str, index: int, to: int, child: Any, before: Any) -> None:
+        log = self._log
+        if log is _LOG_DROPPED:
+            return
+        if not _is_control(child) or (before is not None and not _is_control(before)):
+            self._log = _LOG_DROPPED
+            return
+        if log is None:
+            log = self._log = []
+        log.append((op, index, to, child, before))  # type: ignore[union-attr]
+        if len(log) > len(self):
+            self._log = _LOG_DROPPED
+
+    def _sibling(self, index: int) -> Any:
+        return self[index] if index < len(self) else None
+
     def __setitem__(self, index, value) -> None:  # type: ignore[override]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                super().__setitem__(index, value)
+                self.drop_log()
+                self._mark()
+                return
+            from .reconcile import reconcile_children
+
+            values = list(value)
+            stop = max(start, stop)
+            removed = super().__getitem__(slice(start, stop))
+            super().__setitem__(slice(start, stop), values)
+            if reconcile_children(removed, values):
+                # Adopted ids come back as moves, which only the keyed diff finds.
+                self.drop_log()
+                self._mark()
+                return
+            before = self._sibling(start + len(values))
+            for child in removed:
+                self._record("remove", start, start, child, None)
+            for offset, child in enumerate(values):
+                self._record("insert", start + offset, start + offset, child, before)
+            self._mark()
+            return
+        position = index + len(self) if index < 0 else index
+        removed = self[position]
         super().__setitem__(index, value)
+        self._record("remove", position, position, removed, None)
+        self._record("insert", position, position, value, self._sibling(position + 1))
         self._mark()
 
     def __delitem__(self, index) -> None:  # type: ignore[override]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            removed = super().__getitem__(index)
+            super().__delitem__(index)
+            if step != 1:
+                self.drop_log()
+            else:
+                for child in removed:
+                    self._record("remove", start, start, child, None)
+            self._mark()
+            return
+        position = index + len(self) if index < 0 else index
+        removed = self[position]
         super().__delitem__(index)
+        self._record("remove", position, position, removed, None)
         self._mark()
 
+    def __iadd__(self, values: Iterable[Any]) -> "DirtyChildrenList":  # type: ignore[override]
+        self.extend(values)
+        return self
+
+    def __imul__(self, count: int) -> "DirtyChildrenList":  # type: ignore[override]
+        super().__imul__(count)
+        self.drop_log()
+        self._mark()
+        return self
+
     def append(self, value: Any) -> None:  # type: ignore[override]
         super().append(value)
+        self._record("insert", len(self) - 1, len(self) - 1, value, None)
         self._mark()
 
     def extend(self, values: Iterable[Any]) -> None:  # type: ignore[override]
         values = list(values)
         if not values:
             return
+        start = len(self)
         super().extend(values)
+        for offset, child in enumerate(values):
+            self._record("insert", start + offset, start + offset, child, None)
         self._mark()
 
     def insert(self, index: int, value: Any) -> None:  # type: ignore[override]
-        super().insert(index, value)
+        size = len(self)
+        position = max(0, size + index) if index < 0 else min(index, size)
+        super().insert(position, value)
+        self._record("insert", position, position, value, self._sibling(position + 1))
+        self._mark()
+
+    def move(self, index: int, to: int) -> None:
+        """Move the child at ``index`` so it ends up at position ``to``."""
+        position = index + len(self) if index < 0 else index
+        child = super().pop(index)
+        size = len(self)
+        target = max(0, size + to + 1) if to < 0 else min(to, size)
+        super().insert(target, child)
+        self._record("move", position, target, child, self._sibling(target + 1))
         self._mark()
 
     def remove(self, value: Any) -> None:  # type: ignore[override]
-        super().remove(value)
+        position = self.index(value)
+        removed = self[position]
+        super().__delitem__(position)
+        self._record("remove", position, position, removed, None)
         self._mark()
 
     def pop(self, index: int = -1) -> Any:  # type: ignore[override]
         value = super().pop(index)
+        position = index + len(self) + 1 if index < 0 else index
+        self._record("remove", position, position, value, None)
         self._mark()
         return value
 
@@ -167,12 +363,15 @@ class DirtyChildrenList(list[Any]):
         if not self:
             return
         super().clear()
+        self.drop_log()
         self._mark()
 
     def reverse(self) -> None:  # type: ignore[override]
         super().reverse()
+        self.drop_log()
         self._mark()
 
     def sort(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[override]
         super().sort(*args, **kwargs)
+        self.drop_log()
         self._mark()
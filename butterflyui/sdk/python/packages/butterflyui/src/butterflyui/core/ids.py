@@ -1,9 +1,33 @@
 from __future__ import annotations
 
-import uuid
+import itertools
 
-__all__ = ["new_control_id"]
+__all__ = ["encode_base62", "new_control_id"]
+
+_BASE62 = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# ``next()`` on ``itertools.count`` is atomic under the GIL, so ids stay
+# unique across threads without a lock.
+_NEXT_ID = itertools.count(1)
+
+
+def encode_base62(value: int) -> str:
+    if value < 0:
+        raise ValueError("value must be non-negative")
+    if value < 62:
+        return _BASE62[value]
+    digits: list[str] = []
+    while value:
+        value, digit = divmod(value, 62)
+        digits.append(_BASE62[digit])
+    return "".join(reversed(digits))
 
 
 def new_control_id() -> str:
-    return uuid.uuid4().hex
+    """Return the next control id of this process.
+
+    Ids are ``_`` plus a base-62 counter (``_1``, ``_a``, ``_10``, ...), so
+    they stay 2-5 characters for any realistic app. The underscore keeps them
+    apart from ids an app passes as ``control_id``.
+    """
+    return "_" + encode_base62(next(_NEXT_ID))
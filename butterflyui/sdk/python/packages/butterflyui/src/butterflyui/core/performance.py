@@ -1,8 +1,20 @@
 """Performance configuration for 60 FPS optimization in Python SDK."""
 
+import os
 import time
 from typing import Optional, Dict, Any
 
+_FALSE_VALUES = {"0", "false", "no", "off"}
+_PRODUCTION_MODES = {"prod", "production"}
+
+
+def _source_capture_from_env() -> bool:
+    raw = os.environ.get("BUTTERFLYUI_SOURCE_CAPTURE", "").strip().lower()
+    if raw:
+        return raw not in _FALSE_VALUES
+    mode = os.environ.get("BUTTERFLYUI_MODE", "").strip().lower()
+    return mode not in _PRODUCTION_MODES
+
 class PerformanceConfig:
     """Performance configuration for 60 FPS optimization."""
     
@@ -13,6 +25,7 @@ class PerformanceConfig:
     _frame_count = 0
     _last_fps_update = 0.0
     _initialized = False
+    _source_capture: Optional[bool] = None
     
     @classmethod
     def initialize(cls) -> None:
@@ -76,6 +89,28 @@ class PerformanceConfig:
             "initialized": cls._initialized,
         }
     
+    @classmethod
+    def source_capture_enabled(cls) -> bool:
+        """Return whether controls record their construction site in ``meta``.
+
+        On by default. ``BUTTERFLYUI_MODE=production`` or
+        ``BUTTERFLYUI_SOURCE_CAPTURE=0`` turn it off.
+        """
+        if cls._source_capture is None:
+            cls._source_capture = _source_capture_from_env()
+        return cls._source_capture
+
+    @classmethod
+    def set_source_capture(cls, enabled: Optional[bool]) -> None:
+        """Force source capture on or off; ``None`` re-reads the environment."""
+        cls._source_capture = None if enabled is None else bool(enabled)
+
+    @classmethod
+    def set_production(cls, production: Optional[bool]) -> None:
+        """Apply an app-level production toggle (``None`` keeps the environment)."""
+        if production is not None:
+            cls.set_source_capture(not production)
+
     @classmethod
     def reset(cls) -> None:
         """Reset performance tracking."""
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any, Callable
+
+from .dirty import DirtyChildrenList
+
+__all__ = ["reconcile_children"]
+
+
+def reconcile_children(previous: Iterable[Any], children: Sequence[Any]) -> int:
+    """Let keyed children take over the ids of the children they replace.
+
+    A child whose ``key`` prop matches a previous child of the same type
+    adopts that child's ``control_id``, so the tree differ sends ``move`` and
+    ``props`` ops for it instead of a remove plus insert and the runtime
+    keeps the widget state behind the id. Inside an adopted child, unkeyed
+    children and control-valued props are matched by position and type as
+    well. Controls that stay in the list keep their ids.
+
+    Returns the number of controls that adopted an id.
+    """
+    from .control import Control, _register_control
+
+    return _Reconciler(Control, _register_control).children(previous, children, False)
+
+
+class _Reconciler:
+    __slots__ = ("_control", "_register")
+
+    def __init__(self, control: type, register: Callable[[Any], None]) -> None:
+        self._control = control
+        self._register = register
+
+    def children(self, previous: Iterable[Any], children: Sequence[Any], by_position: bool) -> int:
+        control = self._control
+        current = {id(child) for child in children}
+        keyed: dict[tuple[str, str], list[Any]] = {}
+        unkeyed: list[Any] = []
+        for old in previous:
+            if not isinstance(old, control) or id(old) in current:
+                continue
+            key = old.props.get("key")
+            if key is not None:
+                keyed.setdefault((old.control_type, str(key)), []).append(old)
+            elif by_position:
+                unkeyed.append(old)
+        if not keyed and not unkeyed:
+            return 0
+
+        adopted = 0
+        position = 0
+        for child in children:
+            if not isinstance(child, control):
+                continue
+            key = child.props.get("key")
+            if key is not None:
+                matches = keyed.get((child.control_type, str(key)))
+                if matches:
+                    adopted += self.adopt(matches.pop(0), child)
+            elif by_position:
+                if position < len(unkeyed) and unkeyed[position].control_type == child.control_type:
+                    adopted += self.adopt(unkeyed[position], child)
+                position += 1
+        return adopted
+
+    def adopt(self, old: Any, new: Any) -> int:
+        adopted = 0
+        if new.control_id != old.control_id:
+            state = new._dirty_state
+            if state.adopted is None:
+                state.adopted = new.control_id
+            old_state = old._dirty_state
+            if (
+                old_state.mask
+                or old_state.events
+                or old._dynamic_props
+                or new._dynamic_props
+                or new.props != old.props
+            ):
+                # Only props that may differ from what was sent get compared.
+                for name in set(old.props) | set(new.props):
+                    state.mark(name)
+            new.control_id = old.control_id
+            new._json_cache = None
+            self._register(new)
+            adopted = 1
+        children = new.children
+        if children and old.children:
+            adopted += self.children(old.children, children, True)
+        if adopted and isinstance(children, DirtyChildrenList):
+            # The log was written against the new children, not the sent ones.
+            children.drop_log()
+        control = self._control
+        for name, value in new.props.items():
+            previous = old.props.get(name)
+            if (
+                isinstance(value, control)
+                and isinstance(previous, control)
+                and previous is not value
+                and previous.control_type == value.control_type
+                and previous.props.get("key") == value.props.get("key")
+            ):
+                adopted += self.adopt(previous, value)
+        return adopted
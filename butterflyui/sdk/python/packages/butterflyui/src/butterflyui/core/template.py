@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .control import Control, coerce_control_map, coerce_json_value
+from .ids import encode_base62, new_control_id
+
+__all__ = [
+    "Slot",
+    "Template",
+    "TemplateInstance",
+    "TemplateNode",
+    "expand_template_node",
+]
+
+# Skeleton placeholder for slot ``i``: ``{"$slot": i}``.
+SLOT_KEY = "$slot"
+
+_SLOT_PREFIX = "\x00slot:"
+_NEXT_TEMPLATE = itertools.count(1)
+
+
+class Slot(str):
+    """Placeholder for a per-instance value in a template prototype.
+
+    A ``Slot`` is a marker string, so it passes through constructors that
+    expect text. Use it as a whole prop value (or inside a list or dict
+    prop); it cannot be embedded in a longer string.
+    """
+
+    def __new__(cls, name: str) -> "Slot":
+        return super().__new__(cls, _SLOT_PREFIX + str(name))
+
+    @property
+    def name(self) -> str:
+        return self[len(_SLOT_PREFIX) :]
+
+
+class TemplateNode(dict):
+    """Expanded JSON of one template instance.
+
+    A plain node for every consumer; the connection writer uses
+    ``template`` and ``slot_values`` to send it as an instance reference when the
+    runtime supports ``ui.templates``.
+    """
+
+    __slots__ = ("template", "slot_values")
+
+
+class Template:
+    """A control subtree serialized once and instanced with per-row values.
+
+    Build a prototype whose varying props hold ``Slot`` markers; each
+    instance only stores its values and is expanded by copying the
+    serialized prototype, without building controls.
+
+    ```python
+    row = bui.Template(
+        bui.Row(bui.Text(bui.Slot("name")), bui.Checkbox(value=bui.Slot("done")))
+    )
+    bui.ListView(*row.instances({"name": t.name, "done": t.done} for t in tasks))
+    ```
+
+    Node ids inside an instance are derived from its ``control_id``: the
+    root uses it as is and the ``k``-th node in pre-order gets
+    ``"<control_id>.<k>"`` (see ``TemplateInstance.node_id``). Controls held
+    in props (a ``ListTile``'s ``title``) are nodes too and come before the
+    children of the control holding them. Instances are immutable; replace
+    one to change its values.
+    """
+
+    __slots__ = ("template_id", "slots", "node", "_plan")
+
+    # Number of templates created in this process; the connection writer
+    # skips its walk while this is zero.
+    created = 0
+
+    def __init__(self, prototype: Control | Mapping[str, Any], *, template_id: str | None = None) -> None:
+        if isinstance(prototype, Control):
+            source = prototype.to_json()
+        elif isinstance(prototype, Mapping):
+            source = coerce_control_map(prototype)
+        else:
+            raise TypeError("Template prototype must be a Control or a control map")
+        self.template_id = str(template_id) if template_id else "t" + encode_base62(next(_NEXT_TEMPLATE))
+        slots: dict[str, int] = {}
+        self.node, self._plan = _compile(source, slots)
+        self.slots: tuple[str, ...] = tuple(slots)
+        Template.created += 1
+
+    def __repr__(self) -> str:
+        return f"Template({self.template_id!r}, slots={list(self.slots)!r})"
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the wire form registered with ``ui.templates`` runtimes."""
+        return {"slots": list(self.slots), "node": self.node}
+
+    def instance(self, *, control_id: str | None = None, **values: Any) -> "TemplateInstance":
+        return TemplateInstance(self, self._values(values), control_id=control_id)
+
+    def instances(self, rows: Iterable[Mapping[str, Any]]) -> list["TemplateInstance"]:
+        return [TemplateInstance(self, self._values(row)) for row in rows]
+
+    def _values(self, values: Mapping[str, Any]) -> tuple[Any, ...]:
+        unknown = [name for name in values if name not in self.slots]
+        if unknown:
+            raise ValueError(f"Unknown slot(s) for template {self.template_id}: {', '.join(map(str, unknown))}")
+        return tuple(coerce_json_value(values.get(name)) for name in self.slots)
+
+    def expand(self, control_id: str, values: tuple[Any, ...]) -> TemplateNode:
+        counter = itertools.count()
+        node = _expand_plan(self._plan, control_id, values, counter, TemplateNode)
+        node.template = self  # type: ignore[attr-defined]
+        node.slot_values = values  # type: ignore[attr-defined]
+        return node  # type: ignore[return-value]
+
+
+class TemplateInstance:
+    """One row of a ``Template``; usable anywhere a child control is."""
+
+    __slots__ = ("template", "values", "control_id", "_parent", "_node")
+
+    # Mirrors `Control._json_dynamic` for the tree differ.
+    _json_dynamic = False
+
+    def __init__(self, template: Template, values: tuple[Any, ...], *, control_id: str | None = None) -> None:
+        self.template = template
+        self.values = values
+        self.control_id = str(control_id) if control_id else new_control_id()
+        self._parent: Control | None = None
+        self._node: TemplateNode | None = None
+
+    def __repr__(self) -> str:
+        return f"TemplateInstance({self.template.template_id!r}, control_id={self.control_id!r})"
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[self.template.slots.index(name)]
+
+    def node_id(self, index: int) -> str:
+        """Id of the ``index``-th node of this instance in pre-order."""
+        return self.control_id if index == 0 else f"{self.control_id}.{index}"
+
+    def to_json(self) -> TemplateNode:
+        node = self._node
+        if node is None:
+            node = self._node = self.template.expand(self.control_id, self.values)
+        return node
+
+
+def expand_template_node(template: Mapping[str, Any], control_id: str, values: list[Any]) -> dict[str, Any]:
+    """Expand the wire form of a template (``Template.to_json()``).
+
+    Reference implementation of the runtime side of ``ui.templates``.
+    """
+    return _expand_node(template["node"], control_id, values, itertools.count())
+
+
+def _expand_node(
+    node: Mapping[str, Any],
+    control_id: str,
+    values: list[Any] | tuple[Any, ...],
+    counter: "itertools.count[int]",
+) -> dict[str, Any]:
+    index = next(counter)
+    out = dict(node)
+    out["id"] = control_id if index == 0 else f"{control_id}.{index}"
+    if "props" in out:
+        out["props"] = _fill(out["props"], values, control_id, counter)
+    children = out.get("children")
+    if isinstance(children, list):
+        out["children"] = [_expand_node(child, control_id, values, counter) for child in children]
+    return out
+
+
+def _is_control_map(value: Any) -> bool:
+    return isinstance(value, Mapping) and "type" in value and "id" in value and "props" in value
+
+
+def _fill(
+    value: Any,
+    values: list[Any] | tuple[Any, ...],
+    control_id: str,
+    counter: "itertools.count[int]",
+) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and SLOT_KEY in value:
+            return values[value[SLOT_KEY]]
+        if _is_control_map(value):
+            return _expand_node(value, control_id, values, counter)
+        return {key: _fill(item, values, control_id, counter) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, values, control_id, counter) for item in value]
+    return value
+
+
+def _compile(node: Mapping[str, Any], slots: dict[str, int]) -> tuple[dict[str, Any], tuple[Any, ...]]:
+    """Return the wire skeleton of ``node`` and its expansion plan.
+
+    A plan is ``(skeleton, props_template | None, child_plans)``; the props
+    template is only kept for nodes whose props hold a slot or a control,
+    which needs its own id per instance.
+    """
+    skeleton = dict(node)
+    skeleton["id"] = None
+    props = node.get("props")
+    props_template = None
+    if isinstance(props, Mapping):
+        replaced, dynamic = _mark_slots(props, slots)
+        skeleton["props"] = replaced
+        if dynamic:
+            props_template = replaced
+    child_plans: list[tuple[Any, ...]] = []
+    children = node.get("children")
+    if isinstance(children, list):
+        skeleton_children = []
+        for child in children:
+            if not isinstance(child, Mapping):
+                continue
+            child_skeleton, child_plan = _compile(child, slots)
+            skeleton_children.append(child_skeleton)
+            child_plans.append(child_plan)
+        skeleton["children"] = skeleton_children
+    return skeleton, (skeleton, props_template, tuple(child_plans))
+
+
+def _mark_slots(value: Any, slots: dict[str, int]) -> tuple[Any, bool]:
+    if isinstance(value, str) and value.startswith(_SLOT_PREFIX):
+        name = value[len(_SLOT_PREFIX) :]
+        index = slots.setdefault(name, len(slots))
+        return {SLOT_KEY: index}, True
+    if _is_control_map(value):
+        return _compile(value, slots)[0], True
+    if isinstance(value, Mapping):
+        out: dict[str, Any] = {}
+        found = False
+        for key, item in value.items():
+            out[key], marked = _mark_slots(item, slots)
+            found = found or marked
+        return out, found
+    if isinstance(value, (list, tuple)):
+        items = []
+        found = False
+        for item in value:
+            marked_item, marked = _mark_slots(item, slots)
+            items.append(marked_item)
+            found = found or marked
+        return items, found
+    return value, False
+
+
+def _expand_plan(
+    plan: tuple[Any, ...],
+    control_id: str,
+    values: tuple[Any, ...],
+    counter: "itertools.count[int]",
+    node_type: type[dict[str, Any]] = dict,
+) -> dict[str, Any]:
+    skeleton, props_template, child_plans = plan
+    index = next(counter)
+    out = node_type(skeleton)
+    out["id"] = control_id if index == 0 else f"{control_id}.{index}"
+    if props_template is not None:
+        out["props"] = _fill(props_template, values, control_id, counter)
+    if child_plans:
+        out["children"] = [_expand_plan(child, control_id, values, counter) for child in child_plans]
+    return out
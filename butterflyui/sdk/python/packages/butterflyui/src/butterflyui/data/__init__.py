@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from .display_list import DisplayList, simplify
+from .grid import GridQuery
+from .provider import DataProvider, DataWindow, RowCache, SequenceProvider
+from .query import Query, QueryPage, QuerySource
+from .series import RingBuffer, TimeSeries, lttb, minmax
+from .sqlite import SqliteSource
+from .table import ColumnTable
+
+__all__ = [
+    "ColumnTable",
+    "DataProvider",
+    "DataWindow",
+    "DisplayList",
+    "GridQuery",
+    "Query",
+    "QueryPage",
+    "QuerySource",
+    "RingBuffer",
+    "RowCache",
+    "SequenceProvider",
+    "SqliteSource",
+    "TimeSeries",
+    "lttb",
+    "minmax",
+    "simplify",
+]
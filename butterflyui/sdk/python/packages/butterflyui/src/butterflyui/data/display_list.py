@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from ..core.control import Control
+from ..core.diff import ItemsPatch
+from ..runtime.protocol.capabilities import UI_ITEMS
+from ..runtime.session import get_current_session
+
+if TYPE_CHECKING:
+    from ..app import ButterflyUISession
+
+__all__ = ["DisplayList", "simplify"]
+
+
+class DisplayList:
+    """Shapes of a `Canvas`, changed by id and sent as keyed ops.
+
+    The shapes stay in the canvas ``shapes`` prop, one dict per shape with
+    an ``id``. Each change is recorded in the session patch buffer, so all
+    the changes of a frame go out as one ``items`` op (``ui.items``) that
+    carries only the shapes that changed. Runtimes without ``ui.items``
+    get the whole list as one props patch per frame.
+
+    Freehand strokes are ``"path"`` shapes whose ``points`` are a flat
+    ``[x0, y0, x1, y1, ...]`` list. With a ``tolerance`` (in pixels),
+    points closer than that to the previous point of a stroke are dropped
+    as they arrive, and strokes are simplified with `simplify` when they
+    are added or ended.
+    """
+
+    def __init__(self, control: Control, *, prop: str = "shapes", tolerance: float = 0.0) -> None:
+        self.control = control
+        self.prop = prop
+        self.tolerance = max(0.0, float(tolerance))
+        self._session: "ButterflyUISession | None" = get_current_session()
+        self._shapes: list[dict[str, Any]] = []
+        self._index: dict[str, dict[str, Any]] = {}
+        self._next_id = 0
+        # Open strokes -> last point dropped by the tolerance filter.
+        self._open: dict[str, tuple[float, float] | None] = {}
+        for shape in control.props.get(prop) or ():
+            if isinstance(shape, Mapping):
+                shape = dict(shape)
+                shape["id"] = self._new_id() if shape.get("id") is None else str(shape["id"])
+                self._shapes.append(shape)
+                self._index[shape["id"]] = shape
+        control.props[prop] = self._shapes
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __contains__(self, shape_id: object) -> bool:
+        return str(shape_id) in self._index
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._shapes)
+
+    def get(self, shape_id: str) -> Mapping[str, Any] | None:
+        return self._index.get(str(shape_id))
+
+    def add(self, shape: Mapping[str, Any]) -> str:
+        """Add ``shape`` (or replace the shape with its ``id``) and return its id."""
+        shape = dict(shape)
+        shape_id = self._new_id() if shape.get("id") is None else str(shape["id"])
+        shape["id"] = shape_id
+        points = shape.get("points")
+        if self.tolerance and isinstance(points, list):
+            shape["points"] = simplify(points, self.tolerance)
+        current = self._index.get(shape_id)
+        if current is None:
+            self._shapes.append(shape)
+        else:
+            self._shapes[_position(self._shapes, current)] = shape
+        self._index[shape_id] = shape
+        patch = ItemsPatch()
+        patch.add_item(shape)
+        self._send(patch)
+        return shape_id
+
+    def update(self, shape_id: str, changes: Mapping[str, Any] | None = None, **fields: Any) -> None:
+        """Change fields of a shape, sending only those fields."""
+        shape = self._index[str(shape_id)]
+        changes = {**(changes or {}), **fields}
+        changes.pop("id", None)
+        if not changes:
+            return
+        shape.update(changes)
+        patch = ItemsPatch()
+        patch.update_item(shape["id"], changes)
+        self._send(patch)
+
+    def remove(self, shape_id: str) -> None:
+        shape = self._index.pop(str(shape_id), None)
+        if shape is None:
+            return
+        del self._shapes[_position(self._shapes, shape)]
+        self._open.pop(shape["id"], None)
+        patch = ItemsPatch()
+        patch.remove_item(shape["id"])
+        self._send(patch)
+
+    def clear(self) -> None:
+        patch = ItemsPatch()
+        for shape_id in self._index:
+            patch.remove_item(shape_id)
+        self._shapes.clear()
+        self._index.clear()
+        self._open.clear()
+        self._send(patch)
+
+    def begin_stroke(self, points: Sequence[float] = (), **style: Any) -> str:
+        """Start a freehand ``"path"`` shape and return its id."""
+        shape_id = self.add({"type": "path", **style, "points": list(points)})
+        self._open[shape_id] = None
+        return shape_id
+
+    def extend_stroke(self, shape_id: str, points: Sequence[float]) -> None:
+        """Append flat ``[x, y, ...]`` points to a stroke, sending only them."""
+        shape = self._index[str(shape_id)]
+        current: list[float] = shape.setdefault("points", [])
+        added = list(points)
+        if self.tolerance and added:
+            added = self._filter(shape["id"], current, added)
+        if not added:
+            return
+        current.extend(added)
+        patch = ItemsPatch()
+        patch.extend_item(shape["id"], "points", added)
+        self._send(patch)
+
+    def end_stroke(self, shape_id: str) -> None:
+        """Finish a stroke; with a tolerance, send its simplified points."""
+        shape_id = str(shape_id)
+        dropped = self._open.pop(shape_id, None)
+        shape = self._index.get(shape_id)
+        if shape is None:
+            return
+        points: list[float] = shape.setdefault("points", [])
+        if dropped is not None:
+            # Keep where the pointer was released.
+            points.extend(dropped)
+            patch = ItemsPatch()
+            patch.extend_item(shape_id, "points", dropped)
+            self._send(patch)
+        if self.tolerance:
+            simplified = simplify(points, self.tolerance)
+            if len(simplified) < len(points):
+                self.update(shape_id, points=simplified)
+
+    def _filter(self, shape_id: str, current: list[float], added: list[float]) -> list[float]:
+        limit = self.tolerance * self.tolerance
+        kept: list[float] = []
+        last_x, last_y = (current[-2], current[-1]) if len(current) >= 2 else (None, None)
+        dropped = self._open.get(shape_id)
+        for offset in range(0, len(added) - 1, 2):
+            x, y = added[offset], added[offset + 1]
+            if last_x is None or (x - last_x) ** 2 + (y - last_y) ** 2 >= limit:
+                kept.extend((x, y))
+                last_x, last_y = x, y
+                dropped = None
+            else:
+                dropped = (x, y)
+        if shape_id in self._open:
+            self._open[shape_id] = dropped
+        return kept
+
+    def _new_id(self) -> str:
+        while True:
+            self._next_id += 1
+            shape_id = f"s{self._next_id}"
+            if shape_id not in self._index:
+                return shape_id
+
+    def _current_session(self) -> "ButterflyUISession | None":
+        return self._session or get_current_session()
+
+    def _send(self, patch: ItemsPatch) -> None:
+        # The shapes list is the control's prop, changed in place.
+        self.control._mark_ancestors_dirty()
+        session = self._current_session()
+        if session is None:
+            return
+        if session.supports(UI_ITEMS):
+            session.patch_items(self.control.control_id, self.prop, patch)
+        else:
+            session.update_props(self.control.control_id, {self.prop: self._shapes})
+
+
+def _position(shapes: list[dict[str, Any]], shape: dict[str, Any]) -> int:
+    for offset, item in enumerate(shapes):
+        if item is shape:
+            return offset
+    raise KeyError(shape.get("id"))
+
+
+def simplify(points: Iterable[float], tolerance: float) -> list[float]:
+    """Simplify a flat ``[x0, y0, x1, y1, ...]`` polyline (Ramer-Douglas-Peucker).
+
+    Keeps the end points and every point farther than ``tolerance`` from
+    the line through the points kept around it.
+    """
+    points = list(points)
+    count = len(points) // 2
+    if count < 3 or tolerance <= 0:
+        return points[: count * 2]
+    xs, ys = points[0 : count * 2 : 2], points[1 : count * 2 : 2]
+    limit = tolerance * tolerance
+    keep = bytearray(count)
+    keep[0] = keep[count - 1] = 1
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = xs[first], ys[first]
+        dx, dy = xs[last] - x1, ys[last] - y1
+        length = dx * dx + dy * dy
+        farthest, distance = -1, limit
+        if length:
+            # Compare squared cross products to skip a division per point.
+            distance *= length
+            for index in range(first + 1, last):
+                cross = dx * (ys[index] - y1) - dy * (xs[index] - x1)
+                cross *= cross
+                if cross > distance:
+                    farthest, distance = index, cross
+        else:
+            for index in range(first + 1, last):
+                far = (xs[index] - x1) ** 2 + (ys[index] - y1) ** 2
+                if far > distance:
+                    farthest, distance = index, far
+        if farthest >= 0:
+            keep[farthest] = 1
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [value for index in range(count) if keep[index] for value in (xs[index], ys[index])]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from ..core.control import Control, coerce_json_value
+from ..runtime.session import get_current_session
+from .query import Query, QueryPage, QuerySource
+
+if TYPE_CHECKING:
+    from ..app import ButterflyUISession
+
+__all__ = ["GridQuery"]
+
+_UNSET: Any = object()
+
+
+class GridQuery:
+    """Answer sort, filter and paging of a grid from a `QuerySource` in Python.
+
+    The grid only receives the rows of the current page. Its
+    ``sort_change`` and ``filter_change`` events (and ``page_change``, or
+    ``change`` of a bound `Pagination`) run a new query. The answer is sent
+    as a props patch that carries only the props that changed. Use
+    `DataGrid.set_query_source` to create one.
+
+    Grid props kept in sync: ``rows``, ``sort_column``, ``sort_ascending``,
+    ``filter_query``, ``page`` (1-based), ``page_size`` and ``total_items``.
+    """
+
+    def __init__(
+        self,
+        source: QuerySource,
+        *,
+        page_size: int = 50,
+        sort_column: str | None = None,
+        sort_ascending: bool = True,
+        filter_query: str = "",
+        filter_column: str | None = None,
+    ) -> None:
+        self.source = source
+        self.page_size = max(1, int(page_size))
+        self.sort_column = sort_column
+        self.sort_ascending = bool(sort_ascending)
+        self.filter_query = str(filter_query or "")
+        self.filter_column = filter_column
+        self.page = 1
+        self.total = 0
+        self.control: Control | None = None
+        self.paginations: list[Control] = []
+        self._request = 0
+        self._task: asyncio.Task[bool] | None = None
+
+    def attach(self, control: Control) -> None:
+        """Answer the grid events of ``control`` from the source.
+
+        With a synchronous source the first page is filled in right away;
+        an async source sends it as a patch once the query completes.
+        """
+        self.control = control
+        control.add_inline_event_handler("sort_change", self._on_sort)
+        control.add_inline_event_handler("filter_change", self._on_filter)
+        control.add_inline_event_handler("page_change", self._on_page)
+        props: dict[str, Any] = self._state_props()
+        if not inspect.iscoroutinefunction(self.source.query):
+            page = self.source.query(self.query())
+            self.total = page.total
+            props.update(rows=coerce_json_value(page.rows), total_items=page.total)
+        control.props.update(props)
+        if inspect.iscoroutinefunction(self.source.query):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._task = loop.create_task(self.refresh(get_current_session()))
+
+    def bind_pagination(self, pagination: Control) -> None:
+        """Drive ``pagination`` from this query and page on its ``change`` events."""
+        self.paginations.append(pagination)
+        pagination.add_inline_event_handler("change", self._on_page)
+        pagination.props.update(page=self.page, page_size=self.page_size, total_items=self.total)
+
+    def query(self) -> Query:
+        return Query(
+            sort_column=self.sort_column,
+            sort_ascending=self.sort_ascending,
+            filter_query=self.filter_query,
+            filter_column=self.filter_column,
+            offset=(self.page - 1) * self.page_size,
+            limit=self.page_size,
+        )
+
+    async def update(
+        self,
+        session: "ButterflyUISession | None" = None,
+        *,
+        sort_column: str | None = _UNSET,
+        sort_ascending: bool = _UNSET,
+        filter_query: str = _UNSET,
+        filter_column: str | None = _UNSET,
+        page: int = _UNSET,
+        page_size: int = _UNSET,
+    ) -> bool:
+        """Change the query and send the new page.
+
+        A new sort or filter goes back to page 1. Returns ``False`` when a
+        newer update superseded this one before the source answered.
+        """
+        reset = False
+        if sort_column is not _UNSET and sort_column != self.sort_column:
+            self.sort_column, reset = sort_column, True
+        if sort_ascending is not _UNSET and bool(sort_ascending) != self.sort_ascending:
+            self.sort_ascending, reset = bool(sort_ascending), True
+        if filter_query is not _UNSET and str(filter_query or "") != self.filter_query:
+            self.filter_query, reset = str(filter_query or ""), True
+        if filter_column is not _UNSET and filter_column != self.filter_column:
+            self.filter_column, reset = filter_column, True
+        if page_size is not _UNSET and max(1, int(page_size)) != self.page_size:
+            self.page_size, reset = max(1, int(page_size)), True
+        if page is not _UNSET:
+            self.page = max(1, int(page))
+        elif reset:
+            self.page = 1
+        return await self.refresh(session)
+
+    async def refresh(self, session: "ButterflyUISession | None" = None) -> bool:
+        """Run the current query again and send the page if it changed."""
+        self._request += 1
+        request = self._request
+        result = self.source.query(self.query())
+        if inspect.isawaitable(result):
+            result = await result
+        if request != self._request:
+            return False
+        page: QueryPage = result
+        last_page = max(1, -(-page.total // self.page_size))
+        if self.page > last_page and page.total:
+            # The filter shrank the result below the current page.
+            self.page = last_page
+            return await self.refresh(session)
+        self.total = page.total
+        props = self._state_props()
+        props.update(rows=coerce_json_value(page.rows), total_items=page.total)
+        session = session or get_current_session()
+        if self.control is not None:
+            _patch_changed(self.control, props, session)
+        for pagination in self.paginations:
+            _patch_changed(pagination, {"page": self.page, "page_size": self.page_size, "total_items": page.total}, session)
+        return True
+
+    async def sort(self, column: str | None, ascending: bool = True) -> bool:
+        return await self.update(sort_column=column, sort_ascending=ascending)
+
+    async def filter(self, query: str, column: str | None = None) -> bool:
+        return await self.update(filter_query=query, filter_column=column)
+
+    async def set_page(self, page: int) -> bool:
+        return await self.update(page=page)
+
+    def _state_props(self) -> dict[str, Any]:
+        return {
+            "sort_column": self.sort_column,
+            "sort_ascending": self.sort_ascending,
+            "filter_query": self.filter_query,
+            "page": self.page,
+            "page_size": self.page_size,
+        }
+
+    async def _on_sort(self, event: dict[str, Any]) -> None:
+        payload = _payload(event)
+        column = payload.get("sort_column", payload.get("column"))
+        ascending = payload.get("sort_ascending", True)
+        await self.update(sort_column=None if column is None else str(column), sort_ascending=bool(ascending))
+
+    async def _on_filter(self, event: dict[str, Any]) -> None:
+        payload = _payload(event)
+        await self.update(filter_query=str(payload.get("filter_query", payload.get("query")) or ""))
+
+    async def _on_page(self, event: dict[str, Any]) -> None:
+        page = _payload(event).get("page")
+        if page is not None:
+            await self.update(page=int(page))
+
+
+def _payload(event: Any) -> Mapping[str, Any]:
+    payload = event.get("payload") if isinstance(event, Mapping) else None
+    return payload if isinstance(payload, Mapping) else {}
+
+
+def _patch_changed(control: Control, props: dict[str, Any], session: "ButterflyUISession | None") -> None:
+    changed = {key: value for key, value in props.items() if control.props.get(key) != value}
+    if not changed:
+        return
+    control.props.update(changed)
+    if session is not None:
+        session.update_props(control.control_id, changed)
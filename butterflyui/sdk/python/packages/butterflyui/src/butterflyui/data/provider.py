@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import inspect
+import math
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+from ..core.control import Control, coerce_child_json, coerce_json_value
+from ..core.template import TemplateInstance
+from ..runtime.protocol.capabilities import UI_WINDOWS
+from ..runtime.session import get_current_session
+
+if TYPE_CHECKING:
+    from ..app import ButterflyUISession
+
+__all__ = ["DataProvider", "DataWindow", "RowCache", "SequenceProvider"]
+
+# Row height the runtime assumes when ``item_extent`` is not set.
+_DEFAULT_ITEM_EXTENT = 72.0
+
+# Rows may serialize to ``None``, so a cache miss needs its own marker.
+_MISSING: Any = object()
+
+
+@runtime_checkable
+class DataProvider(Protocol):
+    """Rows of a windowed list, fetched by index range.
+
+    ``get_range(start, end)`` returns the rows ``start`` to ``end - 1`` and
+    may be a coroutine function. ``len()`` is the total row count.
+    """
+
+    def __len__(self) -> int: ...
+
+    def get_range(self, start: int, end: int) -> Sequence[Any] | Awaitable[Sequence[Any]]: ...
+
+
+class SequenceProvider:
+    """`DataProvider` over any sequence (a list, a ``range``, a mmap view)."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: Sequence[Any]) -> None:
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_range(self, start: int, end: int) -> Sequence[Any]:
+        return self.rows[start:end]
+
+
+class RowCache:
+    """LRU cache of serialized row payloads keyed by row index."""
+
+    __slots__ = ("_rows", "maxsize", "hits", "misses")
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self._rows: OrderedDict[int, Any] = OrderedDict()
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, index: int, default: Any = None) -> Any:
+        """Return the cached row at ``index``, or ``default`` when it is not cached."""
+        row = self._rows.get(index, _MISSING)
+        if row is _MISSING:
+            self.misses += 1
+            return default
+        self._rows.move_to_end(index)
+        self.hits += 1
+        return row
+
+    def put(self, index: int, row: Any) -> None:
+        rows = self._rows
+        rows[index] = row
+        rows.move_to_end(index)
+        while len(rows) > self.maxsize:
+            rows.popitem(last=False)
+
+    def discard(self, start: int = 0, end: int | None = None) -> None:
+        """Drop cached rows in ``[start, end)`` (all rows by default)."""
+        if start <= 0 and end is None:
+            self._rows.clear()
+            return
+        for index in [i for i in self._rows if i >= start and (end is None or i < end)]:
+            del self._rows[index]
+
+
+class DataWindow:
+    """Serve a `VirtualList` or `VirtualGrid` from a `DataProvider`.
+
+    Only the rows around the visible range are fetched, rendered and sent
+    (as the control's ``items``), and their payloads are kept in a
+    `RowCache`, so scrolling costs the same for ten rows as for ten
+    million. Use `VirtualList.set_data_provider` to create one.
+
+    The visible range comes from ``range`` events (``{"start", "end"}``)
+    sent by runtimes that support ``ui.windows``. Other runtimes report
+    ``scroll_end`` metrics and ``prefetch``; the range is derived from
+    ``item_extent`` and the window only grows from row 0, as with paging.
+
+    ``render(row, index)`` turns a row into a control, a template instance
+    or a plain item map; by default rows are sent as they are.
+    """
+
+    def __init__(
+        self,
+        provider: DataProvider,
+        *,
+        render: Callable[[Any, int], Any] | None = None,
+        page_size: int = 50,
+        overscan: int | None = None,
+        cache_size: int = 1000,
+        item_extent: float | None = None,
+        columns: int | None = None,
+    ) -> None:
+        self.provider = provider
+        self.render = render
+        self.page_size = max(1, int(page_size))
+        self.overscan = self.page_size if overscan is None else max(0, int(overscan))
+        self.cache = RowCache(cache_size)
+        self.item_extent = item_extent
+        self.columns = columns
+        self.control: Control | None = None
+        self.start = 0
+        self.end = 0
+        self._request = 0
+
+    def attach(self, control: Control) -> None:
+        """Route the window events of ``control`` to this window.
+
+        With a synchronous provider the first page is filled in right away.
+        """
+        self.control = control
+        for event in ("range", "scroll_end", "prefetch"):
+            control.add_inline_event_handler(event, self._on_event)
+        total = len(self.provider)
+        end = 0
+        items: list[Any] = []
+        if not inspect.iscoroutinefunction(self.provider.get_range):
+            # Async providers are first read on the first event.
+            end = min(total, self.page_size + self.overscan)
+            items = self._store(0, self.provider.get_range(0, end)[:end])
+            if len(items) < end:
+                # The provider shrank after len() was read.
+                end = total = len(items)
+        control.props.update(self._props(0, items, total, windowed=False))
+        self.start, self.end = 0, end
+
+    def visible_range(self, payload: dict[str, Any]) -> tuple[int, int] | None:
+        """Return the visible rows ``[first, last)`` described by an event."""
+        if "start" in payload and "end" in payload:
+            return int(payload["start"]), int(payload["end"])
+        columns = max(1, int(self._prop("columns", 1) or 1))
+        if "pixels" in payload:
+            extent = float(self._prop("item_extent", _DEFAULT_ITEM_EXTENT) or _DEFAULT_ITEM_EXTENT)
+            pixels = max(0.0, float(payload.get("pixels") or 0.0))
+            viewport = float(payload.get("viewport_dimension") or 0.0)
+            first = int(pixels // extent) * columns
+            last = math.ceil((pixels + viewport) / extent) * columns
+            return first, last
+        if "visible_index" in payload:
+            index = int(payload["visible_index"])
+            return index, index + self.page_size
+        return None
+
+    async def show(self, first: int, last: int, session: "ButterflyUISession | None" = None) -> bool:
+        """Send the window around rows ``[first, last)``.
+
+        Returns ``False`` when the current window already covers them or a
+        newer request superseded this one.
+        """
+        session = session or get_current_session()
+        control = self.control
+        if control is None or session is None:
+            return False
+        total = len(self.provider)
+        windowed = session.supports(UI_WINDOWS)
+        first = max(0, min(first, total))
+        last = max(first, min(last, total))
+        margin = self.overscan // 2
+        if (
+            self.start <= max(0, first - margin)
+            and min(total, last + margin) <= self.end
+            and (windowed or self.start == 0)
+        ):
+            return False
+        page = self.page_size
+        start = (max(0, first - self.overscan) // page) * page if windowed else 0
+        end = min(total, math.ceil((last + self.overscan) / page) * page)
+        if not windowed:
+            end = max(end, self.end)
+        self._request += 1
+        request = self._request
+        items = await self.fetch(start, end)
+        if request != self._request:
+            return False
+        if len(items) < end - start:
+            # The provider has no rows past the ones it returned.
+            end = total = start + len(items)
+        self.start, self.end = start, end
+        props = self._props(start, items, total, windowed=windowed)
+        control.props.update(props)
+        session.update_props(control.control_id, props)
+        return True
+
+    async def fetch(self, start: int, end: int) -> list[Any]:
+        """Return the payloads of rows ``[start, end)``, from the cache when possible.
+
+        When the provider returns fewer rows than asked (it shrank after
+        ``len()`` was read), the result stops at the last row it returned and
+        cached rows past it are dropped.
+        """
+        cache = self.cache
+        items: list[Any] = [None] * (end - start)
+        missing: list[int] = []
+        for index in range(start, end):
+            row = cache.get(index, _MISSING)
+            if row is _MISSING:
+                missing.append(index)
+            else:
+                items[index - start] = row
+        # One provider call per contiguous run of misses.
+        run_start = 0
+        while run_start < len(missing):
+            run_end = run_start
+            while run_end + 1 < len(missing) and missing[run_end + 1] == missing[run_end] + 1:
+                run_end += 1
+            lo, hi = missing[run_start], missing[run_end] + 1
+            rows = self.provider.get_range(lo, hi)
+            if inspect.isawaitable(rows):
+                rows = await rows
+            stored = self._store(lo, rows[: hi - lo])
+            items[lo - start : lo - start + len(stored)] = stored
+            if len(stored) < hi - lo:
+                cache.discard(lo + len(stored))
+                del items[lo - start + len(stored) :]
+                break
+            run_start = run_end + 1
+        return items
+
+    async def refresh(self, session: "ButterflyUISession | None" = None) -> bool:
+        """Drop cached rows and resend the current window (after data changes)."""
+        self.cache.discard()
+        first, last = self.start, self.end
+        self.start = self.end = 0
+        return await self.show(first, max(last, first + self.page_size), session)
+
+    def _store(self, start: int, rows: Sequence[Any]) -> list[Any]:
+        render = self.render
+        cache = self.cache
+        out: list[Any] = []
+        for index, row in enumerate(rows, start):
+            if render is not None:
+                row = render(row, index)
+            if isinstance(row, (Control, TemplateInstance)):
+                row = coerce_child_json(row)
+            else:
+                row = coerce_json_value(row)
+            cache.put(index, row)
+            out.append(row)
+        return out
+
+    def _props(self, start: int, items: list[Any], total: int, *, windowed: bool) -> dict[str, Any]:
+        return {
+            "items": items,
+            "window_start": start,
+            "item_count": total,
+            # Drives ``prefetch`` on runtimes without ``ui.windows``.
+            "has_more": not windowed and start + len(items) < total,
+        }
+
+    def _prop(self, name: str, default: Any) -> Any:
+        value = getattr(self, name, None)
+        if value is None and self.control is not None:
+            value = self.control.props.get(name)
+        return default if value is None else value
+
+    async def _on_event(self, event: dict[str, Any]) -> None:
+        payload = event.get("payload") if isinstance(event, dict) else None
+        visible = self.visible_range(payload if isinstance(payload, dict) else {})
+        if visible is not None:
+            await self.show(*visible)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, Protocol, runtime_checkable
+
+__all__ = ["Query", "QueryPage", "QuerySource"]
+
+
+@dataclass(frozen=True, slots=True)
+class Query:
+    """One page request of a grid: sort, filter and the row range."""
+
+    sort_column: str | None = None
+    sort_ascending: bool = True
+    filter_query: str = ""
+    filter_column: str | None = None
+    offset: int = 0
+    limit: int = 50
+
+
+@dataclass(slots=True)
+class QueryPage:
+    """Rows of one page and the number of rows matching the whole query."""
+
+    rows: list[dict[str, Any]]
+    total: int
+
+
+@runtime_checkable
+class QuerySource(Protocol):
+    """Answers grid queries; ``query`` may be a coroutine function."""
+
+    def query(self, query: Query) -> QueryPage | Awaitable[QueryPage]: ...
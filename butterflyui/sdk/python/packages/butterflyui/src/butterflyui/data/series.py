@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from ..core.arrays import NumericArray
+from ..core.control import Control
+from ..core.diff import PropAppend
+from ..runtime.protocol.capabilities import UI_APPEND
+from ..runtime.session import get_current_session
+
+if TYPE_CHECKING:
+    from ..app import ButterflyUISession
+
+__all__ = ["RingBuffer", "TimeSeries", "lttb", "minmax"]
+
+_METHODS = ("minmax", "lttb")
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of floats that overwrites its oldest values.
+
+    Values are addressed by absolute index: the ``n``-th value ever
+    appended has index ``n``, and indexes from ``start`` up to ``count``
+    are still held.
+    """
+
+    __slots__ = ("capacity", "count", "_data")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("RingBuffer capacity must be positive")
+        self.capacity = int(capacity)
+        self.count = 0
+        self._data = array("d", bytes(8 * self.capacity))
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest value held."""
+        return self.count - len(self)
+
+    def append(self, value: float) -> None:
+        self._data[self.count % self.capacity] = value
+        self.count += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        values = values if isinstance(values, array) and values.typecode == "d" else array("d", values)
+        size = len(values)
+        capacity = self.capacity
+        if size > capacity:
+            self.count += size - capacity
+            values = values[size - capacity :]
+            size = capacity
+        position = self.count % capacity
+        head = min(size, capacity - position)
+        self._data[position : position + head] = values[:head]
+        if head < size:
+            self._data[: size - head] = values[head:]
+        self.count += size
+
+    def slice(self, begin: int, end: int) -> array:
+        """Values from absolute index ``begin`` up to ``end``, as a copy."""
+        begin = max(begin, self.start)
+        end = min(end, self.count)
+        if begin >= end:
+            return array("d")
+        capacity = self.capacity
+        first, last = begin % capacity, end % capacity or capacity
+        if first < last:
+            return self._data[first:last]
+        return self._data[first:] + self._data[:last]
+
+    def values(self) -> array:
+        return self.slice(self.start, self.count)
+
+
+class _Binding:
+    __slots__ = (
+        "control",
+        "series",
+        "prop",
+        "session",
+        "shown",
+        "seen",
+        "bucketed",
+        "next_bucket",
+        "provisional",
+        "anchor",
+    )
+
+    def __init__(self, control: Control, series: str, prop: str, session: "ButterflyUISession | None") -> None:
+        self.control = control
+        self.series = series
+        self.prop = prop
+        self.session = session
+        # What the runtime shows, kept in step with the ops sent to it.
+        self.shown: list[float] = []
+        # `RingBuffer.count` when the binding was last flushed.
+        self.seen = 0
+        self.bucketed = False
+        # First bucket whose points were not sent as final yet.
+        self.next_bucket = 0
+        # Number of points at the end of `shown` that the next flush replaces.
+        self.provisional = 0
+        # Last final point, the fixed corner of the next LTTB triangle.
+        self.anchor: tuple[float, float] | None = None
+
+
+class TimeSeries:
+    """Live chart data, with a bounded history per series.
+
+    Each named series keeps its last ``capacity`` values in a `RingBuffer`.
+    Bound charts (see `attach`) are flushed at most once per ``interval``.
+    A flush sends only what changed, as an ``append`` op (``ui.append``)
+    that adds the new points and trims the oldest ones.
+
+    While a series holds at most ``max_points`` values they are sent as
+    they are. A longer history is downsampled to about ``max_points``
+    points, in buckets aligned to the absolute sample index. Finished
+    buckets never change, so a flush only replaces the points of the last
+    one or two buckets and appends those of new buckets. ``method`` is
+    ``"minmax"`` (the lowest and highest value of each bucket, which keeps
+    spikes) or ``"lttb"`` (the point of each bucket that best keeps the
+    shape of the line).
+
+    Runtimes without ``ui.append`` get the whole bounded series as one
+    props patch per flush, as do rebuilds after the history outgrew
+    ``max_points`` or a flush fell more than ``capacity`` samples behind.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        *,
+        max_points: int = 1_000,
+        method: str = "minmax",
+        interval: float = 1 / 60,
+    ) -> None:
+        if method not in _METHODS:
+            raise ValueError(f"Unknown downsampling method: {method!r}")
+        self.capacity = max(1, int(capacity))
+        self.max_points = max(2, int(max_points))
+        self.method = method
+        self.interval = max(0.0, float(interval))
+        self._series: dict[str, RingBuffer] = {}
+        self._bindings: list[_Binding] = []
+        self._handle: asyncio.TimerHandle | None = None
+        # Samples per bucket and points kept per bucket once downsampled.
+        self._per_bucket = 2 if method == "minmax" else 1
+        self._bucket = max(1, math.ceil(self.capacity * self._per_bucket / self.max_points))
+
+    def series(self, name: str) -> RingBuffer:
+        """The buffer of series ``name``, created empty on first use."""
+        ring = self._series.get(name)
+        if ring is None:
+            ring = self._series[name] = RingBuffer(self.capacity)
+        return ring
+
+    def names(self) -> list[str]:
+        return list(self._series)
+
+    def values(self, name: str) -> list[float]:
+        """The full history held for series ``name``."""
+        return self.series(name).values().tolist()
+
+    def append(self, name: str, value: float) -> None:
+        self.series(name).append(value)
+        self._schedule()
+
+    def extend(self, name: str, values: Iterable[float]) -> None:
+        self.series(name).extend(values)
+        self._schedule()
+
+    def push(self, values: Mapping[str, float]) -> None:
+        """Append one value to each named series."""
+        for name, value in values.items():
+            self.series(name).append(value)
+        self._schedule()
+
+    def attach(self, control: Control, series: str = "values", *, prop: str = "values") -> None:
+        """Show series ``series`` in the ``prop`` list prop of ``control``.
+
+        Attach before the page is first sent: the prop is set to the
+        current (downsampled) history and later changes are sent as ops.
+        """
+        binding = _Binding(control, series, prop, get_current_session())
+        self.series(series)
+        self._bindings.append(binding)
+        self._flush_binding(binding, None)
+        control.props[prop] = binding.shown
+
+    def detach(self, control: Control) -> None:
+        self._bindings = [binding for binding in self._bindings if binding.control is not control]
+
+    def flush(self, session: "ButterflyUISession | None" = None) -> None:
+        """Send the values appended since the last flush to bound charts."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for binding in self._bindings:
+            self._flush_binding(binding, session or binding.session or get_current_session())
+
+    def _schedule(self) -> None:
+        if self._handle is not None or not self._bindings:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._handle = loop.call_later(self.interval, self._scheduled_flush)
+
+    def _scheduled_flush(self) -> None:
+        self._handle = None
+        self.flush()
+
+    def _flush_binding(self, binding: _Binding, session: "ButterflyUISession | None") -> None:
+        ring = self._series[binding.series]
+        if ring.count == binding.seen:
+            return
+        if binding.bucketed or len(ring) > self.max_points:
+            append = self._bucket_delta(binding, ring)
+        else:
+            begin = max(binding.seen, ring.start)
+            append = PropAppend(ring.slice(begin, ring.count).tolist(), 0, min(self.capacity, self.max_points))
+        binding.seen = ring.count
+        if not append.items and not append.replace:
+            return
+        rebuilt = append.replace >= len(binding.shown) > 0
+        append.apply(binding.shown)
+        # `shown` is the control's prop, changed in place.
+        binding.control._mark_ancestors_dirty()
+        if session is None:
+            return
+        if session.supports(UI_APPEND) and not rebuilt:
+            session.append_prop(
+                binding.control.control_id,
+                binding.prop,
+                append.items,
+                replace=append.replace,
+                limit=append.limit,
+            )
+        else:
+            session.update_props(binding.control.control_id, {binding.prop: NumericArray(binding.shown)})
+
+    def _bucket_delta(self, binding: _Binding, ring: RingBuffer) -> PropAppend:
+        size = self._bucket
+        total = ring.count
+        last = (total - 1) // size
+        if not binding.bucketed or binding.next_bucket * size < ring.start:
+            # First downsampled flush, or the buffer moved past unsent
+            # samples: rebuild the whole series.
+            replace = len(binding.shown)
+            binding.bucketed = True
+            binding.next_bucket = ring.start // size
+            binding.anchor = None
+        else:
+            replace = binding.provisional
+        lttb_mode = self.method == "lttb"
+        # A bucket is final once it is full; with LTTB its point also
+        # depends on the next bucket, so that one has to be full as well.
+        final = last - 1 if lttb_mode else last
+        items: list[float] = []
+        for bucket in range(binding.next_bucket, max(binding.next_bucket, final)):
+            items.extend(self._bucket_points(ring, bucket, binding, True))
+        binding.next_bucket = max(binding.next_bucket, final)
+        provisional: list[float] = []
+        for bucket in range(binding.next_bucket, last if lttb_mode else last + 1):
+            provisional.extend(self._bucket_points(ring, bucket, binding, False))
+        if lttb_mode:
+            # LTTB keeps the newest sample in place of the open bucket.
+            provisional.append(ring.slice(total - 1, total)[0])
+        binding.provisional = len(provisional)
+        items.extend(provisional)
+        limit = self._per_bucket * (math.ceil(self.capacity / size) + 2) + 1
+        return PropAppend(items, replace, limit)
+
+    def _bucket_points(self, ring: RingBuffer, bucket: int, binding: _Binding, final: bool) -> list[float]:
+        size = self._bucket
+        begin = max(bucket * size, ring.start)
+        values = ring.slice(begin, (bucket + 1) * size)
+        if not values:
+            return []
+        if self.method == "minmax":
+            low, high = min(values), max(values)
+            if values.index(low) <= values.index(high):
+                return [low, high]
+            return [high, low]
+        anchor = binding.anchor
+        if anchor is None:
+            # The first sample of the series is always kept.
+            point = (float(begin), values[0])
+        else:
+            following = ring.slice((bucket + 1) * size, (bucket + 2) * size)
+            if following:
+                target = ((bucket + 1) * size + (len(following) - 1) / 2, sum(following) / len(following))
+            else:
+                target = (float(begin + len(values) - 1), values[-1])
+            point = _largest_triangle(anchor, target, begin, values)
+        if final:
+            binding.anchor = point
+        return [point[1]]
+
+
+def _largest_triangle(
+    anchor: tuple[float, float],
+    target: tuple[float, float],
+    begin: int,
+    values: Sequence[float],
+) -> tuple[float, float]:
+    """The point of ``values`` (at ``begin``) forming the largest triangle."""
+    ax, ay = anchor
+    dx, dy = target[0] - ax, target[1] - ay
+    best, best_area = 0, -1.0
+    for offset, value in enumerate(values):
+        area = abs(dx * (value - ay) - dy * (begin + offset - ax))
+        if area > best_area:
+            best, best_area = offset, area
+    return float(begin + best), values[best]
+
+
+def minmax(values: Sequence[float], max_points: int) -> list[float]:
+    """Downsample ``values`` to the low and high of ``max_points // 2`` buckets."""
+    if len(values) <= max_points:
+        return list(values)
+    size = math.ceil(2 * len(values) / max(2, max_points))
+    points: list[float] = []
+    for begin in range(0, len(values), size):
+        bucket = values[begin : begin + size]
+        low, high = min(bucket), max(bucket)
+        points.extend((low, high) if bucket.index(low) <= bucket.index(high) else (high, low))
+    return points
+
+
+def lttb(values: Sequence[float], max_points: int) -> list[float]:
+    """Downsample ``values`` to ``max_points`` with Largest-Triangle-Three-Buckets."""
+    length = len(values)
+    if length <= max_points or max_points < 3:
+        return list(values)
+    size = (length - 2) / (max_points - 2)
+    points = [values[0]]
+    anchor = (0.0, float(values[0]))
+    for bucket in range(max_points - 2):
+        begin = int(bucket * size) + 1
+        end = int((bucket + 1) * size) + 1
+        following_end = min(int((bucket + 2) * size) + 1, length)
+        following = values[end:following_end]
+        if not following:
+            end, following = length - 1, values[length - 1 :]
+            following_end = length
+        target = ((end + following_end - 1) / 2, sum(following) / len(following))
+        anchor = _largest_triangle(anchor, target, begin, values[begin:end])
+        points.append(anchor[1])
+    points.append(values[-1])
+    return points
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .query import Query, QueryPage
+
+__all__ = ["SqliteSource"]
+
+_T = TypeVar("_T")
+
+# Alias of the implicit rowid in table sources, dropped from the rows.
+_ROWID = "__butterflyui_rowid__"
+
+
+class SqliteSource:
+    """`QuerySource` over a SQLite table or ``SELECT`` statement.
+
+    Sort, filter and paging are pushed down to SQLite as ``ORDER BY``,
+    ``WHERE ... LIKE`` and ``LIMIT``. Queries run on a small thread pool,
+    one connection per thread, so the event loop never waits on the
+    database. Recent pages are kept in an LRU cache and match counts are
+    kept per filter. When the next page follows a page already read, it is
+    read from the last row of that page (keyset paging) instead of with an
+    ``OFFSET`` that SQLite would have to walk.
+
+    ``key`` is a unique column used to break sort ties and for keyset
+    paging. It defaults to the ``rowid`` of ``table``; with ``sql`` and no
+    ``key``, pages are read with ``OFFSET``. Index the columns users sort
+    by, as ``ORDER BY`` on a large unindexed column sorts the whole table.
+    Filters match text anywhere in a cell, which scans every row; limit
+    them with ``filter_columns``.
+
+    Call `invalidate` after writing to the database, then refresh the grid.
+    """
+
+    def __init__(
+        self,
+        database: str | os.PathLike[str],
+        table: str | None = None,
+        *,
+        sql: str | None = None,
+        key: str | None = None,
+        filter_columns: Sequence[str] | None = None,
+        cache_size: int = 64,
+        max_workers: int = 2,
+        uri: bool = False,
+    ) -> None:
+        if (table is None) == (sql is None):
+            raise ValueError("SqliteSource needs exactly one of table or sql")
+        self.database = database
+        self.table = table
+        self.sql = sql
+        self.key = key
+        self.filter_columns = None if filter_columns is None else list(filter_columns)
+        self.cache_size = max(0, int(cache_size))
+        self.max_workers = max(1, int(max_workers))
+        self.uri = uri
+        self.columns: list[str] | None = None
+        self.hits = 0
+        self.misses = 0
+        self._pages: OrderedDict[tuple[Any, ...], QueryPage] = OrderedDict()
+        self._totals: dict[tuple[Any, ...], int] = {}
+        self._cursors: dict[tuple[Any, ...], tuple[Any, Any]] = {}
+        self._generation = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    async def query(self, query: Query) -> QueryPage:
+        if self.columns is None:
+            self.columns = await self._call(self._describe)
+        columns = self.columns
+        filter_column = query.filter_column if query.filter_column in columns else None
+        sort_column = query.sort_column if query.sort_column in columns else None
+        needle = str(query.filter_query or "").strip().lower()
+        where = (needle, filter_column)
+        order = (sort_column, bool(query.sort_ascending) or sort_column is None)
+        offset, limit = max(0, query.offset), max(0, query.limit)
+        page_key = (*where, *order, offset, limit)
+        cached = self._pages.get(page_key)
+        if cached is not None:
+            self._pages.move_to_end(page_key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        generation = self._generation
+        cursor = self._cursors.get((*where, *order, offset)) if offset else None
+        rows, total, last = await self._call(
+            self._fetch, where, order, offset, limit, self._totals.get(where), cursor
+        )
+        page = QueryPage(rows, total)
+        if generation == self._generation:
+            self._totals[where] = total
+            if last is not None:
+                if len(self._cursors) >= 4 * max(1, self.cache_size):
+                    self._cursors.clear()
+                self._cursors[(*where, *order, offset + len(rows))] = last
+            if self.cache_size:
+                self._pages[page_key] = page
+                while len(self._pages) > self.cache_size:
+                    self._pages.popitem(last=False)
+        return page
+
+    def invalidate(self) -> None:
+        """Forget cached pages and counts, after the data changed."""
+        self._generation += 1
+        self._pages.clear()
+        self._totals.clear()
+        self._cursors.clear()
+
+    def close(self) -> None:
+        """Stop the worker threads and close their connections."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    async def _call(self, fn: Callable[..., _T], *args: Any) -> _T:
+        executor = self._executor
+        if executor is None:
+            executor = self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="butterflyui-sqlite"
+            )
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database, uri=self.uri, check_same_thread=False)
+            with self._lock:
+                self._connections.append(connection)
+            self._local.connection = connection
+        return connection
+
+    def _source(self) -> str:
+        if self.table is not None:
+            if self.key is None:
+                return f"(SELECT rowid AS {_quote(_ROWID)}, * FROM {_quote(self.table)})"
+            return _quote(self.table)
+        return f"({self.sql})"
+
+    def _key(self) -> str | None:
+        if self.key is not None:
+            return self.key
+        return _ROWID if self.table is not None else None
+
+    def _describe(self) -> list[str]:
+        cursor = self._connection().execute(f"SELECT * FROM {self._source()} LIMIT 0")
+        columns = [str(column[0]) for column in cursor.description]
+        if self.key is not None and self.key not in columns:
+            raise ValueError(f"Unknown key column: {self.key}")
+        return [column for column in columns if column != _ROWID]
+
+    def _fetch(
+        self,
+        where: tuple[str, str | None],
+        order: tuple[str | None, bool],
+        offset: int,
+        limit: int,
+        total: int | None,
+        cursor: tuple[Any, Any] | None,
+    ) -> tuple[list[dict[str, Any]], int, tuple[Any, Any] | None]:
+        connection = self._connection()
+        source = self._source()
+        conditions, params = self._filter(*where)
+        if total is None:
+            sql = f"SELECT count(*) FROM {source}{_where(conditions)}"
+            total = int(connection.execute(sql, params).fetchone()[0])
+        sort_column, ascending = order
+        key = self._key()
+        direction = "ASC" if ascending else "DESC"
+        terms = [f"{_quote(name)} {direction}" for name in (sort_column, key) if name is not None]
+        if cursor is not None and key is not None:
+            conditions.append(_after(sort_column, key, ascending, cursor, params))
+            params["limit"], params["offset"] = limit, 0
+        else:
+            params["limit"], params["offset"] = limit, offset
+        sql = f"SELECT * FROM {source}{_where(conditions)}"
+        if terms:
+            sql += " ORDER BY " + ", ".join(terms)
+        result = connection.execute(sql + " LIMIT :limit OFFSET :offset", params)
+        names = [str(column[0]) for column in result.description]
+        rows = [dict(zip(names, values)) for values in result]
+        last = None
+        if rows and key is not None:
+            tail = rows[-1]
+            last = (tail.get(sort_column) if sort_column is not None else None, tail[key])
+        for row in rows:
+            row_key = row.pop(_ROWID, None)
+            if "id" not in row:
+                # Gives the runtime a selection key that is stable across pages.
+                row["id"] = row[key] if key is not None and key != _ROWID else row_key
+        return rows, total, last
+
+    def _filter(self, needle: str, column: str | None) -> tuple[list[str], dict[str, Any]]:
+        if not needle:
+            return [], {}
+        if column is not None:
+            names = [column]
+        else:
+            names = self.filter_columns if self.filter_columns is not None else list(self.columns or [])
+        # LIKE is case-insensitive for ASCII, like the runtime's lowercased match.
+        pattern = "%" + needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        match = " OR ".join(f"{_quote(name)} LIKE :needle ESCAPE '\\'" for name in names)
+        return [f"({match or '0'})"], {"needle": pattern}
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _where(conditions: list[str]) -> str:
+    return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+
+def _after(
+    sort_column: str | None,
+    key: str,
+    ascending: bool,
+    cursor: tuple[Any, Any],
+    params: dict[str, Any],
+) -> str:
+    """Condition for the rows after ``cursor`` in ``ORDER BY sort, key``."""
+    value, last_key = cursor
+    params["after_key"] = last_key
+    k = _quote(key)
+    step = ">" if ascending else "<"
+    if sort_column is None:
+        return f"{k} {step} :after_key"
+    s = _quote(sort_column)
+    # NULLs sort first, so they precede every value ascending and follow it descending.
+    if value is None:
+        if ascending:
+            return f"(({s} IS NULL AND {k} > :after_key) OR {s} IS NOT NULL)"
+        return f"({s} IS NULL AND {k} < :after_key)"
+    params["after_value"] = value
+    condition = f"({s}, {k}) {step} (:after_value, :after_key)"
+    return condition if ascending else f"({condition} OR {s} IS NULL)"
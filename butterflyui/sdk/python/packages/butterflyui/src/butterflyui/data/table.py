@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from .query import Query, QueryPage
+
+__all__ = ["ColumnTable"]
+
+# Joins the cells of a row into one filter haystack; never typed in a query.
+_CELL_SEPARATOR = "\x1f"
+# Text cells that can parse as a number start with one of these.
+_NUMBER_START = frozenset("0123456789+-.")
+
+
+class ColumnTable:
+    """In-memory columnar table that answers grid queries in Python.
+
+    Each column is one list. Per column, the table builds a sort index
+    (row numbers in ascending order, an ``array('q')``) the first time it
+    is sorted by that column, and a lowercased text copy the first time it is
+    filtered. Both are reused until `append` changes the data. Only the rows
+    of the requested page are materialized as dicts.
+
+    Sorting and filtering follow the grid runtime. A query matches a row
+    when any cell, as lowercased text, contains it. Cells that read as
+    numbers sort numerically before other cells, which sort as lowercased
+    text.
+    """
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]], *, key: str | None = None) -> None:
+        names = list(columns)
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("ColumnTable columns must have the same length")
+        if key is not None and key not in columns:
+            raise ValueError(f"Unknown key column: {key}")
+        self.names: list[str] = names
+        self.key = key
+        self._columns: dict[str, list[Any]] = {name: list(columns[name]) for name in names}
+        self._length = lengths.pop() if lengths else 0
+        self._sort_indexes: dict[str, array] = {}
+        self._text: dict[str, list[str]] = {}
+        self._haystack: list[str] | None = None
+        self._matches: tuple[str, str | None, array] | None = None
+        self._ordered: tuple[tuple[Any, ...], Sequence[int]] | None = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping[str, Any]],
+        columns: Sequence[str] | None = None,
+        *,
+        key: str | None = None,
+    ) -> "ColumnTable":
+        rows = list(rows)
+        if columns is None:
+            names: dict[str, None] = {}
+            for row in rows:
+                names.update(dict.fromkeys(row))
+            columns = list(names)
+        return cls({name: [row.get(name) for row in rows] for name in columns}, key=key)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> list[Any]:
+        return self._columns[name]
+
+    def row(self, index: int) -> dict[str, Any]:
+        row = {name: values[index] for name, values in self._columns.items()}
+        if "id" not in row:
+            # Gives the runtime a selection key that is stable across pages.
+            row["id"] = row[self.key] if self.key is not None else index
+        return row
+
+    def append(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Append rows and drop the indexes built so far."""
+        added = 0
+        for row in rows:
+            for name, values in self._columns.items():
+                values.append(row.get(name))
+            added += 1
+        if not added:
+            return
+        self._length += added
+        self._sort_indexes.clear()
+        self._text.clear()
+        self._haystack = None
+        self._matches = None
+        self._ordered = None
+
+    def sort_index(self, column: str) -> array:
+        """Row numbers of ``column`` in ascending order, built once."""
+        order = self._sort_indexes.get(column)
+        if order is None:
+            order = self._sort_indexes[column] = self._build_sort_index(column)
+        return order
+
+    def match(self, query: str, column: str | None = None) -> array | None:
+        """Row numbers matching ``query``, or ``None`` when it is blank."""
+        needle = str(query or "").strip().lower()
+        if not needle:
+            return None
+        previous = self._matches
+        if previous is not None and previous[1] == column and previous[0] == needle:
+            return previous[2]
+        haystack = self._text_column(column) if column is not None else self._rows_text()
+        if previous is not None and previous[1] == column and previous[0] in needle:
+            # Typing narrows the query: only the previous matches can match.
+            rows = array("q", [i for i in previous[2] if needle in haystack[i]])
+        else:
+            rows = array("q", [i for i, text in enumerate(haystack) if needle in text])
+        self._matches = (needle, column, rows)
+        return rows
+
+    def ordered(
+        self,
+        sort_column: str | None = None,
+        filter_query: str = "",
+        filter_column: str | None = None,
+    ) -> Sequence[int]:
+        """Row numbers that pass the filter, in ascending sort order."""
+        if sort_column not in self._columns:
+            sort_column = None
+        if filter_column not in self._columns:
+            filter_column = None
+        state = (sort_column, str(filter_query or "").strip().lower(), filter_column)
+        cached = self._ordered
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        matches = self.match(filter_query, filter_column)
+        ordered: Sequence[int]
+        if sort_column is None:
+            ordered = range(self._length) if matches is None else matches
+        elif matches is None or len(matches) == self._length:
+            ordered = self.sort_index(sort_column)
+        elif len(matches) * max(1, len(matches).bit_length()) < self._length and sort_column not in self._sort_indexes:
+            # Few matches and no index yet: sorting them is cheaper.
+            values = self._columns[sort_column]
+            ordered = array("q", sorted(matches, key=lambda i: _sort_key(values[i])))
+        else:
+            mask = bytearray(self._length)
+            for i in matches:
+                mask[i] = 1
+            ordered = array("q", [i for i in self.sort_index(sort_column) if mask[i]])
+        self._ordered = (state, ordered)
+        return ordered
+
+    def query(self, query: Query) -> QueryPage:
+        ordered = self.ordered(query.sort_column, query.filter_query, query.filter_column)
+        total = len(ordered)
+        offset = max(0, query.offset)
+        limit = max(0, query.limit)
+        if query.sort_ascending or query.sort_column not in self._columns:
+            indexes: Iterable[int] = ordered[offset : offset + limit]
+        else:
+            indexes = reversed(ordered[max(0, total - offset - limit) : max(0, total - offset)])
+        return QueryPage([self.row(i) for i in indexes], total)
+
+    def _build_sort_index(self, column: str) -> array:
+        values = self._columns[column]
+        if all(type(value) in (int, float) for value in values):
+            return array("q", sorted(range(self._length), key=values.__getitem__))
+        # Numbers and text sort apart, so neither needs a tuple key.
+        keys: list[Any] = [None] * self._length
+        numbers: list[int] = []
+        texts: list[int] = []
+        for index, value in enumerate(values):
+            numeric, key = _sort_key(value)
+            keys[index] = key
+            (numbers if numeric == 0 else texts).append(index)
+        numbers.sort(key=keys.__getitem__)
+        texts.sort(key=keys.__getitem__)
+        return array("q", numbers + texts)
+
+    def _text_column(self, column: str) -> list[str]:
+        text = self._text.get(column)
+        if text is None:
+            text = self._text[column] = [_cell_text(value) for value in self._columns[column]]
+        return text
+
+    def _rows_text(self) -> list[str]:
+        haystack = self._haystack
+        if haystack is None:
+            if not self.names:
+                haystack = [""] * self._length
+            else:
+                columns = [
+                    self._text.get(name) or [_cell_text(value) for value in self._columns[name]]
+                    for name in self.names
+                ]
+                haystack = [_CELL_SEPARATOR.join(cells) for cells in zip(*columns)]
+            self._haystack = haystack
+        return haystack
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).lower()
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    text = _cell_text(value)
+    if text.lstrip()[:1] in _NUMBER_START:
+        try:
+            return (0, float(text))
+        except ValueError:
+            pass
+    return (1, text)
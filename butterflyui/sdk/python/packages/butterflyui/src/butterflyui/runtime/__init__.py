@@ -13,7 +13,7 @@ from .runner import (
 	load_runner_config,
 	resolve_run_target,
 )
-from .transport.websocket import WebSocketRuntimeServer
+from .transport.websocket import RuntimeConnection, WebSocketRuntimeServer
 from .session import get_current_session, set_current_session
 
 __all__ = [
@@ -22,6 +22,7 @@ __all__ = [
 	"KNOWN_TARGETS",
 	"RunTarget",
 	"RunnerConfig",
+	"RuntimeConnection",
 	"RuntimeMessage",
 	"RuntimePlan",
 	"WebSocketRuntimeServer",
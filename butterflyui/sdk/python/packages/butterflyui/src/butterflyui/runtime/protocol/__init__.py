@@ -1,4 +1,27 @@
 from .message import RuntimeMessage
-from .codec import encode_message, decode_message, build_message
+from .codec import (
+    CODECS,
+    JSON_CODEC,
+    MSGPACK_CODEC,
+    JsonCodec,
+    MsgPackCodec,
+    build_message,
+    decode_message,
+    encode_message,
+    negotiate_codec,
+    server_codecs,
+)
 
-__all__ = ["RuntimeMessage", "encode_message", "decode_message", "build_message"]
\ No newline at end of file
+__all__ = [
+    "RuntimeMessage",
+    "encode_message",
+    "decode_message",
+    "build_message",
+    "CODECS",
+    "JSON_CODEC",
+    "MSGPACK_CODEC",
+    "JsonCodec",
+    "MsgPackCodec",
+    "negotiate_codec",
+    "server_codecs",
+]
\ No newline at end of file
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+from ...core.arrays import DTYPES, NumericArray
+
+__all__ = ["ARRAY_KEY", "encode_arrays", "decode_arrays"]
+
+# ``{"$array": i, "dtype", "length", "columns"?}`` stands for attachment ``i``.
+ARRAY_KEY = "$array"
+
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+def encode_arrays(payload: dict[str, Any]) -> tuple[dict[str, Any], list[memoryview]]:
+    """Move the `NumericArray` values of ``payload`` into attachments.
+
+    Returns the payload with each array replaced by a reference and the
+    array buffers (little-endian bytes, no copies) in reference order. The
+    payload gets ``attachments: n``; the writer sends the ``n`` buffers as
+    binary frames right after the message. Containers on the path to an
+    array are copied; everything else is passed through as is.
+    """
+    if not NumericArray.created:
+        return payload, []
+    buffers: list[memoryview] = []
+    encoded = _encode(payload, buffers)
+    if not buffers:
+        return payload, []
+    encoded["attachments"] = len(buffers)
+    return encoded, buffers
+
+
+def _encode(value: Any, buffers: list[memoryview]) -> Any:
+    kind = type(value)
+    if kind is NumericArray:
+        ref = {ARRAY_KEY: len(buffers), **value.to_wire()}
+        buffers.append(value.buffer)
+        return ref
+    if isinstance(value, dict):
+        out = None
+        for key, item in value.items():
+            if type(item) in _SCALARS:
+                continue
+            encoded = _encode(item, buffers)
+            if encoded is not item:
+                if out is None:
+                    out = dict(value)
+                out[key] = encoded
+        return value if out is None else out
+    if kind is list or kind is tuple:
+        out_list = None
+        for index, item in enumerate(value):
+            if type(item) in _SCALARS:
+                continue
+            encoded = _encode(item, buffers)
+            if encoded is not item:
+                if out_list is None:
+                    out_list = list(value)
+                out_list[index] = encoded
+        return value if out_list is None else out_list
+    return value
+
+
+def decode_arrays(payload: dict[str, Any], frames: Sequence[bytes]) -> dict[str, Any]:
+    """Reference implementation of the runtime side of ``ui.arrays``.
+
+    Replaces each reference with the values of its attachment frame.
+    """
+    if not isinstance(payload.get("attachments"), int):
+        return payload
+    out = {key: _decode(value, frames) for key, value in payload.items() if key != "attachments"}
+    return out
+
+
+def _decode(value: Any, frames: Sequence[bytes]) -> Any:
+    if isinstance(value, dict):
+        if ARRAY_KEY in value and "dtype" in value:
+            values = array(DTYPES[value["dtype"]], bytes(frames[int(value[ARRAY_KEY])]))
+            if sys.byteorder != "little":
+                values.byteswap()
+            if len(values) != int(value.get("length", len(values))):
+                raise ValueError("array attachment length does not match its reference")
+            columns = int(value.get("columns") or 1)
+            items = values.tolist()
+            if columns == 1:
+                return items
+            return [items[i : i + columns] for i in range(0, len(items), columns)]
+        return {key: _decode(item, frames) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item, frames) for item in value]
+    return value
@@ -0,0 +1,234 @@
+"""Pure-Python MessagePack encoder/decoder used when `msgpack` is not installed.
+
+Only the subset the runtime protocol needs is supported: nil, booleans,
+integers up to 64 bits, float64, str, bin, arrays and maps. Extension types
+are rejected.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Mapping
+from typing import Any
+
+from ...core.arrays import NumericArray
+
+__all__ = ["pack_into", "packb", "unpackb"]
+
+_pack_f64 = struct.Struct(">Bd").pack
+_pack_u8 = struct.Struct(">BB").pack
+_pack_u16 = struct.Struct(">BH").pack
+_pack_u32 = struct.Struct(">BI").pack
+_pack_u64 = struct.Struct(">BQ").pack
+_pack_i8 = struct.Struct(">Bb").pack
+_pack_i16 = struct.Struct(">Bh").pack
+_pack_i32 = struct.Struct(">Bi").pack
+_pack_i64 = struct.Struct(">Bq").pack
+
+
+def _pack_int(value: int, out: bytearray) -> None:
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif value >= 0:
+        if value <= 0xFF:
+            out += _pack_u8(0xCC, value)
+        elif value <= 0xFFFF:
+            out += _pack_u16(0xCD, value)
+        elif value <= 0xFFFFFFFF:
+            out += _pack_u32(0xCE, value)
+        elif value <= 0xFFFFFFFFFFFFFFFF:
+            out += _pack_u64(0xCF, value)
+        else:
+            raise OverflowError("integer too large for MessagePack")
+    elif value >= -0x80:
+        out += _pack_i8(0xD0, value)
+    elif value >= -0x8000:
+        out += _pack_i16(0xD1, value)
+    elif value >= -0x80000000:
+        out += _pack_i32(0xD2, value)
+    elif value >= -0x8000000000000000:
+        out += _pack_i64(0xD3, value)
+    else:
+        raise OverflowError("integer too small for MessagePack")
+
+
+def _pack_header(size: int, out: bytearray, fix: int, fix_limit: int, code16: int, code32: int) -> None:
+    if size < fix_limit:
+        out.append(fix | size)
+    elif size <= 0xFFFF:
+        out += _pack_u16(code16, size)
+    else:
+        out += _pack_u32(code32, size)
+
+
+def _pack_str(value: str, out: bytearray) -> None:
+    data = value.encode("utf-8")
+    size = len(data)
+    if size < 32:
+        out.append(0xA0 | size)
+    elif size <= 0xFF:
+        out += _pack_u8(0xD9, size)
+    elif size <= 0xFFFF:
+        out += _pack_u16(0xDA, size)
+    else:
+        out += _pack_u32(0xDB, size)
+    out += data
+
+
+def pack_into(value: Any, out: bytearray) -> None:
+    """Append the MessagePack encoding of ``value`` to ``out``."""
+    kind = type(value)
+    if kind is str:
+        _pack_str(value, out)
+    elif value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif kind is int:
+        _pack_int(value, out)
+    elif kind is float:
+        out += _pack_f64(0xCB, value)
+    elif kind is dict or isinstance(value, Mapping):
+        _pack_header(len(value), out, 0x80, 16, 0xDE, 0xDF)
+        for key, item in value.items():
+            if type(key) is str:
+                _pack_str(key, out)
+            else:
+                pack_into(key, out)
+            pack_into(item, out)
+    elif kind is list or kind is tuple:
+        _pack_header(len(value), out, 0x90, 16, 0xDC, 0xDD)
+        for item in value:
+            pack_into(item, out)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        size = len(data)
+        if size <= 0xFF:
+            out += _pack_u8(0xC4, size)
+        elif size <= 0xFFFF:
+            out += _pack_u16(0xC5, size)
+        else:
+            out += _pack_u32(0xC6, size)
+        out += data
+    elif isinstance(value, int):
+        _pack_int(int(value), out)
+    elif isinstance(value, float):
+        out += _pack_f64(0xCB, float(value))
+    elif isinstance(value, str):
+        _pack_str(str(value), out)
+    elif isinstance(value, (list, tuple)):
+        pack_into(list(value), out)
+    elif isinstance(value, NumericArray):
+        pack_into(value.tolist(), out)
+    else:
+        raise TypeError(f"Object of type {kind.__name__} is not MessagePack serializable")
+
+
+def packb(value: Any) -> bytes:
+    out = bytearray()
+    pack_into(value, out)
+    return bytes(out)
+
+
+class _Reader:
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def take(self, size: int) -> bytes:
+        start = self.offset
+        end = start + size
+        if end > len(self.data):
+            raise ValueError("truncated MessagePack data")
+        self.offset = end
+        return self.data[start:end]
+
+    def unpack(self, fmt: str, size: int) -> Any:
+        return struct.unpack(fmt, self.take(size))[0]
+
+
+def _read(reader: _Reader) -> Any:
+    code = reader.take(1)[0]
+    if code < 0x80:
+        return code
+    if code >= 0xE0:
+        return code - 0x100
+    if 0xA0 <= code <= 0xBF:
+        return reader.take(code & 0x1F).decode("utf-8")
+    if 0x90 <= code <= 0x9F:
+        return [_read(reader) for _ in range(code & 0x0F)]
+    if 0x80 <= code <= 0x8F:
+        return _read_map(reader, code & 0x0F)
+    if code == 0xC0:
+        return None
+    if code == 0xC2:
+        return False
+    if code == 0xC3:
+        return True
+    if code == 0xCA:
+        return reader.unpack(">f", 4)
+    if code == 0xCB:
+        return reader.unpack(">d", 8)
+    if code in _INT_FORMATS:
+        fmt, size = _INT_FORMATS[code]
+        return reader.unpack(fmt, size)
+    if code in (0xD9, 0xDA, 0xDB):
+        fmt, size = _LENGTH_FORMATS[code]
+        return reader.take(reader.unpack(fmt, size)).decode("utf-8")
+    if code in (0xC4, 0xC5, 0xC6):
+        fmt, size = _LENGTH_FORMATS[code]
+        return reader.take(reader.unpack(fmt, size))
+    if code in (0xDC, 0xDD):
+        fmt, size = _LENGTH_FORMATS[code]
+        return [_read(reader) for _ in range(reader.unpack(fmt, size))]
+    if code in (0xDE, 0xDF):
+        fmt, size = _LENGTH_FORMATS[code]
+        return _read_map(reader, reader.unpack(fmt, size))
+    raise ValueError(f"unsupported MessagePack type code 0x{code:02x}")
+
+
+def _read_map(reader: _Reader, size: int) -> dict[Any, Any]:
+    out: dict[Any, Any] = {}
+    for _ in range(size):
+        key = _read(reader)
+        out[key] = _read(reader)
+    return out
+
+
+_INT_FORMATS = {
+    0xCC: (">B", 1),
+    0xCD: (">H", 2),
+    0xCE: (">I", 4),
+    0xCF: (">Q", 8),
+    0xD0: (">b", 1),
+    0xD1: (">h", 2),
+    0xD2: (">i", 4),
+    0xD3: (">q", 8),
+}
+
+_LENGTH_FORMATS = {
+    0xC4: (">B", 1),
+    0xC5: (">H", 2),
+    0xC6: (">I", 4),
+    0xD9: (">B", 1),
+    0xDA: (">H", 2),
+    0xDB: (">I", 4),
+    0xDC: (">H", 2),
+    0xDD: (">I", 4),
+    0xDE: (">H", 2),
+    0xDF: (">I", 4),
+}
+
+
+def unpackb(data: bytes | bytearray | memoryview) -> Any:
+    reader = _Reader(bytes(data))
+    value = _read(reader)
+    if reader.offset != len(reader.data):
+        raise ValueError("extra data after MessagePack value")
+    return value
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any
+
+__all__ = [
+    "SERVER_CAPABILITIES",
+    "UI_ACKS",
+    "UI_APPEND",
+    "UI_ARRAYS",
+    "UI_CHUNKS",
+    "UI_ITEMS",
+    "UI_OPS",
+    "UI_RESUME",
+    "UI_STRINGS",
+    "UI_TEMPLATES",
+    "UI_WINDOWS",
+    "negotiate_capabilities",
+    "parse_capabilities",
+]
+
+# Keyed insert/remove/move/props ops in ``ui.apply`` payloads (``ops`` key).
+UI_OPS = "ui.ops"
+
+# Oversized ``ui.*`` frames split into ``ui.chunk`` messages (see ``chunks``).
+UI_CHUNKS = "ui.chunks"
+
+# ``ui.apply`` payloads carry a ``seq``; the runtime answers each applied
+# batch with ``ui.applied {"seq": n}``.
+UI_ACKS = "ui.acks"
+
+# A reconnecting runtime sends ``resume: {"session_id", "seq"}`` in
+# ``runtime.hello`` and gets only the batches it missed.
+UI_RESUME = "ui.resume"
+
+# ``ui.apply`` payloads replace repeated names with indices into a
+# per-connection string table (see ``strings``).
+UI_STRINGS = "ui.strings"
+
+# Template instances in ``ui.apply`` are sent as ``{"id", "template",
+# "values"}`` plus one definition per template (see ``templates``).
+UI_TEMPLATES = "ui.templates"
+
+# ``virtual_list``/``virtual_grid`` render ``item_count`` rows with ``items``
+# placed at ``window_start`` and report the visible rows as ``range`` events.
+UI_WINDOWS = "ui.windows"
+
+# Numeric arrays in ``ui.apply`` are sent as ``{"$array": i, "dtype",
+# "length"}`` and follow the message as raw little-endian binary frames
+# (see ``arrays``).
+UI_ARRAYS = "ui.arrays"
+
+# ``ops`` may hold ``{"op": "append", "id", "prop", "items", "replace",
+# "limit"}``: drop ``replace`` trailing items of the list prop, append
+# ``items`` and keep the last ``limit``.
+UI_APPEND = "ui.append"
+
+# ``ops`` may hold ``{"op": "items", "id", "prop", "remove", "add",
+# "update", "extend"}``: keyed changes to a list prop of dicts with an
+# ``id`` (see ``core.diff.ItemsPatch``).
+UI_ITEMS = "ui.items"
+
+SERVER_CAPABILITIES: frozenset[str] = frozenset(
+    {
+        UI_OPS,
+        UI_CHUNKS,
+        UI_ACKS,
+        UI_RESUME,
+        UI_STRINGS,
+        UI_TEMPLATES,
+        UI_WINDOWS,
+        UI_ARRAYS,
+        UI_APPEND,
+        UI_ITEMS,
+    }
+)
+
+
+def parse_capabilities(raw: Any) -> frozenset[str]:
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    if not isinstance(raw, (list, tuple, set, frozenset)):
+        return frozenset()
+    return frozenset(str(item).strip() for item in raw if item is not None and str(item).strip())
+
+
+def negotiate_capabilities(client: Any, server: frozenset[str] = SERVER_CAPABILITIES) -> frozenset[str]:
+    """Return the capabilities both the runtime and this server support."""
+    return parse_capabilities(client) & server
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any
+
+__all__ = ["CHUNK_MESSAGE", "ChunkAssembler", "split_encoded"]
+
+# Envelope for one slice of an oversized encoded frame. Payload:
+# ``{"stream": int, "index": int, "count": int, "data": str | bytes}``.
+CHUNK_MESSAGE = "ui.chunk"
+
+
+def split_encoded(data: str | bytes, chunk_size: int) -> list[str | bytes]:
+    """Split an encoded frame into slices of at most ``chunk_size`` units."""
+    size = max(1, int(chunk_size))
+    return [data[offset : offset + size] for offset in range(0, len(data), size)]
+
+
+class ChunkAssembler:
+    """Reassemble ``ui.chunk`` streams into the original encoded frame.
+
+    Reference implementation of the runtime side: once every slice of a stream
+    has arrived, `add` returns the joined frame for the codec to decode.
+    """
+
+    def __init__(self) -> None:
+        self._streams: dict[Any, list[Any]] = {}
+
+    def add(self, payload: dict[str, Any]) -> str | bytes | None:
+        stream = payload.get("stream")
+        count = int(payload.get("count") or 0)
+        index = int(payload.get("index") or 0)
+        if count <= 0 or not 0 <= index < count:
+            raise ValueError("invalid ui.chunk index/count")
+        parts = self._streams.get(stream)
+        if parts is None or len(parts) != count:
+            parts = self._streams[stream] = [None] * count
+        parts[index] = payload.get("data")
+        if any(part is None for part in parts):
+            return None
+        del self._streams[stream]
+        if isinstance(parts[0], str):
+            return "".join(parts)
+        return b"".join(bytes(part) for part in parts)
+
+    def discard(self) -> None:
+        self._streams.clear()
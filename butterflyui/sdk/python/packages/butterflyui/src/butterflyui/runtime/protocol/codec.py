@@ -1,22 +1,168 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterable
 
+from ...core.arrays import NumericArray
+from . import binary
 from .message import RuntimeMessage
 
+try:
+    import msgpack as _msgpack
+except ModuleNotFoundError:  # pragma: no cover - optional accelerator
+    _msgpack = None  # type: ignore[assignment]
 
-def encode_message(message: RuntimeMessage) -> str:
-    return json.dumps(message.to_dict(), separators=(",", ":"))
+
+def _encode_default(value: Any) -> Any:
+    # Arrays not sent as ``ui.arrays`` attachments go out as plain lists.
+    if isinstance(value, NumericArray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+_json_encode = json.JSONEncoder(separators=(",", ":"), default=_encode_default).encode
+
+
+class JsonCodec:
+    """Text frames holding one JSON object per message (the default)."""
+
+    name = "json"
+    binary = False
+
+    def encode(self, message: RuntimeMessage) -> str:
+        parts = ['{"type":', _json_encode(message.type), ',"payload":', _json_encode(message.payload)]
+        if message.id is not None:
+            parts += [',"id":', _json_encode(message.id)]
+        if message.reply_to is not None:
+            parts += [',"reply_to":', _json_encode(message.reply_to)]
+        parts.append("}")
+        return "".join(parts)
+
+    def decode(self, raw: str | bytes) -> RuntimeMessage:
+        if isinstance(raw, (bytes, bytearray, memoryview)):
+            raw = bytes(raw).decode("utf-8")
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("runtime message must be a JSON object")
+        return RuntimeMessage.from_dict(data)
+
+
+class MsgPackCodec:
+    """Binary frames holding one MessagePack map per message.
+
+    Uses the `msgpack` package when installed and the in-tree encoder in
+    `binary` otherwise. Messages the binary encoder cannot represent (for
+    example integers wider than 64 bits) are sent as JSON text frames.
+    """
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self) -> None:
+        self.accelerated = _msgpack is not None
+
+    def encode(self, message: RuntimeMessage) -> bytes | str:
+        try:
+            if self.accelerated:
+                return self._encode_native(message)
+            return self._encode_pure(message)
+        except (TypeError, OverflowError, ValueError):
+            return JSON_CODEC.encode(message)
+
+    def _encode_native(self, message: RuntimeMessage) -> bytes:
+        packer = _msgpack.Packer(use_bin_type=True, autoreset=True, default=_encode_default)
+        size = 2 + (message.id is not None) + (message.reply_to is not None)
+        parts = [
+            packer.pack_map_header(size),
+            packer.pack("type"),
+            packer.pack(message.type),
+            packer.pack("payload"),
+            packer.pack(message.payload),
+        ]
+        if message.id is not None:
+            parts += [packer.pack("id"), packer.pack(message.id)]
+        if message.reply_to is not None:
+            parts += [packer.pack("reply_to"), packer.pack(message.reply_to)]
+        return b"".join(parts)
+
+    def _encode_pure(self, message: RuntimeMessage) -> bytes:
+        out = bytearray()
+        size = 2 + (message.id is not None) + (message.reply_to is not None)
+        out.append(0x80 | size)
+        binary.pack_into("type", out)
+        binary.pack_into(message.type, out)
+        binary.pack_into("payload", out)
+        binary.pack_into(message.payload, out)
+        if message.id is not None:
+            binary.pack_into("id", out)
+            binary.pack_into(message.id, out)
+        if message.reply_to is not None:
+            binary.pack_into("reply_to", out)
+            binary.pack_into(message.reply_to, out)
+        return bytes(out)
+
+    def decode(self, raw: str | bytes) -> RuntimeMessage:
+        if isinstance(raw, str):
+            return JSON_CODEC.decode(raw)
+        if self.accelerated:
+            data = _msgpack.unpackb(raw, raw=False, strict_map_key=False)
+        else:
+            data = binary.unpackb(raw)
+        if not isinstance(data, dict):
+            raise ValueError("runtime message must be a MessagePack map")
+        return RuntimeMessage.from_dict(data)
+
+
+JSON_CODEC = JsonCodec()
+MSGPACK_CODEC = MsgPackCodec()
+
+CODECS: dict[str, JsonCodec | MsgPackCodec] = {
+    JSON_CODEC.name: JSON_CODEC,
+    MSGPACK_CODEC.name: MSGPACK_CODEC,
+}
+
+
+def server_codecs() -> list[str]:
+    """Codec names in server preference order.
+
+    MessagePack is only preferred over JSON when the native `msgpack`
+    encoder is installed; the pure-Python encoder is slower than the C JSON
+    encoder, so it is kept for runtimes that cannot speak JSON.
+    """
+    if MSGPACK_CODEC.accelerated:
+        return [MSGPACK_CODEC.name, JSON_CODEC.name]
+    return [JSON_CODEC.name, MSGPACK_CODEC.name]
+
+
+def negotiate_codec(client: Any, preference: Iterable[str] | None = None) -> JsonCodec | MsgPackCodec:
+    """Pick the server's most preferred codec among those the runtime offers."""
+    if isinstance(client, str):
+        client = client.split(",")
+    if not isinstance(client, (list, tuple)):
+        return JSON_CODEC
+    offered = {str(item).strip().lower() for item in client if item is not None}
+    for name in preference or server_codecs():
+        if name in offered and name in CODECS:
+            return CODECS[name]
+    return JSON_CODEC
+
+
+def encode_message(
+    message: RuntimeMessage,
+    codec: JsonCodec | MsgPackCodec | None = None,
+) -> str | bytes:
+    return (codec or JSON_CODEC).encode(message)
 
 
 def decode_message(raw: str | bytes) -> RuntimeMessage:
-    if isinstance(raw, bytes):
-        raw = raw.decode("utf-8")
-    data = json.loads(raw)
-    if not isinstance(data, dict):
-        raise ValueError("runtime message must be a JSON object")
-    return RuntimeMessage.from_dict(data)
+    # Text frames and bytes starting with "{" are JSON; a MessagePack message
+    # always starts with a map header (0x80-0x8f, 0xde, 0xdf).
+    if isinstance(raw, str):
+        return JSON_CODEC.decode(raw)
+    head = bytes(raw[:1])
+    if head in (b"{", b" ", b"\n", b"\r", b"\t"):
+        return JSON_CODEC.decode(raw)
+    return MSGPACK_CODEC.decode(raw)
 
 
 def build_message(
@@ -26,4 +172,4 @@ def build_message(
     msg_id: str | None = None,
     reply_to: str | None = None,
 ) -> RuntimeMessage:
-    return RuntimeMessage(type=msg_type, payload=payload or {}, id=msg_id, reply_to=reply_to)
\ No newline at end of file
+    return RuntimeMessage(type=msg_type, payload=payload or {}, id=msg_id, reply_to=reply_to)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from typing import Any
+
+__all__ = ["StringTable", "StringTableReader"]
+
+# Payload keys of ``ui.apply`` whose value is one control tree.
+_TREE_SLOTS = ("root", "screen", "overlay", "splash")
+
+
+class StringTable:
+    """Sender side of ``ui.strings``: intern repeated names in ``ui.apply``.
+
+    Map keys of nodes, props, ops and patches, control types, op names and
+    removed prop names are replaced by their index in a per-connection
+    table. Each payload lists the strings it added under ``strings``, in
+    index order. Ids and prop values are left as they are. Once ``limit``
+    strings are interned, new names are sent as plain strings (a key made of
+    digits only is always interned, so it cannot be mistaken for an index).
+    """
+
+    __slots__ = ("_index", "limit")
+
+    def __init__(self, limit: int = 4096) -> None:
+        self._index: dict[str, int] = {}
+        self.limit = max(0, int(limit))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def encode_apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return ``payload`` with names replaced by table indices."""
+        added: list[str] = []
+        out: dict[str, Any] = {}
+        for key, value in payload.items():
+            if key in _TREE_SLOTS and isinstance(value, dict):
+                value = self._node(value, added)
+            elif key == "ops" and isinstance(value, list):
+                value = [self._op(op, added) if isinstance(op, dict) else op for op in value]
+            elif key == "patch" and isinstance(value, dict):
+                value = self._map(value, added)
+            elif key == "patches" and isinstance(value, list):
+                value = [self._map(patch, added) if isinstance(patch, dict) else patch for patch in value]
+            out[key] = value
+        out["strings"] = added
+        return out
+
+    def _ref(self, value: Any, added: list[str], *, force: bool = False) -> Any:
+        if not isinstance(value, str):
+            return value
+        index = self._index.get(value)
+        if index is None:
+            if len(self._index) >= self.limit and not force:
+                return value
+            index = self._index[value] = len(self._index)
+            added.append(value)
+        return index
+
+    def _key(self, key: Any, added: list[str]) -> Any:
+        return self._ref(key, added, force=isinstance(key, str) and key.isdigit())
+
+    def _node(self, node: dict[str, Any], added: list[str]) -> dict[Any, Any]:
+        out: dict[Any, Any] = {}
+        for key, value in node.items():
+            if key == "type":
+                value = self._ref(value, added)
+            elif key == "props" and isinstance(value, dict):
+                value = self._props(value, added)
+            elif key == "children" and isinstance(value, list):
+                value = [self._node(child, added) if isinstance(child, dict) else child for child in value]
+            elif key == "meta" and isinstance(value, dict):
+                value = self._meta(value, added)
+            out[self._key(key, added)] = value
+        return out
+
+    def _props(self, props: dict[str, Any], added: list[str]) -> dict[Any, Any]:
+        return {self._key(key, added): value for key, value in props.items()}
+
+    def _meta(self, meta: dict[str, Any], added: list[str]) -> dict[Any, Any]:
+        out: dict[Any, Any] = {}
+        for key, value in meta.items():
+            if key == "source" and isinstance(value, dict):
+                # Construction sites repeat a handful of paths and functions.
+                value = {
+                    self._key(name, added): self._ref(item, added) if name in ("path", "function") else item
+                    for name, item in value.items()
+                }
+            out[self._key(key, added)] = value
+        return out
+
+    def _map(self, patch: dict[str, Any], added: list[str]) -> dict[Any, Any]:
+        out: dict[Any, Any] = {}
+        for key, value in patch.items():
+            if key == "props" and isinstance(value, dict):
+                value = self._props(value, added)
+            out[self._key(key, added)] = value
+        return out
+
+    def _op(self, op: dict[str, Any], added: list[str]) -> dict[Any, Any]:
+        out: dict[Any, Any] = {}
+        for key, value in op.items():
+            if key == "op":
+                value = self._ref(value, added)
+            elif key == "node" and isinstance(value, dict):
+                value = self._node(value, added)
+            elif key == "props" and isinstance(value, dict):
+                value = self._props(value, added)
+            elif key == "remove" and isinstance(value, list):
+                value = [self._ref(name, added) for name in value]
+            elif key == "children" and isinstance(value, list):
+                value = [self._node(child, added) if isinstance(child, dict) else child for child in value]
+            out[self._key(key, added)] = value
+        return out
+
+
+class StringTableReader:
+    """Reference implementation of the runtime side of ``ui.strings``.
+
+    Keep one reader per connection and reset it on ``runtime.hello_ack``.
+    Payloads without ``strings`` were not interned and pass through.
+    """
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+
+    def reset(self) -> None:
+        self._strings.clear()
+
+    def decode_apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        added = payload.get("strings")
+        if not isinstance(added, list):
+            return payload
+        self._strings.extend(str(value) for value in added)
+        out: dict[str, Any] = {}
+        for key, value in payload.items():
+            if key == "strings":
+                continue
+            if key in _TREE_SLOTS and isinstance(value, dict):
+                value = self._node(value)
+            elif key == "ops" and isinstance(value, list):
+                value = [self._op(op) if isinstance(op, dict) else op for op in value]
+            elif key == "patch" and isinstance(value, dict):
+                value = self._map(value)
+            elif key == "patches" and isinstance(value, list):
+                value = [self._map(patch) if isinstance(patch, dict) else patch for patch in value]
+            out[key] = value
+        return out
+
+    def _ref(self, value: Any) -> Any:
+        # bool is an int subclass but never an index.
+        if isinstance(value, int) and not isinstance(value, bool):
+            return self._strings[value]
+        return value
+
+    def _key(self, key: Any) -> Any:
+        if isinstance(key, str) and key.isdigit():
+            return self._strings[int(key)]
+        return self._ref(key)
+
+    def _node(self, node: dict[Any, Any]) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for key, value in node.items():
+            key = self._key(key)
+            if key == "type":
+                value = self._ref(value)
+            elif key == "props" and isinstance(value, dict):
+                value = self._props(value)
+            elif key == "children" and isinstance(value, list):
+                value = [self._node(child) if isinstance(child, dict) else child for child in value]
+            elif key == "meta" and isinstance(value, dict):
+                value = self._meta(value)
+            out[key] = value
+        return out
+
+    def _props(self, props: dict[Any, Any]) -> dict[str, Any]:
+        return {self._key(key): value for key, value in props.items()}
+
+    def _meta(self, meta: dict[Any, Any]) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for key, value in meta.items():
+            key = self._key(key)
+            if key == "source" and isinstance(value, dict):
+                source: dict[str, Any] = {}
+                for name, item in value.items():
+                    name = self._key(name)
+                    source[name] = self._ref(item) if name in ("path", "function") else item
+                value = source
+            out[key] = value
+        return out
+
+    def _map(self, patch: dict[Any, Any]) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for key, value in patch.items():
+            key = self._key(key)
+            if key == "props" and isinstance(value, dict):
+                value = self._props(value)
+            out[key] = value
+        return out
+
+    def _op(self, op: dict[Any, Any]) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for key, value in op.items():
+            key = self._key(key)
+            if key == "op":
+                value = self._ref(value)
+            elif key == "node" and isinstance(value, dict):
+                value = self._node(value)
+            elif key == "props" and isinstance(value, dict):
+                value = self._props(value)
+            elif key == "remove" and isinstance(value, list):
+                value = [self._ref(name) for name in value]
+            elif key == "children" and isinstance(value, list):
+                value = [self._node(child) if isinstance(child, dict) else child for child in value]
+            out[key] = value
+        return out
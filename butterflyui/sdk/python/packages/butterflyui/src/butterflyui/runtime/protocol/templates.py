@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import Any
+
+from ...core.template import Template, TemplateNode, expand_template_node
+
+__all__ = ["TemplateTable", "TemplateTableReader"]
+
+# Payload keys of ``ui.apply`` whose value is one control tree.
+_TREE_SLOTS = ("root", "screen", "overlay", "splash")
+
+
+class TemplateTable:
+    """Sender side of ``ui.templates``: send template instances by reference.
+
+    Expanded instance nodes (``TemplateNode``) in a ``ui.apply`` payload are
+    replaced by ``{"id", "template", "values"}``. The first payload that
+    uses a template on this connection carries its definition under
+    ``templates``. Nodes on the path to an instance are copied; everything
+    else is passed through as is.
+    """
+
+    __slots__ = ("_sent",)
+
+    def __init__(self) -> None:
+        self._sent: dict[str, Template] = {}
+
+    def __len__(self) -> int:
+        return len(self._sent)
+
+    def encode_apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return ``payload`` with template instances sent by reference."""
+        if not Template.created:
+            return payload
+        added: dict[str, Any] = {}
+        out: dict[str, Any] = {}
+        changed = False
+        for key, value in payload.items():
+            encoded = value
+            if key in _TREE_SLOTS and isinstance(value, dict):
+                encoded = self._node(value, added)
+            elif key == "ops" and isinstance(value, list):
+                encoded = self._ops(value, added)
+            changed = changed or encoded is not value
+            out[key] = encoded
+        if not changed:
+            return payload
+        if added:
+            out["templates"] = added
+        return out
+
+    def _ref(self, node: TemplateNode, added: dict[str, Any]) -> dict[str, Any]:
+        template = node.template
+        template_id = template.template_id
+        if self._sent.get(template_id) is not template:
+            # A new id, or an app that reused a template id: (re)define it.
+            self._sent[template_id] = template
+            added[template_id] = template.to_json()
+        return {"id": node["id"], "template": template_id, "values": list(node.slot_values)}
+
+    def _node(self, node: dict[str, Any], added: dict[str, Any]) -> dict[str, Any]:
+        if type(node) is TemplateNode:
+            return self._ref(node, added)
+        children = node.get("children")
+        if not children:
+            return node
+        replaced = self._children(children, added)
+        if replaced is children:
+            return node
+        out = dict(node)
+        out["children"] = replaced
+        return out
+
+    def _children(self, children: list[Any], added: dict[str, Any]) -> list[Any]:
+        replaced: list[Any] | None = None
+        for index, child in enumerate(children):
+            if not isinstance(child, dict):
+                continue
+            node = self._node(child, added)
+            if node is not child:
+                if replaced is None:
+                    replaced = list(children)
+                replaced[index] = node
+        return children if replaced is None else replaced
+
+    def _ops(self, ops: list[Any], added: dict[str, Any]) -> list[Any]:
+        replaced: list[Any] | None = None
+        for index, op in enumerate(ops):
+            if not isinstance(op, dict):
+                continue
+            encoded = self._op(op, added)
+            if encoded is not op:
+                if replaced is None:
+                    replaced = list(ops)
+                replaced[index] = encoded
+        return ops if replaced is None else replaced
+
+    def _op(self, op: dict[str, Any], added: dict[str, Any]) -> dict[str, Any]:
+        node = op.get("node")
+        if isinstance(node, dict):
+            encoded = self._node(node, added)
+            if encoded is not node:
+                return {**op, "node": encoded}
+            return op
+        children = op.get("children")
+        if isinstance(children, list):
+            encoded_children = self._children(children, added)
+            if encoded_children is not children:
+                return {**op, "children": encoded_children}
+        return op
+
+
+class TemplateTableReader:
+    """Reference implementation of the runtime side of ``ui.templates``.
+
+    Keep one reader per connection and reset it on ``runtime.hello_ack``.
+    Apply it after ``StringTableReader``: definitions under ``templates``
+    are registered first, then every ``{"id", "template", "values"}`` node
+    is expanded.
+    """
+
+    __slots__ = ("_templates",)
+
+    def __init__(self) -> None:
+        self._templates: dict[str, dict[str, Any]] = {}
+
+    def reset(self) -> None:
+        self._templates.clear()
+
+    def decode_apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        definitions = payload.get("templates")
+        if isinstance(definitions, dict):
+            self._templates.update(definitions)
+        if not self._templates:
+            return payload
+        out: dict[str, Any] = {}
+        for key, value in payload.items():
+            if key == "templates":
+                continue
+            if key in _TREE_SLOTS and isinstance(value, dict):
+                value = self._node(value)
+            elif key == "ops" and isinstance(value, list):
+                value = [self._op(op) if isinstance(op, dict) else op for op in value]
+            out[key] = value
+        return out
+
+    def _node(self, node: dict[str, Any]) -> dict[str, Any]:
+        template_id = node.get("template")
+        if template_id is not None and "type" not in node:
+            return expand_template_node(self._templates[template_id], node["id"], node.get("values") or [])
+        children = node.get("children")
+        if not children:
+            return node
+        return {**node, "children": [self._node(child) if isinstance(child, dict) else child for child in children]}
+
+    def _op(self, op: dict[str, Any]) -> dict[str, Any]:
+        if isinstance(op.get("node"), dict):
+            return {**op, "node": self._node(op["node"])}
+        if isinstance(op.get("children"), list):
+            return {**op, "children": [self._node(child) if isinstance(child, dict) else child for child in op["children"]]}
+        return op
@@ -87,6 +87,17 @@ class RuntimePlan:
     hello_timeout: float | None
     first_render_timeout: float | None
     auto_install: bool
+    production: bool | None = None
+    compression: bool = True
+    compression_threshold: int = 1024
+    chunk_size: int | None = 256 * 1024
+    send_queue_limit: int = 256
+    multi_client: bool = False
+    max_clients: int | None = None
+    broadcast: bool = False
+    max_frames_in_flight: int = 3
+    resume_timeout: float | None = 30.0
+    resume_log_size: int = 256
 
     def as_app_config_kwargs(self) -> dict[str, Any]:
         return {
@@ -99,6 +110,17 @@ class RuntimePlan:
             "target_fps": self.target_fps,
             "hello_timeout": self.hello_timeout,
             "first_render_timeout": self.first_render_timeout,
+            "production": self.production,
+            "compression": self.compression,
+            "compression_threshold": self.compression_threshold,
+            "chunk_size": self.chunk_size,
+            "send_queue_limit": self.send_queue_limit,
+            "multi_client": self.multi_client,
+            "max_clients": self.max_clients,
+            "broadcast": self.broadcast,
+            "max_frames_in_flight": self.max_frames_in_flight,
+            "resume_timeout": self.resume_timeout,
+            "resume_log_size": self.resume_log_size,
         }
 
     def local_endpoints(self) -> list[str]:
@@ -116,6 +138,17 @@ _ALLOWED_TARGET_SETTING_KEYS = {
     "hello_timeout",
     "first_render_timeout",
     "auto_install",
+    "production",
+    "compression",
+    "compression_threshold",
+    "chunk_size",
+    "send_queue_limit",
+    "multi_client",
+    "max_clients",
+    "broadcast",
+    "max_frames_in_flight",
+    "resume_timeout",
+    "resume_log_size",
 }
 
 
@@ -234,6 +267,17 @@ def build_runtime_plan(
         "hello_timeout": 10.0,
         "first_render_timeout": 10.0,
         "auto_install": profile.default_auto_install,
+        "production": None,
+        "compression": True,
+        "compression_threshold": 1024,
+        "chunk_size": 256 * 1024,
+        "send_queue_limit": 256,
+        "multi_client": False,
+        "max_clients": None,
+        "broadcast": False,
+        "max_frames_in_flight": 3,
+        "resume_timeout": 30.0,
+        "resume_log_size": 256,
     }
     settings.update(config.defaults_for_target(resolved_target))
     if overrides:
@@ -252,6 +296,22 @@ def build_runtime_plan(
         field_name="first_render_timeout",
     )
     auto_install = bool(settings.get("auto_install", profile.default_auto_install))
+    production = _coerce_optional_bool(settings.get("production"), field_name="production")
+    compression = bool(settings.get("compression", True))
+    compression_threshold = _coerce_non_negative_int(
+        settings.get("compression_threshold"),
+        field_name="compression_threshold",
+    )
+    chunk_size = _coerce_optional_positive_int(settings.get("chunk_size"), field_name="chunk_size")
+    send_queue_limit = _coerce_positive_int(settings.get("send_queue_limit"), field_name="send_queue_limit")
+    multi_client = bool(settings.get("multi_client", False))
+    max_clients = _coerce_optional_positive_int(settings.get("max_clients"), field_name="max_clients")
+    broadcast = bool(settings.get("broadcast", False))
+    max_frames_in_flight = _coerce_positive_int(
+        settings.get("max_frames_in_flight"), field_name="max_frames_in_flight"
+    )
+    resume_timeout = _coerce_optional_float(settings.get("resume_timeout"), field_name="resume_timeout")
+    resume_log_size = _coerce_positive_int(settings.get("resume_log_size"), field_name="resume_log_size")
 
     return RuntimePlan(
         target=resolved_target,
@@ -268,6 +328,17 @@ def build_runtime_plan(
         hello_timeout=hello_timeout,
         first_render_timeout=first_render_timeout,
         auto_install=auto_install,
+        production=production,
+        compression=compression,
+        compression_threshold=compression_threshold,
+        chunk_size=chunk_size,
+        send_queue_limit=send_queue_limit,
+        multi_client=multi_client,
+        max_clients=max_clients,
+        broadcast=broadcast,
+        max_frames_in_flight=max_frames_in_flight,
+        resume_timeout=resume_timeout,
+        resume_log_size=resume_log_size,
     )
 
 
@@ -357,6 +428,34 @@ def _coerce_positive_int(value: Any, *, field_name: str) -> int:
     return out
 
 
+def _coerce_non_negative_int(value: Any, *, field_name: str) -> int:
+    try:
+        out = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{field_name} must be an integer.") from exc
+    if out < 0:
+        raise ValueError(f"{field_name} must be 0 or greater.")
+    return out
+
+
+def _coerce_optional_positive_int(value: Any, *, field_name: str) -> int | None:
+    if value is None:
+        return None
+    return _coerce_positive_int(value, field_name=field_name)
+
+
+def _coerce_optional_bool(value: Any, *, field_name: str) -> bool | None:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized in {"1", "true", "yes", "on"}:
+            return True
+        if normalized in {"0", "false", "no", "off"}:
+            return False
+    raise ValueError(f"{field_name} must be a boolean or null.")
+
+
 def _coerce_optional_float(value: Any, *, field_name: str) -> float | None:
     if value is None:
         return None
@@ -1,3 +1,5 @@
-from .websocket import WebSocketRuntimeServer
+from .apply_log import ApplyLog
+from .broadcast import BroadcastGroup
+from .websocket import RuntimeConnection, WebSocketRuntimeServer
 
-__all__ = ["WebSocketRuntimeServer"]
\ No newline at end of file
+__all__ = ["ApplyLog", "BroadcastGroup", "RuntimeConnection", "WebSocketRuntimeServer"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+__all__ = ["ApplyLog"]
+
+
+class ApplyLog:
+    """Bounded ring of sequenced ``ui.apply`` payloads for resuming runtimes.
+
+    ``since(seq)`` returns the payloads a runtime that applied up to ``seq``
+    is missing, or ``None`` when that point has fallen out of the ring (or
+    precedes the last ``ui.reset``) and a full snapshot is needed instead.
+    The ring holds at most ``capacity`` batches and roughly ``max_weight``
+    control nodes.
+    """
+
+    def __init__(self, capacity: int = 256, *, max_weight: int = 50_000) -> None:
+        self.capacity = max(1, int(capacity))
+        self.max_weight = max(1, int(max_weight))
+        self._entries: deque[tuple[int, dict[str, Any], int]] = deque()
+        self._weight = 0
+        # Runtimes that applied at least ``_floor`` can be replayed.
+        self._floor = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def last_seq(self) -> int:
+        return self._entries[-1][0] if self._entries else self._floor
+
+    def append(self, seq: int, payload: dict[str, Any], *, weight: int = 1) -> None:
+        weight = max(1, int(weight))
+        self._entries.append((seq, payload, weight))
+        self._weight += weight
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.capacity or self._weight > self.max_weight
+        ):
+            old_seq, _, old_weight = self._entries.popleft()
+            self._weight -= old_weight
+            self._floor = old_seq
+            self.evicted += 1
+
+    def clear(self, seq: int) -> None:
+        """Forget every batch; only runtimes at ``seq`` or later can resume."""
+        self._entries.clear()
+        self._weight = 0
+        self._floor = seq
+
+    def since(self, seq: int) -> list[dict[str, Any]] | None:
+        if seq < self._floor or seq > self.last_seq:
+            return None
+        return [payload for entry_seq, payload, _ in self._entries if entry_seq > seq]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "weight": self._weight,
+            "floor": self._floor,
+            "last_seq": self.last_seq,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Callable, Literal
+
+from ..protocol.codec import build_message
+from .websocket import RuntimeConnection, WebSocketRuntimeServer
+
+__all__ = ["BroadcastGroup", "SlowConsumerPolicy"]
+
+_log = logging.getLogger(__name__)
+
+SlowConsumerPolicy = Literal["resync", "drop"]
+
+
+class BroadcastGroup:
+    """Fan one session's messages out to every connection of a server.
+
+    Each message is encoded once per negotiated codec and the same frame is
+    queued on every connection, so the cost of an update does not grow with
+    the number of runtimes beyond one queue append per connection.
+
+    A connection whose backlog reaches ``max_lag`` messages is a slow
+    consumer. With ``slow_policy="resync"`` its queued updates are dropped,
+    it is skipped until its socket drains, and it then receives a fresh
+    snapshot from ``snapshot``. With ``"drop"`` it is disconnected.
+
+    The group exposes the `WebSocketRuntimeServer` surface used by
+    `ButterflyUISession`; its capabilities are those shared by every
+    subscriber.
+    """
+
+    def __init__(
+        self,
+        server: WebSocketRuntimeServer,
+        *,
+        max_lag: int = 32,
+        slow_policy: SlowConsumerPolicy = "resync",
+        snapshot: Callable[[], dict[str, Any] | None] | None = None,
+    ) -> None:
+        if slow_policy not in ("resync", "drop"):
+            raise ValueError("slow_policy must be 'resync' or 'drop'.")
+        self._server = server
+        self.max_lag = max(1, int(max_lag))
+        self.slow_policy = slow_policy
+        self.snapshot = snapshot
+        self._session_id = uuid.uuid4().hex
+        self._connections: dict[str, RuntimeConnection] = {}
+        self._lagging: dict[str, asyncio.Task[None]] = {}
+        self._closed = asyncio.Event()
+        self._on_event: Callable[..., Any] | None = None
+        self._on_result: Callable[..., Any] | None = None
+        self._on_applied: Callable[..., Any] | None = None
+        self.broadcasts = 0
+        self.encodes = 0
+        self.resyncs = 0
+        self.dropped_connections = 0
+
+    @property
+    def server(self) -> WebSocketRuntimeServer:
+        return self._server
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
+    @property
+    def host(self) -> str:
+        return self._server.host
+
+    @property
+    def port(self) -> int:
+        return self._server.port
+
+    @property
+    def url(self) -> str:
+        return self._server.url
+
+    @property
+    def target_fps(self) -> int:
+        return self._server.target_fps
+
+    @property
+    def connections(self) -> tuple[RuntimeConnection, ...]:
+        return tuple(self._live().values())
+
+    @property
+    def capabilities(self) -> frozenset[str]:
+        """Capabilities negotiated by every subscribed runtime."""
+        shared: frozenset[str] | None = None
+        for connection in self._live().values():
+            caps = connection.capabilities
+            shared = caps if shared is None else shared & caps
+        return shared or frozenset()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connections": len(self._live()),
+            "lagging": len(self._lagging),
+            "broadcasts": self.broadcasts,
+            "encodes": self.encodes,
+            "resyncs": self.resyncs,
+            "dropped_connections": self.dropped_connections,
+        }
+
+    async def start(self) -> None:
+        self._server._on_connect = self.add
+        await self._server.start()
+
+    async def stop(self) -> None:
+        for task in list(self._lagging.values()):
+            task.cancel()
+        self._lagging.clear()
+        await self._server.stop()
+        self._closed.set()
+
+    async def wait_for_hello(self, *, timeout: float | None = None) -> dict[str, Any] | None:
+        # Runtimes join and leave at any time; the session never waits for one.
+        return {}
+
+    async def wait_for_disconnect(self) -> None:
+        await self._closed.wait()
+
+    def add(self, connection: RuntimeConnection) -> None:
+        """Subscribe a connection and send it the current snapshot."""
+        connection._on_event = self._dispatch_event
+        connection._on_result = self._dispatch_result
+        connection._on_applied = self._dispatch_applied
+        self._connections[connection.session_id] = connection
+        self._send_snapshot(connection)
+
+    def discard(self, connection: RuntimeConnection) -> None:
+        self._connections.pop(connection.session_id, None)
+        task = self._lagging.pop(connection.session_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def send(
+        self,
+        msg_type: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        msg_id: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        """Encode a message once per codec and queue it on every connection."""
+        message = build_message(msg_type, payload or {}, msg_id=msg_id, reply_to=reply_to)
+        frames: dict[str, str | bytes] = {}
+        self.broadcasts += 1
+        for session_id, connection in list(self._live().items()):
+            if session_id in self._lagging:
+                continue
+            if connection.backlog >= self.max_lag:
+                self._lag(connection)
+                continue
+            codec = connection._codec
+            data = frames.get(codec.name)
+            if data is None:
+                data = frames[codec.name] = codec.encode(message)
+                self.encodes += 1
+            connection._send_encoded(message, data)
+
+    async def flush(self) -> None:
+        await asyncio.gather(*(connection.flush() for connection in self._live().values()))
+
+    def _live(self) -> dict[str, RuntimeConnection]:
+        connections = self._connections
+        for session_id, connection in list(connections.items()):
+            if not connection.connected:
+                self.discard(connection)
+        return connections
+
+    def _send_snapshot(self, connection: RuntimeConnection) -> None:
+        payload = self.snapshot() if self.snapshot is not None else None
+        codec = connection._codec
+        messages = [build_message("ui.reset", {})]
+        if payload:
+            messages.append(build_message("ui.apply", payload))
+        messages.append(build_message("runtime.ready", {"session_id": self._session_id}))
+        for message in messages:
+            connection._send_encoded(message, codec.encode(message))
+
+    def _lag(self, connection: RuntimeConnection) -> None:
+        if self.slow_policy == "drop":
+            self.dropped_connections += 1
+            self.discard(connection)
+            asyncio.get_running_loop().create_task(connection.close(code=1013, reason="Too slow"))
+            return
+        connection._queue.discard()
+        self._lagging[connection.session_id] = asyncio.get_running_loop().create_task(
+            self._resync(connection)
+        )
+
+    async def _resync(self, connection: RuntimeConnection) -> None:
+        try:
+            await connection.flush()
+            if connection.connected:
+                self.resyncs += 1
+                self._send_snapshot(connection)
+        except asyncio.CancelledError:
+            return
+        except Exception as exc:
+            _log.exception("Broadcast resync failed: %s", exc)
+        finally:
+            if self._lagging.get(connection.session_id) is asyncio.current_task():
+                del self._lagging[connection.session_id]
+
+    def _dispatch_event(self, payload: dict[str, Any]) -> None:
+        if self._on_event is not None:
+            self._on_event(payload)
+
+    def _dispatch_result(self, payload: dict[str, Any], reply_to: str | None) -> None:
+        if self._on_result is not None:
+            self._on_result(payload, reply_to)
+
+    def _dispatch_applied(self, payload: dict[str, Any]) -> None:
+        if self._on_applied is not None:
+            self._on_applied(payload)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from websockets.extensions.base import ServerExtensionFactory
+from websockets.extensions.permessage_deflate import (
+    PerMessageDeflate,
+    ServerPerMessageDeflateFactory,
+)
+from websockets.frames import CTRL_OPCODES, Frame, Opcode
+
+__all__ = ["ThresholdPerMessageDeflate", "threshold_deflate_extensions"]
+
+
+class ThresholdPerMessageDeflate(PerMessageDeflate):
+    """permessage-deflate that leaves messages below ``threshold`` bytes as-is.
+
+    RFC 7692 lets the sender choose per message whether to compress; skipped
+    messages go out with RSV1 unset and do not touch the compression context.
+    """
+
+    def __init__(self, *args: Any, threshold: int = 0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.threshold = max(0, int(threshold))
+        self._passthrough = False
+
+    def encode(self, frame: Frame) -> Frame:
+        if frame.opcode in CTRL_OPCODES:
+            return frame
+        if frame.opcode is not Opcode.CONT:
+            self._passthrough = len(frame.data) < self.threshold
+        if self._passthrough:
+            return frame
+        return super().encode(frame)
+
+
+class _ThresholdDeflateFactory(ServerPerMessageDeflateFactory):
+    def __init__(self, *, threshold: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.threshold = threshold
+
+    def process_request_params(self, params: Any, accepted_extensions: Any) -> Any:
+        response, extension = super().process_request_params(params, accepted_extensions)
+        return response, ThresholdPerMessageDeflate(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+            threshold=self.threshold,
+        )
+
+
+def threshold_deflate_extensions(threshold: int) -> Sequence[ServerExtensionFactory]:
+    """Server extensions for permessage-deflate with a minimum message size.
+
+    Window and memory settings match the websockets defaults.
+    """
+    return [
+        _ThresholdDeflateFactory(
+            threshold=threshold,
+            server_max_window_bits=12,
+            client_max_window_bits=12,
+            compress_settings={"memLevel": 5},
+        )
+    ]
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from ..protocol.message import RuntimeMessage
+
+__all__ = [
+    "PRIORITY_CONTROL",
+    "PRIORITY_DIAGNOSTICS",
+    "PRIORITY_UI",
+    "QueuedMessage",
+    "SendQueue",
+    "message_priority",
+]
+
+PRIORITY_CONTROL = 0
+PRIORITY_UI = 1
+PRIORITY_DIAGNOSTICS = 2
+
+_DIAGNOSTIC_TYPES = {"runtime.problem", "runtime.log", "runtime.stats"}
+# Invokes and runtime.ready may refer to controls created by a queued apply,
+# so they stay ordered with the UI stream.
+_ORDERED_TYPES = {"invoke", "runtime.ready"}
+_TREE_KEYS = {"root", "screen", "overlay", "splash"}
+
+
+def message_priority(msg_type: str) -> int:
+    """Map a message type to its send priority.
+
+    Handshake traffic goes first, then the UI stream, then diagnostics. UI
+    messages are never reordered among themselves: a patch may target a node
+    introduced by an earlier apply, and an apply sent after a patch would
+    overwrite the patched values.
+    """
+    if msg_type.startswith("ui.") or msg_type in _ORDERED_TYPES:
+        return PRIORITY_UI
+    if msg_type in _DIAGNOSTIC_TYPES:
+        return PRIORITY_DIAGNOSTICS
+    return PRIORITY_CONTROL
+
+
+@dataclass(slots=True)
+class QueuedMessage:
+    message: RuntimeMessage
+    priority: int
+    codec: Any = None
+    # Frame already encoded with ``codec`` (broadcasts encode once for all
+    # connections).
+    data: Any = None
+
+
+def _is_full_apply(message: RuntimeMessage) -> bool:
+    payload = message.payload
+    return (
+        message.type == "ui.apply"
+        and "ops" not in payload
+        and "patches" not in payload
+        and any(key in payload for key in _TREE_KEYS)
+    )
+
+
+def _is_patch_batch(message: RuntimeMessage) -> bool:
+    payload = message.payload
+    return (
+        message.type == "ui.apply"
+        and "patches" in payload
+        and len(payload) == (2 if "seq" in payload else 1)
+    )
+
+
+class SendQueue:
+    """Bounded priority queue feeding a connection's single writer task.
+
+    ``put`` waits while more than ``high_water`` UI/diagnostic messages are
+    queued; control messages are never held back. Queued UI messages are
+    coalesced: a full ``ui.apply`` replaces queued full applies directly
+    before it whose keys it covers, and consecutive patch batches merge.
+    """
+
+    def __init__(self, *, high_water: int = 256) -> None:
+        self.high_water = max(1, int(high_water))
+        self._queues: tuple[deque[QueuedMessage], ...] = (deque(), deque(), deque())
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._in_flight = 0
+        self._closed = False
+        self.peak_depth = 0
+        self.enqueued = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.blocked = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _bounded_depth(self) -> int:
+        return len(self._queues[PRIORITY_UI]) + len(self._queues[PRIORITY_DIAGNOSTICS])
+
+    async def put(self, message: RuntimeMessage, *, codec: Any = None) -> None:
+        priority = message_priority(message.type)
+        if priority != PRIORITY_CONTROL:
+            while not self._closed and self._bounded_depth() >= self.high_water:
+                self.blocked += 1
+                self._space.clear()
+                await self._space.wait()
+        self.put_nowait(message, codec=codec, priority=priority)
+
+    def put_nowait(
+        self,
+        message: RuntimeMessage,
+        *,
+        codec: Any = None,
+        priority: int | None = None,
+        data: Any = None,
+    ) -> None:
+        if self._closed:
+            self.dropped += 1
+            return
+        if priority is None:
+            priority = message_priority(message.type)
+        queue = self._queues[priority]
+        self.enqueued += 1
+        if priority == PRIORITY_UI and codec is None and self._coalesce(queue, message):
+            return
+        queue.append(QueuedMessage(message, priority, codec, data))
+        self._idle.clear()
+        self._ready.set()
+        depth = len(self)
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+
+    def _coalesce(self, queue: deque[QueuedMessage], message: RuntimeMessage) -> bool:
+        if not queue:
+            return False
+        if _is_patch_batch(message):
+            tail = queue[-1]
+            if tail.codec is None and _is_patch_batch(tail.message):
+                patches = list(tail.message.payload["patches"]) + list(message.payload["patches"])
+                payload: dict[str, Any] = {"patches": patches}
+                if "seq" in message.payload:
+                    # Acks are cumulative, so the merged batch takes the later seq.
+                    payload["seq"] = message.payload["seq"]
+                tail.message = RuntimeMessage(type="ui.apply", payload=payload)
+                self.coalesced += 1
+                return True
+            return False
+        if _is_full_apply(message):
+            keys = set(message.payload)
+            while queue:
+                tail = queue[-1]
+                if tail.codec is not None or not _is_full_apply(tail.message):
+                    break
+                if not set(tail.message.payload) <= keys:
+                    break
+                queue.pop()
+                self.coalesced += 1
+                self._release_space()
+        return False
+
+    async def get(self) -> QueuedMessage:
+        while True:
+            entry = self.get_nowait()
+            if entry is not None:
+                return entry
+            if self._closed:
+                raise asyncio.CancelledError
+            self._ready.clear()
+            await self._ready.wait()
+
+    def get_nowait(self, *, max_priority: int = PRIORITY_DIAGNOSTICS) -> QueuedMessage | None:
+        for priority in range(max_priority + 1):
+            queue = self._queues[priority]
+            if queue:
+                entry = queue.popleft()
+                self._in_flight += 1
+                self._release_space()
+                return entry
+        return None
+
+    def task_done(self) -> None:
+        self._in_flight -= 1
+        self.sent += 1
+        if self._in_flight <= 0 and not len(self):
+            self._in_flight = 0
+            self._idle.set()
+
+    def _release_space(self) -> None:
+        if self._bounded_depth() < self.high_water:
+            self._space.set()
+
+    def discard(self, priority: int = PRIORITY_UI) -> int:
+        """Drop every queued message of ``priority``; returns how many."""
+        queue = self._queues[priority]
+        count = len(queue)
+        queue.clear()
+        self.dropped += count
+        self._release_space()
+        if self._in_flight <= 0 and not len(self):
+            self._idle.set()
+        return count
+
+    async def join(self) -> None:
+        """Wait until every queued message has been written."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Drop queued messages and release waiting producers and the writer."""
+        self._closed = True
+        for queue in self._queues:
+            self.dropped += len(queue)
+            queue.clear()
+        self._in_flight = 0
+        self._space.set()
+        self._ready.set()
+        self._idle.set()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": len(self),
+            "depth_control": len(self._queues[PRIORITY_CONTROL]),
+            "depth_ui": len(self._queues[PRIORITY_UI]),
+            "depth_diagnostics": len(self._queues[PRIORITY_DIAGNOSTICS]),
+            "high_water": self.high_water,
+            "peak_depth": self.peak_depth,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "blocked": self.blocked,
+            "dropped": self.dropped,
+        }
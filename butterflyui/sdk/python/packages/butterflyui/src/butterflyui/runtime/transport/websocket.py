@@ -8,13 +8,326 @@ from typing import Any
 from websockets import ServerConnection, serve
 from websockets.exceptions import ConnectionClosed
 
-from ..protocol.codec import decode_message, encode_message, build_message
+from ..protocol.capabilities import (
+    SERVER_CAPABILITIES,
+    UI_ARRAYS,
+    UI_CHUNKS,
+    UI_STRINGS,
+    UI_TEMPLATES,
+    negotiate_capabilities,
+)
+from ..protocol.arrays import encode_arrays
+from ..protocol.chunks import CHUNK_MESSAGE, split_encoded
+from ..protocol.codec import (
+    JSON_CODEC,
+    build_message,
+    decode_message,
+    negotiate_codec,
+    server_codecs,
+)
+from ..protocol.message import RuntimeMessage
+from ..protocol.strings import StringTable
+from ..protocol.templates import TemplateTable
+
+from .deflate import threshold_deflate_extensions
+from .send_queue import PRIORITY_CONTROL, QueuedMessage, SendQueue
 
 _log = logging.getLogger(__name__)
 
 
+class RuntimeConnection:
+    """One connected runtime: its socket, send queue, writer task and handshake.
+
+    Exposes the same `send`/`wait_for_hello`/`wait_for_disconnect` surface as
+    `WebSocketRuntimeServer`, so a `ButterflyUISession` can be bound to a
+    single connection of a multi-client server.
+    """
+
+    def __init__(self, server: "WebSocketRuntimeServer", ws: ServerConnection) -> None:
+        self._server = server
+        self._ws: ServerConnection | None = ws
+        self._session_id = uuid.uuid4().hex
+        self._hello_event = asyncio.Event()
+        self._disconnect_event = asyncio.Event()
+        self._hello_payload: dict[str, Any] | None = None
+        self._capabilities: frozenset[str] = frozenset()
+        self._codec = JSON_CODEC
+        self._queue = SendQueue(high_water=server.send_queue_limit)
+        self._writer: asyncio.Task[None] | None = None
+        self._chunk_stream = 0
+        self._strings: StringTable | None = None
+        self._templates: TemplateTable | None = None
+        self._on_event: callable | None = None
+        self._on_result: callable | None = None
+        self._on_applied: callable | None = None
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
+    @property
+    def target_fps(self) -> int:
+        return self._server.target_fps
+
+    @property
+    def capabilities(self) -> frozenset[str]:
+        """Capabilities negotiated with this runtime."""
+        return self._capabilities
+
+    @property
+    def codec_name(self) -> str:
+        """Wire codec negotiated with this runtime."""
+        return self._codec.name
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def remote_address(self) -> Any:
+        ws = self._ws
+        return ws.remote_address if ws is not None else None
+
+    @property
+    def backlog(self) -> int:
+        """Queued UI/diagnostic messages not yet written."""
+        return self._queue._bounded_depth()
+
+    def send_queue_stats(self) -> dict[str, Any]:
+        """Depth and throughput counters of this connection's send queue."""
+        return self._queue.stats()
+
+    async def start(self) -> None:
+        """No-op; the connection is started by its server."""
+
+    async def stop(self) -> None:
+        await self.close()
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        if self._ws is not None:
+            await self._ws.close(code=code, reason=reason)
+
+    async def wait_for_hello(self, *, timeout: float | None = None) -> dict[str, Any] | None:
+        try:
+            await asyncio.wait_for(self._hello_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._hello_payload
+
+    async def wait_for_disconnect(self) -> None:
+        await self._disconnect_event.wait()
+
+    async def send(
+        self,
+        msg_type: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        msg_id: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        """Queue a message for this connection's writer task.
+
+        Returns once the message is queued. Waits while the send queue is
+        above its high-water mark (see `send_queue_limit`), so a slow runtime
+        slows producers down instead of growing memory.
+        """
+        if self._ws is None:
+            return
+        message = build_message(msg_type, payload or {}, msg_id=msg_id, reply_to=reply_to)
+        await self._queue.put(message)
+
+    def send_nowait(
+        self,
+        msg_type: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        msg_id: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        """Queue a message without waiting for queue space.
+
+        For replies that must be ordered before anything a producer sends
+        next, such as a resume replay right after the hello.
+        """
+        if self._ws is None:
+            return
+        message = build_message(msg_type, payload or {}, msg_id=msg_id, reply_to=reply_to)
+        self._queue.put_nowait(message)
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been written to the socket."""
+        await self._queue.join()
+
+    def _send_encoded(self, message: RuntimeMessage, data: str | bytes) -> None:
+        # `data` must be encoded with this connection's codec.
+        if self._ws is not None:
+            self._queue.put_nowait(message, codec=self._codec, data=data)
+
+    async def _serve(self) -> None:
+        ws = self._ws
+        self._writer = asyncio.create_task(self._write_loop(ws, self._queue))
+        try:
+            async for raw in ws:
+                await self._handle_message(raw)
+        except ConnectionClosed as exc:
+            _log.info("Runtime disconnected: %s", exc)
+        except Exception as exc:
+            _log.exception("Runtime transport error: %s", exc)
+        finally:
+            self._queue.close()
+            if self._writer is not None:
+                self._writer.cancel()
+                self._writer = None
+            self._ws = None
+            self._disconnect_event.set()
+
+    async def _write_loop(self, ws: ServerConnection, queue: SendQueue) -> None:
+        try:
+            while True:
+                entry = await queue.get()
+                try:
+                    await self._write(ws, queue, entry)
+                finally:
+                    queue.task_done()
+        except (asyncio.CancelledError, ConnectionClosed):
+            pass
+        except Exception as exc:
+            _log.exception("Runtime writer error: %s", exc)
+
+    async def _write(self, ws: ServerConnection, queue: SendQueue, entry: QueuedMessage) -> None:
+        message = entry.message
+        codec = entry.codec or self._codec
+        data = entry.data
+        attachments: list[memoryview] = []
+        if data is None:
+            try:
+                arrays = UI_ARRAYS in self._capabilities
+                if message.type == "ui.apply" and (
+                    self._strings is not None or self._templates is not None or arrays
+                ):
+                    # Encoded here so table entries reach the runtime in
+                    # the order they were added. Pre-encoded frames (shared
+                    # broadcasts) go out plain.
+                    payload = message.payload
+                    if self._templates is not None:
+                        payload = self._templates.encode_apply(payload)
+                    if arrays:
+                        payload, attachments = encode_arrays(payload)
+                    if self._strings is not None:
+                        payload = self._strings.encode_apply(payload)
+                    message = RuntimeMessage(message.type, payload, message.id, message.reply_to)
+                data = codec.encode(message)
+            except Exception as exc:
+                _log.exception("Failed to encode %s: %s", message.type, exc)
+                return
+        chunk_size = self._server.chunk_size
+        if (
+            chunk_size is None
+            or len(data) <= chunk_size
+            or not message.type.startswith("ui.")
+            or UI_CHUNKS not in self._capabilities
+        ):
+            await ws.send(data)
+            for attachment in attachments:
+                await ws.send(attachment)
+            return
+        self._chunk_stream += 1
+        stream = self._chunk_stream
+        pieces = split_encoded(data, chunk_size)
+        for index, piece in enumerate(pieces):
+            chunk = build_message(
+                CHUNK_MESSAGE,
+                {"stream": stream, "index": index, "count": len(pieces), "data": piece},
+            )
+            await ws.send(codec.encode(chunk))
+            if index + 1 == len(pieces):
+                # Attachments follow the last slice before anything else.
+                for attachment in attachments:
+                    await ws.send(attachment)
+            # Handshake messages are not held back by a long stream.
+            while (urgent := queue.get_nowait(max_priority=PRIORITY_CONTROL)) is not None:
+                try:
+                    await self._write(ws, queue, urgent)
+                finally:
+                    queue.task_done()
+
+    def _callback(self, name: str) -> callable | None:
+        callback = getattr(self, name)
+        if callback is None:
+            callback = getattr(self._server, name)
+        return callback
+
+    async def _handle_message(self, raw: str | bytes) -> None:
+        message = decode_message(raw)
+        if message.type == "runtime.hello":
+            payload = message.payload or {}
+            token = payload.get("token")
+            server = self._server
+            if server.require_token and (token is None or str(token) != str(server.token)):
+                await self.close(code=1008, reason="Invalid token")
+                return
+
+            self._hello_payload = payload
+            self._capabilities = negotiate_capabilities(payload.get("capabilities"))
+            self._strings = StringTable() if UI_STRINGS in self._capabilities else None
+            self._templates = TemplateTable() if UI_TEMPLATES in self._capabilities else None
+            codec = negotiate_codec(payload.get("codecs"))
+
+            client_protocol_raw = payload.get("protocol")
+            try:
+                client_protocol = int(client_protocol_raw)
+            except Exception:
+                client_protocol = None
+
+            ack_payload = {
+                "protocol": int(server.protocol),
+                "client_protocol": client_protocol,
+                "session_id": self._session_id,
+                "server": "python",
+                "target_fps": server.target_fps,
+                "capabilities": sorted(SERVER_CAPABILITIES),
+                "codecs": server_codecs(),
+                "codec": codec.name,
+            }
+            reply_to = message.id
+            ack = build_message("runtime.hello_ack", ack_payload, reply_to=reply_to)
+            # The ack is always JSON; frames written after it use the
+            # negotiated codec.
+            self._queue.put_nowait(ack, codec=JSON_CODEC)
+            self._codec = codec
+            self._hello_event.set()
+            server._hello_received(self)
+            return
+
+        if message.type == "ui.event":
+            callback = self._callback("_on_event")
+            if callback is not None:
+                callback(message.payload or {})
+            return
+
+        if message.type == "invoke.result":
+            callback = self._callback("_on_result")
+            if callback is not None:
+                callback(message.payload or {}, message.reply_to)
+            return
+
+        if message.type == "ui.applied":
+            callback = self._callback("_on_applied")
+            if callback is not None:
+                callback(message.payload or {})
+            return
+
+
 class WebSocketRuntimeServer:
-    """Transport-only WebSocket server that handles runtime.hello/ack."""
+    """Transport-only WebSocket server that handles runtime.hello/ack.
+
+    Every socket gets its own `RuntimeConnection`. Without `on_connect` the
+    server behaves as a single-client transport: `send()` and the other
+    session-level methods target the connection that said hello last, and
+    `on_hello` is called with each hello payload. With
+    `on_connect`, each connection is handed over after its hello and routes
+    its messages to its own callbacks.
+    """
 
     def __init__(
         self,
@@ -26,9 +339,16 @@ class WebSocketRuntimeServer:
         require_token: bool = False,
         protocol: int = 1,
         target_fps: int = 60,
+        compression: bool = True,
+        compression_threshold: int = 1024,
+        chunk_size: int | None = 256 * 1024,
+        send_queue_limit: int = 256,
+        max_connections: int | None = None,
         on_event: callable | None = None,
         on_result: callable | None = None,
         on_applied: callable | None = None,
+        on_connect: callable | None = None,
+        on_hello: callable | None = None,
     ) -> None:
         self.host = host
         self.port = port
@@ -37,20 +357,52 @@ class WebSocketRuntimeServer:
         self.require_token = require_token
         self.protocol = protocol
         self.target_fps = int(target_fps)
+        self.compression = bool(compression)
+        self.compression_threshold = max(0, int(compression_threshold))
+        self.chunk_size = int(chunk_size) if chunk_size else None
+        self.send_queue_limit = max(1, int(send_queue_limit))
+        self.max_connections = int(max_connections) if max_connections else None
         self._on_event = on_event
         self._on_result = on_result
         self._on_applied = on_applied
+        self._on_connect = on_connect
+        self._on_hello = on_hello
 
         self._server: Any | None = None
-        self._ws: ServerConnection | None = None
-        self._session_id: str | None = None
+        self._connections: dict[str, RuntimeConnection] = {}
+        self._primary: RuntimeConnection | None = None
         self._hello_event = asyncio.Event()
         self._disconnect_event = asyncio.Event()
         self._hello_payload: dict[str, Any] | None = None
 
     @property
     def session_id(self) -> str | None:
-        return self._session_id
+        primary = self._primary
+        return primary.session_id if primary is not None else None
+
+    @property
+    def capabilities(self) -> frozenset[str]:
+        """Capabilities negotiated with the connected runtime."""
+        primary = self._primary
+        return primary.capabilities if primary is not None else frozenset()
+
+    @property
+    def codec_name(self) -> str:
+        """Wire codec negotiated with the connected runtime."""
+        primary = self._primary
+        return primary.codec_name if primary is not None else JSON_CODEC.name
+
+    @property
+    def connections(self) -> tuple[RuntimeConnection, ...]:
+        """Open connections, oldest first."""
+        return tuple(self._connections.values())
+
+    def send_queue_stats(self) -> dict[str, Any]:
+        """Depth and throughput counters of the current connection's send queue."""
+        primary = self._primary
+        if primary is None:
+            return SendQueue(high_water=self.send_queue_limit).stats()
+        return primary.send_queue_stats()
 
     @property
     def url(self) -> str:
@@ -65,21 +417,30 @@ class WebSocketRuntimeServer:
             if self.path and path and path != self.path:
                 await ws.close(code=1008, reason="Invalid path")
                 return
-            self._ws = ws
-            self._session_id = uuid.uuid4().hex
+            if self.max_connections is not None and len(self._connections) >= self.max_connections:
+                await ws.close(code=1013, reason="Too many connections")
+                return
+            connection = RuntimeConnection(self, ws)
+            self._connections[connection.session_id] = connection
             _log.info("Runtime connected: %s", ws.remote_address)
             try:
-                async for raw in ws:
-                    await self._handle_message(raw)
-            except ConnectionClosed as exc:
-                _log.info("Runtime disconnected: %s", exc)
-            except Exception as exc:
-                _log.exception("Runtime transport error: %s", exc)
+                await connection._serve()
             finally:
-                self._disconnect_event.set()
-                self._ws = None
+                self._connections.pop(connection.session_id, None)
+                if self._primary is connection:
+                    self._primary = None
+                    self._disconnect_event.set()
 
-        self._server = await serve(_handler, self.host, self.port)
+        if self.compression:
+            self._server = await serve(
+                _handler,
+                self.host,
+                self.port,
+                compression=None,
+                extensions=threshold_deflate_extensions(self.compression_threshold),
+            )
+        else:
+            self._server = await serve(_handler, self.host, self.port, compression=None)
 
         if self._server.sockets:
             sock = self._server.sockets[0]
@@ -92,6 +453,24 @@ class WebSocketRuntimeServer:
         await self._server.wait_closed()
         self._server = None
 
+    def _hello_received(self, connection: RuntimeConnection) -> None:
+        self._hello_payload = connection._hello_payload
+        if self._on_connect is not None:
+            self._hello_event.set()
+            try:
+                self._on_connect(connection)
+            except Exception as exc:
+                _log.exception("Runtime connect handler failed: %s", exc)
+            return
+        self._primary = connection
+        self._disconnect_event.clear()
+        self._hello_event.set()
+        if self._on_hello is not None:
+            try:
+                self._on_hello(self._hello_payload or {})
+            except Exception as exc:
+                _log.exception("Runtime hello handler failed: %s", exc)
+
     async def wait_for_hello(self, *, timeout: float | None = None) -> dict[str, Any] | None:
         try:
             await asyncio.wait_for(self._hello_event.wait(), timeout=timeout)
@@ -110,58 +489,27 @@ class WebSocketRuntimeServer:
         msg_id: str | None = None,
         reply_to: str | None = None,
     ) -> None:
-        if self._ws is None:
+        """Queue a message for the current connection (see `RuntimeConnection.send`)."""
+        primary = self._primary
+        if primary is None:
             return
-        message = build_message(msg_type, payload or {}, msg_id=msg_id, reply_to=reply_to)
-        await self._ws.send(encode_message(message))
-
-    async def _handle_message(self, raw: str | bytes) -> None:
-        message = decode_message(raw)
-        if message.type == "runtime.hello":
-            payload = message.payload or {}
-            token = payload.get("token")
-            if self.require_token and (token is None or str(token) != str(self.token)):
-                await self._close_with_error("Invalid token")
-                return
-
-            self._hello_payload = payload
-            self._hello_event.set()
+        await primary.send(msg_type, payload, msg_id=msg_id, reply_to=reply_to)
 
-            client_protocol_raw = payload.get("protocol")
-            try:
-                client_protocol = int(client_protocol_raw)
-            except Exception:
-                client_protocol = None
-
-            ack_payload = {
-                "protocol": int(self.protocol),
-                "client_protocol": client_protocol,
-                "session_id": self._session_id,
-                "server": "python",
-                "target_fps": self.target_fps,
-            }
-            reply_to = message.id
-            ack = build_message("runtime.hello_ack", ack_payload, reply_to=reply_to)
-            if self._ws is not None:
-                await self._ws.send(encode_message(ack))
-            return
-
-        if message.type == "ui.event":
-            if self._on_event is not None:
-                self._on_event(message.payload or {})
-            return
-
-        if message.type == "invoke.result":
-            if self._on_result is not None:
-                self._on_result(message.payload or {}, message.reply_to)
-            return
-
-        if message.type == "ui.applied":
-            if self._on_applied is not None:
-                self._on_applied(message.payload or {})
-            return
+    def send_nowait(
+        self,
+        msg_type: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        msg_id: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        """Queue a message for the current connection without waiting."""
+        primary = self._primary
+        if primary is not None:
+            primary.send_nowait(msg_type, payload, msg_id=msg_id, reply_to=reply_to)
 
-    async def _close_with_error(self, reason: str) -> None:
-        if self._ws is None:
-            return
-        await self._ws.close(code=1008, reason=reason)
+    async def flush(self) -> None:
+        """Wait until every queued message has been written to the socket."""
+        primary = self._primary
+        if primary is not None:
+            await primary.flush()
@@ -0,0 +1,125 @@
+"""Shared helpers for the SDK tests: a recording server and a runtime mirror."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Iterable, Mapping
+
+from butterflyui.app import AppConfig, ButterflyUISession, Page
+from butterflyui.core.control import Control
+from butterflyui.core.diff import apply_tree_ops
+from butterflyui.runtime import set_current_session
+from butterflyui.runtime.protocol.codec import decode_message
+
+
+def plain(value: Any) -> Any:
+    """A deep copy of ``value`` with numeric arrays turned into lists."""
+    if isinstance(value, Mapping):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+
+class RecordingServer:
+    """Stands in for the websocket server: records every message a session sends.
+
+    ``sent`` holds plain copies taken at send time, so later changes to the
+    session's trees do not leak into them; ``raw`` holds the payloads as sent.
+    """
+
+    target_fps = 60
+
+    def __init__(self, capabilities: Iterable[str] = ()) -> None:
+        self.capabilities = frozenset(capabilities)
+        self.sent: list[tuple[str, Any]] = []
+        self.raw: list[tuple[str, Any]] = []
+
+    async def send(self, msg_type: str, payload: Any, **kwargs: Any) -> None:
+        self.send_nowait(msg_type, payload, **kwargs)
+
+    def send_nowait(self, msg_type: str, payload: Any, **kwargs: Any) -> None:
+        self.raw.append((msg_type, payload))
+        self.sent.append((msg_type, plain(payload)))
+
+    def applied(self, since: int = 0) -> list[dict[str, Any]]:
+        """The ``ui.apply`` payloads sent from message ``since`` on."""
+        return [payload for msg_type, payload in self.sent[since:] if msg_type == "ui.apply"]
+
+
+def control_classes() -> list[type[Control]]:
+    """Every control class the SDK defines, in a stable order."""
+    found: dict[type[Control], None] = {}
+    pending = list(Control.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if cls not in found:
+            found[cls] = None
+            pending.extend(cls.__subclasses__())
+    classes = [cls for cls in found if cls.__module__.startswith("butterflyui.")]
+    return sorted(classes, key=lambda cls: (cls.__module__, cls.__qualname__))
+
+
+def new_page(capabilities: Iterable[str] = (), **config: Any) -> tuple[RecordingServer, ButterflyUISession, Page]:
+    """A page on a fresh session that records what it sends; the session is made current."""
+    server = RecordingServer(capabilities)
+    session = ButterflyUISession(server, AppConfig(**config))
+    set_current_session(session)
+    return server, session, Page(session=session)
+
+
+def replay(payloads: Iterable[Mapping[str, Any]], tree: Mapping[str, Any] | None = None, slot: str = "root") -> Any:
+    """Apply ``ui.apply`` payloads the way the runtime does and return the ``slot`` tree."""
+    for payload in payloads:
+        if slot in payload:
+            tree = payload[slot]
+        patches = payload.get("patches") or ([payload["patch"]] if "patch" in payload else [])
+        for patch in patches:
+            try:
+                tree = apply_tree_ops(tree, [{"op": "props", "id": patch["id"], "props": patch["props"]}])
+            except KeyError:
+                # Like the runtime, skip patches for controls that are not mounted.
+                pass
+        if payload.get("ops"):
+            tree = apply_tree_ops(tree, payload["ops"])
+    return tree
+
+
+def find(node: Any, control_id: str) -> dict[str, Any] | None:
+    """The node with ``control_id`` in a control map tree."""
+    if not isinstance(node, Mapping):
+        return None
+    if node.get("id") == control_id:
+        return dict(node)
+    for child in node.get("children") or ():
+        found = find(child, control_id)
+        if found is not None:
+            return found
+    return None
+
+
+async def hello(
+    websocket: Any,
+    capabilities: Iterable[str] = (),
+    codecs: Iterable[str] = ("json",),
+    **payload: Any,
+) -> dict[str, Any]:
+    """Send a ``runtime.hello`` from a fake runtime and return the server's answer."""
+    hello_payload = {"capabilities": list(capabilities), "codecs": list(codecs), **payload}
+    await websocket.send(json.dumps({"type": "runtime.hello", "payload": hello_payload}))
+    return decode_message(await websocket.recv()).payload
+
+
+async def receive(websocket: Any, msg_type: str, timeout: float = 5.0) -> Any:
+    """Skip messages until one of ``msg_type`` arrives and return it."""
+
+    async def wait() -> Any:
+        while True:
+            message = decode_message(await websocket.recv())
+            if message.type == msg_type:
+                return message
+
+    return await asyncio.wait_for(wait(), timeout)
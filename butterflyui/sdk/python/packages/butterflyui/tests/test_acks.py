@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+
+import butterflyui as bui
+
+from helpers import find, new_page, replay
+
+
+async def _render(capabilities: set[str], **config: object):
+    server, session, page = new_page(capabilities, **config)
+    label = bui.Text("0")
+    page.root = bui.Column(label)
+    page.update()
+    await page.await_updates()
+    return server, session, label
+
+
+def test_flushes_wait_for_acks() -> None:
+    async def scenario() -> None:
+        server, session, label = await _render({"ui.ops", "ui.acks"}, max_frames_in_flight=2)
+        assert server.applied()[-1]["seq"] == 1
+        for value in range(1, 20):
+            session.update_props(label.control_id, {"text": str(value)})
+            await asyncio.sleep(0.01)
+        # The first render plus one patch batch fill the window; the rest waits.
+        assert [payload["seq"] for payload in server.applied()] == [1, 2]
+        stats = session.apply_stats()
+        assert stats["in_flight"] == 2 and stats["deferred_flushes"] == 1
+
+        session._handle_applied({"seq": 2})
+        await asyncio.sleep(0.05)
+        last = server.applied()[-1]
+        assert last["seq"] == 3
+        assert last["patches"] == [{"id": label.control_id, "props": {"text": "19"}}]
+        assert find(replay(server.applied()), label.control_id)["props"]["text"] == "19"
+        stats = session.apply_stats()
+        assert stats["acks"] == 1 and stats["acked_seq"] == 2 and stats["rtt_ms"] is not None
+
+    asyncio.run(scenario())
+
+
+def test_old_acks_are_ignored() -> None:
+    async def scenario() -> None:
+        server, session, label = await _render({"ui.ops", "ui.acks"})
+        session._handle_applied({"seq": 1})
+        session._handle_applied({"seq": 1})
+        session._handle_applied({"seq": 0})
+        assert session.apply_stats()["acks"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_runtimes_without_acks_keep_the_frame_cadence() -> None:
+    async def scenario() -> None:
+        server, session, label = await _render({"ui.ops"}, max_frames_in_flight=1)
+        for value in range(1, 10):
+            session.update_props(label.control_id, {"text": str(value)})
+            await asyncio.sleep(0.03)
+        payloads = server.applied()
+        assert len(payloads) > 5 and all("seq" not in payload for payload in payloads)
+        assert find(replay(payloads), label.control_id)["props"]["text"] == "9"
+
+    asyncio.run(scenario())
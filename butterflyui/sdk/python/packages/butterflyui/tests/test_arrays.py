@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import ctypes
+import json
+import struct
+from array import array
+
+import pytest
+
+import butterflyui as bui
+from butterflyui.core.arrays import NumericArray
+from butterflyui.runtime.protocol.arrays import decode_arrays, encode_arrays
+
+from helpers import plain
+
+
+def test_wraps_buffers_as_little_endian() -> None:
+    big = (ctypes.c_double.__ctype_be__ * 3)(1.5, 2.5, -3.0)
+    values = NumericArray(big)
+    assert values.dtype == "f64" and values.tolist() == [1.5, 2.5, -3.0]
+    assert bytes(values.buffer[:8]) == struct.pack("<d", 1.5)
+    assert NumericArray([1, 2, 3], dtype="i16").to_wire() == {"dtype": "i16", "length": 3}
+    points = NumericArray(array("f", [0, 1, 1, 2, 2, 4]), columns=2)
+    assert len(points) == 3 and points.tolist() == [[0, 1], [1, 2], [2, 4]]
+    with pytest.raises(ValueError):
+        NumericArray([1.0, 2.0, 3.0], columns=2)
+
+
+def test_auto_wrapped_arrays_are_copied() -> None:
+    values = array("d", [1, 2, 3])
+    chart = bui.LineChart(values=values)
+    sent = chart.to_json()["props"]["values"]
+    assert isinstance(sent, NumericArray)
+    values.append(4.0)
+    values[0] = 9.0
+    assert sent.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_explicit_arrays_share_the_buffer() -> None:
+    values = array("d", [1, 2, 3])
+    wrapped = NumericArray(values)
+    values[0] = 9.0
+    assert wrapped.tolist() == [9.0, 2.0, 3.0]
+    with pytest.raises(BufferError):
+        values.append(4.0)
+    assert NumericArray(values, copy=True).tolist() == [9.0, 2.0, 3.0]
+
+
+def test_attachments_round_trip() -> None:
+    chart = bui.LineChart(values=array("d", (index * 0.5 for index in range(1000))))
+    points = NumericArray(array("f", [0, 1, 1, 2]), columns=2)
+    payload = {"root": chart.to_json(), "patches": [{"id": "p", "props": {"points": points}}]}
+    body, attachments = encode_arrays(payload)
+    assert body["attachments"] == 2
+    wire = json.loads(json.dumps(body))
+    assert wire["root"]["props"]["values"] == {"$array": 0, "dtype": "f64", "length": 1000}
+    assert decode_arrays(wire, [bytes(frame) for frame in attachments]) == plain(payload)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import email.utils
+import http.client
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from butterflyui.assets import AssetServer, _parse_range
+
+
+def _request(
+    server: AssetServer, path: str, headers: dict[str, str] | None = None, method: str = "GET"
+) -> tuple[int, dict[str, str], bytes]:
+    connection = http.client.HTTPConnection(server.host, server.port)
+    connection.request(method, path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response.status, {key.lower(): value for key, value in response.getheaders()}, body
+
+
+def _path(server: AssetServer, url: str) -> str:
+    return url.split(str(server.port), 1)[1]
+
+
+def _read_bytes() -> int | None:
+    """Bytes this process has read so far (Linux only)."""
+    try:
+        with open("/proc/self/io") as handle:
+            for line in handle:
+                if line.startswith("rchar"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+@pytest.fixture(params=["threads", "asyncio"])
+def server(request: pytest.FixtureRequest) -> Iterator[AssetServer]:
+    assets = AssetServer(mode=request.param)
+    assets.start()
+    yield assets
+    assets.stop()
+
+
+def test_parse_range() -> None:
+    assert _parse_range("bytes=0-9", 100) == (0, 9)
+    assert _parse_range("bytes=90-", 100) == (90, 99)
+    assert _parse_range("bytes=-10", 100) == (90, 99)
+    assert _parse_range("bytes=-200", 100) == (0, 99)
+    assert _parse_range("bytes=50-500", 100) == (50, 99)
+    # Unsatisfiable.
+    assert _parse_range("bytes=100-", 100) == ()
+    assert _parse_range("bytes=-0", 100) == ()
+    # Ignored: the whole body is sent.
+    assert _parse_range("bytes=5-2", 100) is None
+    assert _parse_range("bytes=0-1,5-6", 100) is None
+    assert _parse_range("items=0-1", 100) is None
+    assert _parse_range("bytes=x-1", 100) is None
+
+
+@pytest.mark.parametrize("source", ["file", "bytes"])
+def test_ranges_and_validators(server: AssetServer, tmp_path: Path, source: str) -> None:
+    data = os.urandom(10_000)
+    if source == "file":
+        path = tmp_path / "s.bin"
+        path.write_bytes(data)
+        url = _path(server, server.register_file(path))
+    else:
+        url = _path(server, server.register_bytes(data, filename="x.bin"))
+
+    status, headers, body = _request(server, url)
+    assert (status, body) == (200, data)
+    assert headers["accept-ranges"] == "bytes"
+    assert headers["cache-control"] == "no-cache"
+    etag, modified = headers["etag"], headers["last-modified"]
+
+    assert _request(server, url, {"If-None-Match": etag})[0] == 304
+    assert _request(server, url, {"If-None-Match": "W/" + etag})[0] == 304
+    assert _request(server, url, {"If-None-Match": '"nope", ' + etag})[0] == 304
+    # If-None-Match wins over If-Modified-Since.
+    assert _request(server, url, {"If-None-Match": '"nope"', "If-Modified-Since": modified})[0] == 200
+    assert _request(server, url, {"If-Modified-Since": modified})[0] == 304
+    earlier = email.utils.formatdate(time.time() - 3 * 86400, usegmt=True)
+    assert _request(server, url, {"If-Modified-Since": earlier})[0] == 200
+    assert _request(server, url, {"If-None-Match": etag}, "HEAD")[0] == 304
+
+    status, headers, body = _request(server, url, {"Range": "bytes=100-199"})
+    assert (status, body) == (206, data[100:200])
+    assert headers["content-range"] == "bytes 100-199/10000"
+    status, _, body = _request(server, url, {"Range": "bytes=-5"})
+    assert (status, body) == (206, data[-5:])
+    status, headers, body = _request(server, url, {"Range": "bytes=20000-"})
+    assert (status, body) == (416, b"")
+    assert headers["content-range"] == "bytes */10000"
+    assert _request(server, url, {"Range": "bytes=0-1,4-5"})[::2] == (200, data)
+
+    assert _request(server, url, {"Range": "bytes=0-9", "If-Range": etag})[::2] == (206, data[:10])
+    assert _request(server, url, {"Range": "bytes=0-9", "If-Range": '"other"'})[::2] == (200, data)
+    assert _request(server, url, {"Range": "bytes=0-9", "If-Range": modified})[0] == 206
+
+    status, headers, body = _request(server, url, {"Range": "bytes=0-9"}, "HEAD")
+    assert (status, body, headers["content-length"]) == (200, b"", "10000")
+
+
+def test_cache_control(server: AssetServer) -> None:
+    url = _path(server, server.register_bytes(b"abc", cache_control="public, max-age=31536000, immutable"))
+    assert _request(server, url)[1]["cache-control"] == "public, max-age=31536000, immutable"
+
+    assets = AssetServer(cache_control="no-store")
+    assets.start()
+    try:
+        assert _request(assets, _path(assets, assets.register_bytes(b"a")))[1]["cache-control"] == "no-store"
+    finally:
+        assets.stop()
+
+
+def test_editing_a_file_changes_its_validators(server: AssetServer, tmp_path: Path) -> None:
+    path = tmp_path / "s.bin"
+    path.write_bytes(b"one")
+    url = _path(server, server.register_file(path))
+    etag = _request(server, url)[1]["etag"]
+    later = time.time() + 5
+    os.utime(path, (later, later))
+    assert _request(server, url, {"If-None-Match": etag})[0] == 200
+
+
+def test_seek_reads_only_the_range(server: AssetServer, tmp_path: Path) -> None:
+    size = 256 * 1024 * 1024
+    video = tmp_path / "video.mp4"
+    with video.open("wb") as handle:
+        handle.truncate(size)
+        handle.seek(size - 10)
+        handle.write(b"0123456789")
+    url = _path(server, server.register_file(video))
+    before = _read_bytes()
+    status, headers, body = _request(server, url, {"Range": f"bytes={size - 10}-"})
+    read = _read_bytes()
+    assert (status, body) == (206, b"0123456789")
+    assert headers["content-range"] == f"bytes {size - 10}-{size - 1}/{size}"
+    if before is not None and read is not None:
+        assert read - before < 64 * 1024
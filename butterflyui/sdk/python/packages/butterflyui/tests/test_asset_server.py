@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from butterflyui.assets import AssetServer
+
+
+def _path(server: AssetServer, url: str) -> str:
+    return url.split(str(server.port), 1)[1]
+
+
+def _fetch(server: AssetServer, paths: list[str], method: str = "GET") -> list[tuple[int, bytes, Any, Any]]:
+    """Fetch ``paths`` over one connection."""
+    connection = http.client.HTTPConnection(server.host, server.port)
+    results = []
+    for path in paths:
+        connection.request(method, path)
+        response = connection.getresponse()
+        results.append(
+            (response.status, response.read(), response.getheader("Connection"), response.getheader("Content-Length"))
+        )
+    connection.close()
+    return results
+
+
+@pytest.fixture(params=["threads", "asyncio"])
+def server(request: pytest.FixtureRequest) -> Iterator[AssetServer]:
+    assets = AssetServer(mode=request.param)
+    assets.start()
+    yield assets
+    assets.stop()
+
+
+def test_serves_registered_files_and_bytes(server: AssetServer, tmp_path: Path) -> None:
+    image = tmp_path / "a.png"
+    image.write_bytes(os.urandom(300_000))
+    empty = tmp_path / "e.txt"
+    empty.write_bytes(b"")
+    paths = [
+        _path(server, server.register_file(image)),
+        _path(server, server.register_bytes(b"hello", filename="h.txt")),
+        _path(server, server.register_file(empty)),
+        _path(server, server.register_bytes(b"x", ttl=-1)),
+        "/assets/nope/x",
+        "/other",
+    ]
+    results = _fetch(server, paths)
+    assert results[0][:2] == (200, image.read_bytes())
+    assert results[1][:2] == (200, b"hello")
+    assert results[2][:2] == (200, b"")
+    # Expired, unknown and foreign paths.
+    assert [result[0] for result in results[3:]] == [404, 404, 404]
+
+    head = _fetch(server, paths[:1], "HEAD")[0]
+    assert head[:2] == (200, b"") and head[3] == "300000"
+    assert _fetch(server, paths[1:2], "POST")[0][0] in (405, 501)
+
+
+def test_asyncio_mode_keeps_connections_open() -> None:
+    server = AssetServer(mode="asyncio")
+    server.start()
+    try:
+        path = _path(server, server.register_bytes(b"abc"))
+        assert _fetch(server, [path])[0][2] == "keep-alive"
+
+        sock = socket.create_connection((server.host, server.port))
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode() * 3)
+        data = b""
+        while data.count(b"abc") < 3:
+            data += sock.recv(65536)
+        assert data.count(b"HTTP/1.1 200") == 3
+        # HTTP/1.0 closes after the answer.
+        sock.sendall(f"GET {path} HTTP/1.0\r\n\r\n".encode())
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+        assert b"Connection: close" in data
+        sock.close()
+
+        sock = socket.create_connection((server.host, server.port))
+        sock.sendall(b"garbage\r\n\r\n")
+        assert b"400" in sock.recv(100)
+        sock.close()
+
+        idle = socket.create_connection((server.host, server.port))
+        time.sleep(0.05)
+    finally:
+        threads = threading.active_count()
+        server.stop()
+    # The loop thread is gone and idle connections are closed.
+    assert threading.active_count() == threads - 1
+    assert idle.recv(10) == b""
+    idle.close()
+
+
+def test_asyncio_mode_runs_on_the_current_loop(tmp_path: Path) -> None:
+    image = tmp_path / "a.png"
+    image.write_bytes(b"png")
+
+    async def scenario() -> None:
+        threads = threading.active_count()
+        server = AssetServer(mode="asyncio")
+        path = _path(server, server.register_file(image))
+        assert threading.active_count() == threads
+        results = await asyncio.to_thread(_fetch, server, [path, path])
+        assert [result[:2] for result in results] == [(200, b"png")] * 2
+        server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        AssetServer(mode="processes")
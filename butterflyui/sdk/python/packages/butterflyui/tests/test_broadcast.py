@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from websockets.asyncio.client import connect
+
+import butterflyui as bui
+from butterflyui.app import BroadcastSession
+
+from helpers import find, hello, receive, replay
+
+
+async def _start() -> tuple[BroadcastSession, bui.Page, bui.Text]:
+    session = BroadcastSession(bui.AppConfig(port=0, compression=False, broadcast=True))
+    await session.start()
+    page = bui.Page(session=session)
+    counter = bui.Text("0")
+    page.root = bui.Column(counter)
+    page.update()
+    await page.await_updates()
+    return session, page, counter
+
+
+async def _text_after_snapshot(websocket: Any, control_id: str) -> Any:
+    await receive(websocket, "ui.reset")
+    snapshot = (await receive(websocket, "ui.apply")).payload
+    return find(snapshot["root"], control_id)["props"]["text"]
+
+
+def test_every_runtime_sees_the_page() -> None:
+    async def scenario() -> None:
+        session, page, counter = await _start()
+        try:
+            async with connect(session.url, proxy=None) as first, connect(session.url, proxy=None) as second:
+                for websocket in (first, second):
+                    await hello(websocket, ["ui.ops"])
+                    assert await _text_after_snapshot(websocket, counter.control_id) == "0"
+                encodes = session.group.stats()["encodes"]
+                counter.text = "1"
+                page.update()
+                await page.await_updates()
+                for websocket in (first, second):
+                    update = (await receive(websocket, "ui.apply")).payload
+                    assert find(replay([{"root": page.root.to_json()}, update]), counter.control_id)["props"]["text"] == "1"
+                # One encode for both connections.
+                assert session.group.stats()["encodes"] == encodes + 1
+
+                counter.patch(session=session, text="patched")
+                await asyncio.sleep(0.1)
+                async with connect(session.url, proxy=None) as late:
+                    await hello(late)
+                    assert await _text_after_snapshot(late, counter.control_id) == "patched"
+        finally:
+            await session.group.stop()
+
+    asyncio.run(scenario())
+
+
+def test_slow_runtime_is_resynced() -> None:
+    async def scenario() -> None:
+        session, page, counter = await _start()
+        session.group.max_lag = 4
+        try:
+            async with connect(session.url, proxy=None, max_size=None, compression=None, max_queue=1) as websocket:
+                await hello(websocket, ["ui.ops"])
+                # Do not read while large updates pile up.
+                for value in range(100):
+                    counter.text = str(value).rjust(200_000, ".")
+                    page.update()
+                    await page.await_updates()
+                assert session.group.stats()["lagging"] == 1
+
+                async def caught_up() -> None:
+                    while True:
+                        text = await _text_after_snapshot(websocket, counter.control_id)
+                        if text.strip(".") == "99":
+                            return
+
+                await asyncio.wait_for(caught_up(), 10)
+                # Read what is left so the close handshake is not stuck behind it.
+                await receive(websocket, "runtime.ready")
+                stats = session.group.stats()
+                assert stats["resyncs"] == 1 and stats["lagging"] == 0
+        finally:
+            await session.group.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import butterflyui as bui
+from butterflyui.core import diff as tree_diff
+from butterflyui.core.diff import apply_tree_ops, diff_control_tree
+
+
+def _fresh(control: Any) -> dict[str, Any]:
+    """``to_json()`` with every cache below ``control`` dropped."""
+
+    def drop(node: Any) -> None:
+        node._json_cache = None
+        for child in node.children:
+            if hasattr(child, "_json_cache"):
+                drop(child)
+
+    drop(control)
+    return control.to_json()
+
+
+def _mutate(rng: random.Random, row: Any, step: int) -> None:
+    children = row.children
+    count = len(children)
+    kind = rng.randrange(12)
+    if kind == 0 and count:
+        children.pop(rng.randrange(-count, count))
+    elif kind == 1:
+        children.insert(rng.randrange(-count - 2, count + 3), bui.Text(f"i{step}"))
+    elif kind == 2:
+        children.append(bui.Text(f"a{step}"))
+    elif kind == 3:
+        children.extend([bui.Text(f"e{step}.{index}") for index in range(rng.randrange(3))])
+    elif kind == 4 and count:
+        children.remove(children[rng.randrange(count)])
+    elif kind == 5 and count:
+        start, stop = sorted((rng.randrange(count + 1), rng.randrange(count + 1)))
+        del children[start:stop]
+    elif kind == 6 and count:
+        children[rng.randrange(-count, count)] = bui.Text(f"s{step}")
+    elif kind == 7:
+        start, stop = sorted((rng.randrange(count + 1), rng.randrange(count + 1)))
+        children[start:stop] = [bui.Text(f"r{step}.{index}") for index in range(rng.randrange(3))]
+    elif kind == 8 and count:
+        children.move(rng.randrange(-count, count), rng.randrange(-count, count))
+    elif kind == 9 and count > 3:
+        children.reverse()
+    elif kind == 10 and count:
+        children[rng.randrange(count)].props["value"] = f"v{step}"
+    else:
+        row.props["spacing"] = step
+
+
+def test_splices_replay_onto_the_snapshot(monkeypatch: Any) -> None:
+    calls = {"splice": 0, "fallback": 0}
+    splice = tree_diff._splice_children
+
+    def counted(*args: Any) -> Any:
+        result = splice(*args)
+        calls["splice" if result is not None else "fallback"] += 1
+        return result
+
+    monkeypatch.setattr(tree_diff, "_splice_children", counted)
+    for seed in range(10):
+        rng = random.Random(seed)
+        rows = [bui.Row(*[bui.Text(f"t{index}") for index in range(rng.randrange(1, 8))]) for _ in range(6)]
+        root = bui.Column(*rows)
+        snapshot = root.to_json()
+        for step in range(80):
+            for _ in range(rng.randrange(1, 5)):
+                _mutate(rng, rng.choice(rows), step)
+            diff = diff_control_tree(root, snapshot)
+            expected = _fresh(root)
+            assert diff is not None
+            assert apply_tree_ops(snapshot, diff.ops) == expected
+            assert diff.snapshot == expected
+            snapshot = diff.snapshot
+    assert calls["splice"] and calls["fallback"]
+
+
+def test_one_edit_in_a_long_list_is_one_op() -> None:
+    column = bui.Column(*[bui.Text(f"row {index}") for index in range(1000)])
+    snapshot = column.to_json()
+    column.children.insert(500, bui.Text("new"))
+    diff = diff_control_tree(column, snapshot)
+    assert [op["op"] for op in diff.ops] == ["insert"]
+    assert diff.ops[0]["before"] == column.children[501].control_id
+
+
+def test_collect_patch_children_ops_are_opt_in() -> None:
+    rng = random.Random(7)
+    for trial in range(200):
+        column = bui.Column(*[bui.Text(f"c{index}") for index in range(rng.randrange(1, 10))])
+        before = _fresh(column)
+        column.clear_dirty()
+        for _ in range(rng.randrange(1, 4)):
+            _mutate(rng, column, trial)
+        after = _fresh(column)
+
+        patch = column.collect_patch()
+        assert "children_ops" not in patch
+        if "children" in patch:
+            assert patch["children"] == after["children"]
+
+        patch = column.collect_patch(children_ops=True)
+        if "children_ops" in patch:
+            assert "children" not in patch
+            replayed = apply_tree_ops(before, patch["children_ops"])
+            assert [child["id"] for child in replayed["children"]] == [child["id"] for child in after["children"]]
+        elif "children" in patch:
+            assert patch["children"] == after["children"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+import websockets
+from websockets.frames import Frame, Opcode
+
+from butterflyui.runtime.protocol.chunks import ChunkAssembler, split_encoded
+from butterflyui.runtime.protocol.codec import decode_message
+from butterflyui.runtime.transport.deflate import ThresholdPerMessageDeflate
+from butterflyui.runtime.transport.websocket import WebSocketRuntimeServer
+
+from helpers import hello
+
+
+def test_chunks_reassemble_in_any_order() -> None:
+    for data in ("x" * 1000 + "é", bytes(range(256)) * 7):
+        pieces = split_encoded(data, 100)
+        assert all(len(piece) <= 100 for piece in pieces)
+        order = list(range(len(pieces)))
+        random.Random(len(data)).shuffle(order)
+        assembler = ChunkAssembler()
+        results = [
+            assembler.add({"stream": 1, "index": index, "count": len(pieces), "data": pieces[index]})
+            for index in order
+        ]
+        assert results[:-1] == [None] * (len(pieces) - 1)
+        assert results[-1] == data
+    with pytest.raises(ValueError):
+        ChunkAssembler().add({"stream": 1, "index": 2, "count": 2, "data": ""})
+
+
+def test_deflate_skips_small_messages() -> None:
+    extension = ThresholdPerMessageDeflate(False, False, 12, 12, {"memLevel": 5}, threshold=1024)
+    small = extension.encode(Frame(Opcode.TEXT, b"x" * 100))
+    assert not small.rsv1 and small.data == b"x" * 100
+    large = extension.encode(Frame(Opcode.TEXT, b"x" * 4096))
+    assert large.rsv1 and len(large.data) < 4096
+    # Later frames still use the same compression context.
+    assert extension.encode(Frame(Opcode.TEXT, b"x" * 4096)).rsv1
+
+
+@pytest.mark.parametrize("codecs", [["json"], ["msgpack"]])
+@pytest.mark.parametrize("chunked", [True, False])
+def test_large_frames_are_chunked(codecs: list[str], chunked: bool) -> None:
+    root = {
+        "id": "r",
+        "type": "column",
+        "props": {},
+        "children": [{"id": f"t{index}", "type": "text", "props": {"value": "x" * 50}} for index in range(5000)],
+    }
+
+    async def scenario() -> None:
+        server = WebSocketRuntimeServer(port=0, chunk_size=64 * 1024)
+        await server.start()
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{server.port}/ws", max_size=None) as websocket:
+                await hello(websocket, ["ui.ops", *(["ui.chunks"] if chunked else [])], codecs)
+                sending = asyncio.create_task(server.send("ui.apply", {"root": root}))
+                assembler = ChunkAssembler()
+                frames = 0
+                while True:
+                    message = decode_message(await websocket.recv())
+                    frames += 1
+                    if message.type != "ui.chunk":
+                        break
+                    data = assembler.add(message.payload)
+                    if data is not None:
+                        message = decode_message(data)
+                        break
+                await sending
+                assert message.type == "ui.apply" and message.payload == {"root": root}
+                assert (frames > 1) == chunked
+                await server.send("ui.apply", {"small": 1})
+                assert decode_message(await websocket.recv()).payload == {"small": 1}
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
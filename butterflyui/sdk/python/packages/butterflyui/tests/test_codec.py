@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from typing import Any
+
+import pytest
+import websockets
+
+from butterflyui.runtime.protocol import binary
+from butterflyui.runtime.protocol.codec import (
+    JSON_CODEC,
+    MSGPACK_CODEC,
+    MsgPackCodec,
+    decode_message,
+    negotiate_codec,
+)
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from butterflyui.runtime.transport.websocket import WebSocketRuntimeServer
+
+from helpers import hello
+
+
+def _value(rng: random.Random, depth: int = 0) -> Any:
+    kind = rng.randrange(8 if depth < 3 else 6)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.random() < 0.5
+    if kind == 2:
+        return rng.randint(-(2**63), 2**64 - 1)
+    if kind == 3:
+        return rng.random() * 1e6
+    if kind == 4:
+        return "é" * rng.randrange(300)
+    if kind == 5:
+        return rng.randint(-40, 200)
+    if kind == 6:
+        return [_value(rng, depth + 1) for _ in range(rng.randrange(6))]
+    return {f"k{index}": _value(rng, depth + 1) for index in range(rng.randrange(6))}
+
+
+def test_binary_round_trip() -> None:
+    rng = random.Random(0)
+    for _ in range(300):
+        value = _value(rng)
+        assert binary.unpackb(binary.packb(value)) == value
+
+
+def test_binary_matches_msgpack() -> None:
+    msgpack = pytest.importorskip("msgpack")
+    rng = random.Random(1)
+    for _ in range(300):
+        value = _value(rng)
+        assert msgpack.unpackb(binary.packb(value), raw=False, strict_map_key=False) == value
+        assert binary.unpackb(msgpack.packb(value, use_bin_type=True)) == value
+
+
+@pytest.mark.parametrize("accelerated", [False, True])
+def test_codecs_round_trip(accelerated: bool) -> None:
+    codec = MsgPackCodec()
+    if accelerated and not codec.accelerated:
+        pytest.skip("msgpack is not installed")
+    codec.accelerated = accelerated
+    message = RuntimeMessage("ui.apply", {"root": {"x": [1.5, 2, "s"]}}, id="a")
+    for current in (JSON_CODEC, codec):
+        assert decode_message(current.encode(message)) == message
+    assert JSON_CODEC.encode(message) == json.dumps(message.to_dict(), separators=(",", ":"))
+    # Wider than 64 bits: sent as a JSON text frame instead.
+    wide = RuntimeMessage("ui.apply", {"n": 2**70})
+    assert isinstance(codec.encode(wide), str)
+    assert decode_message(codec.encode(wide)) == wide
+
+
+def test_negotiation() -> None:
+    assert negotiate_codec(None) is JSON_CODEC
+    assert negotiate_codec(["json"]) is JSON_CODEC
+    assert negotiate_codec(["msgpack"]) is MSGPACK_CODEC
+    assert negotiate_codec("json,msgpack", preference=["msgpack", "json"]) is MSGPACK_CODEC
+    assert negotiate_codec(["cbor"]) is JSON_CODEC
+
+
+@pytest.mark.parametrize("codecs", [["json"], ["msgpack"]])
+def test_hello_negotiates_the_frame_codec(codecs: list[str]) -> None:
+    async def scenario() -> None:
+        server = WebSocketRuntimeServer(port=0)
+        await server.start()
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{server.port}/ws") as websocket:
+                answer = await hello(websocket, ["ui.ops"], codecs)
+                assert answer["codec"] == codecs[0]
+                await server.send("ui.apply", {"small": 1})
+                frame = await websocket.recv()
+                assert isinstance(frame, bytes) == (codecs[0] == "msgpack")
+                assert decode_message(frame).payload == {"small": 1}
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+import butterflyui as bui
+from butterflyui.core.control import Control
+
+from helpers import control_classes
+
+
+@pytest.mark.parametrize("cls", control_classes(), ids=lambda cls: cls.__qualname__)
+def test_every_control_builds(cls: type[Control]) -> None:
+    control = cls()
+    assert control.control_type
+    layout = cls(width=120, padding=8, tooltip="hint")
+    assert (layout.props["width"], layout.props["padding"], layout.props["tooltip"]) == (120, 8, "hint")
+    inspect.signature(cls)
+
+
+def test_positional_arguments_and_keywords() -> None:
+    assert bui.Text("x", size=12).props == {"text": "x", "size": 12}
+    assert bui.Button("Save", disabled=False).props == {"disabled": False, "label": "Save"}
+    assert bui.TextField("v", label="L").props == {"value": "v", "label": "L"}
+    row = bui.Row(bui.Text("a"), bui.Text("b"), spacing=3)
+    assert row.props == {"spacing": 3} and len(row.children) == 2
+    assert list(inspect.signature(bui.Text).parameters)[0] == "value"
+
+
+def test_custom_initializers() -> None:
+    class Card(bui.Container):
+        def __init__(self, title: str, **kwargs: object) -> None:
+            super().__init__(bui.Text(title), **kwargs)
+
+    card = Card("t", padding=4)
+    assert card.control_type == "container"
+    assert card.props["padding"] == 4 and card.props["title"] == "t"
+    assert [child.props["text"] for child in card.children] == ["t"]
+    assert Card("u").props["title"] == "u"
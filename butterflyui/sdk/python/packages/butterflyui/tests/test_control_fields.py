@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+import butterflyui as bui
+from butterflyui.core.control import Control, _ControlField
+
+from helpers import control_classes
+
+
+def test_no_attribute_hooks() -> None:
+    assert Control.__getattribute__ is object.__getattribute__
+    assert Control.__setattr__ is object.__setattr__
+    assert Control.__delattr__ is object.__delattr__
+
+
+@pytest.mark.parametrize("cls", control_classes(), ids=lambda cls: cls.__qualname__)
+def test_fields_read_and_write_props(cls: type[Control]) -> None:
+    control = cls()
+    for name in cls._butterflyui_control_field_order:
+        field = inspect.getattr_static(cls, name, None)
+        if type(field) is not _ControlField:
+            continue
+        value = object()
+        setattr(control, name, value)
+        assert control.props[field.prop_name] is value
+        assert getattr(control, name) is value
+        delattr(control, name)
+        assert field.prop_name not in control.props
+        assert getattr(control, name) == field.fallback
+
+
+def test_aliases_and_special_fields() -> None:
+    text = bui.Text("x", class_name="big", theme="dark")
+    assert text.props["classes"] == "big" and text.props["style_pack"] == "dark"
+    assert text.class_name == "big"
+
+    container = bui.Container()
+    label = bui.Text("inside")
+    container.content = label
+    assert container.children == [label] and container.content is label
+
+    column = bui.Column(bui.Text("a"))
+    column.controls = [bui.Text("b"), bui.Text("c")]
+    assert [child.props["text"] for child in column.children] == ["b", "c"]
+
+
+def test_writes_mark_the_control_dirty() -> None:
+    text = bui.Text("a")
+    root = bui.Column(text)
+    root.to_json()
+    root.clear_dirty()
+    text.value = "b"
+    assert "text" in text._dirty_state.props
+    assert root.to_json()["children"][0]["props"]["text"] == "b"
+
+    text.clear_dirty()
+    text.events = ["click"]
+    assert text._dirty_state.events
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import butterflyui as bui
+from butterflyui.data.provider import DataWindow, RowCache
+
+from helpers import new_page, replay
+
+
+class _Rows:
+    """A provider of generated rows that counts its reads."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.calls: list[tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_range(self, start: int, end: int) -> list[dict[str, Any]]:
+        self.calls.append((start, end))
+        return [{"label": f"Row {index}", "value": index} for index in range(start, end)]
+
+
+class _AsyncRows(_Rows):
+    async def get_range(self, start: int, end: int) -> list[dict[str, Any]]:  # type: ignore[override]
+        await asyncio.sleep(0)
+        return _Rows.get_range(self, start, end)
+
+
+class _NullRows(_Rows):
+    def get_range(self, start: int, end: int) -> list[None]:  # type: ignore[override]
+        self.calls.append((start, end))
+        return [None] * (end - start)
+
+
+class _ShrunkRows(_Rows):
+    """Reports ``count`` rows but only ``available`` are left."""
+
+    def __init__(self, count: int, available: int) -> None:
+        super().__init__(count)
+        self.available = available
+
+    def get_range(self, start: int, end: int) -> list[dict[str, Any]]:
+        return super().get_range(start, min(end, self.available))
+
+
+async def _event(session: Any, control: Any, event: str, payload: dict[str, Any]) -> None:
+    session._handle_event({"control_id": control.control_id, "event": event, "payload": payload})
+    await asyncio.sleep(0.05)
+    while session._patch_buffer:
+        await asyncio.sleep(0.01)
+
+
+def test_row_cache_evicts_least_recently_used() -> None:
+    cache = RowCache(2)
+    cache.put(0, "a")
+    cache.put(1, "b")
+    assert cache.get(0) == "a"
+    cache.put(2, "c")
+    assert cache.get(1) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.discard(2)
+    assert len(cache) == 1 and cache.get(0) == "a"
+
+
+def test_null_rows_are_cached() -> None:
+    cache = RowCache(4)
+    cache.put(0, None)
+    assert cache.get(0, "missing") is None
+    assert cache.get(1, "missing") == "missing"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    rows = _NullRows(100)
+    window = DataWindow(rows, page_size=10)
+    window.attach(bui.VirtualList())
+    rows.calls.clear()
+    # The first 20 rows were read on attach; only the rest go to the provider.
+    assert asyncio.run(window.fetch(0, 30)) == [None] * 30
+    assert rows.calls == [(20, 30)]
+    assert window.cache.hits == 20
+
+
+def test_short_provider_results_keep_rows_in_place() -> None:
+    rows = _ShrunkRows(1000, 1000)
+    window = DataWindow(rows, page_size=10)
+    window.attach(bui.VirtualList())
+    asyncio.run(window.fetch(40, 60))
+    rows.available = 25
+    items = asyncio.run(window.fetch(0, 60))
+    assert [item["value"] for item in items] == list(range(25))
+    # Cached rows past the new end are gone.
+    assert window.cache.get(45) is None
+
+
+def test_shrunk_provider_clamps_the_window() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops", "ui.windows"})
+        rows = _ShrunkRows(1000, 1000)
+        virtual_list = bui.VirtualList(item_extent=40)
+        window = virtual_list.set_data_provider(rows, page_size=50)
+        page.root = virtual_list
+        page.update()
+        await page.await_updates()
+        rows.available = 430
+        await _event(session, virtual_list, "range", {"start": 400, "end": 420})
+        props = replay(server.applied())["props"]
+        assert [item["value"] for item in props["items"]] == list(range(props["window_start"], 430))
+        assert props["item_count"] == window.end == 430
+
+    asyncio.run(scenario())
+
+    window = DataWindow(_ShrunkRows(1000, 7), page_size=10)
+    control = bui.VirtualList()
+    window.attach(control)
+    assert (window.end, control.props["item_count"], len(control.props["items"])) == (7, 7, 7)
+
+
+def test_visible_range_from_events() -> None:
+    window = DataWindow(bui.SequenceProvider(range(100)), page_size=10, item_extent=40, columns=2)
+    assert window.visible_range({"start": 5, "end": 9}) == (5, 9)
+    assert window.visible_range({"pixels": 400, "viewport_dimension": 200}) == (20, 30)
+    assert window.visible_range({"visible_index": 7}) == (7, 17)
+    assert window.visible_range({}) is None
+
+
+def test_fetch_reads_each_missing_run_once() -> None:
+    rows = _Rows(1000)
+    window = DataWindow(rows, page_size=10)
+    window.attach(bui.VirtualList())
+    rows.calls.clear()
+    asyncio.run(window.fetch(5, 30))
+    assert rows.calls == [(20, 30)]
+
+
+def test_scrolling_sends_only_the_window() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops", "ui.windows"})
+        rows = _Rows(10_000_000)
+        virtual_list = bui.VirtualList(item_extent=40)
+        window = virtual_list.set_data_provider(rows, page_size=50, cache_size=500)
+        page.root = virtual_list
+        page.update()
+        await page.await_updates()
+        root = server.applied()[-1]["root"]
+        assert root["props"]["item_count"] == 10_000_000
+        assert len(root["props"]["items"]) == 100
+
+        for pixels in (40 * 5_000, 40 * 4_000_000, 0):
+            await _event(session, virtual_list, "scroll_end", {"pixels": pixels, "viewport_dimension": 800})
+            first = pixels // 40
+            assert window.start <= first and first + 20 <= window.end
+            assert window.end - window.start <= 200
+            props = replay(server.applied())["props"]
+            assert props["window_start"] == window.start
+            assert [item["value"] for item in props["items"]] == list(range(window.start, window.end))
+        assert len(window.cache) <= 500
+
+    asyncio.run(scenario())
+
+
+def test_async_provider_fills_on_the_first_event() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops", "ui.windows"})
+        virtual_list = bui.VirtualList(item_extent=40)
+        window = virtual_list.set_data_provider(_AsyncRows(1000), page_size=50)
+        page.root = virtual_list
+        page.update()
+        await page.await_updates()
+        assert server.applied()[-1]["root"]["props"]["items"] == []
+        await _event(session, virtual_list, "range", {"start": 400, "end": 420})
+        props = replay(server.applied())["props"]
+        assert props["items"][0]["value"] == window.start
+        assert window.start <= 400 and 420 <= window.end
+
+    asyncio.run(scenario())
+
+
+def test_runtimes_without_windows_grow_from_row_zero() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops"})
+        virtual_list = bui.VirtualList(item_extent=40)
+        window = virtual_list.set_data_provider(_Rows(1000), page_size=50)
+        page.root = virtual_list
+        page.update()
+        await page.await_updates()
+        await _event(session, virtual_list, "scroll_end", {"pixels": 40 * 180, "viewport_dimension": 800})
+        assert window.start == 0 and window.end >= 200
+        props = replay(server.applied())["props"]
+        assert props["has_more"] is True
+        assert len(props["items"]) == window.end
+
+    asyncio.run(scenario())
+
+
+def test_grid_renders_rows() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops", "ui.windows"})
+        grid = bui.VirtualGrid(columns=3)
+        window = grid.set_data_provider(bui.SequenceProvider(range(1000)), render=lambda row, index: bui.Text(str(row)))
+        page.root = grid
+        page.update()
+        await page.await_updates()
+        await _event(session, grid, "range", {"start": 600, "end": 630})
+        first = grid.props["items"][0]
+        assert first["type"] == "text"
+        assert first["props"] == {"text": str(window.start)}
+
+    asyncio.run(scenario())
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import math
+import random
+
+import butterflyui as bui
+from butterflyui.core.diff import ItemsPatch
+from butterflyui.data import simplify
+
+from helpers import find, new_page, replay
+
+
+def _random_patch(rng: random.Random, ids: list[str]) -> ItemsPatch:
+    patch = ItemsPatch()
+    for _ in range(rng.randrange(1, 4)):
+        shape_id = rng.choice(ids)
+        kind = rng.random()
+        if kind < 0.25:
+            patch.add_item({"id": shape_id, "v": rng.randrange(9), "points": [rng.randrange(9)]})
+        elif kind < 0.5:
+            patch.update_item(shape_id, rng.choice([{"v": rng.randrange(9)}, {"points": [rng.randrange(9)]}, {"w": 1}]))
+        elif kind < 0.7:
+            patch.remove_item(shape_id)
+        else:
+            patch.extend_item(shape_id, rng.choice(["points", "q"]), [rng.randrange(9) for _ in range(rng.randrange(1, 3))])
+    return patch
+
+
+def test_merged_items_patch_equals_applying_each() -> None:
+    rng = random.Random(3)
+    ids = ["a", "b", "c", "d"]
+    for _ in range(1000):
+        base = [{"id": shape_id, "v": 0, "points": [1]} for shape_id in ids[: rng.randrange(0, 4)]]
+        patches = [_random_patch(rng, ids) for _ in range(rng.randrange(1, 5))]
+        expected = copy.deepcopy(base)
+        merged = ItemsPatch()
+        for patch in patches:
+            patch.apply(expected)
+            merged.merge(patch)
+        assert merged.apply(copy.deepcopy(base)) == expected
+        op = json.loads(json.dumps(merged.to_op("x", "shapes")))
+        assert ItemsPatch.from_op(op).apply(copy.deepcopy(base)) == expected
+
+
+def test_simplify() -> None:
+    line = [float(value) for index in range(100) for value in (index, 0.0)]
+    assert simplify(line, 0.5) == [0.0, 0.0, 99.0, 0.0]
+    zigzag = [float(value) for index in range(100) for value in (index, (index % 2) * 3.0)]
+    assert len(simplify(zigzag, 0.5)) == len(zigzag)
+    assert len(simplify(zigzag, 5)) == 4
+    circle = [
+        value
+        for index in range(1001)
+        for value in (100 * math.cos(index / 1000 * 2 * math.pi), 100 * math.sin(index / 1000 * 2 * math.pi))
+    ]
+    assert len(simplify(circle, 0.5)) < len(circle) // 4
+
+
+def _draw(capabilities: set[str], tolerance: float) -> None:
+    async def scenario() -> None:
+        server, session, page = new_page(capabilities)
+        canvas = bui.Canvas(shapes=[{"type": "rect", "x": 1, "y": 2, "width": 3, "height": 4}])
+        shapes = canvas.display_list(tolerance=tolerance)
+        page.root = bui.Column(canvas)
+        page.update()
+        await page.await_updates()
+        rng = random.Random(4)
+        strokes: list[str] = []
+        for _ in range(400):
+            kind = rng.random()
+            if kind < 0.05 or not strokes:
+                strokes.append(shapes.begin_stroke([rng.random() * 100, rng.random() * 100], color="#000", stroke=2))
+            elif kind < 0.75:
+                if strokes[-1] in shapes:
+                    shapes.extend_stroke(strokes[-1], [rng.random() * 100 for _ in range(2 * rng.randrange(1, 4))])
+            elif kind < 0.8:
+                shapes.end_stroke(strokes[-1])
+            elif kind < 0.88:
+                if (shape_id := rng.choice(strokes)) in shapes:
+                    shapes.update(shape_id, color=rng.choice(["#f00", "#0f0"]))
+            elif kind < 0.93:
+                shapes.remove(rng.choice(strokes))
+            elif kind < 0.97:
+                shapes.add({"type": "circle", "x": 5, "y": 5, "radius": 3})
+            elif kind < 0.975:
+                shapes.clear()
+                strokes = []
+            else:
+                shapes.add({"id": rng.choice(strokes), "type": "line", "x1": 0, "y1": 0, "x2": 5, "y2": 5})
+            if rng.random() < 0.2:
+                await asyncio.sleep(0.02)
+        while session._patch_buffer:
+            await asyncio.sleep(0.02)
+
+        runtime = find(replay(server.applied()), canvas.control_id)["props"]["shapes"]
+        assert runtime == list(shapes)
+        snapshot = session._snapshot_payload()
+        assert find(snapshot["root"], canvas.control_id)["props"]["shapes"] == runtime
+
+    asyncio.run(scenario())
+
+
+def test_strokes_match_the_runtime() -> None:
+    for capabilities in ({"ui.ops", "ui.items"}, {"ui.ops"}):
+        for tolerance in (0.0, 2.0):
+            _draw(capabilities, tolerance)
+
+
+def test_items_reach_the_snapshot_and_are_not_resent() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops", "ui.items"})
+        label = bui.Text("a")
+        canvas = bui.Canvas()
+        shapes = canvas.display_list()
+        page.root = bui.Column(label, canvas)
+        page.update()
+        await page.await_updates()
+
+        stroke = shapes.begin_stroke([0, 0], color="#000")
+        shapes.extend_stroke(stroke, [1, 1, 2, 2])
+        shapes.add({"id": "box", "type": "rect", "x": 1})
+        while session._patch_buffer:
+            await asyncio.sleep(0.02)
+        assert [op["op"] for payload in server.applied() for op in payload.get("ops") or ()][-1] == "items"
+
+        expected = list(shapes)
+        snapshot = session._snapshot_payload()
+        assert find(snapshot["root"], canvas.control_id)["props"]["shapes"] == expected
+        assert find(session._last_root, canvas.control_id)["props"]["shapes"] == expected
+        assert canvas.to_json()["props"]["shapes"] == expected
+
+        sent = len(server.sent)
+        label.text = "b"
+        page.update()
+        await page.await_updates()
+        ops = [op for payload in server.applied(sent) for op in payload.get("ops") or ()]
+        assert ops == [{"op": "props", "id": label.control_id, "props": {"text": "b"}}]
+
+        shapes.clear()
+        while session._patch_buffer:
+            await asyncio.sleep(0.02)
+        assert find(session._snapshot_payload()["root"], canvas.control_id)["props"]["shapes"] == []
+
+    asyncio.run(scenario())
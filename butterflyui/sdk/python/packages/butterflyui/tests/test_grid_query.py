@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+import butterflyui as bui
+from butterflyui.data.table import _cell_text, _sort_key
+
+from helpers import new_page
+
+_WORDS = ["alpha", "beta", "Gamma", "delta", "eps", "Zeta", "10", "9", "2.5"]
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    rng = random.Random(3)
+    return [
+        {
+            "name": rng.choice(_WORDS) + str(rng.randrange(50)),
+            "qty": rng.randrange(100),
+            "tag": rng.choice(_WORDS + [None, True]),
+        }
+        for _ in range(count)
+    ]
+
+
+def _expected(rows: list[dict[str, Any]], column: str | None, ascending: bool, needle: str) -> list[int]:
+    indices = list(range(len(rows)))
+    needle = needle.strip().lower()
+    if needle:
+        indices = [i for i in indices if any(needle in _cell_text(value) for value in rows[i].values())]
+    if column:
+        indices.sort(key=lambda i: _sort_key(rows[i][column]))
+        if not ascending:
+            indices.reverse()
+    return indices
+
+
+def test_column_table_matches_a_brute_force_query() -> None:
+    rows = _rows(2000)
+    table = bui.ColumnTable.from_rows(rows)
+    # A growing filter narrows the previous matches.
+    for needle in ["", "a", "al", "alp", "alpha1", "1", "true", "zz"]:
+        for column in [None, "name", "qty", "tag"]:
+            for ascending in (True, False):
+                for offset in (0, 50, 1990):
+                    page = table.query(
+                        bui.Query(
+                            sort_column=column,
+                            sort_ascending=ascending,
+                            filter_query=needle,
+                            offset=offset,
+                            limit=50,
+                        )
+                    )
+                    expected = _expected(rows, column, ascending, needle)
+                    assert page.total == len(expected)
+                    got = [row["id"] for row in page.rows]
+                    want = expected[offset : offset + 50]
+                    if column is None:
+                        assert got == want
+                    else:
+                        # Ties may come out in another order.
+                        assert [_sort_key(rows[i][column]) for i in got] == [_sort_key(rows[i][column]) for i in want]
+
+
+def test_appended_rows_are_queried() -> None:
+    table = bui.ColumnTable.from_rows([{"name": "b", "qty": 2}])
+    table.query(bui.Query(sort_column="qty"))
+    table.append([{"name": "a", "qty": 1}])
+    page = table.query(bui.Query(sort_column="qty"))
+    assert [row["name"] for row in page.rows] == ["a", "b"]
+    assert page.total == 2
+
+
+def test_grid_events_send_one_page() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops"})
+        grid = bui.DataGrid(columns=[{"key": "name"}, {"key": "qty"}], sortable=True, filterable=True, page_size=25)
+        pager = bui.Pagination()
+        query = grid.set_query_source(bui.ColumnTable.from_rows(_rows(3000)))
+        query.bind_pagination(pager)
+        page.root = bui.Column(grid, pager)
+        page.update()
+        await page.await_updates()
+        root = server.applied()[-1]["root"]
+        props = root["children"][0]["props"]
+        assert (len(props["rows"]), props["total_items"], props["page"]) == (25, 3000, 1)
+        assert root["children"][1]["props"]["total_items"] == 3000
+
+        async def event(control: Any, name: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+            since = len(server.sent)
+            session._handle_event({"control_id": control.control_id, "event": name, "payload": payload})
+            await asyncio.sleep(0.05)
+            while session._patch_buffer:
+                await asyncio.sleep(0.01)
+            return [
+                patch
+                for payload in server.applied(since)
+                for patch in payload.get("patches") or [payload.get("patch")]
+                if patch and patch["id"] == grid.control_id and "rows" in patch["props"]
+            ]
+
+        patches = await event(grid, "sort_change", {"sort_column": "qty", "sort_ascending": False})
+        assert len(patches) == 1 and len(patches[0]["props"]["rows"]) == 25
+        assert grid.props["rows"][0]["qty"] == 99
+
+        patches = await event(pager, "change", {"page": 3})
+        assert patches[0]["props"]["page"] == 3
+        # Only the props that changed go out.
+        assert "sort_column" not in patches[0]["props"]
+
+        patches = await event(grid, "filter_change", {"filter_query": "alpha"})
+        assert patches[0]["props"]["page"] == 1
+        assert pager.props["page"] == 1
+        assert grid.props["total_items"] < 3000
+        assert await event(grid, "filter_change", {"filter_query": "alpha"}) == []
+
+    asyncio.run(scenario())
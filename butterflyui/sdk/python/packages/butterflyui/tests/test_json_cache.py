@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import butterflyui as bui
+from butterflyui.state import State
+
+
+def test_to_json_is_cached_until_a_dirty_mark() -> None:
+    leaf = bui.Text("a")
+    row = bui.Row(leaf, bui.Text("b"))
+    root = bui.Column(row, bui.Text("c"))
+    first = root.to_json()
+    assert root.to_json() is first
+    sibling = first["children"][1]
+
+    leaf.text = "z"
+    second = root.to_json()
+    assert second is not first
+    assert second["children"][0]["children"][0]["props"]["text"] == "z"
+    # Only the path to the changed leaf is rebuilt.
+    assert second["children"][1] is sibling
+
+
+def test_children_and_props_edits_drop_the_cache() -> None:
+    root = bui.Column(bui.Text("a"))
+    first = root.to_json()
+    root.children.append(bui.Text("b"))
+    assert [child["props"]["text"] for child in root.to_json()["children"]] == ["a", "b"]
+
+    cached = root.to_json()
+    root.props = {"spacing": 4}
+    assert root.to_json() is not cached and root.to_json()["props"]["spacing"] == 4
+    assert first is not cached
+
+
+def test_state_props_are_never_cached() -> None:
+    state = State("one")
+    label = bui.Text("x")
+    label.props["label"] = state
+    root = bui.Column(label)
+    assert root.to_json()["children"][0]["props"]["label"] == "one"
+    state.value = "two"
+    assert root.to_json()["children"][0]["props"]["label"] == "two"
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+import butterflyui as bui
+from butterflyui.core.diff import apply_tree_ops, diff_control_tree
+from butterflyui.core.reconcile import reconcile_children
+from helpers import new_page, replay
+
+
+def _fresh(control: Any) -> dict[str, Any]:
+    """``to_json()`` with every cache below ``control`` dropped."""
+
+    def drop(node: Any) -> None:
+        node._json_cache = None
+        for child in node.children:
+            if hasattr(child, "_json_cache"):
+                drop(child)
+
+    drop(control)
+    return control.to_json()
+
+
+def _row(item: int, rng: random.Random, keyed: bool = True) -> Any:
+    kwargs: dict[str, Any] = {"key": f"k{item}"} if keyed else {}
+    if rng.random() < 0.3:
+        kwargs["spacing"] = rng.randrange(3)
+    children = [bui.Text(f"name {item}"), bui.Text(f"v{rng.randrange(3)}")]
+    if rng.random() < 0.3:
+        children.append(bui.Button("x"))
+    return bui.Row(*children, **kwargs)
+
+
+def test_reconcile_adopts_ids_by_key_and_type() -> None:
+    old = [bui.Row(bui.Text("a"), key="a"), bui.Row(key="b"), bui.Text("c", key="c")]
+    new = [bui.Row(key="b"), bui.Row(bui.Text("a2"), key="a"), bui.Row(key="c")]
+    assert reconcile_children(old, new) == 3
+    assert new[0].control_id == old[1].control_id
+    assert new[1].control_id == old[0].control_id
+    # Unkeyed children inside an adopted child are paired by position.
+    assert new[1].children[0].control_id == old[0].children[0].control_id
+    # Same key, other type: a new control.
+    assert new[2].control_id != old[2].control_id
+
+
+def test_controls_that_stay_keep_their_ids() -> None:
+    kept = bui.Row(key="a")
+    kept_id = kept.control_id
+    assert reconcile_children([kept], [kept]) == 0
+    assert kept.control_id == kept_id
+
+
+def test_rebuilt_children_replay_onto_the_snapshot() -> None:
+    for seed in range(30):
+        rng = random.Random(seed)
+        items = list(range(rng.randrange(0, 20)))
+        next_item = 1000
+        column = bui.Column(*[_row(item, rng) for item in items])
+        snapshot = column.to_json()
+        column.clear_dirty()
+        for step in range(20):
+            kind = rng.randrange(5)
+            if kind == 0:
+                rng.shuffle(items)
+            elif kind == 1:
+                for _ in range(rng.randrange(4)):
+                    items.insert(rng.randrange(len(items) + 1), next_item)
+                    next_item += 1
+            elif kind == 2:
+                items = [item for item in items if rng.random() < 0.7]
+            elif kind == 3 and items:
+                items.append(items[0])  # a duplicate key
+            rows = [_row(item, rng, keyed=rng.random() < 0.9) for item in items]
+            how = rng.randrange(3)
+            if how == 0:
+                column.children = rows
+            elif how == 1:
+                column.children[:] = rows
+            else:
+                column.set_children(rows)
+            diff = diff_control_tree(column, snapshot)
+            target = _fresh(column)
+            assert apply_tree_ops(snapshot, diff.ops) == target, (seed, step)
+            assert diff.snapshot == target
+            ids = [child["id"] for child in target["children"]]
+            assert len(set(ids)) == len(ids), (seed, step)
+            snapshot = diff.snapshot
+
+
+def test_shuffled_keyed_rows_cost_moves_only() -> None:
+    def rows(items: list[int]) -> list[Any]:
+        return [bui.Row(bui.Text(f"n{item}"), key=str(item)) for item in items]
+
+    items = list(range(100))
+    column = bui.Column(*rows(items))
+    snapshot = column.to_json()
+    column.clear_dirty()
+    random.Random(1).shuffle(items)
+    column.children = rows(items)
+    diff = diff_control_tree(column, snapshot)
+    assert {op["op"] for op in diff.ops} == {"move"}
+    assert len(diff.adopted) == 200
+    assert apply_tree_ops(snapshot, diff.ops) == _fresh(column)
+
+
+def test_handlers_follow_the_adopted_id() -> None:
+    calls: list[tuple[str, int]] = []
+
+    def rows(items: list[int], session: Any = None) -> list[Any]:
+        built = []
+        for item in items:
+            button = bui.Button(f"del {item}")
+            button.add_inline_event_handler("click", lambda event, item=item: calls.append(("inline", item)))
+            if session is not None:
+                button.on_click(session, lambda event, item=item: calls.append(("explicit", item)))
+            built.append(bui.Row(button, key=str(item)))
+        return built
+
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops"})
+        page.root = bui.Column(*rows([0, 1, 2]))
+        page.update()
+        await page.await_updates()
+        since = len(server.sent)
+
+        page.root.children = rows([2, 1, 0], session)
+        page.update()
+        await page.await_updates()
+        payload = server.applied(since)[-1]
+        assert "root" not in payload
+        assert {op["op"] for op in payload["ops"]} <= {"move", "props"}
+        assert replay(server.applied()) == _fresh(page.root)
+
+        button = page.root.children[0].children[0]
+        session._handle_event({"control_id": button.control_id, "event": "click"})
+        await asyncio.sleep(0)
+        assert sorted(calls) == [("explicit", 2), ("inline", 2)]
+        # The replaced buttons' handlers are gone.
+        assert sum(1 for _, event in session._event_handlers if event == "click") == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+import butterflyui as bui
+from butterflyui.core.dirty import DirtyChildrenList, DirtyPropsDict, DirtyState, PropIndex
+
+
+def test_prop_index_hands_out_bits_in_order() -> None:
+    index = PropIndex(["text", "color"])
+    assert index.bit("text") == 1
+    assert index.bit("color") == 2
+    assert index.bit("extra") == 4
+    assert len(index) == 3
+    assert index.names(1 | 4) == ["text", "extra"]
+    assert index.names(0) == []
+
+
+def test_dirty_state_props_follow_the_mask() -> None:
+    state = DirtyState(index=PropIndex(["a", "b"]))
+    assert state.clean and state.props == set()
+    state.mark("b")
+    state.mark("new")
+    assert state.props == {"b", "new"}
+    assert not state.clean
+    state.clear()
+    assert state.mask == 0 and state.clean
+
+
+def test_controls_do_not_materialize_an_instance_dict() -> None:
+    text = bui.Text("x")
+    text.text = "y"
+    text.to_json()
+    assert vars(text) == {}
+    column = bui.Column(text)
+    assert isinstance(column.props, DirtyPropsDict)
+    assert isinstance(column.children, DirtyChildrenList)
+    assert not hasattr(column.props, "__dict__")
+    assert not hasattr(column.children, "__dict__")
+
+
+def test_source_meta_is_shared_until_written() -> None:
+    a, b = [bui.Text(str(index)) for index in range(2)]
+    first_a, first_b = a.to_json(), b.to_json()
+    assert "source" in first_a["meta"]
+    assert first_a["meta"] is first_b["meta"]
+
+    a.meta["x"] = 1
+    assert a.to_json()["meta"]["x"] == 1
+    assert "x" not in b.meta
+    assert "x" not in b.to_json()["meta"]
+
+
+def test_meta_edit_drops_the_cached_json_of_ancestors() -> None:
+    leaf = bui.Text("a")
+    root = bui.Column(bui.Row(leaf))
+    root.to_json()
+    leaf.meta["role"] = "title"
+    assert root.to_json()["children"][0]["children"][0]["meta"]["role"] == "title"
+
+
+def test_classes_with_a_meta_field_keep_an_eager_dict() -> None:
+    tile = bui.ListTile()
+    assert isinstance(tile.meta, dict)
+
+
+def test_bytes_per_control_stay_bounded() -> None:
+    count = 5000
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        rows = [bui.Text(f"row {index}") for index in range(count)]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(rows) == count
+    # Roughly 730 bytes per control with source capture on; the baseline was
+    # above 2,300.
+    assert used / count < 1200
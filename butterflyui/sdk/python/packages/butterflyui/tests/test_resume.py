@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from websockets.asyncio.client import connect
+
+import butterflyui as bui
+from butterflyui.app import RuntimeApp, WebSession, _build_server
+from butterflyui.runtime.protocol.codec import decode_message
+from butterflyui.runtime.transport.apply_log import ApplyLog
+
+from helpers import find, hello, replay
+
+
+def test_apply_log_replays_or_asks_for_a_snapshot() -> None:
+    log = ApplyLog(3)
+    for seq in range(1, 6):
+        log.append(seq, {"seq": seq})
+    assert [payload["seq"] for payload in log.since(3)] == [4, 5]
+    assert log.since(5) == []
+    assert log.since(1) is None  # evicted
+    assert log.since(6) is None  # never sent
+    log.clear(5)
+    assert log.since(5) == [] and log.since(4) is None
+
+    heavy = ApplyLog(100, max_weight=10)
+    for seq in range(1, 5):
+        heavy.append(seq, {"seq": seq}, weight=4)
+    assert len(heavy) == 2 and heavy.stats()["evicted"] == 2
+
+
+async def _connect(url: str, resume: dict[str, Any] | None = None) -> tuple[Any, list[Any]]:
+    """Connect a runtime and collect messages until the session goes quiet."""
+    websocket = await connect(url, max_size=None, proxy=None)
+    await hello(websocket, ["ui.ops", "ui.resume", "ui.acks"], **({"resume": resume} if resume else {}))
+    messages = []
+    while True:
+        try:
+            messages.append(decode_message(await asyncio.wait_for(websocket.recv(), 0.3)))
+        except asyncio.TimeoutError:
+            return websocket, messages
+
+
+def _run(log_size: int, expect_resumed: bool) -> None:
+    async def scenario() -> None:
+        label = bui.Text("0")
+
+        def main(page: bui.Page) -> None:
+            page.root = bui.Column(bui.Text("hi"), label)
+
+        config = bui.AppConfig(port=0, compression=False, resume_log_size=log_size, first_render_timeout=None)
+        session = WebSession(config)
+        await session.start()
+        app = RuntimeApp(main, config, target="web")
+
+        async def serve() -> None:
+            await session.wait_for_hello(timeout=5)
+            await app.serve_session(session)
+
+        task = asyncio.create_task(serve())
+        try:
+            websocket, messages = await _connect(session.url)
+            applied = [message.payload for message in messages if message.type == "ui.apply"]
+            ready = [message for message in messages if message.type == "runtime.ready"][0]
+            await websocket.close()
+            await asyncio.sleep(0.05)
+
+            for value in range(1, 6):
+                session.update_props(label.control_id, {"text": str(value)})
+                await asyncio.sleep(0.03)
+            resume = {"session_id": ready.payload["session_id"], "seq": applied[-1]["seq"]}
+            websocket, messages = await _connect(session.url, resume)
+            types = [message.type for message in messages]
+            assert ("ui.reset" not in types) == expect_resumed
+            assert messages[-1].type == "runtime.ready"
+            assert messages[-1].payload.get("resumed", False) == expect_resumed
+            if expect_resumed:
+                payloads = applied + [message.payload for message in messages if message.type == "ui.apply"]
+            else:
+                payloads = [message.payload for message in messages if message.type == "ui.apply"]
+            seqs = [payload["seq"] for payload in payloads]
+            assert seqs == sorted(seqs)
+            assert find(replay(payloads), label.control_id)["props"]["text"] == "5"
+            stats = session.apply_stats()
+            assert (stats["resumes"], stats["resume_snapshots"]) == ((1, 0) if expect_resumed else (0, 1))
+            await websocket.close()
+        finally:
+            task.cancel()
+            await session.stop()
+
+    asyncio.run(scenario())
+
+
+def test_reconnecting_runtime_gets_the_missed_batches() -> None:
+    _run(256, expect_resumed=True)
+
+
+def test_runtime_too_far_behind_gets_a_snapshot() -> None:
+    _run(2, expect_resumed=False)
+
+
+def test_hub_rebinds_a_resuming_runtime_to_its_session() -> None:
+    async def scenario() -> None:
+        def main(page: bui.Page) -> None:
+            page.root = bui.Column(bui.Text("hi"))
+
+        config = bui.AppConfig(port=0, compression=False, multi_client=True, first_render_timeout=None)
+        server = _build_server(config)
+        hub = bui.SessionHub(server, config, RuntimeApp(main, config, target="web").serve_session)
+        await hub.start()
+        try:
+            websocket, messages = await _connect(server.url)
+            ready = [message for message in messages if message.type == "runtime.ready"][0]
+            seq = max(message.payload.get("seq", 0) for message in messages if message.type == "ui.apply")
+            await websocket.close()
+            await asyncio.sleep(0.05)
+            assert len(hub) == 1
+
+            resume = {"session_id": ready.payload["session_id"], "seq": seq}
+            websocket, messages = await _connect(server.url, resume)
+            assert messages[-1].payload == {"session_id": ready.payload["session_id"], "resumed": True}
+            assert len(hub) == 1
+            await websocket.close()
+        finally:
+            await hub.stop()
+
+    asyncio.run(scenario())
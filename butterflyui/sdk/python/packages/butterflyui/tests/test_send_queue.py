@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from butterflyui.runtime.transport.send_queue import (
+    PRIORITY_CONTROL,
+    PRIORITY_DIAGNOSTICS,
+    PRIORITY_UI,
+    SendQueue,
+    message_priority,
+)
+
+
+def _drain(queue: SendQueue) -> list[RuntimeMessage]:
+    out = []
+    while (entry := queue.get_nowait()) is not None:
+        out.append(entry.message)
+        queue.task_done()
+    return out
+
+
+def test_priorities() -> None:
+    assert message_priority("runtime.hello_ack") == PRIORITY_CONTROL
+    assert message_priority("ui.apply") == PRIORITY_UI
+    assert message_priority("invoke") == PRIORITY_UI
+    assert message_priority("runtime.ready") == PRIORITY_UI
+    assert message_priority("runtime.problem") == PRIORITY_DIAGNOSTICS
+
+
+def test_control_messages_jump_the_ui_stream() -> None:
+    queue = SendQueue()
+    queue.put_nowait(RuntimeMessage("runtime.log", {}))
+    queue.put_nowait(RuntimeMessage("ui.apply", {"ops": [1]}))
+    queue.put_nowait(RuntimeMessage("invoke", {}))
+    queue.put_nowait(RuntimeMessage("pong", {}))
+    assert [message.type for message in _drain(queue)] == ["pong", "ui.apply", "invoke", "runtime.log"]
+
+
+def test_ui_messages_coalesce() -> None:
+    queue = SendQueue()
+    queue.put_nowait(RuntimeMessage("ui.apply", {"patches": [{"id": "a"}], "seq": 1}))
+    queue.put_nowait(RuntimeMessage("ui.apply", {"patches": [{"id": "b"}], "seq": 2}))
+    queue.put_nowait(RuntimeMessage("ui.apply", {"root": {"id": "r1"}}))
+    queue.put_nowait(RuntimeMessage("ui.apply", {"root": {"id": "r2"}, "screen": {}}))
+    queue.put_nowait(RuntimeMessage("ui.apply", {"ops": []}))
+    queue.put_nowait(RuntimeMessage("ui.apply", {"root": {"id": "r3"}}))
+    assert [message.payload for message in _drain(queue)] == [
+        {"patches": [{"id": "a"}, {"id": "b"}], "seq": 2},
+        {"root": {"id": "r2"}, "screen": {}},
+        {"ops": []},
+        {"root": {"id": "r3"}},
+    ]
+    assert queue.stats()["coalesced"] == 2
+
+
+def test_put_waits_above_the_high_water_mark() -> None:
+    async def scenario() -> None:
+        queue = SendQueue(high_water=2)
+        for index in range(2):
+            await queue.put(RuntimeMessage("ui.apply", {"ops": [index]}))
+        blocked = asyncio.create_task(queue.put(RuntimeMessage("ui.apply", {"ops": [2]})))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        await queue.put(RuntimeMessage("pong", {}))
+        assert queue.get_nowait().message.type == "pong"
+        queue.task_done()
+        assert not blocked.done()
+        queue.get_nowait()
+        queue.task_done()
+        await asyncio.wait_for(blocked, 1)
+        assert queue.stats()["blocked"] == 1
+        _drain(queue)
+        await asyncio.wait_for(queue.join(), 1)
+
+        queue.put_nowait(RuntimeMessage("ui.apply", {"ops": []}))
+        queue.close()
+        assert len(queue) == 0 and queue.stats()["dropped"] == 1
+
+    asyncio.run(scenario())
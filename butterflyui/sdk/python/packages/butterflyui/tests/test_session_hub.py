@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+import websockets
+
+import butterflyui as bui
+from butterflyui.app import _build_server
+
+from helpers import find, hello, receive, replay
+
+
+def _main(page: bui.Page) -> None:
+    count = 0
+    label = bui.Text("0")
+
+    def add() -> str:
+        nonlocal count
+        count += 1
+        return str(count)
+
+    button = bui.Button("Add")
+    button.on_click(page.session, add, outputs=label)
+    page.root = bui.Column(label, button)
+
+
+def _ids(root: dict[str, Any]) -> tuple[str, str]:
+    label, button = root["children"]
+    return label["id"], button["id"]
+
+
+async def _click(websocket: Any, button_id: str) -> None:
+    event = {"control_id": button_id, "event": "click", "payload": {}}
+    await websocket.send(json.dumps({"type": "ui.event", "payload": event}))
+
+
+def test_each_connection_gets_its_own_page() -> None:
+    async def scenario() -> None:
+        config = bui.AppConfig(port=0, multi_client=True, first_render_timeout=None)
+        server = _build_server(config)
+        hub = bui.SessionHub(server, config, bui.RuntimeApp(_main, config, target="web").serve_session)
+        await hub.start()
+        try:
+            async with websockets.connect(server.url) as first, websockets.connect(server.url) as second:
+                trees = []
+                for websocket in (first, second):
+                    await hello(websocket, ["ui.ops"])
+                    trees.append((await receive(websocket, "ui.apply")).payload)
+                assert len(hub) == 2
+                assert len(set(hub.sessions)) == 2
+
+                await _click(first, _ids(trees[0]["root"])[1])
+                await _click(first, _ids(trees[0]["root"])[1])
+                await _click(second, _ids(trees[1]["root"])[1])
+                for websocket, tree, expected in ((first, trees[0], "2"), (second, trees[1], "1")):
+                    payloads = [tree]
+                    label_id = _ids(tree["root"])[0]
+                    while find(replay(payloads), label_id)["props"].get("text") != expected:
+                        payloads.append((await receive(websocket, "ui.apply")).payload)
+        finally:
+            await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_max_clients_closes_extra_connections() -> None:
+    async def scenario() -> None:
+        config = bui.AppConfig(port=0, multi_client=True, max_clients=1, first_render_timeout=None)
+        server = _build_server(config)
+        hub = bui.SessionHub(server, config, bui.RuntimeApp(_main, config, target="web").serve_session)
+        await hub.start()
+        try:
+            async with websockets.connect(server.url) as first:
+                await hello(first, ["ui.ops"])
+                async with websockets.connect(server.url) as extra:
+                    with pytest.raises(websockets.ConnectionClosed) as closed:
+                        await asyncio.wait_for(extra.recv(), 5)
+                    assert closed.value.rcvd.code == 1013
+        finally:
+            await hub.stop()
+
+    asyncio.run(scenario())
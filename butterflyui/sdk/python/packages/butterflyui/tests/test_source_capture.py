@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+import butterflyui as bui
+from butterflyui.core.performance import PerformanceConfig
+
+
+@pytest.fixture(autouse=True)
+def _restore_capture() -> Iterator[None]:
+    saved = PerformanceConfig._source_capture
+    yield
+    PerformanceConfig._source_capture = saved
+
+
+def test_controls_record_where_they_were_built() -> None:
+    PerformanceConfig.set_source_capture(True)
+    source = bui.Text("x").to_json()["meta"]["source"]
+    assert source["path"] == __file__
+    assert source["function"] == "test_controls_record_where_they_were_built"
+
+
+def test_production_turns_capture_off() -> None:
+    PerformanceConfig.set_production(True)
+    assert not PerformanceConfig.source_capture_enabled()
+    assert "meta" not in bui.Text("x").to_json()
+
+
+@pytest.mark.parametrize(
+    ("env", "enabled"),
+    [
+        ({}, True),
+        ({"BUTTERFLYUI_MODE": "production"}, False),
+        ({"BUTTERFLYUI_SOURCE_CAPTURE": "0"}, False),
+        ({"BUTTERFLYUI_MODE": "production", "BUTTERFLYUI_SOURCE_CAPTURE": "1"}, True),
+    ],
+)
+def test_environment(monkeypatch: pytest.MonkeyPatch, env: dict[str, str], enabled: bool) -> None:
+    monkeypatch.delenv("BUTTERFLYUI_MODE", raising=False)
+    monkeypatch.delenv("BUTTERFLYUI_SOURCE_CAPTURE", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    PerformanceConfig.set_source_capture(None)
+    assert PerformanceConfig.source_capture_enabled() is enabled
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import butterflyui as bui
+
+from helpers import new_page
+
+_QUERIES: list[dict[str, Any]] = [
+    {},
+    {"sort_column": "qty"},
+    {"sort_column": "qty", "sort_ascending": False},
+    {"sort_column": "name", "filter_query": "ALP"},
+    {"sort_column": "name", "sort_ascending": False, "filter_query": "a"},
+    {"filter_query": "%"},
+    {"filter_query": "_x"},
+    {"sort_column": "nope"},
+]
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> str:
+    path = str(tmp_path / "items.db")
+    rng = random.Random(5)
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE items (sku TEXT, name TEXT, qty INTEGER, price REAL)")
+        db.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?)",
+            [
+                (
+                    f"S{index:05d}",
+                    rng.choice(["Alpha", "beta", "GAMMA_x", "de%lta"]) + str(rng.randrange(30)) if rng.random() > 0.1 else None,
+                    rng.choice([None, rng.randrange(20)]),
+                    rng.random(),
+                )
+                for index in range(2000)
+            ],
+        )
+        db.execute("CREATE INDEX items_qty ON items(qty)")
+    db.close()
+    return path
+
+
+async def _all_pages(source: bui.SqliteSource, **query: Any) -> tuple[list[Any], int]:
+    ids: list[Any] = []
+    offset = 0
+    while True:
+        page = await source.query(bui.Query(offset=offset, limit=37, **query))
+        if not page.rows:
+            return ids, page.total
+        ids.extend(row["id"] for row in page.rows)
+        offset += 37
+
+
+@pytest.mark.parametrize("query", _QUERIES, ids=[str(sorted(query.items())) for query in _QUERIES])
+def test_keyset_pages_match_offset_pages(database: str, query: dict[str, Any]) -> None:
+    async def scenario() -> None:
+        keyset = bui.SqliteSource(database, "items")
+        plain = bui.SqliteSource(database, "items", cache_size=0)
+        cursors: list[Any] = []
+        fetch = keyset._fetch
+
+        def recording(*args: Any) -> Any:
+            cursors.append(args[-1])
+            return fetch(*args)
+
+        keyset._fetch = recording  # type: ignore[method-assign]
+        try:
+            ids, total = await _all_pages(keyset, **query)
+            reference: list[Any] = []
+            offset = 0
+            while offset < total:
+                plain._cursors.clear()
+                page = await plain.query(bui.Query(offset=offset, limit=37, **query))
+                reference.extend(row["id"] for row in page.rows)
+                offset += 37
+        finally:
+            keyset.close()
+            plain.close()
+        assert ids == reference
+        assert len(set(ids)) == len(ids) == total
+        # Every full page after the first continued from the previous page's
+        # last row; the final read past the end has nothing to continue from.
+        assert cursors[0] is None
+        assert all(cursor is not None for cursor in cursors[1:-1])
+
+    asyncio.run(scenario())
+
+
+def test_like_wildcards_match_literally(database: str) -> None:
+    async def scenario() -> None:
+        source = bui.SqliteSource(database, "items")
+        try:
+            page = await source.query(bui.Query(filter_query="%"))
+        finally:
+            source.close()
+        with sqlite3.connect(database) as db:
+            (expected,) = db.execute(
+                "SELECT count(*) FROM items WHERE instr(coalesce(name, ''), '%') > 0 OR instr(sku, '%') > 0"
+            ).fetchone()
+        db.close()
+        assert page.total == expected > 0
+
+    asyncio.run(scenario())
+
+
+def test_pages_are_cached_until_invalidated(database: str) -> None:
+    async def scenario() -> None:
+        source = bui.SqliteSource(database, "items")
+        try:
+            first = await source.query(bui.Query(limit=10))
+            assert await source.query(bui.Query(limit=10)) is first
+            assert (source.hits, source.misses) == (1, 1)
+            with sqlite3.connect(database) as db:
+                db.execute("DELETE FROM items WHERE rowid <= 5")
+            db.close()
+            source.invalidate()
+            page = await source.query(bui.Query(limit=10))
+            assert page.total == first.total - 5
+        finally:
+            source.close()
+
+    asyncio.run(scenario())
+
+
+def test_sql_source_feeds_a_table(database: str) -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops"})
+        source = bui.SqliteSource(database, sql="SELECT sku, name, qty FROM items WHERE qty > 5", key="sku")
+        table = bui.DataTable(columns=["sku", "name", "qty"], sortable=True, filterable=True)
+        table.set_query_source(source, page_size=20)
+        page.root = table
+        page.update()
+        await page.await_updates()
+        try:
+            for _ in range(100):
+                if table.props.get("rows"):
+                    break
+                await asyncio.sleep(0.02)
+            assert len(table.props["rows"]) == 20
+            assert table.props["rows"][0]["id"] == table.props["rows"][0]["sku"]
+
+            session._handle_event(
+                {"control_id": table.control_id, "event": "sort_change", "payload": {"sort_column": "qty", "sort_ascending": False}}
+            )
+            for _ in range(100):
+                if table.props.get("sort_column") == "qty":
+                    break
+                await asyncio.sleep(0.02)
+            assert [row["qty"] for row in table.props["rows"][:3]] == [19, 19, 19]
+        finally:
+            source.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("control_type", [bui.DataTable, bui.DataGrid, bui.TableView])
+def test_constructor_page_size_carries_through(database: str, control_type: Any) -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops"})
+        source = bui.SqliteSource(database, "items")
+        table = control_type(columns=["sku", "qty"], page_size=15)
+        query = table.set_query_source(source)
+        page.root = table
+        page.update()
+        await page.await_updates()
+        try:
+            for _ in range(100):
+                if table.props.get("rows"):
+                    break
+                await asyncio.sleep(0.02)
+            assert query.page_size == 15
+            assert len(table.props["rows"]) == 15
+            # An explicit argument still wins.
+            assert control_type(columns=["sku"], page_size=15).set_query_source(source, page_size=5).page_size == 5
+        finally:
+            source.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+import websockets
+
+import butterflyui as bui
+from butterflyui.core.diff import diff_control_tree
+from butterflyui.core.ids import encode_base62, new_control_id
+from butterflyui.runtime.protocol.codec import JSON_CODEC, MSGPACK_CODEC, decode_message
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from butterflyui.runtime.protocol.strings import StringTable, StringTableReader
+from butterflyui.runtime.transport.websocket import WebSocketRuntimeServer
+
+from helpers import hello
+
+
+def _tree(count: int) -> Any:
+    return bui.Column(
+        *[
+            bui.Row(bui.Text(f"t{index}"), bui.TextField(f"v{index}", label="L"), bui.Checkbox(value=True), key=str(index))
+            for index in range(count)
+        ]
+    )
+
+
+def _payloads() -> list[dict[str, Any]]:
+    page = _tree(20)
+    page.props["123"] = "digits"
+    snapshot = page.to_json()
+    page.children.append(bui.Text("new"))
+    page.children[3].props["tooltip"] = "x"
+    del page.children[5]
+    page.children[7].children[0].props.pop("text", None)
+    ops = diff_control_tree(page, snapshot).ops
+    return [
+        {"root": snapshot, "seq": 1},
+        {"ops": ops, "seq": 2},
+        {"patch": {"id": "_1", "props": {"value": 3}}, "patches": [{"id": "_2", "props": {"99": 1, "z": None}}]},
+    ]
+
+
+def test_base62() -> None:
+    assert [encode_base62(value) for value in (0, 9, 10, 61, 62, 3843, 3844)] == ["0", "9", "a", "Z", "10", "ZZ", "100"]
+    with pytest.raises(ValueError):
+        encode_base62(-1)
+
+
+def test_control_ids_are_short_and_unique() -> None:
+    ids = [new_control_id() for _ in range(10_000)]
+    assert len(set(ids)) == len(ids)
+    assert all(control_id.startswith("_") and len(control_id) <= 5 for control_id in ids)
+
+
+@pytest.mark.parametrize("limit", [4096, 5])
+@pytest.mark.parametrize("codec", [JSON_CODEC, MSGPACK_CODEC], ids=["json", "msgpack"])
+def test_string_table_round_trip(limit: int, codec: Any) -> None:
+    table, reader = StringTable(limit), StringTableReader()
+    for payload in _payloads():
+        encoded = table.encode_apply(payload)
+        wire = codec.decode(codec.encode(RuntimeMessage("ui.apply", encoded))).payload
+        assert reader.decode_apply(wire) == json.loads(json.dumps(payload))
+    if limit == 5:
+        # Past the limit only digit-only keys are still interned.
+        assert {"123", "99"} <= set(table._index)
+        assert len(table) <= limit + 2
+
+
+def test_names_are_sent_once() -> None:
+    table = StringTable()
+    first = table.encode_apply({"root": bui.Text("a").to_json()})
+    assert "text" in first["strings"]
+    second = table.encode_apply({"root": bui.Text("b").to_json()})
+    assert "text" not in second["strings"]
+    # Ids and prop values stay plain.
+    assert second["root"][table._index["props"]][table._index["text"]] == "b"
+
+
+@pytest.mark.parametrize("codecs", [["json"], ["msgpack"]])
+def test_connection_interns_after_hello(codecs: list[str]) -> None:
+    async def scenario() -> None:
+        server = WebSocketRuntimeServer(port=0)
+        await server.start()
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{server.port}/ws") as websocket:
+                answer = await hello(websocket, ["ui.ops", "ui.strings"], codecs)
+                assert "ui.strings" in answer["capabilities"]
+                reader = StringTableReader()
+                root = _tree(200).to_json()
+                plain = (JSON_CODEC if codecs == ["json"] else MSGPACK_CODEC).encode(RuntimeMessage("ui.apply", {"root": root}))
+                for _ in range(2):
+                    await server.send("ui.apply", {"root": root})
+                    frame = await websocket.recv()
+                    assert reader.decode_apply(decode_message(frame).payload)["root"] == root
+                    assert len(frame) < len(plain)
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+import butterflyui as bui
+from butterflyui.core.diff import apply_tree_ops, diff_control_tree
+from butterflyui.core.template import expand_template_node
+from butterflyui.runtime.protocol.codec import JSON_CODEC, MSGPACK_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from butterflyui.runtime.protocol.templates import TemplateTable, TemplateTableReader
+
+
+def _ids(node: Any, out: list[str]) -> list[str]:
+    """Node ids in pre-order, counting controls held in props before children."""
+    if isinstance(node, dict):
+        if "type" in node and "id" in node and "props" in node:
+            out.append(node["id"])
+            _ids(node["props"], out)
+            for child in node.get("children") or ():
+                _ids(child, out)
+        else:
+            for value in node.values():
+                _ids(value, out)
+    elif isinstance(node, list):
+        for item in node:
+            _ids(item, out)
+    return out
+
+
+def _strip(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {key: _strip(value) for key, value in node.items() if key not in ("id", "meta")}
+    if isinstance(node, list):
+        return [_strip(item) for item in node]
+    return node
+
+
+def _row(name: Any, done: Any, tags: Any) -> bui.Row:
+    return bui.Row(
+        bui.Text(name),
+        bui.Column(bui.Checkbox(value=done, label="Done"), bui.Text("static")),
+        bui.Text(tags),
+    )
+
+
+ROW = bui.Template(_row(bui.Slot("name"), bui.Slot("done"), bui.Slot("tags")))
+ROWS = [{"name": f"n{index}", "done": index % 2 == 0, "tags": str(index)} for index in range(50)]
+
+
+def test_instances_expand_like_the_controls() -> None:
+    instance = ROW.instance(name="a", done=True, tags="x")
+    node = instance.to_json()
+    assert _strip(node) == _strip(_row("a", True, "x").to_json())
+    ids = _ids(node, [])
+    assert ids == [instance.node_id(index) for index in range(len(ids))]
+    assert expand_template_node(json.loads(json.dumps(ROW.to_json())), instance.control_id, list(instance.values)) == node
+    assert instance["name"] == "a"
+    with pytest.raises(ValueError):
+        ROW.instance(bogus=1)
+
+
+def test_controls_in_props_get_instance_ids() -> None:
+    template = bui.Template(bui.ListTile(title=bui.Text(bui.Slot("name")), leading=bui.Icon("x")))
+    instances = template.instances([{"name": "a"}, {"name": "b"}])
+    nodes = [instance.to_json() for instance in instances]
+    ids = [_ids(node, []) for node in nodes]
+    assert len({node_id for row in ids for node_id in row}) == sum(len(row) for row in ids)
+    for instance, node, row in zip(instances, nodes, ids):
+        assert row == [instance.node_id(index) for index in range(len(row))]
+        assert node["props"]["title"]["props"]["text"] == instance["name"]
+        wire = json.loads(json.dumps(template.to_json()))
+        assert expand_template_node(wire, instance.control_id, list(instance.values)) == node
+
+
+@pytest.mark.parametrize("list_type", [bui.ListView, bui.GridView, bui.VirtualList])
+def test_list_changes_diff_as_ops(list_type: type) -> None:
+    view = list_type(*ROW.instances(ROWS))
+    before = view.to_json()
+    view.children.append(ROW.instance(name="new", done=False, tags=""))
+    del view.children[3]
+    diff = diff_control_tree(view, before)
+    assert diff is not None and all(op["op"] != "children" for op in diff.ops)
+    assert _strip(apply_tree_ops(before, diff.ops)) == _strip(view.to_json())
+
+    before = view.to_json()
+    view.children = list(view.children)[::2] + ROW.instances(ROWS[:3])
+    diff = diff_control_tree(view, before)
+    assert _strip(apply_tree_ops(before, diff.ops)) == _strip(view.to_json())
+
+
+@pytest.mark.parametrize("codec", [JSON_CODEC, MSGPACK_CODEC])
+def test_table_round_trip(codec: Any) -> None:
+    page = bui.Column(bui.Text("header"), bui.ListView(*ROW.instances(ROWS)))
+    before = page.to_json()
+    table, reader = TemplateTable(), TemplateTableReader()
+    encoded = table.encode_apply({"root": before, "seq": 1})
+    assert "templates" in encoded
+    wire = codec.decode(codec.encode(RuntimeMessage("ui.apply", encoded))).payload
+    assert reader.decode_apply(wire) == json.loads(json.dumps({"root": before, "seq": 1}))
+
+    page.children[1].children.insert(0, ROW.instance(name="i", done=True, tags="t"))
+    diff = diff_control_tree(page, before)
+    encoded = table.encode_apply({"ops": diff.ops})
+    assert "templates" not in encoded
+    wire = codec.decode(codec.encode(RuntimeMessage("ui.apply", encoded))).payload
+    assert reader.decode_apply(wire) == json.loads(json.dumps({"ops": diff.ops}))
+
+    plain = {"root": bui.Text("x").to_json()}
+    assert TemplateTable().encode_apply(plain) is plain
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+
+import butterflyui as bui
+from butterflyui.core.diff import PropAppend
+from butterflyui.data.series import RingBuffer, lttb, minmax
+
+from helpers import find, new_page, plain, replay
+
+
+def test_ring_buffer_matches_a_list() -> None:
+    rng = random.Random(1)
+    for capacity in (1, 3, 7, 100):
+        ring = RingBuffer(capacity)
+        reference: list[float] = []
+        for _ in range(200):
+            values = [rng.random() for _ in range(rng.randrange(0, 3 * capacity + 2))]
+            ring.extend(values)
+            reference.extend(values)
+            assert ring.count == len(reference)
+            assert ring.values().tolist() == reference[-capacity:]
+            begin = rng.randrange(0, len(reference) + 1)
+            end = rng.randrange(begin, len(reference) + 1)
+            assert ring.slice(begin, end).tolist() == reference[max(begin, len(reference) - capacity) : end]
+
+
+def test_prop_append_then_equals_applying_both() -> None:
+    rng = random.Random(2)
+    for _ in range(500):
+        base = [rng.random() for _ in range(rng.randrange(0, 10))]
+        first = PropAppend([rng.random() for _ in range(rng.randrange(0, 5))], rng.randrange(0, 4), 12)
+        count = rng.randrange(0, 5)
+        second = PropAppend([rng.random() for _ in range(count)], rng.randrange(0, count + 1), 12)
+        assert first.then(second).apply(list(base)) == second.apply(first.apply(list(base)))
+
+
+def test_downsampling_keeps_ends_and_peaks() -> None:
+    values = [math.sin(index / 50) + (5 if index == 777 else 0) for index in range(10_000)]
+    buckets = minmax(values, 1000)
+    assert len(buckets) <= 1000 and max(buckets) == max(values) and min(buckets) == min(values)
+    points = lttb(values, 500)
+    assert len(points) == 500
+    assert points[0] == values[0] and points[-1] == values[-1] and max(points) == max(values)
+
+
+def _stream(capabilities: set[str], method: str, capacity: int, max_points: int, total: int, batch: int) -> None:
+    async def scenario() -> None:
+        server, session, page = new_page(capabilities)
+        series = bui.TimeSeries(capacity, max_points=max_points, method=method)
+        series.extend("a", [0.5] * 3)
+        chart = bui.LineChart()
+        series.attach(chart, "a")
+        page.root = bui.Column(chart)
+        page.update()
+        await page.await_updates()
+        rng = random.Random(3)
+        for start in range(0, total, batch):
+            series.extend("a", [math.sin((start + index) / 37.0) * (1 + rng.random()) for index in range(batch)])
+            await asyncio.sleep(0.02 if rng.random() < 0.3 else 0)
+        series.flush(session)
+        while session._patch_buffer:
+            await asyncio.sleep(0.02)
+
+        binding = series._bindings[0]
+        runtime = find(replay(server.applied()), chart.control_id)
+        assert runtime is not None and runtime["props"]["values"] == binding.shown
+        assert len(binding.shown) <= max_points * 2
+        ring = series.series("a")
+        if not binding.bucketed:
+            assert binding.shown == ring.values().tolist()
+        elif method == "minmax":
+            size = series._bucket
+            expected: list[float] = []
+            for bucket in range(ring.start // size + 1, (ring.count - 1) // size + 1):
+                expected.extend(minmax(ring.slice(bucket * size, (bucket + 1) * size).tolist(), 2))
+            assert binding.shown[-len(expected) :] == expected
+
+    asyncio.run(scenario())
+
+
+def test_streamed_series_matches_the_runtime() -> None:
+    for capabilities in ({"ui.ops", "ui.append"}, {"ui.ops"}):
+        for method in ("minmax", "lttb"):
+            _stream(capabilities, method, 5000, 500, 6000, 37)
+            _stream(capabilities, method, 300, 1000, 1000, 11)
+            _stream(capabilities, method, 1000, 100, 6000, 1500)
+
+
+def test_appends_reach_the_snapshot_and_are_not_resent() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops", "ui.append"})
+        series = bui.TimeSeries(100, max_points=50)
+        chart = bui.LineChart()
+        series.attach(chart, "v")
+        label = bui.Text("a")
+        series.extend("v", [1.0, 2.0, 3.0])
+        series.flush(session)
+        page.root = bui.Column(label, chart)
+        page.update()
+        await page.await_updates()
+
+        series.extend("v", [4.0, 5.0])
+        series.flush(session)
+        await asyncio.sleep(0.05)
+        assert [op["op"] for payload in server.applied() for op in payload.get("ops") or ()][-1] == "append"
+
+        snapshot = session._snapshot_payload()
+        assert snapshot is not None
+        assert plain(find(snapshot["root"], chart.control_id)["props"]["values"]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert plain(chart.to_json()["props"]["values"]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+        sent = len(server.sent)
+        label.text = "b"
+        page.update()
+        await page.await_updates()
+        ops = [op for payload in server.applied(sent) for op in payload.get("ops") or ()]
+        assert ops == [{"op": "props", "id": label.control_id, "props": {"text": "b"}}]
+
+    asyncio.run(scenario())
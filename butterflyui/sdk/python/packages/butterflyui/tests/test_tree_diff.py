@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+import butterflyui as bui
+from butterflyui.core.diff import apply_tree_ops, diff_control_tree
+from butterflyui.state import State
+
+from helpers import new_page, replay
+
+
+def _fresh(control: Any) -> dict[str, Any]:
+    """``to_json()`` with every cache below ``control`` dropped."""
+
+    def drop(node: Any) -> None:
+        node._json_cache = None
+        for child in node.children:
+            if hasattr(child, "_json_cache"):
+                drop(child)
+
+    drop(control)
+    return control.to_json()
+
+
+def test_ops_rebuild_the_tree() -> None:
+    rng = random.Random(1)
+    state = State("s0")
+    rows = [bui.Row(*[bui.Text(f"t{index}") for index in range(5)]) for _ in range(20)]
+    root = bui.Column(*rows)
+    snapshot = root.to_json()
+    for step in range(300):
+        row = rng.choice(rows)
+        kind = rng.randrange(7)
+        if kind == 0 and row.children:
+            row.children.pop(rng.randrange(len(row.children)))
+        elif kind == 1:
+            row.children.insert(rng.randrange(len(row.children) + 1), bui.Text(f"t{step}"))
+        elif kind == 2:
+            rng.shuffle(row.children)
+            row.mark_children_dirty()
+        elif kind == 3 and row.children:
+            rng.choice(row.children).props["value"] = f"v{step}"
+        elif kind == 4:
+            root.children.reverse()
+        elif kind == 5 and row.children:
+            state.value = f"s{step}"
+            row.children[0].props["label"] = state
+        else:
+            row.props["spacing"] = step
+        diff = diff_control_tree(root, snapshot)
+        expected = _fresh(root)
+        assert diff is not None
+        assert apply_tree_ops(snapshot, diff.ops) == expected
+        assert diff.snapshot == expected
+        snapshot = diff.snapshot
+
+
+def test_clean_tree_has_no_ops() -> None:
+    root = bui.Column(*[bui.Text(f"t{index}") for index in range(10)])
+    diff = diff_control_tree(root, root.to_json())
+    assert diff is None or not diff.ops
+
+
+def test_page_update_sends_keyed_ops() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page({"ui.ops"})
+        items = [bui.Text(f"i{index}") for index in range(100)]
+        page.root = bui.Column(*items)
+        page.update()
+        await page.await_updates()
+        assert "root" in server.applied()[-1]
+
+        items[3].props["value"] = "x"
+        page.root.children.append(bui.Text("new"))
+        page.update()
+        page.update()
+        await page.await_updates()
+        payload = server.applied()[-1]
+        assert "root" not in payload
+        assert sorted(op["op"] for op in payload["ops"]) == ["insert", "props"]
+        assert replay(server.applied()) == page.root.to_json()
+
+        # More ops than nodes: the whole tree is sent instead.
+        page.root.children = [bui.Text(f"n{index}") for index in range(100)]
+        page.update()
+        await page.await_updates()
+        assert "root" in server.applied()[-1]
+        assert replay(server.applied()) == page.root.to_json()
+
+    asyncio.run(scenario())
+
+
+def test_runtimes_without_ops_get_full_trees() -> None:
+    async def scenario() -> None:
+        server, session, page = new_page()
+        label = bui.Text("a")
+        page.root = bui.Column(label)
+        page.update()
+        await page.await_updates()
+        label.text = "b"
+        page.update()
+        await page.await_updates()
+        assert all("ops" not in payload for payload in server.applied())
+        assert replay(server.applied()) == page.root.to_json()
+
+    asyncio.run(scenario())
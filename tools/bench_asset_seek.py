@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+
+
+def _seek(server: bui.AssetServer, path: str, offset: int, window: int, use_range: bool) -> int:
+    """Fetch ``window`` bytes at ``offset`` the way a player does; return the bytes received."""
+    connection = http.client.HTTPConnection(server.host, server.port)
+    headers = {"Range": f"bytes={offset}-{offset + window - 1}"} if use_range else {}
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    # Without Range support the player has to read up to the seek point.
+    wanted = window if response.status == 206 else offset + window
+    received = 0
+    while received < wanted:
+        chunk = response.read(min(1 << 20, wanted - received))
+        if not chunk:
+            break
+        received += len(chunk)
+    connection.close()
+    return received
+
+
+def run(label: str, mode: str, args: argparse.Namespace, video: Path, image: Path, use_range: bool) -> None:
+    rng = random.Random(5)
+    size = video.stat().st_size
+    window = args.window * 1024
+    server = bui.AssetServer(mode=mode)
+    server.start()
+    prefix = f"http://{server.host}:{server.port}"
+    video_path = server.register_file(video)[len(prefix) :]
+    image_path = server.register_file(image)[len(prefix) :]
+
+    received = 0
+    start = time.perf_counter()
+    for _ in range(args.seeks):
+        received += _seek(server, video_path, rng.randrange(0, size - window), window, use_range)
+    elapsed = time.perf_counter() - start
+
+    # A re-render asks for the image again with the validator it holds.
+    connection = http.client.HTTPConnection(server.host, server.port)
+    connection.request("GET", image_path)
+    response = connection.getresponse()
+    etag = response.getheader("ETag")
+    response.read()
+    revalidate = {"If-None-Match": etag} if use_range and etag else {}
+    connection.request("GET", image_path, headers=revalidate)
+    response = connection.getresponse()
+    refetched = len(response.read())
+    connection.close()
+    server.stop()
+
+    print(
+        f"{label:>16} | {elapsed / args.seeks * 1000:8.1f}ms {received / args.seeks / 2**20:9.1f}M "
+        f"{response.status:>6} {refetched / 1024:8.0f}K"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seek around a large local video served by AssetServer.")
+    parser.add_argument("--size-mb", type=int, default=2048, help="video size (a sparse file)")
+    parser.add_argument("--seeks", type=int, default=8)
+    parser.add_argument("--window", type=int, default=512, help="KiB a player buffers after each seek")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        video = Path(folder) / "video.mp4"
+        with video.open("wb") as handle:
+            handle.truncate(args.size_mb * 2**20)
+        image = Path(folder) / "poster.jpg"
+        image.write_bytes(os.urandom(256 * 1024))
+        print(f"{args.size_mb:,} MB video, {args.seeks} seeks buffering {args.window} KiB, 256 KiB poster")
+        print(f"{'':>16} | {'per seek':>10} {'received':>10} {'poster':>6} {'resent':>9}")
+        run("no Range", "threads", args, video, image, use_range=False)
+        run("threads", "threads", args, video, image, use_range=True)
+        run("asyncio", "asyncio", args, video, image, use_range=True)
+
+
+if __name__ == "__main__":
+    main()
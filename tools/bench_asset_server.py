@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+
+
+async def _fetch(host: str, port: int, paths: list[str], latencies: list[float], stats: dict[str, int]) -> None:
+    """Fetch ``paths`` in order, reusing the connection while the server allows it."""
+    reader: asyncio.StreamReader | None = None
+    writer: asyncio.StreamWriter | None = None
+    for path in paths:
+        start = time.perf_counter()
+        while True:
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                    stats["connections"] += 1
+                assert reader is not None
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("ascii"))
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+                length = int(head.split("content-length:", 1)[1].split("\r\n", 1)[0])
+                await reader.readexactly(length)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Refused or reset (a full listen backlog): retry like a browser.
+                stats["resets"] += 1
+                if writer is not None:
+                    writer.close()
+                writer = None
+        latencies.append(time.perf_counter() - start)
+        stats["bytes"] += length
+        if not head.startswith("http/1.1") or "connection: close" in head:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _client(host: str, port: int, paths: list[str], connections: int, rounds: int) -> dict[str, float]:
+    """A gallery opening: every connection fetches its share of the thumbnails."""
+    latencies: list[float] = []
+    stats = {"connections": 0, "resets": 0, "bytes": 0}
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_fetch(host, port, paths[index::connections] * rounds, latencies, stats) for index in range(connections))
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+        "connections": stats["connections"],
+        "resets": stats["resets"],
+        "bytes": stats["bytes"],
+    }
+
+
+def run(label: str, mode: str, args: argparse.Namespace, files: list[Path]) -> None:
+    # Threads the server adds: the sampler below counts itself once.
+    baseline = threading.active_count() + 1
+    server = bui.AssetServer(mode=mode)
+    server.start()
+    prefix = f"http://{server.host}:{server.port}"
+    paths = [server.register_file(path)[len(prefix) :] for path in files]
+    peak = baseline
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.wait(0.002):
+            peak = max(peak, threading.active_count())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    cpu = time.process_time()
+    # The client runs in its own process so it does not share the server's GIL.
+    output = subprocess.run(
+        [sys.executable, __file__, "--client", server.host, str(server.port), str(args.connections), str(args.rounds)],
+        input="\n".join(paths),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    cpu = time.process_time() - cpu
+    done.set()
+    sampler.join()
+    server.stop()
+    result = json.loads(output.strip().splitlines()[-1])
+    print(
+        f"{label:>10} | {peak - baseline:>7} {result['connections']:>6} {result['resets']:>6} {result['requests'] / result['elapsed']:>9,.0f} "
+        f"{result['p50'] * 1000:>7.1f}ms {result['p99'] * 1000:>7.1f}ms {cpu / result['requests'] * 1e6:>7.0f}us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Open an image gallery against the asset server.")
+    parser.add_argument("--thumbnails", type=int, default=400)
+    parser.add_argument("--size", type=int, default=24, help="thumbnail size in KiB")
+    parser.add_argument("--connections", type=int, default=200, help="concurrent client connections")
+    parser.add_argument("--rounds", type=int, default=5, help="times each thumbnail is fetched")
+    parser.add_argument("--client", nargs=4, metavar=("HOST", "PORT", "CONNECTIONS", "ROUNDS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.client:
+        host, port, connections, rounds = args.client
+        paths = sys.stdin.read().split()
+        print(json.dumps(asyncio.run(_client(host, int(port), paths, int(connections), int(rounds)))))
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        files = []
+        for index in range(args.thumbnails):
+            path = Path(folder) / f"thumb{index:04d}.jpg"
+            path.write_bytes(os.urandom(args.size * 1024))
+            files.append(path)
+        print(
+            f"{args.thumbnails} thumbnails x {args.size} KiB, {args.connections} connections, "
+            f"{args.thumbnails * args.rounds:,} requests"
+        )
+        print(f"{'':>10} | {'threads':>7} {'conns':>6} {'resets':>6} {'req/s':>9} {'p50':>9} {'p99':>9} {'cpu/req':>9}")
+        run("threads", "threads", args, files)
+        run("asyncio", "asyncio", args, files)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+from websockets.asyncio.client import connect
+
+import butterflyui as bui
+from butterflyui.app import BroadcastSession
+from butterflyui.examples.dashboard import build_page
+from butterflyui.runtime.protocol.codec import JSON_CODEC, build_message, decode_message
+
+
+class Reader:
+    """Fake runtime that reads every frame; a stalled one stops after the first render."""
+
+    def __init__(self, url: str, *, stall: bool = False) -> None:
+        self.url = url
+        self.stall = stall
+        self.frames = 0
+        self.ready = asyncio.Event()
+        self.changed = asyncio.Event()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        async with connect(self.url, max_size=None, proxy=None, compression=None) as ws:
+            hello = build_message("runtime.hello", {"protocol": 1, "capabilities": ["ui.ops"]})
+            await ws.send(JSON_CODEC.encode(hello))
+            reader = asyncio.create_task(self._read(ws))
+            await stop.wait()
+            reader.cancel()
+
+    async def _read(self, ws) -> None:
+        while True:
+            message = decode_message(await ws.recv())
+            self.frames += 1
+            if message.type == "runtime.ready":
+                self.ready.set()
+                if self.stall:
+                    await asyncio.sleep(3600)
+            self.changed.set()
+
+
+async def run(clients: int, updates: int, stall: int, padding: int) -> dict[str, float]:
+    config = bui.AppConfig(port=0, compression=False, broadcast=True)
+    session = BroadcastSession(config)
+    await session.start()
+    page = bui.Page(session=session)
+    page.root = build_page(page)
+    counter = bui.Text("0")
+    page.root.children.append(counter)
+    page.update()
+    await page.await_updates()
+
+    stop = asyncio.Event()
+    readers = [Reader(session.url, stall=index < stall) for index in range(clients)]
+    tasks = [asyncio.create_task(reader.run(stop)) for reader in readers]
+    await asyncio.gather(*(reader.ready.wait() for reader in readers))
+
+    group = session.group
+    encodes_before = group.encodes
+    fan_out = 0.0
+    encode = 0.0
+    send = group.send
+
+    async def timed_send(msg_type, payload=None, **kwargs):
+        nonlocal fan_out, encode
+        mark = time.perf_counter()
+        await send(msg_type, payload, **kwargs)
+        fan_out += time.perf_counter() - mark
+        mark = time.perf_counter()
+        JSON_CODEC.encode(build_message(msg_type, payload or {}))
+        encode += time.perf_counter() - mark
+
+    group.send = timed_send
+    start = time.perf_counter()
+    for value in range(1, updates + 1):
+        counter.value = str(value).rjust(padding, ".")
+        page.update()
+        await page.await_updates()
+        await asyncio.gather(*(reader.changed.wait() for reader in readers if not reader.stall))
+        for reader in readers:
+            reader.changed.clear()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "fan_out_us": fan_out / updates * 1e6,
+        "encode_us": encode / updates * 1e6,
+        "wall_per_update_ms": elapsed / updates * 1e3,
+        "encodes_per_update": (group.encodes - encodes_before) / updates,
+        "lagging": group.stats()["lagging"],
+        "resyncs": group.resyncs,
+    }
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await session.group.stop()
+    return result
+
+
+async def run_all(counts: list[int], updates: int, stall: int, padding: int) -> None:
+    print(
+        f"{'clients':>8} {'stalled':>8} {'fan-out':>12} {'one encode':>12} "
+        f"{'delivered':>12} {'encodes':>8} {'lagging':>8} {'resyncs':>8}"
+    )
+    for clients in counts:
+        r = await run(clients, updates, min(stall, clients), padding)
+        print(
+            f"{clients:8d} {min(stall, clients):8d} {r['fan_out_us']:9.1f} us {r['encode_us']:9.1f} us "
+            f"{r['wall_per_update_ms']:9.2f} ms {r['encodes_per_update']:8.2f} {r['lagging']:8d} {r['resyncs']:8d}"
+        )
+    print("fan-out: time to queue one update on every connection; delivered: until every reader got it")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure broadcast fan-out cost per update.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--stall", type=int, default=0, help="clients that stop reading after the first frame")
+    parser.add_argument("--padding", type=int, default=0, help="pad each update to this many characters")
+    args = parser.parse_args()
+    asyncio.run(run_all(args.clients, args.updates, args.stall, args.padding))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.runtime import set_current_session
+from bench_common import RecordingServer
+
+
+def freehand(rng: random.Random, points: int) -> list[float]:
+    """A wobbly pen stroke, sampled once per pointer move."""
+    x, y = rng.uniform(0, 1600), rng.uniform(0, 900)
+    heading = rng.uniform(0, 2 * math.pi)
+    out: list[float] = []
+    for _ in range(points):
+        heading += rng.gauss(0, 0.15)
+        x += math.cos(heading) * 3 + rng.gauss(0, 0.3)
+        y += math.sin(heading) * 3 + rng.gauss(0, 0.3)
+        out.extend((round(x, 1), round(y, 1)))
+    return out
+
+
+async def run(label: str, args: argparse.Namespace, capabilities: set[str], tolerance: float) -> None:
+    rng = random.Random(11)
+    server = RecordingServer(capabilities)
+    session = bui.ButterflyUISession(server, bui.AppConfig())
+    set_current_session(session)
+    page = bui.Page(session=session)
+    canvas = bui.Canvas()
+    shapes = canvas.display_list(tolerance=tolerance)
+    strokes = [freehand(rng, args.points) for _ in range(args.strokes)]
+    start = time.perf_counter()
+    for points in strokes:
+        shapes.add({"type": "path", "color": "#0f172a", "stroke": 2, "points": points})
+    build = time.perf_counter() - start
+    page.root = canvas
+    page.update()
+    await page.await_updates()
+    initial = server.frames[-1]
+    points = sum(len(shape["points"]) // 2 for shape in shapes)
+    sent = len(server.frames)
+
+    # Draw one more stroke: two pointer moves per frame.
+    pen = freehand(rng, args.moves)
+    stroke = shapes.begin_stroke(pen[:2], color="#dc2626", stroke=3)
+    elapsed = 0.0
+    frames = 0
+    for offset in range(2, len(pen), 4):
+        start = time.perf_counter()
+        shapes.extend_stroke(stroke, pen[offset : offset + 2])
+        shapes.extend_stroke(stroke, pen[offset + 2 : offset + 4])
+        await session._flush_patch_buffer()
+        elapsed += time.perf_counter() - start
+        frames += 1
+    shapes.end_stroke(stroke)
+    await session._flush_patch_buffer()
+    sizes = server.frames[sent:]
+    print(
+        f"{label:>26} | {build * 1000:7.0f}ms {points:>10,} {initial / 1024:8.0f}K "
+        f"{elapsed / frames * 1000:8.2f}ms {sum(sizes[:-1]) / max(1, len(sizes) - 1) / 1024:9.2f}K"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Draw on a whiteboard that already holds many strokes.")
+    parser.add_argument("--strokes", type=int, default=5_000)
+    parser.add_argument("--points", type=int, default=200, help="pointer samples per stroke")
+    parser.add_argument("--moves", type=int, default=240, help="pointer samples of the stroke being drawn")
+    parser.add_argument("--tolerance", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{args.strokes:,} strokes x {args.points} samples, drawing a stroke of {args.moves} samples")
+    print(f"{'':>26} | {'build':>9} {'points':>10} {'initial':>9} {'per frame':>10} {'sent':>10}")
+    await run("whole list", args, {"ui.ops"}, 0.0)
+    await run("ui.items", args, {"ui.ops", "ui.items"}, 0.0)
+    await run(f"ui.items, {args.tolerance:g}px simplify", args, {"ui.ops", "ui.items"}, args.tolerance)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
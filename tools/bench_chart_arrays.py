@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.runtime.protocol.arrays import decode_arrays, encode_arrays
+from butterflyui.runtime.protocol.codec import JSON_CODEC, MSGPACK_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serialize a large chart series as a list and as a binary array.")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--series", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    series = [[math.sin(i / 100 + s) * 100 for i in range(args.points)] for s in range(args.series)]
+    packed = [array("d", values) for values in series]
+    print(f"{args.series} series x {args.points:,} points")
+    print(f"{'':>24} | {'build':>9} {'encode':>9} {'frames':>10}")
+
+    for label, data, arrays in (
+        ("list", series, False),
+        ("array, as list", packed, False),
+        ("array, ui.arrays", packed, True),
+    ):
+        for codec in (JSON_CODEC, MSGPACK_CODEC):
+
+            def build() -> dict[str, Any]:
+                charts = [bui.LineChart(values=values) for values in data]
+                return {"root": bui.Column(*charts).to_json()}
+
+            build_time, payload = _best(build, args.repeat)
+
+            def encode() -> list[Any]:
+                body, attachments = encode_arrays(payload) if arrays else (payload, [])
+                return [codec.encode(RuntimeMessage("ui.apply", body)), *attachments]
+
+            encode_time, frames = _best(encode, args.repeat)
+            if arrays:
+                message = codec.decode(frames[0])
+                decoded = decode_arrays(message.payload, [bytes(frame) for frame in frames[1:]])
+                assert decoded["root"]["children"][0]["props"]["values"] == series[0]
+            size = sum(len(frame) for frame in frames)
+            print(
+                f"{codec.name + ' ' + label:>24} | {build_time * 1000:7.1f}ms {encode_time * 1000:7.1f}ms "
+                f"{size / 1024:8.0f}K"
+            )
+
+
+if __name__ == "__main__":
+    main()
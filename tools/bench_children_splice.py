@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.diff import diff_control_tree
+
+
+def _append(page: Any, step: int) -> None:
+    page.children.append(bui.Text(f"appended {step}"))
+
+
+def _insert_front(page: Any, step: int) -> None:
+    page.children.insert(0, bui.Text(f"inserted {step}"))
+
+
+def _pop_middle(page: Any, step: int) -> None:
+    page.children.pop(len(page.children) // 2)
+
+
+def _move_last_to_front(page: Any, step: int) -> None:
+    page.children.move(-1, 0)
+
+
+def _replace_one(page: Any, step: int) -> None:
+    page.children[len(page.children) // 3] = bui.Text(f"replaced {step}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time tree diffs for single-child edits on a long list.")
+    parser.add_argument("--children", type=int, default=10_000, help="children in the list")
+    parser.add_argument("--rounds", type=int, default=50, help="edits per case")
+    args = parser.parse_args()
+
+    cases: dict[str, Callable[[Any, int], None]] = {
+        "append": _append,
+        "insert at 0": _insert_front,
+        "pop middle": _pop_middle,
+        "move last to 0": _move_last_to_front,
+        "replace one": _replace_one,
+    }
+    print(f"{'edit':>16} {'ms/diff':>8} {'ops':>5} {'weight':>7} {'bytes':>8}")
+    for label, edit in cases.items():
+        page = bui.Column(*[bui.Text(f"row {i}") for i in range(args.children)])
+        snapshot = page.to_json()
+        page.clear_dirty()
+        elapsed = 0.0
+        ops = weight = size = 0
+        for step in range(args.rounds):
+            edit(page, step)
+            start = time.perf_counter()
+            diff = diff_control_tree(page, snapshot)
+            elapsed += time.perf_counter() - start
+            assert diff is not None
+            snapshot = diff.snapshot
+            ops += len(diff.ops)
+            weight += diff.weight
+            size += len(json.dumps(diff.ops, separators=(",", ":")))
+        rounds = args.rounds
+        print(
+            f"{label:>16} {elapsed / rounds * 1e3:8.3f} {ops / rounds:5.1f} "
+            f"{weight / rounds:7.1f} {size / rounds:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+from butterflyui.runtime.protocol.codec import JSON_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+
+
+class RecordingServer:
+    """Stands in for the websocket server and keeps the encoded frame sizes."""
+
+    def __init__(self, capabilities: set[str]) -> None:
+        self.capabilities = frozenset(capabilities)
+        self.frames: list[int] = []
+
+    async def send(self, message_type: str, payload: dict[str, Any], **_: Any) -> None:
+        self.frames.append(len(JSON_CODEC.encode(RuntimeMessage(message_type, payload))))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.performance import PerformanceConfig
+
+
+def build(count: int) -> list[bui.Control]:
+    # One Row per ten Text controls, so `count` controls in total.
+    rows: list[bui.Control] = []
+    per_row = 10
+    for start in range(0, count, per_row + 1):
+        rows.append(bui.Row(*[bui.Text(f"cell {start + offset}") for offset in range(per_row)], spacing=4))
+    return rows
+
+
+def run(count: int, repeat: int) -> None:
+    results: dict[str, float] = {}
+    for label, enabled in (("capture on", True), ("capture off", False)):
+        PerformanceConfig.set_source_capture(enabled)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build(count)
+            best = min(best, time.perf_counter() - start)
+        results[label] = best
+    PerformanceConfig.set_source_capture(None)
+
+    for label, seconds in results.items():
+        per_control = seconds / count * 1e6
+        print(f"{label:12} {seconds * 1e3:9.1f} ms  {per_control:6.2f} us/control")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Text/Row construction with source capture on and off.")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
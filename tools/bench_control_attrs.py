@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+
+
+def _build_form(rows: int) -> tuple[bui.Column, list[tuple[Any, Any, Any, Any]]]:
+    widgets = []
+    for i in range(rows):
+        widgets.append(
+            (
+                bui.TextField(f"value {i}", label=f"Field {i}"),
+                bui.Checkbox(value=i % 2 == 0, label="Enabled"),
+                bui.Text(f"status {i}"),
+                bui.Button("Save", disabled=False),
+            )
+        )
+    page = bui.Column(*[bui.Row(*row) for row in widgets])
+    return page, widgets
+
+
+def _validate_form(widgets: list[tuple[Any, Any, Any, Any]]) -> int:
+    """Typical change handler: read field state, update labels and buttons."""
+    invalid = 0
+    for field, checkbox, status, button in widgets:
+        value = field.value or ""
+        enabled = bool(checkbox.value)
+        ok = enabled and bool(value.strip()) and field.label is not None
+        if not ok:
+            invalid += 1
+        status.value = "ok" if ok else "needs input"
+        button.disabled = not ok
+        if field.error is not None and ok:
+            field.error = None
+        field.props.get("placeholder")
+        field.control_id
+    return invalid
+
+
+def _time(fn: Callable[[], Any], rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time attribute-heavy handler code on controls.")
+    parser.add_argument("--rows", type=int, default=500, help="form rows (4 controls each)")
+    parser.add_argument("--rounds", type=int, default=50, help="handler runs to average")
+    parser.add_argument("--ops", type=int, default=200_000, help="iterations for the single-attribute timings")
+    args = parser.parse_args()
+
+    page, widgets = _build_form(args.rows)
+    field, checkbox, status, button = widgets[0]
+    page.clear_dirty()
+
+    singles: dict[str, Callable[[], Any]] = {
+        "field read": lambda: field.value,
+        "field read (default)": lambda: field.helper,
+        "field write": lambda: setattr(status, "value", "x"),
+        "child read": lambda: page.children,
+        "props read": lambda: field.props,
+        "private write": lambda: setattr(field, "_json_cache", None),
+        "method lookup": lambda: field.to_json,
+    }
+    print(f"{'operation':>22} {'ns/op':>8}")
+    for label, fn in singles.items():
+        seconds = _time(fn, args.ops)
+        print(f"{label:>22} {seconds * 1e9:8.1f}")
+
+    seconds = _time(lambda: _validate_form(widgets), args.rounds)
+    print(f"{'form handler':>22} {seconds * 1e3:8.2f} ms for {args.rows} rows ({seconds / args.rows * 1e6:.2f} us/row)")
+
+
+if __name__ == "__main__":
+    main()
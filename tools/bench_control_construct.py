@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.control import Control
+
+
+def _catalog() -> list[type[Control]]:
+    found: dict[type[Control], None] = {}
+    pending = list(Control.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if cls in found:
+            continue
+        found[cls] = None
+        pending.extend(cls.__subclasses__())
+    return sorted(found, key=lambda cls: (cls.__module__, cls.__qualname__))
+
+
+def _time_class(cls: type[Control], rounds: int, kwargs: dict[str, object]) -> float | None:
+    try:
+        cls(**kwargs)
+    except Exception:
+        return None
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cls(**kwargs)
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time constructing every control class in the catalog.")
+    parser.add_argument("--rounds", type=int, default=200, help="instances built per class")
+    parser.add_argument("--top", type=int, default=10, help="slowest classes to list")
+    args = parser.parse_args()
+
+    classes = _catalog()
+    cases = {
+        "no args": {},
+        "layout kwargs": {"width": 120, "padding": 8, "expand": True, "tooltip": "hint"},
+    }
+    print(f"{len(classes)} control classes, {args.rounds} instances each")
+    print(f"{'case':>14} {'mean':>10} {'median':>10} {'p95':>10} {'controls/s':>12}")
+    slowest: dict[str, float] = {}
+    for label, kwargs in cases.items():
+        timings: list[float] = []
+        for cls in classes:
+            seconds = _time_class(cls, args.rounds, kwargs)
+            if seconds is None:
+                continue
+            timings.append(seconds)
+            name = cls.__qualname__
+            slowest[name] = max(slowest.get(name, 0.0), seconds)
+        timings.sort()
+        mean = statistics.fmean(timings)
+        p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+        print(
+            f"{label:>14} {mean * 1e6:7.1f} us {statistics.median(timings) * 1e6:7.1f} us "
+            f"{p95 * 1e6:7.1f} us {1.0 / mean:12.0f}"
+        )
+
+    start = time.perf_counter()
+    rows = [bui.Row(bui.Text(f"cell {i}"), bui.Text(str(i)), bui.Button("Open")) for i in range(2000)]
+    bui.Column(*rows)
+    elapsed = time.perf_counter() - start
+    print(f"{'report page':>14} {elapsed * 1e3:7.1f} ms for {len(rows) * 4 + 1} controls")
+
+    print(f"slowest {args.top}:")
+    for name, seconds in sorted(slowest.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {name:<28} {seconds * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
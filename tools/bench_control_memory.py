@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.performance import PerformanceConfig
+
+
+def _text_rows(nodes: int) -> Any:
+    rows = [bui.Row(bui.Text(f"cell {i}"), bui.Text(str(i))) for i in range(nodes // 3)]
+    return bui.Column(*rows)
+
+
+def _form_rows(nodes: int) -> Any:
+    rows = [
+        bui.Row(bui.TextField(f"value {i}", label="Name"), bui.Checkbox(value=True), bui.Button("Save"))
+        for i in range(nodes // 4)
+    ]
+    return bui.Column(*rows)
+
+
+def _serialized(build: Callable[[int], Any]) -> Callable[[int], Any]:
+    def run(nodes: int) -> Any:
+        page = build(nodes)
+        page.to_json()
+        # What a session holds after diffing: the tree plus clean dirty state.
+        page.clear_dirty()
+        return page
+
+    return run
+
+
+def _count(control: Any) -> int:
+    return 1 + sum(_count(child) for child in control.children if isinstance(child, bui.Control))
+
+
+def _measure(build: Callable[[int], Any], nodes: int) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    page = build(nodes)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = _count(page)
+    return count, (after - before) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure retained bytes per control with tracemalloc.")
+    parser.add_argument("--nodes", type=int, default=50_000, help="approximate controls per tree")
+    args = parser.parse_args()
+
+    trees: dict[str, Callable[[int], Any]] = {
+        "text rows": _text_rows,
+        "form rows": _form_rows,
+        "text rows, serialized": _serialized(_text_rows),
+    }
+    print(f"{'tree':>24} {'source':>7} {'controls':>9} {'bytes/control':>14} {'MB':>8}")
+    for capture in (True, False):
+        PerformanceConfig.set_source_capture(capture)
+        for label, build in trees.items():
+            count, per_control = _measure(build, args.nodes)
+            print(
+                f"{label:>24} {'on' if capture else 'off':>7} {count:9d} "
+                f"{per_control:14.0f} {per_control * count / 1e6:8.1f}"
+            )
+    PerformanceConfig.set_source_capture(None)
+
+
+if __name__ == "__main__":
+    main()
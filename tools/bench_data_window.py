@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.runtime.protocol.codec import JSON_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from bench_common import RecordingServer
+
+
+class GeneratedRows:
+    """Rows computed on demand, so the dataset itself takes no memory."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_range(self, start: int, end: int) -> list[dict[str, Any]]:
+        return [{"label": f"Row {i}", "subtitle": f"Group {i % 97}", "value": i} for i in range(start, end)]
+
+
+async def scroll(rows: int, scrolls: int, extent: float, viewport: float) -> None:
+    server = RecordingServer({"ui.ops", "ui.windows"})
+    session = bui.ButterflyUISession(server, bui.AppConfig())
+    page = bui.Page(session=session)
+    view = bui.VirtualList(item_extent=extent)
+    window = view.set_data_provider(GeneratedRows(rows), page_size=50, cache_size=1000)
+    page.root = view
+    page.update()
+    await page.await_updates()
+
+    rng = random.Random(7)
+    per_row = int(viewport // extent)
+    tracemalloc.start()
+    checkpoints: dict[int, float] = {}
+    elapsed = 0.0
+    for step in range(1, scrolls + 1):
+        # Mostly short scrolls with the occasional jump across the dataset.
+        if step % 10 == 0:
+            first = rng.randrange(rows)
+        else:
+            first = min(rows - per_row, max(0, window.start + rng.randrange(-200, 400)))
+        start = time.perf_counter()
+        await window.show(first, first + per_row, session)
+        elapsed += time.perf_counter() - start
+        await asyncio.sleep(0)
+        if step in (scrolls // 10, scrolls):
+            checkpoints[step] = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    await asyncio.sleep(0.05)
+
+    frames = server.frames[1:]
+    print(f"rows {rows:,}, {scrolls} scrolls, window {window.end - window.start} rows")
+    print(f"  per scroll        {elapsed / scrolls * 1000:8.2f} ms")
+    print(f"  per frame         {sum(frames) / max(1, len(frames)) / 1024:8.1f} KB ({len(frames)} frames)")
+    print(f"  cache             {len(window.cache)} rows, {window.cache.hits} hits / {window.cache.misses} misses")
+    for step, kib in checkpoints.items():
+        print(f"  retained after {step:>5} scrolls {kib:8.0f} KB")
+
+
+def full_list(rows: int) -> None:
+    data = GeneratedRows(rows).get_range(0, rows)
+    start = time.perf_counter()
+    payload = bui.VirtualList(items=data, item_extent=40).to_json()
+    size = len(JSON_CODEC.encode(RuntimeMessage("ui.apply", {"root": payload})))
+    print(f"items= with {rows:,} rows: to_json + encode {(time.perf_counter() - start) * 1000:.0f} ms, {size / 1024:.0f} KB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scroll a windowed VirtualList over a large generated dataset.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--scrolls", type=int, default=1_000)
+    parser.add_argument("--baseline-rows", type=int, default=100_000, help="rows sent as a plain items list")
+    args = parser.parse_args()
+    full_list(args.baseline_rows)
+    asyncio.run(scroll(args.rows, args.scrolls, extent=40.0, viewport=800.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.runtime.protocol.codec import JSON_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from bench_common import RecordingServer
+
+
+def _columns(rows: int) -> dict[str, list[Any]]:
+    rng = random.Random(11)
+    regions = ["North", "South", "East", "West", "Central"]
+    return {
+        "sku": [f"SKU-{i:07d}" for i in range(rows)],
+        "name": [f"Item {rng.randrange(rows)}" for _ in range(rows)],
+        "region": [regions[i % len(regions)] for i in range(rows)],
+        "qty": [rng.randrange(10_000) for _ in range(rows)],
+        "price": [round(rng.uniform(1, 500), 2) for _ in range(rows)],
+    }
+
+
+def _ms(start: float) -> str:
+    return f"{(time.perf_counter() - start) * 1000:8.1f} ms"
+
+
+async def run(rows: int, page_size: int) -> None:
+    columns = _columns(rows)
+    start = time.perf_counter()
+    table = bui.ColumnTable(columns, key="sku")
+    print(f"rows {rows:,} x {len(table.names)} columns, page size {page_size}")
+    print(f"  build table        {_ms(start)}")
+
+    server = RecordingServer({"ui.ops"})
+    session = bui.ButterflyUISession(server, bui.AppConfig())
+    page = bui.Page(session=session)
+    grid = bui.DataGrid(columns=[{"key": name} for name in table.names], sortable=True, filterable=True)
+    query = grid.set_query_source(table, page_size=page_size)
+    page.root = grid
+    page.update()
+    await page.await_updates()
+
+    async def step(label: str, **changes: Any) -> None:
+        start = time.perf_counter()
+        await query.update(session, **changes)
+        elapsed = _ms(start)
+        # Let the session flush the patch so each step is one frame.
+        await asyncio.sleep(0.02)
+        print(f"  {label:<18} {elapsed}  total {query.total:>9,}  frame {server.frames[-1] / 1024:5.1f} KB")
+
+    await step("sort qty (index)", sort_column="qty")
+    await step("sort qty desc", sort_ascending=False)
+    await step("sort name (index)", sort_column="name", sort_ascending=True)
+    await step("sort qty again", sort_column="qty")
+    for typed in ("I", "It", "Ite", "Item 12", "Item 123", "Item 1234"):
+        await step(f"filter {typed!r}", filter_query=typed)
+    await step("clear filter", filter_query="")
+    for number in (2, 3, 500, query.total // page_size):
+        await step(f"page {number}", page=number)
+    full = len(JSON_CODEC.encode(RuntimeMessage("ui.apply", {"rows": [table.row(i) for i in range(rows)]})))
+    print(f"  all rows as JSON   {full / 1024 / 1024:8.1f} MB (the rows= alternative)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sort, filter and page a large ColumnTable behind a DataGrid.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.diff import count_control_nodes, diff_control_tree
+
+
+def _rows(items: list[int], keyed: bool) -> list[Any]:
+    rows = []
+    for item in items:
+        cells = (bui.Text(f"item {item}"), bui.Text(str(item * 7 % 100)), bui.Checkbox(value=item % 2 == 0))
+        rows.append(bui.Row(*cells, key=str(item)) if keyed else bui.Row(*cells))
+    return rows
+
+
+def _shuffled(items: list[int], rng: random.Random) -> list[int]:
+    items = list(items)
+    rng.shuffle(items)
+    return items
+
+
+def _inserted(items: list[int], rng: random.Random) -> list[int]:
+    items = list(items)
+    start = len(items)
+    for offset in range(max(1, len(items) // 100)):
+        items.insert(rng.randrange(len(items) + 1), start + offset)
+    return items
+
+
+def _filtered(items: list[int], rng: random.Random) -> list[int]:
+    return [item for item in items if item % 2 == 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff rebuilt lists with and without key= reconciliation.")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the list")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    cases: dict[str, Callable[[list[int], random.Random], list[int]]] = {
+        "shuffled": _shuffled,
+        "inserted 1%": _inserted,
+        "filtered 50%": _filtered,
+    }
+    print(
+        f"{'case':>13} {'keys':>5} {'ms':>8} {'insert':>7} {'remove':>7} {'move':>6} "
+        f"{'props':>6} {'weight':>7} {'KB':>8} {'full resend':>12}"
+    )
+    for label, reorder in cases.items():
+        for keyed in (False, True):
+            rng = random.Random(args.seed)
+            items = list(range(args.rows))
+            page = bui.Column(*_rows(items, keyed))
+            snapshot = page.to_json()
+            page.clear_dirty()
+            size = count_control_nodes(snapshot)
+            rows = _rows(reorder(items, rng), keyed)
+            start = time.perf_counter()
+            page.children = rows
+            diff = diff_control_tree(page, snapshot)
+            elapsed = time.perf_counter() - start
+            assert diff is not None
+            counts = Counter(op["op"] for op in diff.ops)
+            payload = len(json.dumps(diff.ops, separators=(",", ":"))) / 1024
+            print(
+                f"{label:>13} {'on' if keyed else 'off':>5} {elapsed * 1e3:8.1f} {counts['insert']:7d} "
+                f"{counts['remove']:7d} {counts['move']:6d} {counts['props']:6d} {diff.weight:7d} "
+                f"{payload:8.0f} {'yes' if diff.weight > size else 'no':>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
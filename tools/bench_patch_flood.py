@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+from websockets.asyncio.client import connect
+
+import butterflyui as bui
+from butterflyui.runtime import WebSocketRuntimeServer
+from butterflyui.runtime.protocol.codec import JSON_CODEC, build_message, decode_message
+
+
+class SlowRuntime:
+    """Fake runtime that spends ``apply_s`` on every ui.apply and optionally acks it."""
+
+    def __init__(self, url: str, *, acks: bool, apply_s: float) -> None:
+        self.url = url
+        self.acks = acks
+        self.apply_s = apply_s
+        self.batches = 0
+        self.patches = 0
+        self.value: object = None
+        self.seen_at: float = 0.0
+
+    async def run(self, ready: threading.Event, stop: threading.Event) -> None:
+        capabilities = ["ui.ops", "ui.acks"] if self.acks else ["ui.ops"]
+        async with connect(self.url, max_size=None, proxy=None, compression=None) as ws:
+            await ws.send(JSON_CODEC.encode(build_message("runtime.hello", {"capabilities": capabilities})))
+            ready.set()
+            while not stop.is_set():
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=0.2)
+                except asyncio.TimeoutError:
+                    continue
+                message = decode_message(raw)
+                if message.type != "ui.apply":
+                    continue
+                # Simulate layout and paint on a slow device.
+                time.sleep(self.apply_s)
+                self.batches += 1
+                for patch in message.payload.get("patches", ()):
+                    self.patches += 1
+                    self.value = patch["props"].get("value")
+                    self.seen_at = time.perf_counter()
+                seq = message.payload.get("seq")
+                if self.acks and seq is not None:
+                    await ws.send(JSON_CODEC.encode(build_message("ui.applied", {"seq": seq})))
+
+
+async def run(acks: bool, rate: int, seconds: float, apply_s: float) -> dict[str, float]:
+    config = bui.AppConfig(port=0, compression=False)
+    server = WebSocketRuntimeServer(port=0, compression=False, target_fps=config.target_fps)
+    session = bui.ButterflyUISession(server, config)
+    await session.start()
+    runtime = SlowRuntime(server.url, acks=acks, apply_s=apply_s)
+    # The runtime gets its own thread and loop so its apply cost does not
+    # block the server.
+    ready, stop = threading.Event(), threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(runtime.run(ready, stop)))
+    thread.start()
+    await session.wait_for_hello(timeout=5)
+
+    total = int(rate * seconds)
+    step = max(1, rate // 100)
+    start = time.perf_counter()
+    for value in range(1, total + 1):
+        session.update_props("progress", {"value": value})
+        if value % step == 0:
+            await asyncio.sleep(0.01)
+    produced = time.perf_counter()
+    while runtime.value != total and time.perf_counter() - produced < 30:
+        await asyncio.sleep(0.01)
+    caught_up = runtime.seen_at - produced if runtime.value == total else float("inf")
+
+    stats = session.apply_stats()
+    result = {
+        "updates": total,
+        "batches": runtime.batches,
+        "patches": runtime.patches,
+        "produce_s": produced - start,
+        "lag_s": caught_up,
+        "rtt_ms": stats["rtt_ms"] or 0.0,
+        "deferred": stats["deferred_flushes"],
+    }
+    stop.set()
+    await asyncio.to_thread(thread.join)
+    await server.stop()
+    return result
+
+
+async def run_all(rate: int, seconds: float, apply_ms: float) -> None:
+    print(f"{rate} updates/s for {seconds:g}s, runtime apply cost {apply_ms:g} ms")
+    print(f"{'mode':>10} {'batches':>8} {'patches':>8} {'final lag':>10} {'apply rtt':>10} {'deferred':>9}")
+    for acks in (False, True):
+        r = await run(acks, rate, seconds, apply_ms / 1000.0)
+        print(
+            f"{'ui.acks' if acks else 'fixed':>10} {r['batches']:8d} {r['patches']:8d} "
+            f"{r['lag_s'] * 1000.0:7.1f} ms {r['rtt_ms']:7.1f} ms {r['deferred']:9d}"
+        )
+    print("final lag: time from the last update to the runtime applying it")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Flood a slow runtime with prop patches.")
+    parser.add_argument("--rate", type=int, default=10_000, help="update_props calls per second")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--apply-ms", type=float, default=40.0, help="simulated runtime cost per ui.apply")
+    args = parser.parse_args()
+    asyncio.run(run_all(args.rate, args.seconds, args.apply_ms))
+
+
+if __name__ == "__main__":
+    main()
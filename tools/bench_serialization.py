@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.examples.dashboard import build_page
+
+
+def _iter_controls(control: bui.Control) -> Iterator[bui.Control]:
+    stack: list[Any] = [control]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, bui.Control):
+            yield current
+            stack.extend(current.children)
+            stack.extend(current.props.values())
+        elif isinstance(current, dict):
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple)):
+            stack.extend(current)
+
+
+def _drop_json_caches(control: bui.Control) -> None:
+    for node in _iter_controls(control):
+        node._json_cache = None
+
+
+def _build_tree(copies: int) -> bui.Control:
+    roots = []
+    for _ in range(copies):
+        page = SimpleNamespace()
+        roots.append(build_page(page))  # type: ignore[arg-type]
+    return roots[0] if copies == 1 else bui.Column(*roots)
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(copies: int, repeat: int) -> None:
+    root = _build_tree(copies)
+    root.to_json()
+    nodes = sum(1 for _ in _iter_controls(root))
+    leaf = next(node for node in _iter_controls(root) if node.control_type == "text")
+    counter = iter(range(10**9))
+
+    def cold() -> None:
+        _drop_json_caches(root)
+        root.to_json()
+
+    def one_leaf() -> None:
+        leaf.props["value"] = f"value {next(counter)}"
+        root.to_json()
+
+    def unchanged() -> None:
+        root.to_json()
+
+    drop = _time(lambda: _drop_json_caches(root), repeat)
+    cold_s = max(_time(cold, repeat) - drop, 0.0)
+    leaf_s = _time(one_leaf, repeat)
+    warm_s = _time(unchanged, repeat)
+    print(f"dashboard x{copies}: {nodes} controls")
+    print(f"  full serialize   {cold_s * 1e3:9.3f} ms")
+    print(f"  one leaf changed {leaf_s * 1e3:9.3f} ms  ({cold_s / max(leaf_s, 1e-9):.0f}x)")
+    print(f"  unchanged        {warm_s * 1e3:9.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cached Control.to_json() on the dashboard example.")
+    parser.add_argument("--copies", type=int, nargs="*", default=[1, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for copies in args.copies:
+        run(copies, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+
+
+def build(path: Path, rows: int) -> None:
+    db = sqlite3.connect(path)
+    db.executescript(
+        f"""
+        CREATE TABLE orders (sku TEXT, customer TEXT, region TEXT, qty INTEGER, total REAL);
+        WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < {rows - 1})
+        INSERT INTO orders
+        SELECT printf('SKU-%08d', i), 'Customer ' || ((i * 7919) % 1000003),
+               CASE i % 5 WHEN 0 THEN 'North' WHEN 1 THEN 'South' WHEN 2 THEN 'East'
+                          WHEN 3 THEN 'West' ELSE 'Central' END,
+               (i * 104729) % 10007, ((i * 31) % 50000) / 100.0
+        FROM n;
+        CREATE INDEX orders_qty ON orders(qty);
+        CREATE INDEX orders_customer ON orders(customer);
+        """
+    )
+    db.commit()
+    db.close()
+
+
+class LoopMonitor:
+    """Measures the longest stall of the event loop while queries run."""
+
+    def __init__(self) -> None:
+        self.worst = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def _tick(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            self.worst = max(self.worst, time.perf_counter() - start - 0.001)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+async def run(path: Path, page_size: int) -> None:
+    source = bui.SqliteSource(path, "orders", filter_columns=["sku", "customer"])
+    grid = bui.DataGrid(columns=["sku", "customer", "region", "qty", "total"], sortable=True, filterable=True)
+    query = grid.set_query_source(source, page_size=page_size)
+    monitor = LoopMonitor()
+    monitor.start()
+
+    async def step(label: str, **changes: Any) -> None:
+        start = time.perf_counter()
+        await query.update(**changes)
+        print(f"  {label:<28} {(time.perf_counter() - start) * 1000:8.1f} ms  total {query.total:>11,}")
+
+    await step("first page")
+    await step("sort qty (indexed)", sort_column="qty")
+    for number in (2, 3, 4):
+        await step(f"next page {number} (keyset)", page=number)
+    await step("back to page 2 (cached)", page=2)
+    await step("jump to page 20,000 (offset)", page=20_000)
+    await step("page 20,001 (keyset)", page=20_001)
+    await step("sort qty desc", sort_ascending=False)
+    await step("sort customer (indexed)", sort_column="customer", sort_ascending=True)
+    await step("sort total (unindexed)", sort_column="total")
+    await step("filter 'customer 12345'", filter_query="Customer 12345")
+    await step("filter, page 2", page=2)
+    monitor.stop()
+    print(f"  longest event loop stall     {monitor.worst * 1000:8.1f} ms")
+    print(f"  page cache                   {source.hits} hits / {source.misses} misses")
+    source.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sort, filter and page a large SQLite table behind a DataGrid.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--database", type=Path, help="reuse a database built by an earlier run")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as folder:
+        path = args.database or Path(folder) / "orders.db"
+        if not path.exists():
+            start = time.perf_counter()
+            build(path, args.rows)
+            print(f"built {args.rows:,} rows in {time.perf_counter() - start:.1f} s")
+        asyncio.run(run(path, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
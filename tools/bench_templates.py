@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.performance import PerformanceConfig
+from butterflyui.runtime.protocol.codec import JSON_CODEC, MSGPACK_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from butterflyui.runtime.protocol.strings import StringTable, StringTableReader
+from butterflyui.runtime.protocol.templates import TemplateTable, TemplateTableReader
+
+
+def _card(title: Any, subtitle: Any, price: Any, stock: Any, starred: Any) -> Any:
+    return bui.Container(
+        bui.Row(
+            bui.Column(
+                bui.Text(title, weight="bold"),
+                bui.Text(subtitle, size=12),
+                bui.Row(bui.Text("Price"), bui.Text(price)),
+                bui.Row(bui.Text("In stock"), bui.Text(stock)),
+            ),
+            bui.Checkbox(value=starred, label="Starred"),
+            bui.Button("Open"),
+        ),
+        padding=8,
+    )
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "title": f"Item {i}",
+            "subtitle": f"Category {i % 7}",
+            "price": f"{i * 1.25:.2f}",
+            "stock": str(i % 40),
+            "starred": i % 3 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare repeated rows built as controls and as template instances.")
+    parser.add_argument("--rows", type=int, default=2_000, help="cards in the list (13 controls each)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    PerformanceConfig.set_source_capture(False)
+    rows = _rows(args.rows)
+    template = bui.Template(
+        _card(bui.Slot("title"), bui.Slot("subtitle"), bui.Slot("price"), bui.Slot("stock"), bui.Slot("starred"))
+    )
+
+    control_time, control_tree = _best(lambda: bui.ListView(*[_card(**row) for row in rows]).to_json(), args.repeat)
+    template_time, template_tree = _best(lambda: bui.ListView(*template.instances(rows)).to_json(), args.repeat)
+    print(f"{'build + to_json':>26} | controls {control_time * 1000:8.1f} ms | template {template_time * 1000:8.1f} ms")
+
+    print(f"{'payload':>26} | {'bytes':>10} {'encode':>9} {'parse':>9}")
+    for codec in (JSON_CODEC, MSGPACK_CODEC):
+        for label, tree, tables in (
+            ("controls", control_tree, False),
+            ("controls + strings", control_tree, True),
+            ("template + strings", template_tree, True),
+        ):
+
+            def encode() -> bytes | str:
+                payload = {"root": tree, "seq": 1}
+                if tables:
+                    payload = StringTable().encode_apply(TemplateTable().encode_apply(payload))
+                return codec.encode(RuntimeMessage("ui.apply", payload))
+
+            encode_time, data = _best(encode, args.repeat)
+            # Frame parsing only: the table readers here are reference code,
+            # a runtime builds widgets from the template without copying it.
+            parse_time, message = _best(lambda: codec.decode(data), args.repeat)
+            if tables:
+                decoded = TemplateTableReader().decode_apply(StringTableReader().decode_apply(message.payload))
+                plain = JSON_CODEC.encode(RuntimeMessage("ui.apply", {"root": tree}))
+                assert decoded["root"] == JSON_CODEC.decode(plain).payload["root"]
+            print(
+                f"{codec.name + ' ' + label:>26} | {len(data) / 1024:9.0f}K "
+                f"{encode_time * 1000:7.1f}ms {parse_time * 1000:7.1f}ms"
+            )
+    PerformanceConfig.set_source_capture(None)
+
+
+if __name__ == "__main__":
+    main()
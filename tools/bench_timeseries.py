@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.data import minmax
+from bench_common import RecordingServer
+
+
+def _sample(series: int, tick: int) -> float:
+    return math.sin(tick / 250 + series) * 50 + (tick * 7919 + series * 104729) % 997 / 100
+
+
+async def run(label: str, args: argparse.Namespace, capabilities: set[str], strategy: str) -> None:
+    server = RecordingServer(capabilities)
+    session = bui.ButterflyUISession(server, bui.AppConfig())
+    page = bui.Page(session=session)
+    charts = [bui.LineChart() for _ in range(args.series)]
+    names = [f"s{index}" for index in range(args.series)]
+    source = bui.TimeSeries(args.capacity, max_points=args.max_points, method=args.method)
+    history = [deque(maxlen=args.capacity) for _ in charts]
+    update: Callable[[], None]
+    if strategy == "stream":
+        for chart, name in zip(charts, names):
+            chart.set_time_series(source, name)
+
+        def update() -> None:
+            source.flush(session)
+
+    else:
+        # What an app does without TimeSeries: resend the bounded list each frame.
+        def update() -> None:
+            for chart, values in zip(charts, history):
+                shown = list(values) if strategy == "resend" else minmax(list(values), args.max_points)
+                session.update_props(chart.control_id, {"values": shown})
+
+    page.root = bui.Column(*charts)
+    page.update()
+    await page.await_updates()
+    sent = len(server.frames)
+
+    frames = int(args.seconds * args.fps)
+    tick = 0
+    ingest = flush = 0.0
+    for frame in range(frames):
+        end = (frame + 1) * args.rate // args.fps
+        start = time.perf_counter()
+        for index, name in enumerate(names):
+            values = [_sample(index, t) for t in range(tick, end)]
+            if strategy == "stream":
+                source.extend(name, values)
+            else:
+                history[index].extend(values)
+        tick = end
+        middle = time.perf_counter()
+        update()
+        await session._flush_patch_buffer()
+        flush += time.perf_counter() - middle
+        ingest += middle - start
+    sizes = server.frames[sent:]
+    print(
+        f"{label:>26} | {ingest / frames * 1000:7.3f}ms {flush / frames * 1000:8.3f}ms "
+        f"{flush / args.seconds * 100:6.1f}% {sum(sizes) / max(1, len(sizes)) / 1024:9.1f}K"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream 1 kHz samples into line charts.")
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--rate", type=int, default=1000, help="samples per second per series")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--max-points", type=int, default=1_000)
+    parser.add_argument("--method", choices=("minmax", "lttb"), default="minmax")
+    args = parser.parse_args()
+
+    print(
+        f"{args.series} series x {args.rate} Hz for {args.seconds:g}s at {args.fps} fps, "
+        f"history {args.capacity:,}, budget {args.max_points:,} ({args.method})"
+    )
+    print(f"{'':>26} | {'ingest':>9} {'send':>10} {'cpu':>7} {'per frame':>10}")
+    await run("resend full list", args, {"ui.ops"}, "resend")
+    await run("resend downsampled", args, {"ui.ops"}, "downsample")
+    await run("TimeSeries, patches", args, {"ui.ops"}, "stream")
+    await run("TimeSeries, ui.append", args, {"ui.ops", "ui.append"}, "stream")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
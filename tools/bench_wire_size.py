@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import uuid
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+import butterflyui as bui
+from butterflyui.core.diff import diff_control_tree
+from butterflyui.core.performance import PerformanceConfig
+from butterflyui.runtime.protocol.codec import JSON_CODEC, MSGPACK_CODEC
+from butterflyui.runtime.protocol.message import RuntimeMessage
+from butterflyui.runtime.protocol.strings import StringTable
+
+
+def _page(rows: int) -> Any:
+    return bui.Column(
+        *[
+            bui.Row(
+                bui.Text(f"item {i}"),
+                bui.TextField(f"value {i}", label="Name"),
+                bui.Checkbox(value=i % 2 == 0, label="Done"),
+                bui.Button("Save"),
+                key=str(i),
+            )
+            for i in range(rows)
+        ]
+    )
+
+
+def _uuid_ids(value: Any, ids: dict[str, str]) -> Any:
+    """Rewrite control ids to 32-character hex, as generated before."""
+    if isinstance(value, list):
+        return [_uuid_ids(item, ids) for item in value]
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for key, item in value.items():
+        if key in ("id", "parent", "before") and isinstance(item, str):
+            item = ids.setdefault(item, uuid.uuid4().hex)
+        else:
+            item = _uuid_ids(item, ids)
+        out[key] = item
+    return out
+
+
+def _sizes(payloads: list[dict[str, Any]]) -> list[int]:
+    ids: dict[str, str] = {}
+    table = StringTable()
+    totals = [0] * 6
+    for payload in payloads:
+        variants = (_uuid_ids(payload, ids), payload, table.encode_apply(payload))
+        for column, variant in enumerate(variants):
+            message = RuntimeMessage("ui.apply", variant)
+            totals[column] += len(JSON_CODEC.encode(message))
+            totals[column + 3] += len(MSGPACK_CODEC.encode(message))
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ui.apply payload sizes for id formats and ui.strings.")
+    parser.add_argument("--rows", type=int, default=5_000, help="rows in the page (5 controls each)")
+    args = parser.parse_args()
+
+    print(
+        f"{'payload':>22} {'source':>7} | {'json uuid':>10} {'short ids':>10} {'+strings':>10} "
+        f"| {'msgpack uuid':>12} {'short ids':>10} {'+strings':>10}"
+    )
+    for capture in (False, True):
+        PerformanceConfig.set_source_capture(capture)
+        page = _page(args.rows)
+        tree = page.to_json()
+        page.clear_dirty()
+        for i in range(0, args.rows, 10):
+            page.children[i].children[1].props["value"] = f"edited {i}"
+        for i in range(0, args.rows, 100):
+            page.children.insert(i, bui.Row(bui.Text(f"new {i}"), bui.Button("Undo"), key=f"n{i}"))
+        diff = diff_control_tree(page, tree)
+        assert diff is not None
+        cases = {
+            "full tree": [{"root": tree, "seq": 1}],
+            "ops update": [{"root": tree, "seq": 1}, {"ops": diff.ops, "seq": 2}],
+        }
+        for label, payloads in cases.items():
+            sizes = _sizes(payloads)
+            if label == "ops update":
+                # Only the second payload, sent after the table is warm.
+                first = _sizes(payloads[:1])
+                sizes = [total - head for total, head in zip(sizes, first)]
+            json_uuid, json_short, json_strings, pack_uuid, pack_short, pack_strings = sizes
+            print(
+                f"{label:>22} {'on' if capture else 'off':>7} | {json_uuid / 1024:9.0f}K "
+                f"{json_short / 1024:9.0f}K {json_strings / 1024:9.0f}K | {pack_uuid / 1024:11.0f}K "
+                f"{pack_short / 1024:9.0f}K {pack_strings / 1024:9.0f}K"
+            )
+    PerformanceConfig.set_source_capture(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PY_SRC = REPO_ROOT / "butterflyui" / "sdk" / "python" / "packages" / "butterflyui" / "src"
+if str(PY_SRC) not in sys.path:
+    sys.path.insert(0, str(PY_SRC))
+
+from websockets.asyncio.client import connect
+
+import butterflyui as bui
+from butterflyui.runtime import WebSocketRuntimeServer
+from butterflyui.runtime.protocol.codec import CODECS, build_message, decode_message
+
+
+def _main(page: bui.Page) -> None:
+    count = 0
+    label = bui.Text("0")
+
+    def add() -> str:
+        nonlocal count
+        count += 1
+        return str(count)
+
+    button = bui.Button("Add")
+    button.on_click(page.session, add, outputs=label)
+    page.root = bui.Column(bui.Text("Load test"), label, button, *(bui.Text(f"row {i}") for i in range(20)))
+
+
+def _find(node: Any, control_type: str) -> str | None:
+    if isinstance(node, dict):
+        if node.get("type") == control_type and node.get("id"):
+            return str(node["id"])
+        for child in node.get("children") or ():
+            found = _find(child, control_type)
+            if found is not None:
+                return found
+    return None
+
+
+def _has_patch(message: Any) -> bool:
+    payload = message.payload
+    return message.type == "ui.apply" and ("patches" in payload or "patch" in payload or "ops" in payload)
+
+
+class FakeRuntime:
+    """Minimal runtime client: handshake, first render ack, click events."""
+
+    def __init__(self, url: str, codec: str) -> None:
+        self.url = url
+        self.codec = CODECS[codec]
+        self.setup_s = 0.0
+        self.event_rtts: list[float] = []
+
+    async def run(self, events: int) -> None:
+        start = time.perf_counter()
+        async with connect(self.url, max_size=None, proxy=None) as ws:
+            hello = build_message(
+                "runtime.hello",
+                {"protocol": 1, "capabilities": ["ui.ops", "ui.chunks"], "codecs": [self.codec.name]},
+            )
+            await ws.send(self.codec.encode(hello))
+            button_id = None
+            ready = False
+            while button_id is None or not ready:
+                message = decode_message(await ws.recv())
+                if message.type == "ui.apply" and "root" in message.payload:
+                    button_id = _find(message.payload["root"], "button")
+                elif message.type == "runtime.ready":
+                    ready = True
+            applied = build_message("ui.applied", {"first_render": True, "has_root": True})
+            await ws.send(self.codec.encode(applied))
+            self.setup_s = time.perf_counter() - start
+
+            for _ in range(events):
+                event = build_message("ui.event", {"control_id": button_id, "event": "click", "payload": {}})
+                sent = time.perf_counter()
+                await ws.send(self.codec.encode(event))
+                while not _has_patch(decode_message(await ws.recv())):
+                    pass
+                self.event_rtts.append(time.perf_counter() - sent)
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))] * 1000.0
+    return (
+        f"p50 {pick(0.50):7.2f} ms  p95 {pick(0.95):7.2f} ms  "
+        f"p99 {pick(0.99):7.2f} ms  mean {statistics.fmean(values) * 1000.0:7.2f} ms"
+    )
+
+
+async def run(clients: int, concurrency: int, events: int, codec: str) -> None:
+    config = bui.AppConfig(port=0, multi_client=True, first_render_timeout=None)
+    server = WebSocketRuntimeServer(
+        host=config.host,
+        port=config.port,
+        path=config.path,
+        target_fps=config.target_fps,
+        send_queue_limit=config.send_queue_limit,
+    )
+    app = bui.RuntimeApp(_main, config, target="web")
+    hub = bui.SessionHub(server, config, app.serve_session)
+    await hub.start()
+
+    runtimes = [FakeRuntime(server.url, codec) for _ in range(clients)]
+    gate = asyncio.Semaphore(concurrency)
+    peak_sessions = 0
+
+    async def _client(runtime: FakeRuntime) -> None:
+        nonlocal peak_sessions
+        async with gate:
+            await runtime.run(events)
+            peak_sessions = max(peak_sessions, len(hub))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(runtime) for runtime in runtimes))
+    elapsed = time.perf_counter() - start
+    await hub.stop()
+
+    setups = [runtime.setup_s for runtime in runtimes]
+    rtts = [rtt for runtime in runtimes for rtt in runtime.event_rtts]
+    print(f"clients={clients} concurrency={concurrency} events/client={events} codec={codec}")
+    print(f"wall time        : {elapsed:8.3f} s  ({clients / elapsed:8.1f} sessions/s)")
+    print(f"peak sessions    : {peak_sessions}")
+    print(f"session setup    : {_percentiles(setups)}")
+    print(f"event round trip : {_percentiles(rtts)}")
+    print(f"events/s         : {len(rtts) / elapsed:8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the multi-client session hub with fake runtimes.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100, help="clients connected at the same time")
+    parser.add_argument("--events", type=int, default=10, help="click events per client")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="json")
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.concurrency, args.events, args.codec))
+
+
+if __name__ == "__main__":
+    main()